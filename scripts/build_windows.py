@@ -67,6 +67,7 @@ def build_windows_gui():
             "--noconfirm",
             "--add-data", "src/fonts/msyh.ttf;fonts",  # 微软雅黑字体
             "--add-data", "src/fonts/msyhbd.ttc;fonts",  # 微软雅黑粗体字体
+            "--add-data", "src/data/keyword_aliases.json;src/data",  # 关键字别名配置
             "src/gui_app.py"
         ]
     
@@ -0,0 +1,194 @@
+"""
+数据转PDF标签 - 命令行入口
+
+用法:
+    python -m src.cli batch 订单汇总.xlsx -o 输出目录 [--workers 4]
+    python -m src.cli batch erp_jobs.ndjson -o 输出目录
+    python -m src.cli variable 序列号清单.xlsx -o 小箱标.pdf --level 小箱标
+    python -m src.cli locate 订单汇总.xlsx DSK01234-05
+    python -m src.cli carton 订单汇总.xlsx --level 大箱标 --number 57
+    python -m src.cli manifest 订单汇总.xlsx -o 标签清单.csv
+    python -m src.cli calibrate
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+
+import click
+
+# 添加项目根目录到Python路径（支持直接运行 python src/cli.py）
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.data.job_adapters import iter_file_jobs
+from src.data.job_records import TEMPLATE_ALIASES, iter_workbook_records
+from src.pdf.batch_generator import job_dir_name, run_batch
+from src.pdf.cost_estimator import DEFAULT_PROFILE_PATH, calibrate_cost_profile
+from src.pdf.label_manifest import MANIFEST_FIELDS, MANIFEST_FORMATS, iter_manifest, iter_manifest_lines
+from src.pdf.serial_lookup import carton_contents, locate_serial
+from src.pdf.variable_data import LABEL_LEVELS, VariableDataTemplate
+
+
+@click.group()
+def cli():
+    """数据转PDF标签命令行工具"""
+
+
+@cli.command()
+@click.argument("jobs_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("-o", "--output-dir", required=True, type=click.Path(file_okay=False), help="输出目录")
+@click.option("-w", "--workers", type=int, default=None, help="并行进程数（默认min(4, CPU核数)）")
+@click.option("--sheet", type=int, default=0, show_default=True, help="任务所在工作表索引")
+def batch(jobs_file, output_dir, workers, sheet):
+    """
+    批量模式：工作簿/CSV每行一个生产任务，或JSON/NDJSON每个对象一个任务
+
+    表头（或JSON字段）需包含 客户名称编码/标签名称/开始号/总张数/张/盒/主题/盒/小箱，
+    可选列：模板、盒/套、小箱/大箱、选择外观、标签模版、中文名称、是否有小箱、序列号字体大小、是否有盒标、
+    渲染引擎（fast/canvas）、渲染进程数（盒标分片并行渲染）、
+    级别进程数（同一任务各级标签并行生成，批量模式默认为1）、流式写入（逐页写入文件，内存占用与页数无关）、
+    压缩线程数（快速引擎/流式写入时在后台线程压缩页面，0为不使用，批量模式默认为0）、
+    严格校验（标签计划校验不通过时报错，默认只警告）
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    summary = run_batch(iter_file_jobs(jobs_file, sheet), output_dir, max_workers=workers)
+    if summary["failed"]:
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("workbook", type=click.Path(exists=True, dir_okay=False))
+@click.option("-o", "--output", required=True, type=click.Path(dir_okay=False), help="输出PDF路径")
+@click.option("--level", required=True, type=click.Choice(LABEL_LEVELS), help="标签级别")
+@click.option("--template", type=click.Choice(["常规", "分/套盒"]), default="常规", show_default=True)
+@click.option("--title", default=None, help="标签名称（行内未填写时使用）")
+@click.option("--remark", default=None, help="客户名称编码（行内未填写时使用）")
+@click.option("--chinese-name", default="", help="中文名称，填写时第一页输出空箱标签/空白首页")
+@click.option("--appearance", type=click.Choice(["外观一", "外观二"]), default="外观一", show_default=True)
+@click.option("--label-template", type=click.Choice(["有纸卡备注", "无纸卡备注"]), default="有纸卡备注", show_default=True)
+@click.option("--font-size", type=click.IntRange(6, 14), default=10, show_default=True, help="序列号字体大小")
+@click.option("--pieces-per-box", type=int, default=None, help="张/盒（盒标外观二，行内未填写时使用）")
+@click.option("--sheet", type=int, default=0, show_default=True, help="数据所在工作表索引")
+@click.option("--compress-workers", type=click.IntRange(0), default=None,
+              help="页面压缩线程数（0为不使用，默认CPU核数减一，最多4个）")
+def variable(workbook, output, level, template, title, remark, chinese_name, appearance,
+             label_template, font_size, pieces_per_box, sheet, compress_workers):
+    """
+    可变数据模式：工作簿每行一张标签（逐行流式读取和渲染，只生成一个PDF文件）
+
+    盒标需要列 序列号；小箱标/大箱标需要列 序列号（或 开始序列号+结束序列号）、数量、箱号
+    """
+    defaults = {
+        "标签名称": title,
+        "客户名称编码": remark,
+        "中文名称": chinese_name,
+        "选择外观": appearance,
+        "标签模版": label_template,
+        "序列号字体大小": font_size,
+        "张/盒": pieces_per_box,
+    }
+    VariableDataTemplate().create_labels(
+        iter_workbook_records(workbook, sheet), output, level,
+        template=TEMPLATE_ALIASES[template], defaults=defaults, compress_workers=compress_workers
+    )
+
+
+def _echo_json(value):
+    click.echo(json.dumps(value, ensure_ascii=False, indent=2))
+
+
+@cli.command()
+@click.argument("jobs_file", type=click.Path(exists=True, dir_okay=False))
+@click.argument("serial")
+@click.option("--sheet", type=int, default=0, show_default=True, help="任务所在工作表索引")
+def locate(jobs_file, serial, sheet):
+    """
+    反向查询：盒标序列号所在的任务、盒、套、小箱、大箱和PDF页码
+
+    JOBS_FILE 与batch命令相同，依次在每个任务中查找SERIAL
+    """
+    matches = []
+    for job in iter_file_jobs(jobs_file, sheet):
+        if "error" in job:
+            continue
+        try:
+            result = locate_serial(job["template"], job["data"], job["params"], serial)
+        except ValueError:
+            continue
+        matches.append({"source": job["source"], **result})
+    _echo_json(matches)
+    if not matches:
+        click.echo(f"❌ 没有任务包含序列号 {serial}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("jobs_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--level", required=True, type=click.Choice(["小箱标", "大箱标", "箱标"]), help="箱标级别")
+@click.option("--number", required=True, type=int, help="箱号（从1开始）")
+@click.option("--job", "job_number", type=int, default=1, show_default=True, help="任务序号（从1开始）")
+@click.option("--sheet", type=int, default=0, show_default=True, help="任务所在工作表索引")
+def carton(jobs_file, level, number, job_number, sheet):
+    """范围查询：某个小箱/大箱/箱内的全部盒标序列号"""
+    job = next((job for index, job in enumerate(iter_file_jobs(jobs_file, sheet), 1) if index == job_number), None)
+    if job is None:
+        raise click.BadParameter(f"任务文件中没有第{job_number}个任务", param_hint="--job")
+    if "error" in job:
+        raise click.ClickException(f"{job['source']}: {job['error']}")
+    try:
+        result = carton_contents(job["template"], job["data"], job["params"], level, number)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    _echo_json({"source": job["source"], **result})
+
+
+@cli.command()
+@click.argument("jobs_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("-o", "--output", required=True, type=click.Path(dir_okay=False), help="清单文件路径（.csv/.ndjson）")
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default=None, help="清单格式（默认按后缀识别）")
+@click.option("--sheet", type=int, default=0, show_default=True, help="任务所在工作表索引")
+def manifest(jobs_file, output, fmt, sheet):
+    """
+    仅计划模式：不渲染PDF，导出每张标签的清单（用于导入WMS或比对任务）
+
+    每行包含 任务来源、级别、编号、序列号/序列号范围、数量、Carton No、目标文件和页码；
+    目标文件为批量模式输出目录下的相对路径（含每个任务的子目录）
+    """
+    fmt = fmt or MANIFEST_FORMATS.get(os.path.splitext(output)[1].lower())
+    if fmt is None:
+        raise click.BadParameter("无法从文件名识别清单格式，请使用 .csv/.ndjson 或指定 --format", param_hint="--output")
+    failed = []
+
+    def rows():
+        used_dirs = set()
+        for index, job in enumerate(iter_file_jobs(jobs_file, sheet), start=1):
+            if "error" in job:
+                failed.append(f"{job['source']}: {job['error']}")
+                continue
+            job_dir = job_dir_name(job["source"], index, used_dirs)
+            try:
+                for row in iter_manifest(job["template"], job["data"], job["params"]):
+                    yield {"source": job["source"], **row, "file": f"{job_dir}/{row['file']}"}
+            except ValueError as e:
+                failed.append(f"{job['source']}: {e}")
+
+    with open(output, "w", encoding="utf-8-sig" if fmt == "csv" else "utf-8", newline="") as f:
+        f.writelines(iter_manifest_lines(rows(), fmt, ("source",) + MANIFEST_FIELDS))
+    for message in failed:
+        click.echo(f"❌ {message}", err=True)
+    if failed:
+        sys.exit(1)
+
+
+@cli.command()
+@click.option("--profile", "profile_path", type=click.Path(dir_okay=False), default=DEFAULT_PROFILE_PATH,
+              show_default=True, help="校准配置保存路径")
+def calibrate(profile_path):
+    """在本机实测每页渲染耗时和文件大小，供参数对话框估算任务耗时"""
+    calibrate_cost_profile(profile_path)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    cli()
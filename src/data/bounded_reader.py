@@ -0,0 +1,121 @@
+"""
+有界区域工作表读取器
+
+逐行读取工作表（行来源见reader_backends），所有关键字及其目标单元格
+都读到后立即停止，整个过程不依赖pandas
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.data.keyword_matcher import KeywordMatcher, keyword_alternatives
+
+
+# 数据相对于关键字的方向 → (行偏移, 列偏移)
+DIRECTION_OFFSETS = {
+    'right': (0, 1),
+    'down': (1, 0),
+    'left': (0, -1),
+    'up': (-1, 0),
+    'right_down': (1, 1),
+    'left_down': (1, -1),
+    'right_up': (-1, 1),
+    'left_up': (-1, -1),
+}
+
+
+def is_empty_cell(value: Any) -> bool:
+    """判断单元格是否为空（None或NaN/NaT）"""
+    return value is None or value != value
+
+
+class BoundedRegionReader:
+    """
+    有界区域读取器
+    逐行读取直到所有关键字都已定位且目标单元格已读入
+    """
+
+    def __init__(self, keyword_config: Dict[str, Dict], value_keyword_config: Optional[Dict[str, Dict]] = None,
+                 matcher: Optional[KeywordMatcher] = None):
+        """
+        初始化读取器
+
+        Args:
+            keyword_config: 关键字配置，格式与ExcelDataExtractor.extract_data_by_keywords相同
+                            （支持'keywords'别名列表）
+            value_keyword_config: 需要目标单元格非空才算定位成功的关键字配置（格式同上），
+                                  如总张数需要跳过下方为空的匹配
+            matcher: 预编译的多模式匹配器，需包含所有关键字；None时按配置编译
+        """
+        # 每个目标: (候选关键字, 行偏移, 列偏移, 是否要求目标非空)
+        self.targets: List[Tuple[List[str], int, int, bool]] = []
+        for configs, require_value in ((keyword_config, False), (value_keyword_config or {}, True)):
+            for config in configs.values():
+                offset = config.get('offset', (0, 0))
+                dr, dc = DIRECTION_OFFSETS.get(config.get('direction', 'right'), (0, 0))
+                self.targets.append((keyword_alternatives(config), dr + offset[0], dc + offset[1], require_value))
+
+        # 关键字 → 使用它的目标索引
+        self._keyword_targets: Dict[str, List[int]] = {}
+        for target_idx, (keywords, _, _, _) in enumerate(self.targets):
+            for keyword in keywords:
+                self._keyword_targets.setdefault(keyword, []).append(target_idx)
+        self.matcher = matcher or KeywordMatcher(self._keyword_targets)
+
+    def read(self, rows: Iterable[List[Any]]) -> List[List[Any]]:
+        """
+        读取行直到全部目标定位完成
+
+        Args:
+            rows: 行迭代器（如ReaderBackend.iter_rows的返回值）
+
+        Returns:
+            已读取的行列表（行优先，关键字之前的行全部保留）
+        """
+        grid: List[List[Any]] = []
+        pending = list(range(len(self.targets)))
+        # 每个目标已发现但目标单元格尚未确认的候选位置
+        candidates: Dict[int, List[Tuple[int, int]]] = {i: [] for i in pending}
+
+        for row_idx, row in enumerate(rows):
+            grid.append(row)
+
+            for col_idx, value in enumerate(row):
+                if is_empty_cell(value):
+                    continue
+                # 一次匹配得到单元格包含的全部关键字及别名
+                for keyword in self.matcher.find(str(value).strip()):
+                    for target_idx in self._keyword_targets.get(keyword, ()):
+                        found = candidates[target_idx]
+                        if not found or found[-1] != (row_idx, col_idx):
+                            found.append((row_idx, col_idx))
+
+            pending = [i for i in pending if not self._resolve(i, candidates[i], grid)]
+            if not pending:
+                print(f"✅ 有界读取完成: 读取{len(grid)}行后所有关键字已定位")
+                break
+
+        return grid
+
+    def _resolve(self, target_idx: int, found: List[Tuple[int, int]], grid: List[List[Any]]) -> bool:
+        """
+        按出现顺序检查候选位置，判断目标是否已定位
+
+        与全表扫描保持一致：普通关键字取所有候选关键字中第一个匹配；
+        要求非空的关键字取第一个目标单元格非空的匹配
+        """
+        _, dr, dc, require_value = self.targets[target_idx]
+        loaded_rows = len(grid)
+
+        while found:
+            row_idx, col_idx = found[0]
+            target_row, target_col = row_idx + dr, col_idx + dc
+            if target_row >= loaded_rows:
+                return False  # 目标行还未读到，继续读取
+            if not require_value:
+                return True
+            if 0 <= target_row and 0 <= target_col < len(grid[target_row]) \
+                    and not is_empty_cell(grid[target_row][target_col]):
+                return True
+            found.pop(0)
+
+        return False
@@ -0,0 +1,216 @@
+"""
+Excel提取结果缓存
+
+以文件内容哈希 + 关键字配置作为键，分两级缓存提取出的公共数据：
+进程内LRU缓存 + 磁盘缓存（按总大小淘汰最久未使用的条目）
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+# 缓存格式版本，提取逻辑变化导致结果不兼容时递增
+CACHE_VERSION = 2
+
+# 默认磁盘缓存目录，可通过环境变量覆盖
+DEFAULT_CACHE_DIR = os.environ.get(
+    'DATA_TO_PDFPRINT_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.data_to_pdfprint', 'cache', 'extraction')
+)
+
+
+def _json_default(value: Any) -> Any:
+    """JSON序列化兜底：numpy标量转Python原生类型，其余转字符串"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class ExtractionCache:
+    """
+    提取结果两级缓存
+    内存层为LRU，磁盘层按文件修改时间淘汰，超过总大小上限时删除最旧的条目
+    """
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 max_memory_entries: int = 32, max_disk_bytes: int = 16 * 1024 * 1024):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录，None表示只使用内存缓存
+            max_memory_entries: 内存层最多保留的条目数
+            max_disk_bytes: 磁盘层总大小上限（字节）
+        """
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # 文件哈希记忆：{路径: ((修改时间, 大小), 哈希)}，同一文件未变化时不重复读取
+        self._file_hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def file_hash(self, file_path: str) -> str:
+        """
+        计算文件内容的SHA-256哈希
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            十六进制哈希字符串
+        """
+        path = os.path.abspath(str(file_path))
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        remembered = self._file_hashes.get(path)
+        if remembered and remembered[0] == signature:
+            return remembered[1]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        file_digest = digest.hexdigest()
+        self._file_hashes[path] = (signature, file_digest)
+        return file_digest
+
+    def make_key(self, file_path: str, config: Any) -> str:
+        """
+        生成缓存键
+
+        Args:
+            file_path: Excel文件路径
+            config: 影响提取结果的配置（关键字配置、读取模式等），需可JSON序列化
+
+        Returns:
+            缓存键
+        """
+        config_text = json.dumps(config, sort_keys=True, ensure_ascii=False, default=_json_default)
+        key_source = f"{CACHE_VERSION}|{self.file_hash(file_path)}|{config_text}"
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存，先查内存层再查磁盘层
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存的数据副本，未命中返回None
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            return dict(self._memory[key])
+
+        data = self._read_disk(key)
+        if data is not None:
+            self.stats['disk_hits'] += 1
+            self._remember(key, data)
+            return dict(data)
+
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key: str, data: Dict[str, Any]):
+        """
+        写入缓存（内存层和磁盘层）
+
+        Args:
+            key: 缓存键
+            data: 提取结果
+        """
+        # 统一经过JSON往返，保证内存层和磁盘层返回的数据完全一致
+        payload = json.dumps(data, ensure_ascii=False, default=_json_default)
+        self._remember(key, json.loads(payload))
+        self._write_disk(key, payload)
+
+    def clear(self):
+        """清空内存层和磁盘层"""
+        self._memory.clear()
+        self._file_hashes.clear()
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.json'):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+    def _remember(self, key: str, data: Dict[str, Any]):
+        """写入内存LRU层，超出上限时淘汰最久未使用的条目"""
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取磁盘层，命中时刷新修改时间作为LRU依据"""
+        if not self.cache_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            os.utime(path, None)
+            return data
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 读取提取缓存失败，忽略: {e}")
+            return None
+
+    def _write_disk(self, key: str, payload: str):
+        """原子写入磁盘层，并按总大小淘汰旧条目"""
+        if not self.cache_dir:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except OSError as e:
+            print(f"⚠️ 写入提取缓存失败，忽略: {e}")
+
+    def _evict_disk(self):
+        """磁盘层总大小超过上限时，按修改时间从旧到新删除"""
+        entries = []
+        total_bytes = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total_bytes -= size
+            except OSError:
+                pass
+
+
+# 创建全局实例
+extraction_cache = ExtractionCache()
@@ -0,0 +1,117 @@
+"""
+生产任务输入适配器
+
+ERP等系统直接导出的任务文件（CSV、JSON、NDJSON）不经过Excel解析，
+逐条规范化为与ExcelDataExtractor.get_unified_standard_data相同的六字段数据加包装参数。
+NDJSON逐行惰性读取，数千条任务的文件也不会一次性载入内存。
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterator, Tuple
+
+from src.data.job_records import iter_normalized_jobs, iter_workbook_jobs, iter_workbook_records, normalize_job_record
+
+
+# 任务文件格式 → 说明
+JOB_FILE_SUFFIXES = {
+    ".csv": "CSV（第一行为表头）",
+    ".json": "JSON（任务数组，或 {\"jobs\": [...]}）",
+    ".ndjson": "NDJSON（每行一个任务）",
+    ".jsonl": "NDJSON（每行一个任务）",
+}
+
+
+def _flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    展开嵌套记录：{'data': {...}, 'params': {...}, 'template': ...} 与扁平记录等价，
+    顶层字段优先
+    """
+    flat: Dict[str, Any] = {}
+    for section in ("params", "data"):
+        if isinstance(record.get(section), dict):
+            flat.update(record[section])
+    flat.update({key: value for key, value in record.items()
+                 if not (key in ("data", "params") and isinstance(value, dict))})
+    return flat
+
+
+def iter_csv_records(file_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    流式读取CSV任务文件（使用CSV读取后端，不依赖pandas/openpyxl）
+
+    Yields:
+        (来源描述, {列名: 值})
+    """
+    return iter_workbook_records(file_path)
+
+
+def iter_json_records(file_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    读取JSON任务文件：任务数组、{"jobs": [...]} 或单个任务对象
+
+    Yields:
+        (来源描述, 扁平记录)
+
+    Raises:
+        ValueError: 文件结构不是任务数组或任务对象
+    """
+    with open(file_path, encoding="utf-8-sig") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data["jobs"] if isinstance(data.get("jobs"), list) else [data]
+    if not isinstance(data, list):
+        raise ValueError(f"JSON任务文件必须是任务数组或任务对象: {file_path}")
+
+    file_name = os.path.basename(str(file_path))
+    # JSON已整体载入，先检查结构，避免批量生成到一半才失败
+    for index, record in enumerate(data, start=1):
+        if not isinstance(record, dict):
+            raise ValueError(f"{file_name} 第{index}个任务不是对象")
+    for index, record in enumerate(data, start=1):
+        yield f"{file_name} 第{index}个任务", _flatten_record(record)
+
+
+def iter_ndjson_jobs(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    逐行惰性读取NDJSON任务文件并规范化，跳过空行
+
+    格式错误的行输出 {'source': 来源, 'error': 错误信息}，不会中断迭代
+
+    Yields:
+        任务字典（见normalize_job_record）
+    """
+    file_name = os.path.basename(str(file_path))
+    with open(file_path, encoding="utf-8-sig") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            source = f"{file_name} 第{line_no}行"
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("每行必须是一个JSON对象")
+                yield normalize_job_record(_flatten_record(record), source)
+            except ValueError as e:  # json.JSONDecodeError是ValueError的子类
+                yield {"source": source, "error": str(e)}
+
+
+def iter_file_jobs(file_path: str, sheet_index: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    按文件格式读取任务：CSV/JSON/NDJSON使用适配器，其余按工作簿读取
+
+    Args:
+        file_path: 任务文件路径
+        sheet_index: 工作簿的工作表索引（仅工作簿格式使用）
+
+    Yields:
+        任务字典，不合法的任务带'error'
+    """
+    suffix = os.path.splitext(str(file_path))[1].lower()
+    if suffix in (".ndjson", ".jsonl"):
+        return iter_ndjson_jobs(file_path)
+    if suffix == ".json":
+        return iter_normalized_jobs(iter_json_records(file_path))
+    if suffix == ".csv":
+        return iter_normalized_jobs(iter_csv_records(file_path))
+    return iter_workbook_jobs(file_path, sheet_index)
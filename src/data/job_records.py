@@ -0,0 +1,263 @@
+"""
+生产任务记录
+
+把一行任务数据（工作簿的一行、CSV/JSON记录等）规范化为与
+ExcelDataExtractor.get_unified_standard_data相同的六字段数据，加上包装参数，
+供PDFGenerator直接使用
+"""
+
+import os
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.data.bounded_reader import is_empty_cell
+from src.data.reader_backends import get_backend
+
+
+# 标准六字段（与get_unified_standard_data一致）
+STANDARD_FIELDS = ["客户名称编码", "标签名称", "开始号", "总张数", "张/盒", "主题"]
+
+# 模板名称 → PDFGenerator模板类型
+TEMPLATE_ALIASES = {
+    "常规": "regular_box",
+    "regular": "regular_box",
+    "regular_box": "regular_box",
+    "分/套盒": "split_box",
+    "分盒": "split_box",
+    "套盒": "split_box",
+    "split": "split_box",
+    "split_box": "split_box",
+}
+
+# 模板列的可选列名
+TEMPLATE_COLUMNS = ("模板", "模板类型", "template")
+
+# 包装参数默认值（与参数对话框的默认选择一致）
+DEFAULT_PARAMS = {
+    "盒/套": 1,
+    "小箱/大箱": 1,
+    "选择外观": "外观一",
+    "标签模版": "有纸卡备注",
+    "是否有小箱": True,
+    "序列号字体大小": 10,
+    "是否有盒标": False,
+}
+
+# 盒标渲染引擎（可选）：fast为快速引擎，canvas为reportlab画布（默认）
+RENDER_ENGINE_ALIASES = {
+    "fast": "fast",
+    "快速": "fast",
+    "canvas": "canvas",
+    "画布": "canvas",
+    "标准": "canvas",
+}
+
+# 逐箱容量参数（可选）：小箱容量对应盒/小箱（无小箱时为每箱盒数），大箱容量对应小箱/大箱
+CAPACITY_FIELDS = ("小箱容量", "大箱容量")
+
+# 布尔参数可接受的文本
+_TRUE_TEXTS = {"1", "true", "yes", "y", "是", "有", "有小箱", "有盒标"}
+_FALSE_TEXTS = {"0", "false", "no", "n", "否", "无", "无小箱", "无盒标"}
+
+
+def _is_blank(value: Any) -> bool:
+    return is_empty_cell(value) or str(value).strip() == ""
+
+
+def _to_text(value: Any) -> str:
+    """转为去空白文本，整数值的浮点数不带小数点（如1001.0 → '1001'）"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _to_positive_int(field: str, value: Any) -> int:
+    try:
+        number = int(float(str(value).strip()))
+    except ValueError:
+        raise ValueError(f"'{field}'必须为正整数，当前值：{value}")
+    if number <= 0:
+        raise ValueError(f"'{field}'必须为正整数，当前值：{value}")
+    return number
+
+
+def _to_non_negative_int(field: str, value: Any) -> int:
+    try:
+        number = int(float(str(value).strip()))
+    except ValueError:
+        raise ValueError(f"'{field}'必须为非负整数，当前值：{value}")
+    if number < 0:
+        raise ValueError(f"'{field}'必须为非负整数，当前值：{value}")
+    return number
+
+
+def _to_bool(field: str, value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = _to_text(value).lower()
+    if text in _TRUE_TEXTS:
+        return True
+    if text in _FALSE_TEXTS:
+        return False
+    raise ValueError(f"'{field}'无法识别为是/否，当前值：{value}")
+
+
+def parse_capacity_list(field: str, value: Any) -> Optional[Tuple[int, ...]]:
+    """
+    解析逐箱容量列表
+
+    Args:
+        field: 参数名称（用于错误信息）
+        value: 整数列表，或用逗号/空格分隔的文本（如 "10,10,8"）；为空时返回None
+
+    Returns:
+        容量元组（按顺序循环使用），未填写时为None
+
+    Raises:
+        ValueError: 包含非正整数
+    """
+    if value is None or isinstance(value, (list, tuple)) and not value or _is_blank(value):
+        return None
+    if isinstance(value, (list, tuple)):
+        items = list(value)
+    else:
+        items = [item for item in re.split(r"[,，;；\s]+", _to_text(value)) if item]
+    return tuple(_to_positive_int(field, item) for item in items)
+
+
+def normalize_job_record(record: Dict[str, Any], source: str = "") -> Dict[str, Any]:
+    """
+    规范化一条任务记录
+
+    Args:
+        record: 原始记录 {列名: 值}，需包含六个标准字段和包装参数（盒/小箱等）
+        source: 记录来源描述（如"订单.xlsx 第5行"），原样记录在任务字典中
+
+    Returns:
+        任务字典 {
+            'data': 六字段标准数据,
+            'params': 包装参数,
+            'template': 'regular_box' 或 'split_box',
+            'source': 来源描述
+        }
+
+    Raises:
+        ValueError: 缺少必填字段或参数不合法
+    """
+    record = {str(key).strip(): value for key, value in record.items() if key is not None}
+
+    missing = [field for field in STANDARD_FIELDS + ["盒/小箱"] if _is_blank(record.get(field))]
+    if missing:
+        raise ValueError(f"缺少字段: {', '.join(missing)}")
+
+    data = {
+        "客户名称编码": _to_text(record["客户名称编码"]),
+        "标签名称": _to_text(record["标签名称"]),
+        "开始号": _to_text(record["开始号"]),
+        "总张数": _to_positive_int("总张数", record["总张数"]),
+        "张/盒": _to_positive_int("张/盒", record["张/盒"]),
+        "主题": _to_text(record["主题"]),
+    }
+
+    template_value = next(
+        (record[column] for column in TEMPLATE_COLUMNS if not _is_blank(record.get(column))), "常规"
+    )
+    template = TEMPLATE_ALIASES.get(_to_text(template_value).lower())
+    if template is None:
+        raise ValueError(f"未知的模板类型: {template_value}")
+
+    def param(field):
+        value = record.get(field)
+        return DEFAULT_PARAMS.get(field) if _is_blank(value) else value
+
+    params = {
+        "张/盒": data["张/盒"],
+        "盒/小箱": _to_positive_int("盒/小箱", record["盒/小箱"]),
+        "小箱/大箱": _to_positive_int("小箱/大箱", param("小箱/大箱")),
+        "选择外观": _to_text(param("选择外观")),
+        "标签模版": _to_text(param("标签模版")),
+        # 中文名称未填写时与GUI一致，使用主题
+        "中文名称": _to_text(param("中文名称") or data["主题"]),
+        "是否有小箱": _to_bool("是否有小箱", param("是否有小箱")),
+        "序列号字体大小": _to_positive_int("序列号字体大小", param("序列号字体大小")),
+        "是否有盒标": _to_bool("是否有盒标", param("是否有盒标")),
+    }
+    if not 6 <= params["序列号字体大小"] <= 14:
+        raise ValueError(f"序列号字体大小必须在6-14之间，当前值：{params['序列号字体大小']}")
+    if template == "split_box":
+        params["盒/套"] = _to_positive_int("盒/套", param("盒/套"))
+    engine = record.get("渲染引擎")
+    if not _is_blank(engine):
+        params["渲染引擎"] = RENDER_ENGINE_ALIASES.get(_to_text(engine).lower())
+        if params["渲染引擎"] is None:
+            raise ValueError(f"未知的渲染引擎: {engine}")
+    for field in ("流式写入", "严格校验"):
+        if not _is_blank(record.get(field)):
+            params[field] = _to_bool(field, record[field])
+    for field in ("渲染进程数", "级别进程数"):
+        if not _is_blank(record.get(field)):
+            params[field] = _to_positive_int(field, record[field])
+    if not _is_blank(record.get("压缩线程数")):
+        params["压缩线程数"] = _to_non_negative_int("压缩线程数", record["压缩线程数"])
+    for field in CAPACITY_FIELDS:
+        capacities = parse_capacity_list(field, record.get(field))
+        if capacities is not None:
+            params[field] = capacities
+
+    return {"data": data, "params": params, "template": template, "source": source}
+
+
+def iter_normalized_jobs(records: Iterable[Tuple[str, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """
+    逐条规范化任务记录，不合法的记录不会中断迭代
+
+    Args:
+        records: (来源描述, 原始记录) 迭代器
+
+    Yields:
+        任务字典；不合法的记录输出 {'source': 来源, 'error': 错误信息}
+    """
+    for source, record in records:
+        try:
+            yield normalize_job_record(record, source)
+        except ValueError as e:
+            yield {"source": source, "error": str(e)}
+
+
+def iter_workbook_records(file_path: str, sheet_index: int = 0) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    流式读取任务工作簿：第一个非空行为表头，之后每行一个任务
+
+    Args:
+        file_path: 工作簿路径（reader_backends支持的任意格式）
+        sheet_index: 工作表索引
+
+    Yields:
+        (来源描述, {列名: 值})，跳过空行
+    """
+    backend = get_backend(file_path, streaming=True)
+    header: Optional[List[str]] = None
+    file_name = os.path.basename(str(file_path))
+
+    for row_idx, row in enumerate(backend.iter_rows(file_path, sheet_index), start=1):
+        if all(_is_blank(value) for value in row):
+            continue
+        if header is None:
+            header = [None if _is_blank(value) else str(value).strip() for value in row]
+            continue
+        record = {column: value for column, value in zip(header, row) if column}
+        yield f"{file_name} 第{row_idx}行", record
+
+
+def iter_workbook_jobs(file_path: str, sheet_index: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    流式读取任务工作簿并规范化为任务字典（惰性，不会一次性载入全部行）
+
+    Args:
+        file_path: 工作簿路径
+        sheet_index: 工作表索引
+
+    Yields:
+        任务字典（见normalize_job_record），不合法的行带'error'
+    """
+    return iter_normalized_jobs(iter_workbook_records(file_path, sheet_index))
@@ -0,0 +1,134 @@
+"""
+多模式关键字匹配器
+
+用Aho-Corasick自动机把所有字段的关键字及其别名编译为一个匹配器，
+每个单元格文本只需遍历一次即可得到其中包含的全部关键字。
+别名从keyword_aliases.json加载，新增客户写法无需修改代码。
+"""
+
+import json
+import os
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+# 内置别名配置（随程序打包）
+DEFAULT_ALIASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keyword_aliases.json")
+
+# 用户别名配置：环境变量指定或用户目录下的keyword_aliases.json，其中的别名追加到内置配置之后
+USER_ALIASES_PATH = os.environ.get(
+    "DATA_TO_PDFPRINT_KEYWORD_ALIASES",
+    os.path.join(os.path.expanduser("~"), ".data_to_pdfprint", "keyword_aliases.json")
+)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick多模式匹配器（不区分大小写的包含匹配）
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        编译匹配器
+
+        Args:
+            patterns: 关键字列表，重复的关键字只保留一个
+        """
+        self.patterns: List[str] = list(dict.fromkeys(p for p in patterns if p))
+        # 状态转移表、失败指针和每个状态的输出（关键字在patterns中的索引）
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern.casefold():
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        # 广度优先计算失败指针，并合并失败状态的输出
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> List[str]:
+        """
+        查找文本中包含的所有关键字
+
+        Args:
+            text: 单元格文本
+
+        Returns:
+            包含的关键字列表（按patterns顺序，不重复）
+        """
+        found = set()
+        state = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for char in text.casefold():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return [self.patterns[index] for index in sorted(found)]
+
+
+def keyword_alternatives(config: Dict) -> List[str]:
+    """
+    获取字段配置的全部候选关键字
+
+    Args:
+        config: 字段配置，'keyword' 为单个关键字，'keywords' 为多个候选关键字
+
+    Returns:
+        去重后的关键字列表，'keyword' 在前
+    """
+    keywords = [config['keyword']] if config.get('keyword') else []
+    keywords.extend(config.get('keywords', []))
+    return list(dict.fromkeys(keywords))
+
+
+def _read_aliases(path: str) -> Dict[str, List[str]]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("别名配置必须是 {字段: [关键字, ...]} 格式")
+    return {str(field): [str(alias) for alias in aliases] for field, aliases in data.items()}
+
+
+def load_keyword_aliases(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    加载字段别名配置
+
+    Args:
+        path: 指定配置文件路径；None表示内置配置加上用户配置
+
+    Returns:
+        {字段: [关键字, ...]}
+    """
+    if path is not None:
+        return _read_aliases(path)
+
+    aliases = _read_aliases(DEFAULT_ALIASES_PATH)
+    if os.path.exists(USER_ALIASES_PATH):
+        try:
+            for field, extra in _read_aliases(USER_ALIASES_PATH).items():
+                aliases[field] = list(dict.fromkeys(aliases.get(field, []) + extra))
+            print(f"✅ 已加载用户关键字别名: {USER_ALIASES_PATH}")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 用户关键字别名配置无效，已忽略: {e}")
+    return aliases
@@ -0,0 +1,307 @@
+"""
+工作表读取后端注册表
+
+按文件格式选择可用的最快解析器，统一以"逐行单元格值列表"的形式输出，
+供ExcelDataExtractor构建单元格网格使用
+"""
+
+import codecs
+import csv
+import importlib.util
+import os
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+# CSV中可安全转换为数字的文本（不含前导0，避免丢失开始号等编码的位数）
+_INT_PATTERN = re.compile(r'-?(0|[1-9]\d*)')
+_FLOAT_PATTERN = re.compile(r'-?(0|[1-9]\d*)\.\d+')
+
+
+def _normalize_number(value: Any) -> Any:
+    """整数值的浮点数转为int，与openpyxl读取xlsx的类型保持一致"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class ReaderBackend:
+    """
+    读取后端基类
+    子类实现sheet_names和iter_rows，空单元格统一输出为None
+    """
+
+    name = ''
+    suffixes: Tuple[str, ...] = ()
+    priority = 0  # 同一格式有多个可用后端时，优先级高的先使用
+    streaming = False  # 是否真正逐行解析（有界读取可以提前停止，不必解析整个工作表）
+    module: Optional[str] = None  # 依赖的可选模块，None表示只依赖标准库/核心依赖
+
+    def is_available(self) -> bool:
+        """检查依赖模块是否已安装"""
+        return self.module is None or importlib.util.find_spec(self.module) is not None
+
+    def sheet_names(self, file_path: str) -> List[str]:
+        """返回工作表名称列表"""
+        raise NotImplementedError
+
+    def iter_rows(self, file_path: str, sheet_index: int = 0) -> Iterator[List[Any]]:
+        """
+        逐行读取工作表
+
+        Args:
+            file_path: 文件路径
+            sheet_index: 工作表索引
+
+        Yields:
+            每行单元格值列表（行号、列号与工作表一致，从A1开始）
+        """
+        raise NotImplementedError
+
+
+class CalamineBackend(ReaderBackend):
+    """python-calamine后端（Rust实现，支持xlsx/xls/ods，速度最快）"""
+
+    name = 'calamine'
+    suffixes = ('.xlsx', '.xlsm', '.xlsb', '.xls', '.ods')
+    priority = 30
+    module = 'python_calamine'
+
+    def sheet_names(self, file_path: str) -> List[str]:
+        from python_calamine import CalamineWorkbook
+        return list(CalamineWorkbook.from_path(str(file_path)).sheet_names)
+
+    def iter_rows(self, file_path: str, sheet_index: int = 0) -> Iterator[List[Any]]:
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(str(file_path))
+        try:
+            sheet = workbook.get_sheet_by_index(sheet_index)
+            for row in sheet.iter_rows():
+                yield [None if value == '' else _normalize_number(value) for value in row]
+        finally:
+            if hasattr(workbook, 'close'):
+                workbook.close()
+
+
+class OpenpyxlBackend(ReaderBackend):
+    """openpyxl只读流式后端（核心依赖，xlsx默认后端）"""
+
+    name = 'openpyxl'
+    suffixes = ('.xlsx', '.xlsm')
+    priority = 20
+    streaming = True
+
+    def sheet_names(self, file_path: str) -> List[str]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+
+    def iter_rows(self, file_path: str, sheet_index: int = 0) -> Iterator[List[Any]]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook.worksheets[sheet_index]
+            for row in worksheet.iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+
+
+class XlrdBackend(ReaderBackend):
+    """xlrd后端（旧版.xls格式）"""
+
+    name = 'xlrd'
+    suffixes = ('.xls',)
+    priority = 20
+    module = 'xlrd'
+
+    def sheet_names(self, file_path: str) -> List[str]:
+        import xlrd
+
+        workbook = xlrd.open_workbook(str(file_path), on_demand=True)
+        try:
+            return workbook.sheet_names()
+        finally:
+            workbook.release_resources()
+
+    def iter_rows(self, file_path: str, sheet_index: int = 0) -> Iterator[List[Any]]:
+        import xlrd
+
+        workbook = xlrd.open_workbook(str(file_path), on_demand=True)
+        try:
+            sheet = workbook.sheet_by_index(sheet_index)
+            for row_idx in range(sheet.nrows):
+                row = []
+                for cell in sheet.row(row_idx):
+                    if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+                        row.append(None)
+                    elif cell.ctype == xlrd.XL_CELL_DATE:
+                        row.append(xlrd.xldate_as_datetime(cell.value, workbook.datemode))
+                    elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
+                        row.append(bool(cell.value))
+                    else:
+                        row.append(_normalize_number(cell.value))
+                yield row
+        finally:
+            workbook.release_resources()
+
+
+class OdfBackend(ReaderBackend):
+    """odfpy后端（.ods格式，通过pandas的odf引擎读取）"""
+
+    name = 'odf'
+    suffixes = ('.ods',)
+    priority = 10
+    module = 'odf'
+
+    def sheet_names(self, file_path: str) -> List[str]:
+        import pandas as pd
+        return list(pd.ExcelFile(file_path, engine='odf').sheet_names)
+
+    def iter_rows(self, file_path: str, sheet_index: int = 0) -> Iterator[List[Any]]:
+        import pandas as pd
+
+        df = pd.read_excel(file_path, header=None, sheet_name=sheet_index, engine='odf')
+        for row in df.to_numpy(dtype=object).tolist():
+            yield [None if value != value else _normalize_number(value) for value in row]
+
+
+class CsvBackend(ReaderBackend):
+    """CSV后端（标准库，单一工作表，自动识别UTF-8/GB18030编码）"""
+
+    name = 'csv'
+    suffixes = ('.csv',)
+    priority = 10
+    streaming = True
+
+    def sheet_names(self, file_path: str) -> List[str]:
+        return [os.path.splitext(os.path.basename(str(file_path)))[0]]
+
+    def iter_rows(self, file_path: str, sheet_index: int = 0) -> Iterator[List[Any]]:
+        if sheet_index != 0:
+            raise IndexError(f"CSV文件只有一个工作表: {sheet_index}")
+
+        with open(file_path, 'r', encoding=self._detect_encoding(file_path), newline='') as f:
+            for row in csv.reader(f):
+                yield [self._convert_text(value) for value in row]
+
+    @staticmethod
+    def _detect_encoding(file_path: str) -> str:
+        """根据文件开头判断编码：能按UTF-8解码则用UTF-8，否则按GB18030（Excel中文版导出）"""
+        with open(file_path, 'rb') as f:
+            sample = f.read(64 * 1024)
+        try:
+            codecs.getincrementaldecoder('utf-8-sig')().decode(sample, final=False)
+            return 'utf-8-sig'
+        except UnicodeDecodeError:
+            return 'gb18030'
+
+    @staticmethod
+    def _convert_text(value: str) -> Any:
+        """空文本转None，纯数字文本转数字，其余保留原文"""
+        text = value.strip()
+        if text == '':
+            return None
+        if _INT_PATTERN.fullmatch(text):
+            return int(text)
+        if _FLOAT_PATTERN.fullmatch(text):
+            return float(text)
+        return value
+
+
+# 已注册的后端
+_BACKENDS: List[ReaderBackend] = []
+
+
+def register_backend(backend: ReaderBackend):
+    """
+    注册读取后端（同名后端会被替换）
+
+    Args:
+        backend: 后端实例
+    """
+    _BACKENDS[:] = [b for b in _BACKENDS if b.name != backend.name]
+    _BACKENDS.append(backend)
+    _BACKENDS.sort(key=lambda b: -b.priority)
+
+
+def available_backends(suffix: Optional[str] = None) -> List[ReaderBackend]:
+    """
+    获取可用的后端（按优先级排序）
+
+    Args:
+        suffix: 文件扩展名（如'.xlsx'），None表示所有格式
+
+    Returns:
+        后端列表
+    """
+    return [
+        b for b in _BACKENDS
+        if (suffix is None or suffix.lower() in b.suffixes) and b.is_available()
+    ]
+
+
+def supported_suffixes() -> Tuple[str, ...]:
+    """当前环境可读取的文件扩展名"""
+    suffixes = []
+    for backend in available_backends():
+        for suffix in backend.suffixes:
+            if suffix not in suffixes:
+                suffixes.append(suffix)
+    return tuple(suffixes)
+
+
+def get_backend(file_path: str, name: Optional[str] = None, streaming: bool = False) -> ReaderBackend:
+    """
+    为文件选择读取后端
+
+    Args:
+        file_path: 文件路径
+        name: 指定后端名称，None表示自动选择该格式下最快的可用后端
+        streaming: 优先选择逐行解析的后端（有界读取只需要表头区域，
+                   流式后端提前停止比整表解析的快速后端更省时）
+
+    Returns:
+        后端实例
+    """
+    suffix = os.path.splitext(str(file_path))[1].lower()
+    candidates = available_backends(suffix)
+    if streaming:
+        candidates.sort(key=lambda b: not b.streaming)  # 稳定排序，同类中保持优先级顺序
+    if name is not None:
+        candidates = [b for b in candidates if b.name == name]
+        if not candidates:
+            raise ValueError(f"读取后端 '{name}' 不可用或不支持 {suffix} 格式")
+    if not candidates:
+        raise ValueError(f"不支持的文件格式: {suffix}（可用格式: {', '.join(supported_suffixes())}）")
+    return candidates[0]
+
+
+def rows_to_grid(rows: Iterable[List[Any]]) -> np.ndarray:
+    """
+    将逐行单元格值转为二维单元格网格，短行用None补齐
+
+    Args:
+        rows: 行列表
+
+    Returns:
+        numpy object数组
+    """
+    rows = list(rows)
+    width = max((len(row) for row in rows), default=0)
+    grid = np.full((len(rows), width), None, dtype=object)
+    for row_idx, row in enumerate(rows):
+        grid[row_idx, :len(row)] = row
+    return grid
+
+
+for _backend in (CalamineBackend(), OpenpyxlBackend(), XlrdBackend(), OdfBackend(), CsvBackend()):
+    register_backend(_backend)
@@ -4,6 +4,7 @@ GUI应用程序
 支持Windows和macOS
 """
 
+import multiprocessing
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
@@ -19,6 +20,8 @@ from src.pdf.split_box.ui_dialog import get_split_box_ui_dialog
 # nested_box模块已移至_archived/nested_box（已弃用）
 from src.utils.text_processor import text_processor
 from src.utils.excel_data_extractor import ExcelDataExtractor
+from src.data.extraction_cache import extraction_cache
+from src.data.reader_backends import supported_suffixes
 from src.utils.font_manager import font_manager
 from src.utils.data_input_dialog import show_data_input_dialog
 
@@ -69,7 +72,7 @@ class DataToPDFApp:
         # 文件选择提示
         self.select_label = tk.Label(
             self.select_frame,
-            text="点击此区域选择 Excel 文件\n支持 .xlsx 和 .xls 格式",
+            text=f"点击此区域选择 Excel 文件\n支持 {' '.join(supported_suffixes())} 格式",
             bg="#f8f8f8",
             font=("Arial", 11),
             fg="#666666",
@@ -189,7 +192,10 @@ class DataToPDFApp:
         """选择文件对话框"""
         file_path = filedialog.askopenfilename(
             title="选择Excel文件",
-            filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")],
+            filetypes=[
+                ("Excel files", " ".join(f"*{suffix}" for suffix in supported_suffixes())),
+                ("All files", "*.*"),
+            ],
         )
         if file_path:
             self.process_file(file_path)
@@ -203,13 +209,14 @@ class DataToPDFApp:
             self.root.update()
 
             # 检查文件格式
-            if not file_path.lower().endswith((".xlsx", ".xls")):
-                messagebox.showerror("格式错误", "请选择Excel文件(.xlsx或.xls)")
+            if not file_path.lower().endswith(supported_suffixes()):
+                messagebox.showerror("格式错误", f"请选择Excel文件({'/'.join(supported_suffixes())})")
                 self.status_var.set("❌ 文件格式错误")
                 return
 
             # 使用统一的Excel数据提取器
-            extractor = ExcelDataExtractor(file_path)
+            extractor = ExcelDataExtractor(file_path, reader_mode='bounded', cache=extraction_cache,
+                                           scan_all_sheets=True)
             
             # 先尝试获取统一标准数据（仅Excel数据）
             self.current_data = extractor.get_unified_standard_data()
@@ -251,7 +258,11 @@ class DataToPDFApp:
             info_text += "-" * 40 + "\n"
 
             for key, value in self.current_data.items():
-                info_text += f"{key}: {value}\n"
+                source_sheet = extractor.field_sources.get(key)
+                if source_sheet and value is not None:
+                    info_text += f"{key}: {value}  (工作表: {source_sheet})\n"
+                else:
+                    info_text += f"{key}: {value}\n"
 
             self.info_text.insert(tk.END, info_text)
 
@@ -548,7 +559,7 @@ def main():
     # 检查命令行参数，支持文件关联
     if len(sys.argv) > 1:
         file_path = sys.argv[1]
-        if file_path.lower().endswith((".xlsx", ".xls")):
+        if file_path.lower().endswith(supported_suffixes()):
             # 延迟处理文件，等GUI完全加载
             root.after(500, lambda: app.process_file(file_path))
 
@@ -556,4 +567,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后的应用在子进程中生成各级标签时需要
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,143 @@
+"""
+批量任务生成器
+把任务流（工作簿的每一行、JSON/NDJSON记录等）通过进程池交给PDFGenerator生成，
+任务惰性读取，同一时间只保留有限数量的在途任务。
+每个任务写入输出目录下自己的子目录（以来源命名，如"订单.xlsx 第5行"）：
+客户、标签名称和中文名称相同的两行在同一秒生成时，文件名完全相同，放在同一目录会互相覆盖
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+from src.pdf.generator import PDFGenerator
+from src.utils.filename_utils import clean_for_filename
+
+
+# 每个工作进程复用一个PDFGenerator（模板实例延迟创建）
+_worker_generator: Optional[PDFGenerator] = None
+
+
+def generate_job(job: Dict[str, Any], output_dir: str) -> Dict[str, str]:
+    """
+    生成单个任务的全部标签
+
+    Args:
+        job: 任务字典（见src.data.job_records.normalize_job_record）
+        output_dir: 输出目录
+
+    Returns:
+        生成的文件路径字典（与create_multi_level_pdfs相同）
+    """
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = PDFGenerator()
+
+    # 任务之间已经并行，任务内的各级标签默认在同一进程中依次生成、页面在渲染线程中压缩，避免进程/线程数成倍增加
+    params = dict(job["params"])
+    params.setdefault("级别进程数", 1)
+    params.setdefault("压缩线程数", 0)
+    if job["template"] == "split_box":
+        return _worker_generator.create_split_box_multi_level_pdfs(job["data"], params, output_dir)
+    return _worker_generator.create_multi_level_pdfs(job["data"], params, output_dir)
+
+
+def job_dir_name(source: str, index: int, used: Set[str]) -> str:
+    """
+    任务的输出子目录名：来源描述（如"订单.xlsx 第5行"），来源为空或重复时使用任务序号
+
+    Args:
+        source: 任务来源描述
+        index: 任务在任务流中的序号（从1开始，含不合法的任务）
+        used: 本批次已使用的子目录名（调用后加入本次的名称）
+
+    Returns:
+        本批次内唯一的子目录名
+    """
+    name = clean_for_filename(source) or f"任务{index}"
+    base, suffix = name, 1
+    while name in used:
+        suffix += 1
+        name = f"{base}_{suffix}"
+    used.add(name)
+    return name
+
+
+def _default_workers() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def iter_batch_results(jobs: Iterable[Dict[str, Any]], output_dir: str,
+                       max_workers: Optional[int] = None, use_processes: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    并行生成任务流，按输入顺序逐个返回结果
+
+    Args:
+        jobs: 任务迭代器（惰性读取，不会一次性展开）
+        output_dir: 输出目录，每个任务写入其中的子目录（见 job_dir_name）
+        max_workers: 并行数，None表示min(4, CPU核数)
+        use_processes: True使用进程池（PDF渲染为CPU密集型），False使用线程池
+
+    Yields:
+        {'source': 来源, 'files': 生成的文件} 或 {'source': 来源, 'error': 错误信息}
+    """
+    max_workers = max_workers or _default_workers()
+    # 在途任务上限：保持工作进程忙碌，同时不把整个任务流读入内存
+    max_in_flight = max_workers * 2
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+    with executor_class(max_workers=max_workers) as pool:
+        in_flight = deque()  # (来源, future, 规范化错误)，按输入顺序排列
+
+        def drain_oldest():
+            source, future, error = in_flight.popleft()
+            if future is None:
+                return {"source": source, "error": error}
+            try:
+                return {"source": source, "files": future.result()}
+            except Exception as e:
+                return {"source": source, "error": str(e)}
+
+        used_dirs: Set[str] = set()
+        for index, job in enumerate(jobs, start=1):
+            if "error" in job:
+                in_flight.append((job["source"], None, job["error"]))
+            else:
+                job_dir = os.path.join(output_dir, job_dir_name(job["source"], index, used_dirs))
+                in_flight.append((job["source"], pool.submit(generate_job, job, job_dir), None))
+
+            while len(in_flight) > max_in_flight:
+                yield drain_oldest()
+
+        while in_flight:
+            yield drain_oldest()
+
+
+def run_batch(jobs: Iterable[Dict[str, Any]], output_dir: str,
+              max_workers: Optional[int] = None, use_processes: bool = True) -> Dict[str, Any]:
+    """
+    批量生成并汇总结果
+
+    Args:
+        jobs: 任务迭代器
+        output_dir: 输出目录
+        max_workers: 并行数
+        use_processes: 是否使用进程池
+
+    Returns:
+        {'succeeded': 成功数, 'failed': 失败数, 'results': 结果列表}
+    """
+    results = []
+    succeeded = failed = 0
+    for result in iter_batch_results(jobs, output_dir, max_workers, use_processes):
+        results.append(result)
+        if "error" in result:
+            failed += 1
+            print(f"❌ {result['source']}: {result['error']}")
+        else:
+            succeeded += 1
+            print(f"✅ {result['source']}: 已生成{len(result['files'])}个文件")
+
+    print(f"📊 批量生成完成: 成功{succeeded}个, 失败{failed}个")
+    return {"succeeded": succeeded, "failed": failed, "results": results}
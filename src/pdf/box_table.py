@@ -0,0 +1,45 @@
+"""
+箱标表格绘制（常规模板和分盒模板共用）
+
+同一个PDF文件中每页的表格框线、行标题（Item:/Theme:/Quantity:/Carton No:/Remark:）、
+主题和备注都相同，只有数量、序列号范围和Carton No随页变化。
+静态部分在每个文件中只绘制一次，保存为PDF表单对象（Form XObject），
+之后每页用doForm引用，页面内容流只写入可变文本。
+"""
+
+from src.pdf.label_layout import box_table_layout
+from src.utils.text_processor import text_processor
+
+
+def draw_box_table(c, width, height, theme_text, quantity, serial_range, carton_no, remark_text,
+                   paper_card=True, serial_font_size=10, row_units=None):
+    """
+    绘制箱标表格
+
+    版式（坐标、行标题、换行后的主题）见label_layout.box_table_layout，每个文件只计算一次
+
+    Args:
+        c: ReportLab Canvas对象
+        width, height: 页面尺寸
+        theme_text: 主题
+        quantity: 数量（显示为"{quantity}PCS"）
+        serial_range: 序列号范围
+        carton_no: Carton No
+        remark_text: 备注
+        paper_card: 是否为有纸卡备注模版
+        serial_font_size: 序列号范围的字体大小
+        row_units: 表格高度等分的份数，None时按行数计算（Quantity行占2份）
+    """
+    layout = box_table_layout(width, height, theme_text, remark_text, paper_card, serial_font_size, row_units)
+
+    # 静态部分：每个文件只绘制一次
+    if not c._doc.hasForm(layout.form_name):
+        c.beginForm(layout.form_name)
+        layout.draw_static(c)
+        c.endForm()
+    c.doForm(layout.form_name)
+
+    # 可变部分：每页只写入数量、序列号范围和Carton No
+    layout.draw_field(c, "quantity", f"{quantity}PCS")
+    layout.draw_field(c, "serial_range", text_processor.clean_text_for_font(serial_range))
+    layout.draw_field(c, "carton_no", carton_no)
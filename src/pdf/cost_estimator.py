@@ -0,0 +1,298 @@
+"""
+任务耗时与文件大小估算
+
+确认生成之前估算本次任务：各级标签PDF的页数、文件大小和耗时。
+页数由包装参数直接算出（不构建标签计划，与参数规模无关）；
+文件大小和耗时按本机的校准配置（实测的每页渲染耗时和每页字节数）换算。
+本机未校准时使用内置的默认配置。
+"""
+
+import json
+import math
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from src.data.job_records import parse_capacity_list
+from src.pdf.label_plan import first_label_page
+
+
+# 本机校准配置：环境变量指定或用户目录下的cost_profile.json
+DEFAULT_PROFILE_PATH = os.environ.get(
+    "DATA_TO_PDFPRINT_COST_PROFILE",
+    os.path.join(os.path.expanduser("~"), ".data_to_pdfprint", "cost_profile.json")
+)
+
+# 校准配置格式版本，配置结构变化时递增
+PROFILE_VERSION = 1
+
+# 未校准时的默认配置（开发机实测值；未安装中文字体时渲染较快、文件较小，建议在生产机上校准）
+DEFAULT_COST_PROFILE = {
+    "version": PROFILE_VERSION,
+    "machine": None,
+    "calibrated_at": None,
+    "templates": {
+        "regular_box": {
+            "seconds_per_page": 0.0003,
+            "seconds_per_job": 0.015,
+            "levels": {
+                "盒标": {"bytes_per_page": 510, "bytes_per_file": 840},
+                "小箱标": {"bytes_per_page": 625, "bytes_per_file": 1860},
+                "大箱标": {"bytes_per_page": 625, "bytes_per_file": 1880},
+            },
+        },
+        "split_box": {
+            "seconds_per_page": 0.0003,
+            "seconds_per_job": 0.015,
+            "levels": {
+                "盒标": {"bytes_per_page": 510, "bytes_per_file": 850},
+                "小箱标": {"bytes_per_page": 625, "bytes_per_file": 1880},
+                "大箱标": {"bytes_per_page": 625, "bytes_per_file": 1900},
+            },
+        },
+    },
+}
+
+# 预计耗时超过该值时，确认生成前再次提示（秒）
+LONG_JOB_SECONDS = 5 * 60
+
+
+def _carton_count(total_units: int, per_carton: int, capacities: Optional[Tuple[int, ...]]) -> int:
+    """按容量装箱后的箱数（容量列表循环使用，只遍历一遍列表）"""
+    if not capacities:
+        return math.ceil(total_units / per_carton)
+    cycles, remainder = divmod(total_units, sum(capacities))
+    count = cycles * len(capacities)
+    for capacity in capacities:
+        if remainder <= 0:
+            break
+        remainder -= capacity
+        count += 1
+    return count
+
+
+def count_labels(template: str, data: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, int]:
+    """
+    各级标签数量（闭式计算，结果与build_label_plan(...).counts()一致）
+
+    Args:
+        template: 'regular_box' 或 'split_box'
+        data: 六字段标准数据
+        params: 包装参数
+
+    Returns:
+        {级别名称: 标签数量}，包含盒标（是否生成由调用方决定）
+    """
+    total_boxes = math.ceil(int(float(data['总张数'])) / int(params['张/盒']))
+    boxes_per_small_box = int(params['盒/小箱'])
+    has_small_box = bool(params.get('是否有小箱', True))
+    small_boxes_per_large_box = int(params.get('小箱/大箱', 1)) if has_small_box else 1
+    counts = {'盒标': total_boxes}
+
+    if template == 'regular_box':
+        total_small_boxes = _carton_count(total_boxes, boxes_per_small_box,
+                                          parse_capacity_list('小箱容量', params.get('小箱容量')))
+        if has_small_box:
+            counts['小箱标'] = total_small_boxes
+            counts['大箱标'] = _carton_count(total_small_boxes, small_boxes_per_large_box,
+                                            parse_capacity_list('大箱容量', params.get('大箱容量')))
+        else:
+            counts['箱标'] = total_small_boxes
+        return counts
+
+    # 分盒模板：按套数计算（与_create_three_level_pdfs/_create_two_level_pdfs一致）
+    boxes_per_set = int(params.get('盒/套', params.get('boxes_per_set', 1)))
+    total_sets = math.ceil(total_boxes / boxes_per_set)
+
+    def large_count(ratio: float) -> int:
+        if ratio >= 1:
+            return total_sets * math.ceil(ratio)
+        return math.ceil(total_sets / math.ceil(1 / ratio))
+
+    if has_small_box:
+        small_boxes_per_set = math.ceil(boxes_per_set / boxes_per_small_box)
+        counts['小箱标'] = total_sets * small_boxes_per_set
+        counts['大箱标'] = large_count(small_boxes_per_set / small_boxes_per_large_box)
+    else:
+        counts['箱标'] = large_count(boxes_per_set / boxes_per_small_box)
+    return counts
+
+
+def count_pages(template: str, data: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, int]:
+    """
+    本次生成的各级PDF页数（含盒标空白首页和箱标空箱标签页；未选择盒标时不含盒标）
+
+    Returns:
+        {级别名称: 页数}，级别名称与generated_files的键一致
+    """
+    pages = {}
+    for level, count in count_labels(template, data, params).items():
+        if level == '盒标' and not params.get('是否有盒标', False):
+            continue
+        pages[level] = count + first_label_page(level, params) - 1
+    return pages
+
+
+def load_cost_profile(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    加载本机校准配置
+
+    Args:
+        path: 配置文件路径，None表示DEFAULT_PROFILE_PATH
+
+    Returns:
+        校准配置；文件不存在、无法读取或版本不符时返回DEFAULT_COST_PROFILE
+    """
+    path = path or DEFAULT_PROFILE_PATH
+    if not os.path.exists(path):
+        return DEFAULT_COST_PROFILE
+    try:
+        with open(path, encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 校准配置读取失败，使用默认值: {e}")
+        return DEFAULT_COST_PROFILE
+    if profile.get("version") != PROFILE_VERSION:
+        print(f"⚠️ 校准配置版本不符（{profile.get('version')}），使用默认值")
+        return DEFAULT_COST_PROFILE
+    return profile
+
+
+def estimate_job_cost(template: str, data: Dict[str, Any], params: Dict[str, Any],
+                      profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    估算任务的页数、文件大小和耗时
+
+    Args:
+        template: 'regular_box' 或 'split_box'
+        data: 六字段标准数据
+        params: 包装参数
+        profile: 校准配置，None时加载本机配置
+
+    Returns:
+        {'pages': {级别: 页数}, 'bytes': {级别: 字节数}, 'total_pages', 'total_bytes',
+         'seconds': 预计耗时, 'calibrated': 是否使用了本机校准配置}
+    """
+    profile = profile or load_cost_profile()
+    costs = profile["templates"][template]
+    pages = count_pages(template, data, params)
+
+    sizes = {}
+    for level, page_count in pages.items():
+        # 无小箱时的箱标与大箱标版式相同
+        level_cost = costs["levels"].get(level) or costs["levels"]["大箱标"]
+        sizes[level] = int(level_cost["bytes_per_file"] + level_cost["bytes_per_page"] * page_count)
+
+    total_pages = sum(pages.values())
+    return {
+        'pages': pages,
+        'bytes': sizes,
+        'total_pages': total_pages,
+        'total_bytes': sum(sizes.values()),
+        'seconds': costs["seconds_per_job"] + costs["seconds_per_page"] * total_pages,
+        'calibrated': profile.get("calibrated_at") is not None,
+    }
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.0f} 秒" if seconds >= 1 else "不到1秒"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f} 分钟"
+    return f"{seconds / 3600:.1f} 小时"
+
+
+def format_cost_estimate(estimate: Dict[str, Any]) -> str:
+    """
+    估算结果的显示文本（对话框中使用）
+
+    Args:
+        estimate: estimate_job_cost的返回值
+
+    Returns:
+        多行文本
+    """
+    lines = [f"{level}: {pages} 页，约 {_format_bytes(estimate['bytes'][level])}"
+             for level, pages in estimate['pages'].items()]
+    lines.append(f"合计: {estimate['total_pages']} 页，约 {_format_bytes(estimate['total_bytes'])}")
+    lines.append(f"预计耗时: {_format_seconds(estimate['seconds'])}")
+    if not estimate['calibrated']:
+        lines.append("（本机未校准，按默认值估算）")
+    return "\n".join(lines)
+
+
+def calibrate_cost_profile(path: Optional[str] = None, sizes: Tuple[int, int] = (40, 400)) -> Dict[str, Any]:
+    """
+    在本机实测渲染耗时和文件大小，写入校准配置
+
+    每个模板用两个规模的样例任务生成三级标签，按两次结果的差值计算每页耗时和每页字节数，
+    截距作为每个任务/每个文件的固定开销。
+
+    Args:
+        path: 配置文件路径，None表示DEFAULT_PROFILE_PATH
+        sizes: 两个样例任务的盒数
+
+    Returns:
+        校准配置
+    """
+    # 渲染模板依赖reportlab，只在校准时导入
+    from src.pdf.regular_box.template import RegularTemplate
+    from src.pdf.split_box.template import SplitBoxTemplate
+
+    path = path or DEFAULT_PROFILE_PATH
+    profile = {
+        "version": PROFILE_VERSION,
+        "machine": platform.node(),
+        "calibrated_at": datetime.now().isoformat(timespec="seconds"),
+        "templates": {},
+    }
+    params = {"张/盒": 10, "盒/小箱": 4, "小箱/大箱": 2, "盒/套": 4, "是否有小箱": True, "是否有盒标": True,
+              "选择外观": "外观一", "标签模版": "有纸卡备注", "中文名称": "校准", "序列号字体大小": 10}
+
+    for template, template_class in (("regular_box", RegularTemplate), ("split_box", SplitBoxTemplate)):
+        samples = []
+        # 第一次运行包含字体注册等一次性开销，不计入结果
+        for boxes in (sizes[0],) + tuple(sizes):
+            data = {"客户名称编码": "CAL", "标签名称": "CALIBRATION", "开始号": "CAL01001", "总张数": boxes * 10}
+            with tempfile.TemporaryDirectory() as output_dir:
+                start = time.perf_counter()
+                files = template_class().create_multi_level_pdfs(data, params, output_dir)
+                elapsed = time.perf_counter() - start
+                file_sizes = {level: os.path.getsize(file_path) for level, file_path in files.items()
+                              if str(file_path).endswith(".pdf")}
+            samples.append((count_pages(template, data, params), elapsed, file_sizes))
+
+        (pages_1, seconds_1, bytes_1), (pages_2, seconds_2, bytes_2) = samples[1:]
+        total_1, total_2 = sum(pages_1.values()), sum(pages_2.values())
+        seconds_per_page = max(seconds_2 - seconds_1, 0.0) / (total_2 - total_1)
+        levels = {}
+        for level in bytes_1:
+            bytes_per_page = (bytes_2[level] - bytes_1[level]) / (pages_2[level] - pages_1[level])
+            levels[level] = {
+                "bytes_per_page": round(bytes_per_page, 1),
+                "bytes_per_file": max(int(bytes_1[level] - bytes_per_page * pages_1[level]), 0),
+            }
+        profile["templates"][template] = {
+            "seconds_per_page": round(seconds_per_page, 6),
+            "seconds_per_job": round(max(seconds_1 - seconds_per_page * total_1, 0.0), 4),
+            "levels": levels,
+        }
+        print(f"⏱️ {template}: 每页 {seconds_per_page * 1000:.2f} ms，"
+              + "，".join(f"{level} 每页 {cost['bytes_per_page']:.0f} B" for level, cost in levels.items()))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+    print(f"✅ 校准配置已保存: {path}")
+    return profile
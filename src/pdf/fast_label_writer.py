@@ -0,0 +1,658 @@
+"""
+盒标快速渲染引擎
+
+盒标（外观一/外观二）每页只有序列号不同。reportlab画布每页都要重新设置字体、测量宽度、
+组装文本对象并在保存时统一格式化所有对象；这里把每个LabelLayout预编译为内容流模板：
+静态文本（标题、Ticket count等）的操作符只生成一次，序列号的居中位置用字体的逐字符宽度表计算，
+每页只需拼接字节、压缩后直接写入文件。
+
+内容流与画布路径逐字节相同（同样的字体内部名称、坐标格式和文本操作符），
+字体对象（Type1标准字体、TrueType子集）按reportlab的方式在文件末尾写入一次，
+因此输出与画布路径视觉上完全一致。只支持Type1标准字体和TrueType字体，
+其他字体（如嵌入的Type1字体）由调用方回退到画布路径（见 fast_engine_supported）。
+
+页面内容流的压缩可交给线程池（zlib压缩时释放GIL）：渲染线程继续生成后面的页面，
+压缩完成的页面按页序写入文件，输出与在渲染线程中压缩逐字节相同。
+"""
+
+import hashlib
+import os
+import time
+import zlib
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from reportlab.lib.rl_accel import escapePDF, fp_str, unicode2T1
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import FF_NONSYMBOLIC, FF_SYMBOLIC, SUBSETN, TTFont, makeToUnicodeCMap
+
+from src.pdf.label_layout import LabelLayout, TextSlot, blank_page_layout, box_label_layout
+from src.utils.font_manager import font_manager
+from src.utils.text_measurer import text_measurer
+from src.utils.text_processor import text_processor
+
+
+# 渲染引擎参数（params["渲染引擎"]）
+RENDER_ENGINE_CANVAS = "canvas"
+RENDER_ENGINE_FAST = "fast"
+
+# 与reportlab画布每页开头相同的初始状态（默认Helvetica 12号）和CMYK黑色填充
+_PAGE_PREAMBLE = "1 0 0 1 0 0 cm  BT /F1 12 Tf 14.4 TL ET"
+_CMYK_BLACK_FILL = "0 0 0 1 k"
+
+# 写入文件时的缓冲区大小
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# 页面树和交叉引用表每次写入的条目数（分批写入，不在内存中拼出整张表）
+_XREF_CHUNK = 10000
+
+# 后台压缩：线程数上限、每个压缩任务的页数（单页内容流只有几百字节，逐页提交的调度开销大于压缩本身）、
+# 每个线程最多排队的任务数（限制等待写入的页面占用的内存）
+MAX_COMPRESS_WORKERS = 4
+_DEFLATE_BATCH_PAGES = 64
+_DEFLATE_QUEUE_PER_WORKER = 2
+
+
+def default_compress_workers() -> int:
+    """默认的压缩线程数：留一个核心给渲染线程，单核时为0（在渲染线程中压缩）"""
+    return max(0, min(MAX_COMPRESS_WORKERS, (os.cpu_count() or 1) - 1))
+
+
+def _deflate_pages(pages: List[Tuple[bytes, bool]]) -> List[bytes]:
+    """压缩一批页面内容流（在压缩线程中运行）"""
+    return [zlib.compress(content) if compress else content for content, compress in pages]
+
+
+def _best_font_name() -> str:
+    """盒标使用的字体，与 font_manager.set_best_font(c, size, bold=True) 的选择一致"""
+    if font_manager.bold_font_registered:
+        return font_manager.bold_font_name
+    return font_manager.chinese_font_name
+
+
+def _font_supported(font) -> bool:
+    """是否为快速引擎能直接写出的字体：Type1标准字体（内置编码）或可子集化的TrueType字体"""
+    if isinstance(font, TTFont):
+        return not getattr(font.face, "_full_font", None)
+    if font._dynamicFont or font.face.name not in pdfmetrics.standardFonts:
+        return False
+    return isinstance(font.encoding.makePDFObject(), str)
+
+
+def fast_engine_supported() -> bool:
+    """
+    当前注册的盒标字体能否使用快速引擎
+
+    Returns:
+        bool: 不支持时调用方应使用画布路径
+    """
+    try:
+        return _font_supported(pdfmetrics.getFont(_best_font_name()))
+    except KeyError:
+        return False
+
+
+def _pdf_text(text: str) -> str:
+    """PDF文本字符串：ASCII直接转义，其他文本用带BOM的UTF-16BE十六进制串"""
+    if text.isascii():
+        return f"({escapePDF(text)})"
+    return f"<FEFF{text.encode('utf-16-be').hex().upper()}>"
+
+
+class _PageTemplate:
+    """一个版式预编译后的内容流模板：静态部分的字节 + 每个字段的位置和字体操作符"""
+
+    def __init__(self, prefix: bytes, fields: Dict[str, Tuple[TextSlot, str, str]]):
+        self.prefix = prefix
+        self.fields = fields
+
+
+class FastLabelWriter:
+    """
+    直接写出PDF文件的盒标写入器
+
+    页面对象在 add_page 时立即写入文件（使用压缩线程时在本批压缩完成后按页序写入），
+    内存中只保留对象偏移量和页面编号（紧凑数组，每个对象8字节）；
+    字体、页面树、目录和交叉引用表在 close 时写入。
+
+    用法:
+        with FastLabelWriter(path, page_size, title="盒标") as writer:
+            writer.add_page(layout, {"serial": "DSK00001"})
+    """
+
+    # 预留的对象编号：字体字典、页面树、页面资源
+    _FONTS_OBJ = 1
+    _PAGES_OBJ = 2
+    _RESOURCES_OBJ = 3
+    _FIRST_OBJ = 4
+
+    # 所有页面共用的资源字典
+    _RESOURCES = f"<< /Font {_FONTS_OBJ} 0 R /ProcSet [ /PDF /Text ] >>"
+
+    def __init__(self, output_path: str, page_size: Tuple[float, float], title: str = "",
+                 subject: str = "", creator: str = "Data-to-PDF Print", compress_workers: Optional[int] = None):
+        """
+        创建文件并写入文件头
+
+        Args:
+            output_path: 输出PDF路径
+            page_size: 页面尺寸 (宽, 高)
+            title, subject, creator: 文档信息
+            compress_workers: 页面压缩线程数（params["压缩线程数"]），0为在渲染线程中压缩，
+                None为 default_compress_workers()
+        """
+        self._open(output_path, page_size, self._FIRST_OBJ, compress_workers)
+        self.info = {"Title": title, "Subject": subject, "Creator": creator}
+
+        self._write(b"%PDF-1.4\n%\x93\x8c\x8b\x9e Data-to-PDF Print\n")
+        # 每页开头的初始字体为Helvetica（/F1），与画布路径一致
+        self._internal_name(pdfmetrics.getFont("Helvetica"))
+        self._write_object(self._RESOURCES_OBJ, self._RESOURCES)
+
+    def _open(self, output_path: str, page_size: Tuple[float, float], first_obj: int,
+              compress_workers: Optional[int] = 0):
+        """打开输出文件，初始化字体映射、对象编号、偏移量和压缩线程池"""
+        self.output_path = output_path
+        self.page_size = page_size
+
+        # 与reportlab文档相同的字体映射：fontMapping供TrueType字体分配内部名称（/F2+0等）；
+        # TrueType子集状态以 _font_doc 为键（默认为写入器本身，流式画布中为画布的文档）
+        self.fontMapping: Dict[str, str] = {}
+        self.delayedFonts: List[Any] = []
+        self._type1_fonts: List[Any] = []
+        self._font_doc = self
+
+        self._templates: Dict[int, Tuple[LabelLayout, _PageTemplate]] = {}
+        self._offsets = array("q")  # 对象编号 -> 偏移量
+        self._next_obj = first_obj
+        self._page_objs = array("q")
+        self._file = open(output_path, "wb", buffering=_WRITE_BUFFER_SIZE)
+        self._position = 0
+        self._closed = False
+
+        if compress_workers is None:
+            compress_workers = default_compress_workers()
+        self._deflate_pool = ThreadPoolExecutor(compress_workers, "deflate") if compress_workers > 0 else None
+        self._deflate_max_pending = compress_workers * _DEFLATE_QUEUE_PER_WORKER
+        # 等待提交的页面：(内容流编号, 页面编号, 页面字典, 内容流, 是否压缩)
+        self._page_batch: List[Tuple[int, int, str, bytes, bool]] = []
+        self._pending_batches = deque()  # (压缩任务, 页面批次)，按页序排列
+
+        self._page_dict = (f"<< /Type /Page /Parent {self._PAGES_OBJ} 0 R /MediaBox [ 0 0 {fp_str(*page_size)} ] "
+                           f"/Resources {self._RESOURCES_OBJ} 0 R /Rotate 0 /Contents %d 0 R >>")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_objs)
+
+    # ------------------------------------------------------------------
+    # 对象写入
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._position += len(data)
+
+    def _new_obj(self) -> int:
+        number = self._next_obj
+        self._next_obj += 1
+        return number
+
+    def _set_offset(self, number: int, offset: int):
+        offsets = self._offsets
+        if number >= len(offsets):
+            offsets.frombytes(bytes(offsets.itemsize * (number + 1 - len(offsets))))
+        offsets[number] = offset
+
+    def _write_object(self, number: int, body: str):
+        self._set_offset(number, self._position)
+        self._write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+
+    def _write_stream(self, number: int, data: bytes, extra: str = "", compress: bool = True):
+        """写入流对象（默认Flate压缩）"""
+        self._write_stream_data(number, zlib.compress(data) if compress else data, extra, compress)
+
+    def _write_stream_data(self, number: int, data: bytes, extra: str = "", compressed: bool = True):
+        """写入已压缩（compressed为True）或不压缩的流数据"""
+        self._set_offset(number, self._position)
+        filters = " /Filter /FlateDecode" if compressed else ""
+        self._write(b"".join((
+            f"{number} 0 obj\n<<{filters} /Length {len(data)}{extra} >>\nstream\n".encode("latin-1"),
+            data,
+            b"\nendstream\nendobj\n",
+        )))
+
+    # ------------------------------------------------------------------
+    # 文本操作符（与reportlab PDFTextObject的输出相同）
+
+    def _internal_name(self, font) -> str:
+        """Type1字体的内部名称（/F1、/F2...），首次使用时分配"""
+        name = self.fontMapping.get(font.fontName)
+        if name is None:
+            name = self.fontMapping[font.fontName] = f"/F{len(self.fontMapping) + 1}"
+            self._type1_fonts.append(font)
+        return name
+
+    def _set_font_op(self, font, font_size: float) -> Optional[str]:
+        """canvas.setFont的输出：Type1字体写入字体操作符，TrueType字体在文本对象内切换子集"""
+        if isinstance(font, TTFont):
+            return None
+        return f"BT {self._internal_name(font)} {fp_str(font_size)} Tf {fp_str(font_size * 1.2)} TL ET"
+
+    def _show_text(self, font, font_size: float, text: str) -> str:
+        """文本显示操作符（含Type1替代字体或TrueType子集的切换）"""
+        tf = f"{fp_str(font_size)} Tf {fp_str(font_size * 1.2)} TL"
+        parts = []
+        if isinstance(font, TTFont):
+            current_subset = -1
+            for subset, chunk in font.splitString(text, self._font_doc):
+                if subset != current_subset:
+                    parts.append(f"{font.getSubsetInternalName(subset, self._font_doc)} {tf}")
+                    current_subset = subset
+                parts.append(f"({escapePDF(chunk)}) Tj")
+        else:
+            current_font = font
+            for chunk_font, chunk in unicode2T1(text, [font] + font.substitutionFonts):
+                if chunk_font != current_font:
+                    parts.append(f"{self._internal_name(chunk_font)} {tf}")
+                    current_font = chunk_font
+                parts.append(f"({escapePDF(chunk)}) Tj")
+            if current_font != font:
+                parts.append(f"{self._internal_name(font)} {tf}")
+        return " ".join(parts)
+
+    def _text_op(self, font_name: str, slot: TextSlot, text: str) -> str:
+        """drawString/drawCentredString的输出：居中位置用逐字符宽度表计算"""
+        x = slot.x
+        if slot.centred:
+            advances = text_measurer.glyph_advances(font_name)
+            units = 0
+            for char in text:
+                units += advances[char]
+            x = x - 0.5 * advances.to_points(units, slot.font_size)
+        font = pdfmetrics.getFont(font_name)
+        return f"BT 1 0 0 1 {fp_str(x, slot.y)} Tm {self._show_text(font, slot.font_size, text)} T* ET"
+
+    # ------------------------------------------------------------------
+    # 页面
+
+    def _compile(self, layout: LabelLayout) -> _PageTemplate:
+        """把版式的静态部分编译为内容流前缀（与LabelLayout.draw_static的绘制顺序相同）"""
+        if layout.rect is not None or layout.lines:
+            raise ValueError("快速引擎只支持纯文本版式（盒标），表格版式请使用画布路径")
+        font_name = _best_font_name()
+        font = pdfmetrics.getFont(font_name)
+
+        ops = [_PAGE_PREAMBLE, _CMYK_BLACK_FILL, _CMYK_BLACK_FILL]
+        font_size = None
+        for slot, text in layout.static_text:
+            if slot.font_size != font_size:
+                font_size = slot.font_size
+                ops.append(self._set_font_op(font, font_size))
+            ops.append(self._text_op(font_name, slot, text))
+        prefix = "".join(f"{op}\n" for op in ops if op is not None).encode("latin-1")
+
+        fields = {}
+        for name, slot in layout.fields.items():
+            set_font = self._set_font_op(font, slot.font_size)
+            fields[name] = (slot, font_name, f"{set_font}\n" if set_font else "")
+        return _PageTemplate(prefix, fields)
+
+    def _template(self, layout: LabelLayout) -> _PageTemplate:
+        entry = self._templates.get(id(layout))
+        if entry is None or entry[0] is not layout:
+            entry = self._templates[id(layout)] = (layout, self._compile(layout))
+        return entry[1]
+
+    def add_page(self, layout: LabelLayout, fields: Optional[Dict[str, str]] = None):
+        """
+        写入一页：版式的静态部分 + 各字段本页的文本
+
+        Args:
+            layout: 页面版式（首次使用时预编译）
+            fields: 字段名 -> 本页文本，按字段传入的顺序绘制
+        """
+        template = self._template(layout)
+        parts = [template.prefix]
+        for name, text in (fields or {}).items():
+            slot, font_name, set_font = template.fields[name]
+            parts.append(f"{set_font}{self._text_op(font_name, slot, text)}\n".encode("latin-1"))
+        parts.append(b" \n")
+        self.add_content_page(b"".join(parts))
+
+    def add_content_page(self, content: bytes, page_size: Optional[Tuple[float, float]] = None,
+                         compress: bool = True):
+        """
+        写入一页已生成好的内容流（流式画布每页调用一次）
+
+        Args:
+            content: 页面内容流
+            page_size: 页面尺寸，None表示写入器的页面尺寸
+            compress: 是否Flate压缩
+        """
+        contents = self._new_obj()
+        page = self._new_obj()
+        if page_size is None or tuple(page_size) == tuple(self.page_size):
+            page_body = self._page_dict % contents
+        else:
+            page_body = self._page_dict.replace(
+                f"/MediaBox [ 0 0 {fp_str(*self.page_size)} ]", f"/MediaBox [ 0 0 {fp_str(*page_size)} ]") % contents
+        self._page_objs.append(page)
+        if self._deflate_pool is None:
+            self._write_stream(contents, content, compress=compress)
+            self._write_object(page, page_body)
+            return
+        self._page_batch.append((contents, page, page_body, content, compress))
+        if len(self._page_batch) >= _DEFLATE_BATCH_PAGES:
+            self._submit_page_batch()
+
+    # ------------------------------------------------------------------
+    # 后台压缩：页面按批提交给压缩线程，压缩完成的批次按页序写入（对象编号在add_content_page时已分配）
+
+    def _submit_page_batch(self):
+        batch, self._page_batch = self._page_batch, []
+        future = self._deflate_pool.submit(_deflate_pages, [(content, compress) for *_, content, compress in batch])
+        self._pending_batches.append((future, batch))
+        self._write_finished_batches()
+
+    def _write_finished_batches(self, wait: bool = False):
+        """
+        按页序写入已压缩完成的批次
+
+        Args:
+            wait: True时等待全部批次；否则只在排队的批次超过上限时等待最早的批次
+        """
+        pending = self._pending_batches
+        while pending and (wait or len(pending) > self._deflate_max_pending or pending[0][0].done()):
+            future, batch = pending.popleft()
+            for (contents, page, page_body, _, compress), data in zip(batch, future.result()):
+                self._write_stream_data(contents, data, compressed=compress)
+                self._write_object(page, page_body)
+
+    def _flush_pages(self):
+        """写入所有尚在压缩的页面"""
+        if self._page_batch:
+            self._submit_page_batch()
+        self._write_finished_batches(wait=True)
+
+    def _shutdown_deflate(self):
+        if self._deflate_pool is not None:
+            self._deflate_pool.shutdown(cancel_futures=True)
+            self._deflate_pool = None
+        self._page_batch = []
+        self._pending_batches.clear()
+
+    # ------------------------------------------------------------------
+    # 分片渲染（见 sharded_box_labels）：工作进程按预留的对象编号写出连续页面，主进程按页序拼接
+
+    def prepare(self, layout: LabelLayout):
+        """预编译版式（为静态文本分配字体内部名称和TrueType子集编码），供分片前调用"""
+        self._template(layout)
+
+    def reserve_objects(self, count: int) -> int:
+        """
+        预留一段连续的对象编号
+
+        Returns:
+            第一个对象编号；第i页（从0开始）的内容流为 first + 2i，页面对象为 first + 2i + 1
+        """
+        first = self._next_obj
+        self._next_obj += count
+        return first
+
+    def font_snapshot(self) -> Dict[str, Any]:
+        """
+        当前的字体映射和TrueType子集编码（可序列化），分片写入器按此编码文本
+
+        Returns:
+            {'fontMapping': {字体名: 内部名称}, 'ttf': {字体名: (assignments, subsets, nextCode, internalName)}}
+        """
+        ttf = {}
+        for font in self.delayedFonts:
+            state = font.state[self._font_doc]
+            ttf[font.fontName] = (dict(state.assignments), [list(subset) for subset in state.subsets],
+                                  state.nextCode, state.internalName)
+        return {"fontMapping": dict(self.fontMapping), "ttf": ttf}
+
+    def append_shard(self, shard_path: str, first_obj: int, offsets: Sequence[int]):
+        """
+        把分片文件按原样追加到输出文件
+
+        Args:
+            shard_path: 分片写入器写出的文件（内容流和页面对象交替）
+            first_obj: 分片的第一个对象编号
+            offsets: 分片内各对象相对分片开头的偏移量
+        """
+        self._flush_pages()
+        base = self._position
+        for index, offset in enumerate(offsets):
+            self._set_offset(first_obj + index, base + offset)
+        self._page_objs.extend(range(first_obj + 1, first_obj + len(offsets), 2))
+        with open(shard_path, "rb") as shard:
+            while True:
+                chunk = shard.read(_WRITE_BUFFER_SIZE)
+                if not chunk:
+                    break
+                self._write(chunk)
+
+    # ------------------------------------------------------------------
+    # 文件结束
+
+    def _write_fonts(self) -> Dict[str, int]:
+        """写入本文件用到的字体对象，返回 内部名称 -> 对象编号"""
+        font_objs = {}
+        for font in self._type1_fonts:
+            name = self.fontMapping[font.fontName][1:]
+            encoding = font.encoding.makePDFObject()
+            encoding = f" /Encoding {encoding}" if encoding in (
+                "/MacRomanEncoding", "/MacExpertEncoding", "/WinAnsiEncoding") else ""
+            number = font_objs[name] = self._new_obj()
+            self._write_object(number, f"<< /BaseFont /{font.face.name}{encoding} /Name /{name} "
+                                       f"/Subtype /Type1 /Type /Font >>")
+
+        # TrueType字体按子集写入（与reportlab TTFont.addObjects相同）
+        for font in self.delayedFonts:
+            face = font.face
+            state = font.state[self._font_doc]
+            state.frozen = 1
+            for n, subset in enumerate(state.subsets):
+                name = font.getSubsetInternalName(n, self._font_doc)[1:]
+                base_font = b"".join((SUBSETN(n), b"+", face.name, face.subfontNameX)).decode("pdfdoc")
+
+                to_unicode = self._new_obj()
+                self._write_stream(to_unicode, makeToUnicodeCMap(base_font, subset).encode("latin-1"))
+                font_data = face.makeSubset(subset)
+                font_file = self._new_obj()
+                self._write_stream(font_file, font_data, f" /Length1 {len(font_data)}")
+
+                flags = (face.flags & ~FF_NONSYMBOLIC) | FF_SYMBOLIC
+                descriptor = self._new_obj()
+                self._write_object(descriptor, (
+                    f"<< /Ascent {fp_str(face.ascent)} /CapHeight {fp_str(face.capHeight)} "
+                    f"/Descent {fp_str(face.descent)} /Flags {flags} /FontBBox [ {fp_str(*face.bbox)} ] "
+                    f"/FontFile2 {font_file} 0 R /FontName /{base_font} /ItalicAngle {fp_str(face.italicAngle)} "
+                    f"/MissingWidth {fp_str(face.defaultWidth)} /StemV {fp_str(face.stemV)} /Type /FontDescriptor >>"))
+
+                widths = " ".join(fp_str(face.getCharWidth(code)) for code in subset)
+                number = font_objs[name] = self._new_obj()
+                self._write_object(number, (
+                    f"<< /BaseFont /{base_font} /FirstChar 0 /FontDescriptor {descriptor} 0 R "
+                    f"/LastChar {len(subset) - 1} /Name /{name} /Subtype /TrueType /ToUnicode {to_unicode} 0 R "
+                    f"/Type /Font /Widths [ {widths} ] >>"))
+        return font_objs
+
+    def _release_fonts(self):
+        """释放TrueType字体中以本写入器（或画布文档）为键的子集状态"""
+        for font in self.delayedFonts:
+            font.state.pop(self._font_doc, None)
+        self.delayedFonts = []
+
+    def close(self):
+        """写入字体、页面树、文档信息和交叉引用表，关闭文件"""
+        if self._closed:
+            return
+        try:
+            self._flush_pages()
+            font_objs = self._write_fonts()
+            self._write_object(self._FONTS_OBJ, "<< " + " ".join(
+                f"/{name} {number} 0 R" for name, number in font_objs.items()) + " >>")
+
+            self._set_offset(self._PAGES_OBJ, self._position)
+            self._write(f"{self._PAGES_OBJ} 0 obj\n<< /Count {len(self._page_objs)} /Kids [ ".encode("latin-1"))
+            for start in range(0, len(self._page_objs), _XREF_CHUNK):
+                self._write("".join(f"{number} 0 R " for number in self._page_objs[start:start + _XREF_CHUNK])
+                            .encode("latin-1"))
+            self._write(b"] /Type /Pages >>\nendobj\n")
+
+            catalog = self._new_obj()
+            self._write_object(catalog, f"<< /PageMode /UseNone /Pages {self._PAGES_OBJ} 0 R /Type /Catalog >>")
+            now = time.strftime("D:%Y%m%d%H%M%S+00'00'", time.gmtime())
+            info = self._new_obj()
+            self._write_object(info, "<< " + " ".join(
+                f"/{key} {_pdf_text(value)}" for key, value in self.info.items()) +
+                f" /CreationDate ({now}) /ModDate ({now}) /Producer (Data-to-PDF Print fast label writer) >>")
+
+            xref_position = self._position
+            size = self._next_obj
+            self._write(f"xref\n0 {size}\n0000000000 65535 f \n".encode("latin-1"))
+            for start in range(1, size, _XREF_CHUNK):
+                self._write("".join(f"{self._offsets[number]:010d} 00000 n \n"
+                                    for number in range(start, min(start + _XREF_CHUNK, size))).encode("latin-1"))
+            digest = hashlib.md5(f"{self.output_path}{now}{size}".encode("utf-8")).hexdigest()
+            self._write(f"trailer\n<< /ID [ <{digest}> <{digest}> ] /Info {info} 0 R /Root {catalog} 0 R "
+                        f"/Size {size} >>\nstartxref\n{xref_position}\n%%EOF\n".encode("latin-1"))
+        finally:
+            self._shutdown_deflate()
+            self._release_fonts()
+            self._file.close()
+            self._closed = True
+
+    def abort(self):
+        """出错时关闭并删除未写完的文件"""
+        if self._closed:
+            return
+        self._shutdown_deflate()
+        self._release_fonts()
+        self._file.close()
+        self._closed = True
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+
+class PageShardWriter(FastLabelWriter):
+    """
+    分片写入器：在工作进程中按预留的对象编号写出一段连续页面
+
+    不写文件头、字体和交叉引用表；文本按主进程的字体快照编码，
+    遇到快照中没有的字符（需要新的子集编码或替代字体）时抛出ValueError，由主进程改为单进程渲染。
+    """
+
+    def __init__(self, shard_path: str, page_size: Tuple[float, float], first_obj: int, fonts: Dict[str, Any]):
+        """
+        Args:
+            shard_path: 分片文件路径
+            page_size: 页面尺寸
+            first_obj: 第一个对象编号（主进程 reserve_objects 的返回值加上页偏移）
+            fonts: 主进程 font_snapshot 的返回值
+        """
+        self._open(shard_path, page_size, first_obj)
+        self._first_obj = first_obj
+        self.fontMapping.update(fonts["fontMapping"])
+        self._frozen_fonts = []
+        for font_name, (assignments, subsets, next_code, internal_name) in fonts["ttf"].items():
+            font = pdfmetrics.getFont(font_name)
+            state = font.state[self] = TTFont.State(font._asciiReadable)
+            state.assignments, state.subsets, state.nextCode = assignments, subsets, next_code
+            state.internalName = internal_name
+            state.frozen = 1
+            self._frozen_fonts.append(font)
+
+    def _internal_name(self, font) -> str:
+        name = self.fontMapping.get(font.fontName)
+        if name is None:
+            raise ValueError(f"字体 {font.fontName} 不在主进程的字体快照中")
+        return name
+
+    def finish(self) -> List[int]:
+        """
+        关闭分片文件
+
+        Returns:
+            各对象相对分片开头的偏移量（按对象编号顺序）
+        """
+        try:
+            self._flush_pages()
+            return [self._offsets[number] for number in range(self._first_obj, self._next_obj)]
+        finally:
+            self._shutdown_deflate()
+            self._release_fonts()
+            self._file.close()
+            self._closed = True
+
+    def _release_fonts(self):
+        for font in self._frozen_fonts:
+            font.state.pop(self, None)
+        self._frozen_fonts = []
+
+    def close(self):
+        self.finish()
+
+
+def box_label_page(style: str, page_size: Tuple[float, float], top_text: str, top_text_y: float,
+                   serial_number_y: float, ticket_count=None) -> Tuple[LabelLayout, Callable[[str], str]]:
+    """
+    盒标的版式和序列号字段文本（与渲染器 render_appearance_one/two 相同）
+
+    Returns:
+        (版式, 序列号 -> serial字段文本)
+    """
+    width, height = page_size
+    if style == "外观一":
+        return box_label_layout("外观一", width, None, top_text, top_text_y, serial_number_y), str
+    clean = text_processor.clean_text_for_font
+    layout = box_label_layout("外观二", width, height, top_text, top_text_y, serial_number_y, ticket_count)
+    return layout, lambda serial_number: f"Serial: {clean(str(serial_number))}"
+
+
+def write_box_label_file(output_path: str, page_size: Tuple[float, float], style: str, top_text: str,
+                         serial_numbers: Iterable[str], top_text_y: float, serial_number_y: float,
+                         ticket_count=None, chinese_name: str = "", title: str = "", subject: str = "",
+                         compress_workers: Optional[int] = None) -> int:
+    """
+    用快速引擎生成一个盒标文件（与模板的画布路径输出相同的页面）
+
+    Args:
+        output_path: 输出PDF路径
+        page_size: 页面尺寸
+        style: "外观一" 或 "外观二"
+        top_text: 标题（外观二为Game title）
+        serial_numbers: 每页的序列号，按页序
+        top_text_y, serial_number_y: 外观一标题和序列号的基线位置
+        ticket_count: 外观二的Ticket count
+        chinese_name: 中文名称，非空时第一页为空白首页
+        title, subject: 文档信息
+        compress_workers: 页面压缩线程数（见 FastLabelWriter）
+
+    Returns:
+        写入的页数
+    """
+    width, height = page_size
+    layout, serial_text = box_label_page(style, page_size, top_text, top_text_y, serial_number_y, ticket_count)
+    with FastLabelWriter(output_path, page_size, title=title, subject=subject,
+                         compress_workers=compress_workers) as writer:
+        if chinese_name:
+            writer.add_page(blank_page_layout(style, width, height, chinese_name))
+        for serial_number in serial_numbers:
+            writer.add_page(layout, {"serial": serial_text(serial_number)})
+        return writer.page_count
@@ -3,7 +3,8 @@ PDF生成器 - 重构版本
 使用委托模式将不同模板的逻辑分离到独立文件中
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional
+from src.pdf.label_manifest import export_manifest, iter_manifest
 from src.pdf.regular_box.template import RegularTemplate
 from src.pdf.split_box.template import SplitBoxTemplate
 # NestedBoxTemplate已移至_archived/nested_box（已弃用）
@@ -72,6 +73,29 @@ class PDFGenerator:
         """
         return self.split_box_template.create_multi_level_pdfs(data, params, output_dir, excel_file_path)
 
+    def iter_label_manifest(self, template_name: str, data: Dict[str, Any], params: Dict[str, Any],
+                            timestamp: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        仅计划模式：不渲染PDF，逐行生成每张标签的清单（级别、编号、序列号、数量、Carton No、目标文件、页码）
+
+        Args:
+            template_name: 'regular_box' 或 'split_box'
+            timestamp: 目标文件名中的时间戳，None时为通配符'*'
+        """
+        _get_template_class(template_name)
+        return iter_manifest(template_name, data, params, timestamp)
+
+    def export_label_manifest(self, template_name: str, data: Dict[str, Any], params: Dict[str, Any],
+                              output_path: str, fmt: Optional[str] = None, timestamp: Optional[str] = None) -> int:
+        """
+        仅计划模式：把标签清单流式写入CSV或NDJSON文件
+
+        Returns:
+            导出的标签行数
+        """
+        _get_template_class(template_name)
+        return export_manifest(template_name, data, params, output_path, fmt, timestamp)
+
     # def create_nested_box_multi_level_pdfs(self, data: Dict[str, Any], params: Dict[str, Any], output_dir: str, excel_file_path: str = None) -> Dict[str, str]:
     #     """
     #     已弃用 - nested_box模板已移至_archived
@@ -0,0 +1,285 @@
+"""
+标签版式预计算
+
+同一个文件内每页的坐标、行高、列宽和静态文本（标题、主题、备注及其换行结果）都相同，
+只有序列号、数量和Carton No随页变化。LabelLayout按（外观/标签模版、页面尺寸、字号、静态文本）
+计算一次并缓存，每页绘制时直接按字段名取坐标，不再重复计算位置和换行。
+
+常规模板和分盒模板的盒标外观、箱标表格版式相同，两个模板共用同一份版式。
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from reportlab.lib.colors import CMYKColor
+from reportlab.lib.units import mm
+
+from src.utils.font_manager import font_manager
+from src.utils.text_measurer import text_measurer
+from src.utils.text_processor import text_processor
+
+
+@dataclass(frozen=True)
+class TextSlot:
+    """一段文本的位置和字号（粗体）"""
+    x: float
+    y: float
+    font_size: float
+    centred: bool = True
+
+    def draw(self, c, text: str):
+        if self.centred:
+            c.drawCentredString(self.x, self.y, text)
+        else:
+            c.drawString(self.x, self.y, text)
+
+
+@dataclass(frozen=True)
+class LabelLayout:
+    """
+    一个文件内各页共用的版式
+
+    Attributes:
+        width, height: 页面尺寸
+        static_text: 每页相同的文本（已清理、已换行、已定位），按绘制顺序排列
+        fields: 每页变化的字段名 -> 位置和字号
+        rect: 表格外框 (x, y, 宽, 高)，无表格时为None
+        lines: 表格线 (x1, y1, x2, y2)
+        form_name: 静态部分保存为PDF表单时的名称，同一文件中静态内容相同的版式共用一个表单
+    """
+    width: float
+    height: float
+    static_text: Tuple[Tuple[TextSlot, str], ...]
+    fields: Dict[str, TextSlot] = field(default_factory=dict)
+    rect: Optional[Tuple[float, float, float, float]] = None
+    lines: Tuple[Tuple[float, float, float, float], ...] = ()
+    form_name: Optional[str] = None
+
+    def draw_static(self, c):
+        """绘制每页相同的部分：表格框线和静态文本"""
+        if self.rect is not None:
+            c.setStrokeColor(CMYKColor(0, 0, 0, 1))
+            c.setLineWidth(0.567)
+            c.rect(*self.rect)
+            for line in self.lines:
+                c.line(*line)
+
+        font_size = None
+        for slot, text in self.static_text:
+            if slot.font_size != font_size:
+                font_size = slot.font_size
+                font_manager.set_best_font(c, font_size, bold=True)
+            slot.draw(c, text)
+
+    def draw_field(self, c, name: str, text: str):
+        """在字段位置绘制本页的可变文本"""
+        slot = self.fields[name]
+        font_manager.set_best_font(c, slot.font_size, bold=True)
+        slot.draw(c, text)
+
+
+def _wrap(text: str, max_width: float, font_size: int):
+    """按中文字体（常规）宽度换行，与渲染器原有的换行方式一致"""
+    return text_processor.wrap_text_to_fit(None, text, max_width, font_manager.get_chinese_font_name(), font_size)
+
+
+@lru_cache(maxsize=64)
+def box_label_layout(appearance: str, width: float, height: float, top_text: str,
+                     top_text_y: float, serial_number_y: float, ticket_count=None) -> LabelLayout:
+    """
+    盒标版式（外观一/外观二）
+
+    Args:
+        appearance: "外观一" 或 "外观二"
+        width, height: 页面尺寸（外观一只用到宽度，高度可为None）
+        top_text: 标题（外观一为上部文本，外观二为Game title）
+        top_text_y, serial_number_y: 外观一标题和序列号的基线位置
+        ticket_count: 外观二的Ticket count
+
+    Returns:
+        LabelLayout，可变字段为 serial
+    """
+    clean_top_text = text_processor.clean_text_for_font(top_text)
+
+    if appearance != "外观二":
+        # 外观一：简洁标准样式，标题超宽时换行并缩小到18号
+        top_text_lines = _wrap(clean_top_text, width - 4 * mm, 22)
+        if len(top_text_lines) > 1:
+            line_height = 20  # 行间距
+            start_y = top_text_y + (len(top_text_lines) - 1) * line_height / 2
+            static_text = tuple((TextSlot(width / 2, start_y - i * line_height, 18), line)
+                                for i, line in enumerate(top_text_lines))
+        else:
+            static_text = ((TextSlot(width / 2, top_text_y, 22), top_text_lines[0]),)
+        return LabelLayout(width, height, static_text, {"serial": TextSlot(width / 2, serial_number_y, 22)})
+
+    # 外观二：精确的三行布局格式，统一左边距
+    left_margin = 4 * mm
+    game_title_y = height - 12 * mm  # 距离顶部12mm
+    max_title_width = width - 2 * left_margin  # 留出左右边距
+    title_prefix = "Game title: "
+    used_font = font_manager.get_chinese_font_name() or "Helvetica"
+    content_max_width = max_title_width - text_measurer.string_width(title_prefix, used_font, 12)
+
+    static_text = []
+    for i, line in enumerate(_wrap(clean_top_text, content_max_width, 12)):
+        current_y = game_title_y - i * 14  # 行间距14点
+        if i == 0:
+            # 第一行包含"Game title: "前缀，左对齐
+            static_text.append((TextSlot(left_margin, current_y, 12, centred=False), f"{title_prefix}{line}"))
+        else:
+            # 后续换行内容居中显示
+            center_x = (width - text_measurer.string_width(line, used_font, 12)) / 2
+            static_text.append((TextSlot(center_x, current_y, 12, centred=False), line))
+
+    # Ticket count: 距离底部15mm；Serial: 距离底部6mm
+    static_text.append((TextSlot(left_margin, 15 * mm, 12, centred=False), f"Ticket count: {ticket_count}"))
+    return LabelLayout(width, height, tuple(static_text), {"serial": TextSlot(left_margin, 6 * mm, 12, centred=False)})
+
+
+@lru_cache(maxsize=64)
+def blank_page_layout(appearance: str, width: float, height: float, chinese_name: str) -> LabelLayout:
+    """
+    盒标空白首页版式（只有中文名称，没有可变字段）
+
+    Args:
+        appearance: "外观一"（居中显示）或 "外观二"（与外观二相同的左对齐三行格式）
+        width, height: 页面尺寸
+        chinese_name: 中文名称
+
+    Returns:
+        LabelLayout，没有可变字段
+    """
+    clean_chinese_name = text_processor.clean_text_for_font(chinese_name)
+    current_font_name = font_manager.get_chinese_font_name()
+
+    if appearance != "外观二":
+        # 外观一：22号字体居中显示，超过页面宽度80%时按字符换行（适用于中文）
+        font_size = 22
+        center_x, center_y = width / 2, height / 2
+        max_width = width * 0.8
+        if text_measurer.string_width(clean_chinese_name, current_font_name, font_size) <= max_width:
+            return LabelLayout(width, height, ((TextSlot(center_x, center_y, font_size), clean_chinese_name),))
+
+        title_lines = text_measurer.wrap_chars(clean_chinese_name, max_width, current_font_name, font_size)
+        if len(title_lines) == 1:
+            return LabelLayout(width, height, ((TextSlot(center_x, center_y, font_size), title_lines[0]),))
+        # 多行：保持相同字体大小，行高为字体大小的1.2倍，整体垂直居中
+        line_height = font_size * 1.2
+        start_y = center_y + (len(title_lines) - 1) * line_height / 2
+        return LabelLayout(width, height, tuple((TextSlot(center_x, start_y - i * line_height, font_size), line)
+                                                for i, line in enumerate(title_lines)))
+
+    # 外观二：Game title距离顶部12mm，后续行按前缀宽度缩进；Ticket count和Serial留空
+    left_margin = 4 * mm
+    game_title_y = height - 12 * mm
+    title_prefix = "Game title: "
+    used_font = current_font_name or "Helvetica"
+    prefix_width = text_measurer.string_width(title_prefix, used_font, 12)
+    content_max_width = width - 2 * left_margin - prefix_width
+
+    static_text = []
+    for i, line in enumerate(_wrap(clean_chinese_name, content_max_width, 12)):
+        current_y = game_title_y - i * 14  # 行间距14点
+        if i == 0:
+            static_text.append((TextSlot(left_margin, current_y, 12, centred=False), f"{title_prefix}{line}"))
+        else:
+            static_text.append((TextSlot(left_margin + prefix_width, current_y, 12, centred=False), line))
+    static_text.append((TextSlot(left_margin, 15 * mm, 12, centred=False), "Ticket count:"))
+    static_text.append((TextSlot(left_margin, 6 * mm, 12, centred=False), "Serial:"))
+    return LabelLayout(width, height, tuple(static_text))
+
+
+@lru_cache(maxsize=64)
+def box_table_layout(width: float, height: float, theme_text: str, remark_text: str, paper_card: bool = True,
+                     serial_font_size: int = 10, row_units: Optional[int] = None) -> LabelLayout:
+    """
+    箱标表格版式（小箱标/大箱标/箱标）
+
+    有纸卡备注：5行 (Item: Paper Cards, Theme, Quantity, Carton No, Remark)
+    无纸卡备注：4行 (Item: 主题, Quantity, Carton No, Remark)
+    Quantity行为双倍高度，上层显示数量，下层显示序列号范围
+
+    Args:
+        width, height: 页面尺寸
+        theme_text: 主题
+        remark_text: 备注
+        paper_card: 是否为有纸卡备注模版
+        serial_font_size: 序列号范围的字体大小
+        row_units: 表格高度等分的份数，None时按行数计算（Quantity行占2份）
+
+    Returns:
+        LabelLayout，可变字段为 quantity、serial_range、carton_no
+    """
+    # 表格尺寸和位置 - 上下左右各5mm边距
+    table_width = width - 10 * mm
+    table_height = height - 10 * mm
+    table_x = 5 * mm
+    table_y = 5 * mm
+
+    # 从底部开始：Remark, Carton No, Quantity(双倍), [Theme,] Item
+    total_rows = 5 if paper_card else 4
+    base_row_height = table_height / (row_units or total_rows + 1)
+    quantity_row_height = base_row_height * 2  # Quantity行双倍高度
+    row_positions = []
+    current_y = table_y
+    for height_val in [base_row_height, base_row_height, quantity_row_height] + [base_row_height] * (total_rows - 3):
+        row_positions.append(current_y)
+        current_y += height_val
+
+    # 列宽 (标签列:数据列 = 1:2)
+    label_col_width = table_width / 3
+    data_col_width = table_width * 2 / 3
+    col_x = table_x + label_col_width
+
+    # 行线、列线、Quantity行的分隔线（上层和下层之间）
+    lines = [(table_x, y, table_x + table_width, y) for y in row_positions[1:total_rows]]
+    lines.append((col_x, table_y, col_x, table_y + table_height))
+    quantity_split_y = row_positions[2] + quantity_row_height / 2
+    lines.append((col_x, quantity_split_y, table_x + table_width, quantity_split_y))
+
+    # 居中位置；文字垂直居中使用固定10号字体的偏移量
+    label_center_x = table_x + label_col_width / 2
+    data_center_x = col_x + data_col_width / 2
+    text_offset = 10 / 3
+
+    def cell(x, row_y, row_height):
+        return TextSlot(x, row_y + row_height / 2 - text_offset, 10)
+
+    # 主题所在行：有纸卡备注时为Theme行（Item行显示"Paper Cards"），否则为Item行
+    theme_row = 3
+    static_text = [(cell(label_center_x, row_positions[total_rows - 1], base_row_height), "Item:")]
+    if paper_card:
+        static_text.append((cell(data_center_x, row_positions[total_rows - 1], base_row_height), "Paper Cards"))
+        static_text.append((cell(label_center_x, row_positions[theme_row], base_row_height), "Theme:"))
+
+    theme_lines = _wrap(text_processor.clean_text_for_font(theme_text), data_col_width - 4 * mm, 10)
+    cell_center_y = row_positions[theme_row] + base_row_height / 2
+    if len(theme_lines) > 1:
+        # 多行：8号字体，整个文本块垂直居中
+        line_height = 10
+        start_y = cell_center_y + (len(theme_lines) - 1) * line_height / 2 - 8 / 3
+        static_text.extend((TextSlot(data_center_x, start_y - i * line_height, 8), line)
+                           for i, line in enumerate(theme_lines))
+    else:
+        static_text.append((cell(data_center_x, row_positions[theme_row], base_row_height), theme_lines[0]))
+
+    static_text.append((cell(label_center_x, row_positions[2], quantity_row_height), "Quantity:"))
+    static_text.append((cell(label_center_x, row_positions[1], base_row_height), "Carton No:"))
+    static_text.append((cell(label_center_x, row_positions[0], base_row_height), "Remark:"))
+    static_text.append((cell(data_center_x, row_positions[0], base_row_height),
+                        text_processor.clean_text_for_font(remark_text)))
+
+    fields = {
+        # 上层：票数（在分隔线上方居中）；下层：序列号范围（在分隔线下方居中）
+        "quantity": TextSlot(data_center_x, row_positions[2] + quantity_row_height * 3 / 4 - text_offset, 10),
+        "serial_range": TextSlot(data_center_x, row_positions[2] + quantity_row_height / 4 - text_offset,
+                                 serial_font_size),
+        "carton_no": cell(data_center_x, row_positions[1], base_row_height),
+    }
+    key = repr((paper_card, row_units, width, height, theme_text, remark_text))
+    return LabelLayout(width, height, tuple(static_text), fields,
+                       rect=(table_x, table_y, table_width, table_height), lines=tuple(lines),
+                       form_name=f"BoxTable{hashlib.md5(key.encode('utf-8')).hexdigest()[:16]}")
@@ -0,0 +1,86 @@
+"""
+任务内标签级别并行生成
+同一任务的盒标、小箱标、大箱标（箱标）和外箱汇总表是互相独立的输出文件，
+这里把它们交给进程池同时生成，任务耗时取决于最大的一级而不是各级之和。
+级别进程数为1时在当前进程中依次生成（与原流程相同）。
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.carton_summary_generator import generate_carton_summary_for_template
+
+
+# 默认最多同时生成的级别数（每级一个进程）
+MAX_LEVEL_WORKERS = 4
+
+
+def render_level(render: Callable, output_path: str, *args) -> str:
+    """
+    生成一级标签文件
+
+    Args:
+        render: 模板的生成方法（如 template._create_small_box_label），在工作进程中调用
+        output_path: 该级标签的输出路径
+        args: 传给生成方法的参数
+
+    Returns:
+        输出路径
+    """
+    render(*args)
+    return output_path
+
+
+def render_carton_summary(**kwargs) -> Optional[str]:
+    """
+    生成外箱汇总表（失败不影响主流程）
+
+    Returns:
+        汇总表路径，失败时为None
+    """
+    try:
+        summary_file_path = generate_carton_summary_for_template(**kwargs)
+        print(f"✅ 外箱汇总表已生成: {summary_file_path}")
+        return summary_file_path
+    except Exception as e:
+        print(f"⚠️ 外箱汇总表生成失败: {e}")
+        return None
+
+
+def default_level_workers(level_count: int) -> int:
+    """默认级别进程数：min(级别数, 4, CPU核数)"""
+    return max(1, min(level_count, MAX_LEVEL_WORKERS, os.cpu_count() or 1))
+
+
+def run_label_levels(levels: List[Tuple[str, Callable, tuple, Dict[str, Any]]],
+                     max_workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    生成一个任务的各级标签
+
+    Args:
+        levels: [(级别名称, 生成函数, 位置参数, 关键字参数)]，生成函数返回文件路径（None表示未生成），
+                需可序列化（模块级函数或模板实例的方法）
+        max_workers: 级别进程数，None表示min(级别数, 4, CPU核数)，1为在当前进程中依次生成
+
+    Returns:
+        {级别名称: 文件路径}，按levels的顺序排列（与逐级生成的generated_files相同）
+    """
+    max_workers = max_workers or default_level_workers(len(levels))
+    generated_files = {}
+
+    if max_workers <= 1 or len(levels) <= 1:
+        for name, func, args, kwargs in levels:
+            path = func(*args, **kwargs)
+            if path is not None:
+                generated_files[name] = path
+        return generated_files
+
+    print(f"⚡ 并行生成{len(levels)}个标签级别 (进程数: {min(max_workers, len(levels))})")
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(levels))) as pool:
+        futures = [(name, pool.submit(func, *args, **kwargs)) for name, func, args, kwargs in levels]
+        for name, future in futures:
+            path = future.result()
+            if path is not None:
+                generated_files[name] = path
+    return generated_files
@@ -0,0 +1,165 @@
+"""
+标签清单导出（仅计划，不渲染）
+
+不调用reportlab，直接从任务的标签计划逐行生成清单：每张标签一行，
+包含级别、编号、序列号（或序列号范围）、数量、Carton No、目标文件和页码。
+清单用于导入WMS和比对任务；导出全程是生成器，百万张标签也只占用常量内存。
+"""
+
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+from src.pdf.label_plan import build_label_plan, first_label_page
+from src.pdf.plan_validation import validate_label_plan
+from src.utils.filename_utils import clean_for_filename
+
+
+# 清单列（CSV表头顺序）
+MANIFEST_FIELDS = ('level', 'index', 'serial', 'quantity', 'carton_no', 'file', 'page')
+
+# 按后缀识别的清单格式
+MANIFEST_FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+# 各级别的文件名标记（与模板生成的文件名一致）
+_FILE_TAGS = {
+    'regular_box': {'盒标': '盒标_{appearance}', '小箱标': '小箱标', '大箱标': '大箱标', '箱标': '箱标'},
+    'split_box': {'盒标': '分盒盒标', '小箱标': '分盒小箱标', '大箱标': '分盒大箱标', '箱标': '分盒箱标'},
+}
+
+
+def label_file_names(template: str, data: Dict[str, Any], params: Dict[str, Any],
+                     timestamp: Optional[str] = None) -> Dict[str, str]:
+    """
+    各级标签PDF相对于输出目录的路径（与create_multi_level_pdfs生成的文件名一致）
+
+    Args:
+        template: 'regular_box' 或 'split_box'
+        data: 六字段标准数据
+        params: 包装参数
+        timestamp: 文件名中的时间戳（YYYYmmdd_HHMMSS），None时为通配符'*'
+
+    Returns:
+        {级别名称: '文件夹/文件名.pdf'}
+    """
+    customer_code = clean_for_filename(data['客户名称编码'])
+    english_name = clean_for_filename(data['标签名称'])
+    chinese_name = clean_for_filename(params.get('中文名称', ''))
+    folder_name = f"{customer_code}+{english_name}+{chinese_name}+标签"
+    tags = _FILE_TAGS[template]
+    appearance = params.get('选择外观', '外观一')
+    return {
+        level: f"{folder_name}/{customer_code}_{chinese_name}_{english_name}_"
+               f"{tag.format(appearance=appearance)}_{timestamp or '*'}.pdf"
+        for level, tag in tags.items()
+    }
+
+
+def iter_manifest(template: str, data: Dict[str, Any], params: Dict[str, Any],
+                  timestamp: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    逐行生成任务的标签清单（顺序与生成的PDF一致：盒标、小箱标、大箱标/箱标）
+
+    Args:
+        template: 'regular_box' 或 'split_box'
+        data: 六字段标准数据
+        params: 包装参数
+        timestamp: 目标文件名中的时间戳，None时为通配符'*'
+
+    Yields:
+        {'level', 'index', 'serial', 'quantity', 'carton_no', 'file', 'page'}，
+        盒标的quantity和carton_no为None
+
+    Raises:
+        ValueError: 严格校验时标签计划校验失败（与生成PDF时相同）
+    """
+    plan = build_label_plan(template, data, params)
+    validate_label_plan(plan, params.get('严格校验', False))
+    files = label_file_names(template, data, params, timestamp)
+
+    for level, level_plan in plan.levels.items():
+        if level == '盒标' and not params.get('是否有盒标', False):
+            continue
+        page_offset = first_label_page(level, params) - 1
+        for row in level_plan.iter_rows():
+            yield {
+                'level': level,
+                'index': row['index'],
+                'serial': row['serial'],
+                'quantity': row['quantity'],
+                'carton_no': row['carton_no'],
+                'file': files[level],
+                'page': row['index'] + page_offset,
+            }
+
+
+def iter_manifest_lines(rows: Iterable[Dict[str, Any]], fmt: str = 'csv',
+                        fields: Sequence[str] = MANIFEST_FIELDS) -> Iterator[str]:
+    """
+    把清单行逐行转换为CSV或NDJSON文本（CSV第一行为表头）
+
+    Args:
+        rows: iter_manifest生成的行
+        fmt: 'csv' 或 'ndjson'
+        fields: 输出的列
+
+    Yields:
+        以换行结尾的文本行
+    """
+    if fmt == 'ndjson':
+        for row in rows:
+            yield json.dumps({field: row.get(field) for field in fields}, ensure_ascii=False) + "\n"
+        return
+    if fmt != 'csv':
+        raise ValueError(f"不支持的清单格式: {fmt}，可选: csv, ndjson")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def line(values) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(values)
+        return buffer.getvalue()
+
+    yield line(fields)
+    for row in rows:
+        yield line(['' if row.get(field) is None else row.get(field) for field in fields])
+
+
+def export_manifest(template: str, data: Dict[str, Any], params: Dict[str, Any], output_path: str,
+                    fmt: Optional[str] = None, timestamp: Optional[str] = None) -> int:
+    """
+    导出任务的标签清单文件（流式写入）
+
+    Args:
+        template: 'regular_box' 或 'split_box'
+        data: 六字段标准数据
+        params: 包装参数
+        output_path: 清单文件路径
+        fmt: 'csv' 或 'ndjson'，None时按文件后缀识别
+        timestamp: 目标文件名中的时间戳
+
+    Returns:
+        导出的标签行数
+    """
+    fmt = fmt or MANIFEST_FORMATS.get(Path(output_path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"无法从文件名识别清单格式: {output_path}，请使用 .csv/.ndjson/.jsonl")
+
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    # CSV使用utf-8-sig，Excel打开时中文不乱码
+    encoding = 'utf-8-sig' if fmt == 'csv' else 'utf-8'
+    with open(output_path, 'w', encoding=encoding, newline='') as f:
+        f.writelines(iter_manifest_lines(counted(iter_manifest(template, data, params, timestamp)), fmt))
+    print(f"✅ 标签清单已导出: {output_path}（{count}行）")
+    return count
@@ -0,0 +1,469 @@
+"""
+标签计划（LabelPlan）
+
+一次性用NumPy数组计算整个任务每一级标签的内容：盒标序列号、
+小箱/大箱的起止盒号、实际数量、Carton No和序列号范围。
+计算规则与常规/分盒模板的数据处理器逐一对应，渲染时只需按行读取。
+
+常规模板支持逐箱容量（小箱容量/大箱容量列表），装箱关系保存在前缀和索引中，
+盒→箱、箱→盒号范围的查询在百万盒规模下也只需二分查找。
+"""
+
+import math
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.data.job_records import parse_capacity_list
+from src.utils.serial_formatter import SerialScheme, get_serial_scheme
+
+
+# Carton No格式：'fraction' → "a/b"，'pair' → "a-b"，'padded' → "01"，'single' → "a"，'none' → None
+CARTON_STYLES = ('fraction', 'pair', 'padded', 'single', 'none')
+
+# 模板未提供开始号时使用的默认值（与模板中的默认值一致）
+_DEFAULT_BASE_NUMBERS = {
+    ('regular_box', '盒标'): 'DSK00001',
+}
+_FALLBACK_BASE_NUMBER = 'DEFAULT01001'
+
+
+def _base_number(template: str, level: str, base_number: Optional[str]) -> str:
+    return base_number or _DEFAULT_BASE_NUMBERS.get((template, level), _FALLBACK_BASE_NUMBER)
+
+
+class CartonIndex:
+    """
+    逐箱容量的前缀和索引
+
+    ends[i]为前i+1箱的累计容量，starts[i]为第i+1箱的第一个单位（1-based）。
+    单位→箱号用二分查找（O(log n)），箱号→单位范围直接读取（O(1)）。
+    """
+
+    def __init__(self, capacities: np.ndarray):
+        """
+        Args:
+            capacities: 每箱容量（int64数组）
+        """
+        self.capacities = capacities
+        self.ends = np.cumsum(capacities)
+        self.starts = self.ends - capacities + 1
+
+    @classmethod
+    def build(cls, pattern: Sequence[int], total_units: int) -> 'CartonIndex':
+        """
+        按容量列表依次装箱，列表用完后从头循环，最后一箱装余数
+
+        Args:
+            pattern: 容量列表（如 [10, 10, 8] 表示每三箱中有一个短箱）
+            total_units: 需要装箱的总单位数（盒数或小箱数）
+        """
+        pattern = np.asarray(pattern, dtype=np.int64)
+        if len(pattern) == 0 or (pattern <= 0).any():
+            raise ValueError(f"箱容量必须为正整数: {pattern.tolist()}")
+        repeats = -(-total_units // int(pattern.sum()))
+        capacities = np.tile(pattern, repeats)
+        ends = np.cumsum(capacities)
+        count = int(np.searchsorted(ends, total_units)) + 1
+        capacities = capacities[:count].copy()
+        capacities[-1] -= int(ends[count - 1]) - total_units
+        return cls(capacities)
+
+    def __len__(self) -> int:
+        return len(self.capacities)
+
+    def carton_of(self, unit: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """单位（1-based）所在的箱号（1-based）"""
+        cartons = np.searchsorted(self.ends, unit) + 1
+        return int(cartons) if np.ndim(cartons) == 0 else cartons
+
+    def unit_range(self, carton: int) -> Tuple[int, int]:
+        """箱内的单位范围（1-based，含首尾）"""
+        return int(self.starts[carton - 1]), int(self.ends[carton - 1])
+
+
+class LevelPlan:
+    """
+    单个标签级别的列式计划
+
+    每个标签一行，所有列都是长度为count的int64数组：
+        start_box / end_box: 该标签计入数量的盒号范围（1-based，空标签end_box = start_box - 1）
+        first_main / first_sub, last_main / last_sub: 首尾序列号（主号偏移、副号），
+            盒标首尾相同；无副号时sub为None
+        quantity: 实际张数（盒标为None）
+        carton_a / carton_b: Carton No的两个数字，按carton_style格式化
+    serial_group为副号进位阈值（盒号 = 主号偏移 × serial_group + 副号），无副号时为None（盒号 = 主号偏移 + 1）
+    """
+
+    def __init__(self, name: str, scheme: SerialScheme, start_box: np.ndarray, end_box: np.ndarray,
+                 first_main: np.ndarray, first_sub: Optional[np.ndarray],
+                 last_main: Optional[np.ndarray] = None, last_sub: Optional[np.ndarray] = None,
+                 quantity: Optional[np.ndarray] = None, carton_a: Optional[np.ndarray] = None,
+                 carton_b: Optional[np.ndarray] = None, carton_style: str = 'none',
+                 serial_group: Optional[int] = None):
+        if carton_style not in CARTON_STYLES:
+            raise ValueError(f"未知的Carton No格式: {carton_style}")
+        self.name = name
+        self.scheme = scheme
+        self.start_box = start_box
+        self.end_box = end_box
+        self.first_main = first_main
+        self.first_sub = first_sub
+        # 盒标的首尾序列号相同，直接共用数组
+        self.last_main = first_main if last_main is None else last_main
+        self.last_sub = first_sub if last_main is None else last_sub
+        self.quantity = quantity
+        self.carton_a = carton_a
+        self.carton_b = carton_b
+        self.carton_style = carton_style
+        self.serial_group = serial_group
+
+    @property
+    def is_range(self) -> bool:
+        """是否为序列号范围（小箱标/大箱标）"""
+        return self.quantity is not None
+
+    def __len__(self) -> int:
+        return len(self.first_main)
+
+    def _serial(self, main: int, sub: Optional[int]) -> str:
+        return self.scheme.format(main) if sub is None else self.scheme.format_sub(main, sub)
+
+    def _carton(self, a: int, b: int) -> Optional[str]:
+        style = self.carton_style
+        if style == 'fraction':
+            return f"{a}/{b}"
+        if style == 'pair':
+            return f"{a}-{b}"
+        if style == 'padded':
+            return f"{a:02d}"
+        if style == 'single':
+            return str(a)
+        return None
+
+    def iter_rows(self, start: int = 0, stop: Optional[int] = None, chunk_size: int = 4096) -> Iterator[Dict[str, Any]]:
+        """
+        按行读取标签内容（分块转换为Python整数，避免逐个访问numpy标量）
+
+        Args:
+            start: 起始行（0-based）
+            stop: 结束行（不含），None表示到最后
+
+        Yields:
+            {'index': 标签编号(1-based), 'serial': 序列号或序列号范围文本,
+             'quantity': 实际张数(盒标为None), 'carton_no': Carton No文本}
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for chunk_start in range(start, stop, chunk_size):
+            chunk = slice(chunk_start, min(chunk_start + chunk_size, stop))
+            columns = [self.first_main[chunk].tolist(),
+                       self.first_sub[chunk].tolist() if self.first_sub is not None else None,
+                       self.last_main[chunk].tolist(),
+                       self.last_sub[chunk].tolist() if self.last_sub is not None else None,
+                       self.quantity[chunk].tolist() if self.quantity is not None else None,
+                       self.carton_a[chunk].tolist() if self.carton_a is not None else None,
+                       self.carton_b[chunk].tolist() if self.carton_b is not None else None]
+            first_main, first_sub, last_main, last_sub, quantity, carton_a, carton_b = columns
+            for offset in range(chunk.stop - chunk.start):
+                first = self._serial(first_main[offset], first_sub[offset] if first_sub is not None else None)
+                if self.is_range:
+                    last = self._serial(last_main[offset], last_sub[offset] if last_sub is not None else None)
+                    serial = f"{first}-{last}"
+                else:
+                    serial = first
+                yield {
+                    'index': chunk.start + offset + 1,
+                    'serial': serial,
+                    'quantity': quantity[offset] if quantity is not None else None,
+                    'carton_no': self._carton(carton_a[offset], carton_b[offset]) if carton_a is not None else None,
+                }
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """读取单个标签（index为0-based行号）"""
+        if not 0 <= index < len(self):
+            raise IndexError(f"{self.name}共{len(self)}张，没有第{index + 1}张")
+        return next(self.iter_rows(index, index + 1))
+
+
+class LabelPlan:
+    """
+    整个任务的标签计划：{级别名称: LevelPlan}，级别名称与generated_files的键一致
+
+    常规模板的计划另有装箱索引packing：小箱标/箱标为盒→箱的索引，大箱标为小箱→大箱的索引
+    """
+
+    def __init__(self, template: str, total_pieces: int, pieces_per_box: int, total_boxes: int,
+                 levels: Dict[str, LevelPlan], packing: Optional[Dict[str, CartonIndex]] = None):
+        self.template = template
+        self.total_pieces = total_pieces
+        self.pieces_per_box = pieces_per_box
+        self.total_boxes = total_boxes
+        self.levels = levels
+        self.packing = packing or {}
+
+    def level(self, name: str) -> LevelPlan:
+        """获取指定级别的计划"""
+        if name not in self.levels:
+            raise KeyError(f"标签计划中没有'{name}'，可用级别: {', '.join(self.levels)}")
+        return self.levels[name]
+
+    def counts(self) -> Dict[str, int]:
+        """各级别标签数量"""
+        return {name: len(level) for name, level in self.levels.items()}
+
+    def _packing_index(self, level: str) -> CartonIndex:
+        if level not in self.packing:
+            raise KeyError(f"标签计划中没有'{level}'的装箱索引")
+        return self.packing[level]
+
+    def carton_for_box(self, level: str, box_num: int) -> int:
+        """盒所在的箱号（O(log n)）"""
+        if level == '大箱标':
+            return self._packing_index('大箱标').carton_of(self._packing_index('小箱标').carton_of(box_num))
+        return self._packing_index(level).carton_of(box_num)
+
+    def box_range(self, level: str, carton_num: int) -> Tuple[int, int]:
+        """箱内的盒号范围（1-based，含首尾）"""
+        if level == '大箱标':
+            first_small, last_small = self._packing_index('大箱标').unit_range(carton_num)
+            small_index = self._packing_index('小箱标')
+            return small_index.unit_range(first_small)[0], small_index.unit_range(last_small)[1]
+        return self._packing_index(level).unit_range(carton_num)
+
+
+# ========== 计划构建 ==========
+
+def _numbers(count: int) -> np.ndarray:
+    """1..count 的编号数组"""
+    return np.arange(1, count + 1, dtype=np.int64)
+
+
+def _group_serials(box: np.ndarray, group_size: int):
+    """
+    带副号的序列号：副号满group_size进一
+    套盒规则group_size = 盒/套（主号偏移 = 套号-1，副号 = 套内盒号），传统分盒规则为副号进位阈值
+    """
+    index = box - 1
+    return index // group_size, index % group_size + 1
+
+
+def _build_regular_plan(base_number: Optional[str], total_pieces: int, pieces_per_box: int,
+                        boxes_per_small_box: int, small_boxes_per_large_box: int, has_small_box: bool,
+                        small_box_capacities: Optional[Tuple[int, ...]] = None,
+                        large_box_capacities: Optional[Tuple[int, ...]] = None) -> LabelPlan:
+    """常规模板：序列号线性递增，各级按容量列表装箱（未指定列表时为均匀装箱）"""
+    total_boxes = math.ceil(total_pieces / pieces_per_box)
+    box = _numbers(total_boxes)
+    levels = {'盒标': LevelPlan('盒标', get_serial_scheme(_base_number('regular_box', '盒标', base_number), 'regular'),
+                               box, box, box - 1, None)}
+    scheme = get_serial_scheme(_base_number('regular_box', '小箱标', base_number), 'regular')
+
+    def carton_level(name: str, start: np.ndarray, end: np.ndarray) -> LevelPlan:
+        total = len(start)
+        return LevelPlan(name, scheme, start, end, start - 1, None, end - 1, None,
+                         quantity=(end - start + 1) * pieces_per_box,
+                         carton_a=_numbers(total), carton_b=np.full(total, total, dtype=np.int64),
+                         carton_style='fraction')
+
+    # 无小箱时"盒/小箱"存储的是盒/箱，小箱容量即每箱盒数
+    small_index = CartonIndex.build(small_box_capacities or (boxes_per_small_box,), total_boxes)
+    if has_small_box:
+        large_index = CartonIndex.build(large_box_capacities or (small_boxes_per_large_box,), len(small_index))
+        levels['小箱标'] = carton_level('小箱标', small_index.starts, small_index.ends)
+        levels['大箱标'] = carton_level('大箱标', small_index.starts[large_index.starts - 1],
+                                       small_index.ends[large_index.ends - 1])
+        packing = {'小箱标': small_index, '大箱标': large_index}
+    else:
+        levels['箱标'] = carton_level('箱标', small_index.starts, small_index.ends)
+        packing = {'箱标': small_index}
+    return LabelPlan('regular_box', total_pieces, pieces_per_box, total_boxes, levels, packing)
+
+
+def _split_carton_text(number: np.ndarray, ratio: float, total_sets: int):
+    """分盒大箱标Carton No（与calculate_carton_range_for_large_box一致）"""
+    if ratio > 1:
+        per_set = math.ceil(ratio)
+        return (number - 1) // per_set + 1, (number - 1) % per_set + 1, 'pair'
+    if ratio == 1:
+        return number, number, 'single'
+    sets_per_carton = math.ceil(1 / ratio)
+    start_set = (number - 1) * sets_per_carton + 1
+    return start_set, np.minimum(start_set + sets_per_carton - 1, total_sets), 'pair'
+
+
+def _split_large_level(name: str, scheme: SerialScheme, total_boxes: int, pieces_per_box: int,
+                       boxes_per_set: int, boxes_per_large_box: int, total_large_boxes: int,
+                       carton_ratio: float, total_sets: int) -> LevelPlan:
+    """
+    分盒大箱标/箱标（与generate_set_based_large_box_serial_range、generate_split_large_box_serial_range、
+    calculate_actual_quantity_for_large_box一致）
+    """
+    number = _numbers(total_large_boxes)
+    if boxes_per_set > 1 and boxes_per_large_box < boxes_per_set:
+        # 一套分多箱：序列号和数量都按套内盒号计算
+        per_set = math.ceil(boxes_per_set / boxes_per_large_box)
+        set_index = (number - 1) // per_set
+        start_in_set = ((number - 1) % per_set) * boxes_per_large_box + 1
+        end_in_set = np.minimum(start_in_set + boxes_per_large_box - 1, boxes_per_set)
+        set_start = set_index * boxes_per_set + 1
+        boxes_in_set = np.minimum(set_start + boxes_per_set - 1, total_boxes) - set_start + 1
+        end_in_set = np.where(boxes_in_set < boxes_per_set, np.minimum(end_in_set, boxes_in_set), end_in_set)
+        first_main, first_sub = set_index, start_in_set
+        last_main, last_sub = set_index, end_in_set
+        serial_group = boxes_per_set
+        empty = (set_start > total_boxes) | (start_in_set > boxes_in_set)
+        start = set_index * boxes_per_set + start_in_set
+        end = np.where(empty, start - 1, set_index * boxes_per_set + end_in_set)
+    else:
+        start = (number - 1) * boxes_per_large_box + 1
+        end = np.minimum(start + boxes_per_large_box - 1, total_boxes)
+        serial_group = boxes_per_set if boxes_per_set > 1 else boxes_per_large_box
+        first_main, first_sub = _group_serials(start, serial_group)
+        last_main, last_sub = _group_serials(end, serial_group)
+        end = np.where(start > total_boxes, start - 1, end)
+
+    carton_a, carton_b, carton_style = _split_carton_text(number, carton_ratio, total_sets)
+    return LevelPlan(name, scheme, start, end, first_main, first_sub, last_main, last_sub,
+                     quantity=(end - start + 1) * pieces_per_box,
+                     carton_a=carton_a, carton_b=carton_b, carton_style=carton_style,
+                     serial_group=serial_group)
+
+
+def _build_split_plan(base_number: Optional[str], total_pieces: int, pieces_per_box: int,
+                      boxes_per_small_box: int, small_boxes_per_large_box: int,
+                      has_small_box: bool, boxes_per_set: int) -> LabelPlan:
+    """分盒模板：盒标按套编号，小箱/大箱按套盒或传统分盒规则"""
+    total_boxes = math.ceil(total_pieces / pieces_per_box)
+    total_sets = math.ceil(total_boxes / boxes_per_set)
+    scheme = get_serial_scheme(_base_number('split_box', '盒标', base_number), 'split')
+
+    box = _numbers(total_boxes)
+    box_main, box_sub = _group_serials(box, boxes_per_set)
+    levels = {'盒标': LevelPlan('盒标', scheme, box, box, box_main, box_sub, serial_group=boxes_per_set)}
+
+    if has_small_box:
+        # 数量计算与_create_three_level_pdfs一致：按套数计算小箱数和大箱数
+        small_boxes_per_set_ratio = boxes_per_set / boxes_per_small_box
+        actual_small_boxes_per_set = math.ceil(small_boxes_per_set_ratio)
+        large_boxes_per_set_ratio = actual_small_boxes_per_set / small_boxes_per_large_box
+        total_small_boxes = total_sets * actual_small_boxes_per_set
+        if large_boxes_per_set_ratio >= 1:
+            total_large_boxes = total_sets * math.ceil(large_boxes_per_set_ratio)
+        else:
+            total_large_boxes = math.ceil(total_sets / math.ceil(1 / large_boxes_per_set_ratio))
+
+        # 小箱标（与generate_set_based_small_box_serial_range、generate_split_small_box_serial_range、
+        # calculate_actual_quantity_for_small_box、calculate_carton_number_for_small_box一致）
+        number = _numbers(total_small_boxes)
+        start = (number - 1) * boxes_per_small_box + 1
+        end = np.minimum(start + boxes_per_small_box - 1, total_boxes)
+        if boxes_per_set > 1 and boxes_per_small_box < boxes_per_set:
+            # 一套分多小箱：序列号在套内显示
+            per_set = math.ceil(boxes_per_set / boxes_per_small_box)
+            set_index = (number - 1) // per_set
+            start_in_set = ((number - 1) % per_set) * boxes_per_small_box + 1
+            first_main, first_sub = set_index, start_in_set
+            last_main, last_sub = set_index, np.minimum(start_in_set + boxes_per_small_box - 1, boxes_per_set)
+            serial_group = boxes_per_set
+        else:
+            serial_group = boxes_per_set if boxes_per_set > 1 else boxes_per_small_box * small_boxes_per_large_box
+            first_main, first_sub = _group_serials(start, serial_group)
+            last_main, last_sub = _group_serials(end, serial_group)
+        end = np.where(start > total_boxes, start - 1, end)
+
+        if small_boxes_per_set_ratio > 1:
+            carton_a = (number - 1) // actual_small_boxes_per_set + 1
+            carton_b = (number - 1) % actual_small_boxes_per_set + 1
+            carton_style = 'pair'
+        else:
+            carton_a, carton_b = number, number
+            carton_style = 'padded' if small_boxes_per_set_ratio == 1 else 'none'
+        levels['小箱标'] = LevelPlan('小箱标', scheme, start, end, first_main, first_sub, last_main, last_sub,
+                                    quantity=(end - start + 1) * pieces_per_box,
+                                    carton_a=carton_a, carton_b=carton_b, carton_style=carton_style,
+                                    serial_group=serial_group)
+
+        levels['大箱标'] = _split_large_level(
+            '大箱标', scheme, total_boxes, pieces_per_box, boxes_per_set,
+            boxes_per_small_box * small_boxes_per_large_box, total_large_boxes,
+            large_boxes_per_set_ratio, total_sets
+        )
+    else:
+        # 无小箱时"盒/小箱"存储的是盒/箱
+        boxes_per_large_box = boxes_per_small_box
+        large_boxes_per_set_ratio = boxes_per_set / boxes_per_large_box
+        if large_boxes_per_set_ratio >= 1:
+            total_large_boxes = total_sets * math.ceil(large_boxes_per_set_ratio)
+        else:
+            total_large_boxes = math.ceil(total_sets / math.ceil(1 / large_boxes_per_set_ratio))
+        levels['箱标'] = _split_large_level(
+            '箱标', scheme, total_boxes, pieces_per_box, boxes_per_set,
+            boxes_per_large_box, total_large_boxes, large_boxes_per_set_ratio, total_sets
+        )
+    return LabelPlan('split_box', total_pieces, pieces_per_box, total_boxes, levels)
+
+
+def first_label_page(level: str, params: Optional[Dict[str, Any]] = None) -> int:
+    """
+    标签PDF中第一个标签所在的页码
+
+    箱标文件第一页为空箱标签；盒标文件在外观一/外观二且填写中文名称时有一页空白首页
+
+    Args:
+        level: 级别名称（与generated_files的键一致）
+        params: 包装参数（盒标需要 选择外观/中文名称）
+
+    Returns:
+        页码（从1开始），第n个标签位于 first_label_page + n - 1
+    """
+    if level != '盒标':
+        return 2
+    params = params or {}
+    style = params.get('选择外观', '外观一')
+    return 2 if style in ('外观一', '外观二') and str(params.get('中文名称') or '').strip() else 1
+
+
+@lru_cache(maxsize=8)
+def _cached_plan(template: str, base_number: Optional[str], total_pieces: int, pieces_per_box: int,
+                 boxes_per_small_box: int, small_boxes_per_large_box: int, has_small_box: bool,
+                 boxes_per_set: int, small_box_capacities: Optional[Tuple[int, ...]],
+                 large_box_capacities: Optional[Tuple[int, ...]]) -> LabelPlan:
+    if template == 'split_box':
+        if small_box_capacities or large_box_capacities:
+            raise ValueError("分盒模板按盒/套装箱，不支持逐箱容量（小箱容量/大箱容量）")
+        return _build_split_plan(base_number, total_pieces, pieces_per_box, boxes_per_small_box,
+                                 small_boxes_per_large_box, has_small_box, boxes_per_set)
+    return _build_regular_plan(base_number, total_pieces, pieces_per_box, boxes_per_small_box,
+                               small_boxes_per_large_box, has_small_box, small_box_capacities, large_box_capacities)
+
+
+def build_label_plan(template: str, data: Dict[str, Any], params: Dict[str, Any]) -> LabelPlan:
+    """
+    构建任务的标签计划（按任务参数缓存，同一任务的各级标签共用一份计划）
+
+    Args:
+        template: 'regular_box' 或 'split_box'
+        data: 六字段标准数据
+        params: 包装参数，可选 小箱容量/大箱容量（逐箱容量列表，仅常规模板）
+
+    Returns:
+        LabelPlan
+    """
+    if template not in ('regular_box', 'split_box'):
+        raise ValueError(f"未知的模板类型: {template}")
+    has_small_box = bool(params.get('是否有小箱', True))
+    return _cached_plan(
+        template,
+        data.get('开始号') or None,
+        int(float(data['总张数'])),
+        int(params['张/盒']),
+        int(params['盒/小箱']),
+        # 无小箱时小箱/大箱不参与计算，统一为1以共用缓存
+        int(params.get('小箱/大箱', 1)) if has_small_box else 1,
+        has_small_box,
+        int(params.get('盒/套', params.get('boxes_per_set', 1))) if template == 'split_box' else 1,
+        parse_capacity_list('小箱容量', params.get('小箱容量')),
+        parse_capacity_list('大箱容量', params.get('大箱容量')) if has_small_box else None,
+    )
+
@@ -0,0 +1,142 @@
+"""
+标签计划校验
+
+渲染之前在整个LabelPlan上做一次向量化检查，在写完几分钟的PDF之前就发现箱标与盒标对不上：
+    - 小箱标/大箱标的序列号范围首尾相接，恰好覆盖全部盒标序列号
+    - 每张箱标的数量与其序列号范围内的盒数一致，数量合计等于总张数
+    - 有Carton No的级别，Carton No不重复
+分盒模板按整套编号：最后一套不满时，箱标序列号可以写到该套的末尾（补齐的盒号），
+补齐的盒不计入数量。默认只输出警告并继续生成（与原有输出一致），严格校验时抛出异常。
+所有检查都是NumPy数组运算，百万盒的任务也在一秒内完成。
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+from src.pdf.label_plan import LabelPlan, LevelPlan
+
+
+def _printed_boxes(level: LevelPlan, main: np.ndarray, sub: Optional[np.ndarray]) -> np.ndarray:
+    """序列号（主号偏移、副号）对应的盒号"""
+    if level.serial_group is None or sub is None:
+        return main + 1
+    return main * level.serial_group + sub
+
+
+def _describe(level: LevelPlan, rows: np.ndarray, problem: str) -> str:
+    """第一张出错的标签及出错张数"""
+    first = int(rows[0])
+    label = level.row(first)
+    text = f"{level.name}第{first + 1}张（{label['serial']}）{problem}"
+    if len(rows) > 1:
+        text += f"，共{len(rows)}张"
+    return text
+
+
+def _padded_boxes(plan: LabelPlan) -> int:
+    """序列号可以写到的最后一个盒号：分盒模板补齐最后一套，常规模板为总盒数"""
+    set_size = plan.level('盒标').serial_group
+    if set_size is None:
+        return plan.total_boxes
+    return -(-plan.total_boxes // set_size) * set_size
+
+
+def _check_level(plan: LabelPlan, level: LevelPlan) -> List[str]:
+    """检查单个箱标级别"""
+    errors: List[str] = []
+    if len(level) == 0:
+        return [f"{level.name}数量为0"]
+
+    first = _printed_boxes(level, level.first_main, level.first_sub)
+    last = _printed_boxes(level, level.last_main, level.last_sub)
+    quantity = level.quantity
+    total_boxes = plan.total_boxes
+    padded_boxes = _padded_boxes(plan)
+
+    # 分盒模板按套数计算箱数，末尾可能多出从最后一盒之后开始、数量为0的补齐箱标，不参与范围检查
+    real = np.flatnonzero((quantity > 0) | (first <= total_boxes))
+    count = int(real[-1]) + 1 if len(real) else 1
+    first, last, quantity = first[:count], last[:count], quantity[:count]
+
+    empty = np.flatnonzero(last < first)
+    if len(empty):
+        errors.append(_describe(level, empty, "的序列号范围为空"))
+    beyond = np.flatnonzero(last > padded_boxes)
+    if len(beyond):
+        limit = f"最后一套的末尾（第{padded_boxes}盒）" if padded_boxes > total_boxes else f"最后一盒（第{total_boxes}盒）"
+        errors.append(_describe(level, beyond, f"超出{limit}"))
+
+    # 首尾相接：第一张从第1盒开始，每张从上一张的下一盒开始，最后一张到最后一盒
+    if first[0] != 1:
+        errors.append(_describe(level, np.array([0]), f"从第{int(first[0])}盒开始，应从第1盒开始"))
+    gaps = np.flatnonzero(first[1:] != last[:-1] + 1) + 1
+    if len(gaps):
+        row = int(gaps[0])
+        errors.append(_describe(level, gaps, f"从第{int(first[row])}盒开始，上一张到第{int(last[row - 1])}盒，"
+                                             "序列号范围未首尾相接"))
+    if not total_boxes <= last[-1] <= padded_boxes:
+        errors.append(_describe(level, np.array([count - 1]),
+                                f"到第{int(last[-1])}盒结束，共{total_boxes}盒"))
+
+    # 数量与序列号范围内的实际盒数一致（补齐的盒不计数；最后一盒不满时按整盒计数，与盒标一致）
+    boxes = np.clip(np.minimum(last, total_boxes) - first + 1, 0, None)
+    expected = boxes * plan.pieces_per_box
+    wrong = np.flatnonzero(quantity != expected)
+    if len(wrong):
+        row = int(wrong[0])
+        errors.append(_describe(level, wrong, f"数量为{int(quantity[row])}，"
+                                              f"序列号范围内{int(boxes[row])}盒应为{int(expected[row])}"))
+    labelled = int(level.quantity.sum())
+    if labelled != total_boxes * plan.pieces_per_box:
+        errors.append(f"{level.name}数量合计{labelled}，总张数{plan.total_pieces}"
+                      f"（{total_boxes}盒 × {plan.pieces_per_box}张/盒 = {total_boxes * plan.pieces_per_box}）")
+
+    # Carton No不重复（不打印Carton No的级别不检查）
+    if level.carton_style != 'none' and level.carton_a is not None:
+        pairs = np.stack([level.carton_a, level.carton_b], axis=1)
+        _, first_rows, counts = np.unique(pairs, axis=0, return_index=True, return_counts=True)
+        repeated = np.sort(first_rows[counts > 1])
+        if len(repeated):
+            errors.append(_describe(level, repeated, f"的Carton No {level.row(int(repeated[0]))['carton_no']}重复"))
+    return errors
+
+
+def check_label_plan(plan: LabelPlan) -> List[str]:
+    """
+    检查标签计划
+
+    Args:
+        plan: 标签计划
+
+    Returns:
+        问题描述列表，为空表示通过
+    """
+    errors: List[str] = []
+    for level in plan.levels.values():
+        if level.is_range:
+            errors.extend(_check_level(plan, level))
+    return errors
+
+
+def validate_label_plan(plan: LabelPlan, strict: bool = False) -> List[str]:
+    """
+    渲染前校验标签计划
+
+    Args:
+        plan: 标签计划
+        strict: True时有问题即抛出异常（params["严格校验"]）；默认只输出警告
+
+    Returns:
+        问题描述列表，为空表示通过
+
+    Raises:
+        ValueError: 严格校验时计划中的序列号范围、数量或Carton No有误
+    """
+    errors = check_label_plan(plan)
+    if errors:
+        message = "标签计划校验失败，请检查包装参数:\n" + "\n".join(f"  - {error}" for error in errors)
+        if strict:
+            raise ValueError(message)
+        print(f"⚠️ {message}")
+    return errors
@@ -4,12 +4,13 @@
 """
 
 import pandas as pd
-import re
 import math
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 # 导入现有的通用Excel工具，确保功能一致性
 from src.utils.excel_data_extractor import ExcelDataExtractor
+from src.data.extraction_cache import extraction_cache
+from src.utils.serial_formatter import get_serial_scheme
 
 
 class RegularDataProcessor:
@@ -24,7 +25,8 @@ class RegularDataProcessor:
         提取常规盒标所需的数据 - 使用统一的公共数据提取方法
         """
         # 使用统一的公共数据提取方法
-        extractor = ExcelDataExtractor(excel_file_path)
+        extractor = ExcelDataExtractor(excel_file_path, reader_mode='bounded', cache=extraction_cache,
+                                       scan_all_sheets=True)
         common_data = extractor.extract_common_data()
         
         return {
@@ -38,7 +40,8 @@ class RegularDataProcessor:
         提取常规小箱标所需的数据 - 使用统一的公共数据提取方法
         """
         # 使用统一的公共数据提取方法
-        extractor = ExcelDataExtractor(excel_file_path)
+        extractor = ExcelDataExtractor(excel_file_path, reader_mode='bounded', cache=extraction_cache,
+                                       scan_all_sheets=True)
         return extractor.extract_common_data()
     
     def extract_large_box_label_data(self, excel_file_path: str) -> Dict[str, Any]:
@@ -46,45 +49,23 @@ class RegularDataProcessor:
         提取常规大箱标所需的数据 - 使用统一的公共数据提取方法
         """
         # 使用统一的公共数据提取方法
-        extractor = ExcelDataExtractor(excel_file_path)
+        extractor = ExcelDataExtractor(excel_file_path, reader_mode='bounded', cache=extraction_cache,
+                                       scan_all_sheets=True)
         return extractor.extract_common_data()
     
     def parse_serial_number_format(self, serial_number: str) -> Dict[str, Any]:
         """
         解析序列号格式 - 与原有逻辑完全一致
-        常规模板使用简单的线性递增逻辑
+        常规模板使用简单的线性递增逻辑（字母前缀 + 可选连字符 + 数字，如DSK00001、CAR-01001）
         """
-        # 常规模板的序列号格式相对简单（与原代码一致）
-        if not serial_number:
-            return {
-                'prefix': 'DSK',
-                'start_number': 1,
-                'digits': 5,
-                'separator': ''
-            }
-
-        # 尝试解析DSK00001或CAR-01001这种格式
-        match = re.search(r'([A-Z]+)(-?)(\d+)', serial_number)
-        if match:
-            prefix = match.group(1)
-            separator = match.group(2)  # 保存连字符（如果存在）
-            start_number = int(match.group(3))
-            digits = len(match.group(3))
-
-            return {
-                'prefix': prefix,
-                'start_number': start_number,
-                'digits': digits,
-                'separator': separator
-            }
-        else:
-            # 如果无法解析，使用默认格式
-            return {
-                'prefix': 'DSK',
-                'start_number': 1,
-                'digits': 5,
-                'separator': ''
-            }
+        scheme = get_serial_scheme(serial_number, 'regular')
+        separator = '-' if scheme.prefix.endswith('-') else ''
+        return {
+            'prefix': scheme.prefix[:len(scheme.prefix) - len(separator)],
+            'start_number': scheme.start_number,
+            'digits': scheme.digits,
+            'separator': separator
+        }
     
     def format_serial_number(self, prefix: str, number: int, original_digits: int) -> str:
         """
@@ -137,11 +118,8 @@ class RegularDataProcessor:
 
         常规模板使用简单的线性递增
         """
-        serial_info = self.parse_serial_number_format(base_number)
-
-        # 常规模板序列号生成逻辑：简单的线性递增（与原代码完全一致）
-        current_number = serial_info['start_number'] + (box_num - 1)
-        formatted_number = f"{serial_info['prefix']}{serial_info['separator']}{current_number:0{serial_info['digits']}d}"
+        # 常规模板序列号生成逻辑：简单的线性递增（开始号按任务只解析一次）
+        formatted_number = get_serial_scheme(base_number, 'regular').format(box_num - 1)
 
         print(f"📝 常规盒标 #{box_num}: {formatted_number}")
         return formatted_number
@@ -153,7 +131,7 @@ class RegularDataProcessor:
         对应原来 _create_regular_small_box_label 中的序列号范围计算逻辑
         添加total_boxes边界检查，确保序列号不超出实际盒数
         """
-        serial_info = self.parse_serial_number_format(base_number)
+        scheme = get_serial_scheme(base_number, 'regular')
         
         # 计算当前小箱包含的盒子范围
         start_box = (small_box_num - 1) * boxes_per_small_box + 1
@@ -163,15 +141,8 @@ class RegularDataProcessor:
         if total_boxes is not None:
             end_box = min(end_box, total_boxes)
 
-        # 生成范围内第一个和最后一个序列号
-        first_serial_num = serial_info['start_number'] + (start_box - 1)
-        last_serial_num = serial_info['start_number'] + (end_box - 1)
-
-        first_serial = f"{serial_info['prefix']}{serial_info['separator']}{first_serial_num:0{serial_info['digits']}d}"
-        last_serial = f"{serial_info['prefix']}{serial_info['separator']}{last_serial_num:0{serial_info['digits']}d}"
-
-        # 始终显示为范围格式，即使首尾序列号相同
-        serial_range = f"{first_serial}-{last_serial}"
+        # 范围内第一个和最后一个序列号，始终显示为范围格式，即使首尾序列号相同
+        serial_range = scheme.range_text(start_box - 1, end_box - 1)
 
         print(f"📝 常规小箱标 #{small_box_num}: 包含盒{start_box}-{end_box}, 序列号范围={serial_range}")
         return serial_range
@@ -183,7 +154,7 @@ class RegularDataProcessor:
         对应原来 _create_regular_large_box_label 中的序列号范围计算逻辑
         添加total_boxes边界检查，确保序列号不超出实际盒数
         """
-        serial_info = self.parse_serial_number_format(base_number)
+        scheme = get_serial_scheme(base_number, 'regular')
         
         # 计算当前大箱包含的小箱范围
         start_small_box = (large_box_num - 1) * small_boxes_per_large_box + 1
@@ -197,15 +168,8 @@ class RegularDataProcessor:
         if total_boxes is not None:
             end_box = min(end_box, total_boxes)
         
-        # 生成范围内第一个和最后一个序列号
-        first_serial_num = serial_info['start_number'] + (start_box - 1)
-        last_serial_num = serial_info['start_number'] + (end_box - 1)
-
-        first_serial = f"{serial_info['prefix']}{serial_info['separator']}{first_serial_num:0{serial_info['digits']}d}"
-        last_serial = f"{serial_info['prefix']}{serial_info['separator']}{last_serial_num:0{serial_info['digits']}d}"
-
-        # 始终显示为范围格式，即使首尾序列号相同
-        serial_range = f"{first_serial}-{last_serial}"
+        # 范围内第一个和最后一个序列号，始终显示为范围格式，即使首尾序列号相同
+        serial_range = scheme.range_text(start_box - 1, end_box - 1)
 
         print(f"📝 常规大箱标 #{large_box_num}: 包含小箱{start_small_box}-{end_small_box}, 盒{start_box}-{end_box}, 序列号范围={serial_range}")
         return serial_range
@@ -245,5 +209,52 @@ class RegularDataProcessor:
             return pieces_per_large_box
 
 
+    # ========== 反向查询：序列号 → 盒、小箱、大箱 ==========
+
+    def box_range_for_carton(self, carton_num: int, boxes_per_carton: int, total_boxes: int) -> Tuple[int, int]:
+        """
+        计算箱内的盒号范围（小箱按盒/小箱，大箱按盒/小箱×小箱/大箱）
+
+        Returns:
+            (起始盒号, 结束盒号)，1-based含首尾；箱内没有盒时结束盒号 = 起始盒号 - 1
+        """
+        start_box = (carton_num - 1) * boxes_per_carton + 1
+        return start_box, max(min(carton_num * boxes_per_carton, total_boxes), start_box - 1)
+
+    def locate_serial(self, serial: str, base_number: str, boxes_per_small_box: int,
+                      small_boxes_per_large_box: int, total_boxes: int, has_small_box: bool = True) -> Dict[str, Any]:
+        """
+        反向查询盒标序列号所在的盒、小箱和大箱（generate_regular_box_serial_number的逆运算）
+
+        Args:
+            serial: 盒标序列号（如 DSK01234）
+            base_number: 开始号
+            boxes_per_small_box: 盒/小箱（无小箱时为盒/箱）
+            small_boxes_per_large_box: 小箱/大箱
+            total_boxes: 总盒数
+            has_small_box: 是否有小箱
+
+        Returns:
+            {'box': 盒号, 'small_box': 小箱号（无小箱时为None）, 'large_box': 大箱号（无小箱时为箱号）}
+
+        Raises:
+            ValueError: 序列号不属于本任务
+        """
+        main_offset, sub_number = get_serial_scheme(base_number, 'regular').offset_of(serial)
+        if sub_number is not None:
+            raise ValueError(f"常规模板的序列号没有副号: {serial}")
+        box_num = main_offset + 1
+        if box_num > total_boxes:
+            raise ValueError(f"序列号'{serial}'超出本任务的{total_boxes}盒")
+
+        if has_small_box:
+            return {
+                'box': box_num,
+                'small_box': (box_num - 1) // boxes_per_small_box + 1,
+                'large_box': (box_num - 1) // (boxes_per_small_box * small_boxes_per_large_box) + 1,
+            }
+        return {'box': box_num, 'small_box': None, 'large_box': (box_num - 1) // boxes_per_small_box + 1}
+
+
 # 创建全局实例供regular模板使用
 regular_data_processor = RegularDataProcessor()
\ No newline at end of file
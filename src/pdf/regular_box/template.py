@@ -2,11 +2,9 @@
 常规模板 - 标准的多级标签PDF生成
 """
 import math
-import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
-from reportlab.pdfgen import canvas
 from reportlab.lib.colors import CMYKColor
 from reportlab.lib.units import mm
 
@@ -15,48 +13,16 @@ from src.utils.pdf_base import PDFBaseUtils
 from src.utils.font_manager import font_manager
 from src.utils.text_processor import text_processor
 from src.utils.excel_data_extractor import ExcelDataExtractor
+from src.utils.filename_utils import clean_for_filename
 
-# 导入常规模板专属数据处理器和渲染器
-from src.pdf.regular_box.data_processor import regular_data_processor
+# 导入常规模板专属渲染器和标签计划
 from src.pdf.regular_box.renderer import regular_renderer
-from src.utils.carton_summary_generator import generate_carton_summary_for_template
-
-
-def _clean_for_filename(text: str) -> str:
-    r"""
-    清理文本使其适合作为Windows/macOS文件名
-
-    处理问题：
-    1. 换行符 (\n, \r) - Excel单元格中的换行会导致Windows文件名错误
-    2. Windows非法字符 (< > : " / \ | ? *)
-    3. 控制字符（ASCII 0-31）
-
-    Args:
-        text: 原始文本
-
-    Returns:
-        清理后的安全文本
-    """
-    if not text:
-        return ""
-
-    # 转为字符串并清理
-    text = str(text)
-
-    # 1. 替换换行符为空格（Excel单元格中的换行）
-    text = text.replace('\n', ' ').replace('\r', ' ')
-
-    # 2. 移除Windows非法字符: < > : " / \ | ? * 和控制字符（ASCII 0-31）
-    text = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', text)
-
-    # 3. 移除前后空格和点号（Windows不允许文件名以这些结尾）
-    text = text.strip('. ')
-
-    # 4. 压缩多余的空格和下划线
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'_+', '_', text)
-
-    return text
+from src.pdf.label_plan import build_label_plan
+from src.pdf.fast_label_writer import RENDER_ENGINE_FAST, fast_engine_supported
+from src.pdf.sharded_box_labels import write_box_labels
+from src.pdf.streaming_canvas import open_canvas
+from src.pdf.plan_validation import validate_label_plan
+from src.pdf.label_levels import render_carton_summary, render_level, run_label_levels
 
 
 class RegularTemplate(PDFBaseUtils):
@@ -78,6 +44,9 @@ class RegularTemplate(PDFBaseUtils):
         Returns:
             生成的文件路径字典
         """
+        # 渲染前校验标签计划：序列号范围/数量对不上时给出警告，严格校验时在生成任何文件之前报错
+        validate_label_plan(build_label_plan('regular_box', data, params), params.get("严格校验", False))
+
         # 检查是否有小箱
         has_small_box = params.get("是否有小箱", True)
         
@@ -91,38 +60,19 @@ class RegularTemplate(PDFBaseUtils):
         创建三级包装的PDF（有小箱）
         """
         # 计算数量 - 三级结构：张→盒→小箱→大箱
-        total_pieces = int(float(data["总张数"]))
-        pieces_per_box = int(params["张/盒"])
         boxes_per_small_box = int(params["盒/小箱"])
         small_boxes_per_large_box = int(params["小箱/大箱"])
 
-        # 计算各级数量
-        total_boxes = math.ceil(total_pieces / pieces_per_box)
-        total_small_boxes = math.ceil(total_boxes / boxes_per_small_box)
-        total_large_boxes = math.ceil(total_small_boxes / small_boxes_per_large_box)
-
-        # 计算余数信息
-        remaining_pieces_in_last_box = total_pieces % pieces_per_box
-        remaining_boxes_in_last_small_box = total_boxes % boxes_per_small_box
-        remaining_small_boxes_in_last_large_box = total_small_boxes % small_boxes_per_large_box
-
-        remainder_info = {
-            "total_boxes": total_boxes,
-            "remaining_pieces_in_last_box": (
-                pieces_per_box if remaining_pieces_in_last_box == 0 else remaining_pieces_in_last_box
-            ),
-            "remaining_boxes_in_last_small_box": (
-                boxes_per_small_box if remaining_boxes_in_last_small_box == 0 else remaining_boxes_in_last_small_box
-            ),
-            "remaining_small_boxes_in_last_large_box": (
-                small_boxes_per_large_box if remaining_small_boxes_in_last_large_box == 0 else remaining_small_boxes_in_last_large_box
-            ),
-        }
+        # 计算各级数量（按标签计划的装箱索引，支持小箱容量/大箱容量逐箱指定）
+        label_plan = build_label_plan('regular_box', data, params)
+        total_boxes = label_plan.total_boxes
+        total_small_boxes = len(label_plan.level('小箱标'))
+        total_large_boxes = len(label_plan.level('大箱标'))
 
         # 创建输出目录 - 新格式：编号+英文名+中文名+标签
-        clean_customer_code = _clean_for_filename(data['客户名称编码'])  # 编号
-        clean_label_name = _clean_for_filename(data['标签名称'])  # 英文名
-        clean_chinese_name = _clean_for_filename(params.get("中文名称", ""))  # 中文名
+        clean_customer_code = clean_for_filename(data['客户名称编码'])  # 编号
+        clean_label_name = clean_for_filename(data['标签名称'])  # 英文名
+        clean_chinese_name = clean_for_filename(params.get("中文名称", ""))  # 中文名
         folder_name = f"{clean_customer_code}+{clean_label_name}+{clean_chinese_name}+标签"
         full_output_dir = Path(output_dir) / folder_name
         full_output_dir.mkdir(parents=True, exist_ok=True)
@@ -135,7 +85,7 @@ class RegularTemplate(PDFBaseUtils):
         customer_code = clean_customer_code  # 使用已清理的客户编码
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        generated_files = {}
+        levels = []
 
         # 检查是否需要生成盒标
         has_box_label = params.get("是否有盒标", False)
@@ -147,8 +97,10 @@ class RegularTemplate(PDFBaseUtils):
             box_label_filename = f"{customer_code}_{chinese_name}_{english_name}_盒标_{selected_appearance}_{timestamp}.pdf"
             box_label_path = full_output_dir / box_label_filename
 
-            self._create_box_label(data, params, str(box_label_path), selected_appearance, excel_file_path)
-            generated_files["盒标"] = str(box_label_path)
+            levels.append(("盒标", render_level, (
+                self._create_box_label, str(box_label_path),
+                data, params, str(box_label_path), selected_appearance, excel_file_path
+            ), {}))
         else:
             print("⏭️ 用户选择无盒标，跳过盒标生成")
 
@@ -156,57 +108,55 @@ class RegularTemplate(PDFBaseUtils):
         # 文件名格式：客户编号_中文名称_英文名称_小箱标_日期时间戳
         small_box_filename = f"{customer_code}_{chinese_name}_{english_name}_小箱标_{timestamp}.pdf"
         small_box_path = full_output_dir / small_box_filename
-        self._create_small_box_label(
-            data, params, str(small_box_path), total_small_boxes, remainder_info, total_boxes, excel_file_path
-        )
-        generated_files["小箱标"] = str(small_box_path)
+        levels.append(("小箱标", render_level, (
+            self._create_small_box_label, str(small_box_path),
+            data, params, str(small_box_path), total_small_boxes, total_boxes, excel_file_path
+        ), {}))
 
         # 生成大箱标
         # 文件名格式：客户编号_中文名称_英文名称_大箱标_日期时间戳
         large_box_filename = f"{customer_code}_{chinese_name}_{english_name}_大箱标_{timestamp}.pdf"
         large_box_path = full_output_dir / large_box_filename
-        self._create_large_box_label(
-            data, params, str(large_box_path), total_large_boxes, total_small_boxes, remainder_info, total_boxes, excel_file_path
-        )
-        generated_files["大箱标"] = str(large_box_path)
-
-        # 生成外箱汇总表
-        try:
-            # 计算每箱盒数（有小箱的情况：盒/小箱 × 小箱/大箱）
-            boxes_per_large_box = boxes_per_small_box * small_boxes_per_large_box
-
-            summary_file_path = generate_carton_summary_for_template(
-                output_dir=str(full_output_dir),
-                data=data,
-                params=params,
-                total_large_boxes=total_large_boxes,
-                boxes_per_large_box=boxes_per_large_box
-            )
-            generated_files["外箱汇总表"] = summary_file_path
-            print(f"✅ 外箱汇总表已生成: {summary_file_path}")
-        except Exception as e:
-            print(f"⚠️ 外箱汇总表生成失败: {e}")
-            # 汇总表生成失败不影响主流程
-
-        return generated_files
+        levels.append(("大箱标", render_level, (
+            self._create_large_box_label, str(large_box_path),
+            data, params, str(large_box_path), total_large_boxes, total_small_boxes, total_boxes, excel_file_path
+        ), {}))
+
+        # 生成外箱汇总表（失败不影响主流程）
+        # 计算每箱盒数（有小箱的情况：盒/小箱 × 小箱/大箱）；逐箱指定容量时按标签计划中每个大箱的实际盒数分组
+        boxes_per_large_box = boxes_per_small_box * small_boxes_per_large_box
+        boxes_per_carton = None
+        if params.get("小箱容量") or params.get("大箱容量"):
+            large_level = label_plan.level('大箱标')
+            boxes_per_carton = (large_level.end_box - large_level.start_box + 1).tolist()
+        levels.append(("外箱汇总表", render_carton_summary, (), dict(
+            output_dir=str(full_output_dir),
+            data=data,
+            params=params,
+            total_large_boxes=total_large_boxes,
+            boxes_per_large_box=boxes_per_large_box,
+            boxes_per_carton=boxes_per_carton
+        )))
+
+        # 各级标签互相独立，按级别进程数并行生成
+        return run_label_levels(levels, params.get("级别进程数"))
     
     def _create_two_level_pdfs(self, data: Dict[str, Any], params: Dict[str, Any], output_dir: str, excel_file_path: str = None) -> Dict[str, str]:
         """
         创建二级包装的PDF（无小箱）
         """
         # 计算数量 - 二级结构：张→盒→箱
-        total_pieces = int(float(data["总张数"]))
-        pieces_per_box = int(params["张/盒"])
         boxes_per_large_box = int(params["盒/小箱"])  # 在二级模式下，这实际上是盒/箱
 
-        # 计算各级数量
-        total_boxes = math.ceil(total_pieces / pieces_per_box)
-        total_large_boxes = math.ceil(total_boxes / boxes_per_large_box)
+        # 计算各级数量（按标签计划的装箱索引，支持小箱容量逐箱指定）
+        label_plan = build_label_plan('regular_box', data, params)
+        total_boxes = label_plan.total_boxes
+        total_large_boxes = len(label_plan.level('箱标'))
 
         # 创建输出目录 - 新格式：编号+英文名+中文名+标签
-        clean_customer_code = _clean_for_filename(data['客户名称编码'])  # 编号
-        clean_label_name = _clean_for_filename(data['标签名称'])  # 英文名
-        clean_chinese_name = _clean_for_filename(params.get("中文名称", ""))  # 中文名
+        clean_customer_code = clean_for_filename(data['客户名称编码'])  # 编号
+        clean_label_name = clean_for_filename(data['标签名称'])  # 英文名
+        clean_chinese_name = clean_for_filename(params.get("中文名称", ""))  # 中文名
         folder_name = f"{clean_customer_code}+{clean_label_name}+{clean_chinese_name}+标签"
         full_output_dir = Path(output_dir) / folder_name
         full_output_dir.mkdir(parents=True, exist_ok=True)
@@ -219,7 +169,7 @@ class RegularTemplate(PDFBaseUtils):
         customer_code = clean_customer_code  # 使用已清理的客户编码
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        generated_files = {}
+        levels = []
 
         # 检查是否需要生成盒标
         has_box_label = params.get("是否有盒标", False)
@@ -231,8 +181,10 @@ class RegularTemplate(PDFBaseUtils):
             box_label_filename = f"{customer_code}_{chinese_name}_{english_name}_盒标_{selected_appearance}_{timestamp}.pdf"
             box_label_path = full_output_dir / box_label_filename
 
-            self._create_box_label(data, params, str(box_label_path), selected_appearance, excel_file_path)
-            generated_files["盒标"] = str(box_label_path)
+            levels.append(("盒标", render_level, (
+                self._create_box_label, str(box_label_path),
+                data, params, str(box_label_path), selected_appearance, excel_file_path
+            ), {}))
         else:
             print("⏭️ 用户选择无盒标，跳过盒标生成")
 
@@ -245,28 +197,28 @@ class RegularTemplate(PDFBaseUtils):
         virtual_params = params.copy()
         virtual_params["小箱/大箱"] = 1  # 设置为1表示跳过小箱层级
         
-        self._create_two_level_large_box_label(
+        levels.append(("箱标", render_level, (
+            self._create_two_level_large_box_label, str(large_box_path),
             data, virtual_params, str(large_box_path), total_large_boxes, total_boxes, boxes_per_large_box, excel_file_path
-        )
-        generated_files["箱标"] = str(large_box_path)
-
-        # 生成外箱汇总表
-        try:
-            # 无小箱的情况，每箱盒数就是 boxes_per_large_box
-            summary_file_path = generate_carton_summary_for_template(
-                output_dir=str(full_output_dir),
-                data=data,
-                params=params,
-                total_large_boxes=total_large_boxes,
-                boxes_per_large_box=boxes_per_large_box
-            )
-            generated_files["外箱汇总表"] = summary_file_path
-            print(f"✅ 外箱汇总表已生成: {summary_file_path}")
-        except Exception as e:
-            print(f"⚠️ 外箱汇总表生成失败: {e}")
-            # 汇总表生成失败不影响主流程
-
-        return generated_files
+        ), {}))
+
+        # 生成外箱汇总表（失败不影响主流程）
+        # 无小箱的情况，每箱盒数就是 boxes_per_large_box；逐箱指定容量时按标签计划中每箱的实际盒数分组
+        boxes_per_carton = None
+        if params.get("小箱容量"):
+            box_level = label_plan.level('箱标')
+            boxes_per_carton = (box_level.end_box - box_level.start_box + 1).tolist()
+        levels.append(("外箱汇总表", render_carton_summary, (), dict(
+            output_dir=str(full_output_dir),
+            data=data,
+            params=params,
+            total_large_boxes=total_large_boxes,
+            boxes_per_large_box=boxes_per_large_box,
+            boxes_per_carton=boxes_per_carton
+        )))
+
+        # 各级标签互相独立，按级别进程数并行生成
+        return run_label_levels(levels, params.get("级别进程数"))
 
     def _create_box_label(self, data: Dict[str, Any], params: Dict[str, Any], output_path: str, style: str, excel_file_path: str = None):
         """创建盒标 - 支持分页限制的多页PDF"""
@@ -291,9 +243,37 @@ class RegularTemplate(PDFBaseUtils):
         style: str, start_box: int, end_box: int, top_text: str, base_number: str
     ):
         """创建单个盒标PDF文件"""
-        c = canvas.Canvas(output_path, pagesize=self.page_size)
         width, height = self.page_size
 
+        # 真正的三等分留白布局：每个留白区域高度相等
+        blank_height = height / 5  # 每个留白区域高度：10mm
+        
+        # 布局位置计算（确保三个留白区域等高）
+        top_text_y = height - 1.5 * blank_height      # 产品名称居中在区域2
+        serial_number_y = height - 3.5 * blank_height # 序列号居中在区域4
+
+        # 获取中文名称用于空白首页
+        # 清理中文名称（可能包含Excel换行符\n和Windows非法字符）
+        chinese_name = clean_for_filename(params.get("中文名称", ""))
+
+        # 序列号从任务的标签计划中按行读取（开始号只解析一次）
+        box_plan = build_label_plan('regular_box', data, params).level('盒标')
+
+        render_workers = int(params.get("渲染进程数") or 1)
+        if (params.get("渲染引擎") == RENDER_ENGINE_FAST or render_workers > 1) and fast_engine_supported():
+            # 快速引擎：版式预编译为内容流模板，每页只替换序列号，输出与画布路径相同；
+            # 渲染进程数大于1时按盒号分片并行渲染，再按页序拼接为一个文件
+            has_blank_page = style in ["外观一", "外观二"] and bool(chinese_name)
+            if has_blank_page:
+                print(f"📝 生成常规盒标空白首页({style}): {chinese_name}")
+            write_box_labels(output_path, self.page_size, style, top_text, 'regular_box', data, params, start_box, end_box,
+                             top_text_y, serial_number_y, ticket_count=int(params["张/盒"]),
+                             chinese_name=chinese_name if has_blank_page else "",
+                             title=f"盒标-{style}-{start_box}到{end_box}", subject="Box Label", workers=render_workers)
+            return
+
+        c = open_canvas(output_path, self.page_size, params.get("流式写入", False), params.get("压缩线程数"))
+
         # 设置PDF/X兼容模式和CMYK颜色
         c.setPageCompression(1)
         c.setTitle(f"盒标-{style}-{start_box}到{end_box}")
@@ -303,20 +283,9 @@ class RegularTemplate(PDFBaseUtils):
         # 使用CMYK黑色
         cmyk_black = CMYKColor(0, 0, 0, 1)
         c.setFillColor(cmyk_black)
-        
-        # 真正的三等分留白布局：每个留白区域高度相等
-        blank_height = height / 5  # 每个留白区域高度：10mm
-        
-        # 布局位置计算（确保三个留白区域等高）
-        top_text_y = height - 1.5 * blank_height      # 产品名称居中在区域2
-        serial_number_y = height - 3.5 * blank_height # 序列号居中在区域4
 
-        # 获取中文名称用于空白首页
-        # 清理中文名称（可能包含Excel换行符\n和Windows非法字符）
-        chinese_name = _clean_for_filename(params.get("中文名称", ""))
-        
         # 生成指定范围的盒标
-        for box_num in range(start_box, end_box + 1):
+        for box_num, label in zip(range(start_box, end_box + 1), box_plan.iter_rows(start_box - 1, end_box)):
             # 🔥 新增：在第一个标签时添加空白首页（外观1和外观2都支持）
             if box_num == start_box and style in ["外观一", "外观二"] and chinese_name:
                 print(f"📝 生成常规盒标空白首页({style}): {chinese_name}")
@@ -333,21 +302,7 @@ class RegularTemplate(PDFBaseUtils):
                 c.showPage()
                 c.setFillColor(cmyk_black)
 
-            # 解析基础序列号格式
-            import re
-            match = re.search(r'(\w+)(-?)(\d+)', base_number)
-            if match:
-                # 获取前缀、连字符和数字
-                prefix = match.group(1)
-                separator = match.group(2)  # 保留连字符（如果存在）
-                base_num = int(match.group(3))
-
-                # 计算当前序列号
-                current_num = base_num + (box_num - 1)
-                current_number = f"{prefix}{separator}{current_num:05d}"
-            else:
-                # 如果无法解析，使用简单递增，保持5位数字格式（向后兼容）
-                current_number = f"BOX{box_num:05d}"
+            current_number = label['serial']
 
             # 根据选择的外观渲染
             if style == "外观一":
@@ -368,7 +323,6 @@ class RegularTemplate(PDFBaseUtils):
         params: Dict[str, Any],
         output_path: str,
         total_small_boxes: int,
-        remainder_info: Dict[str, Any],
         total_boxes: int,
         excel_file_path: str = None,
     ):
@@ -402,7 +356,7 @@ class RegularTemplate(PDFBaseUtils):
         total_small_boxes: int, total_boxes: int, serial_font_size: int = 10
     ):
         """创建单个小箱标PDF文件"""
-        c = canvas.Canvas(output_path, pagesize=self.page_size)
+        c = open_canvas(output_path, self.page_size, params.get("流式写入", False), params.get("压缩线程数"))
         width, height = self.page_size
 
         # 设置PDF/X兼容模式和CMYK颜色
@@ -419,7 +373,7 @@ class RegularTemplate(PDFBaseUtils):
         if start_small_box == 1:
             # 获取中文名称参数
             # 清理中文名称（可能包含Excel换行符\n和Windows非法字符）
-            chinese_name = _clean_for_filename(params.get("中文名称", ""))
+            chinese_name = clean_for_filename(params.get("中文名称", ""))
             # 获取标签模版类型
             template_type = params.get("标签模版", "有纸卡备注")
             
@@ -432,28 +386,21 @@ class RegularTemplate(PDFBaseUtils):
             c.showPage()
             c.setFillColor(cmyk_black)
 
+        # 序列号范围、实际张数和Carton No从任务的标签计划中按行读取
+        small_box_plan = build_label_plan('regular_box', data, params).level('小箱标')
+
         # 生成指定范围的小箱标
-        for small_box_num in range(start_small_box, end_small_box + 1):
+        for small_box_num, label in zip(range(start_small_box, end_small_box + 1),
+                                        small_box_plan.iter_rows(start_small_box - 1, end_small_box)):
             if small_box_num > start_small_box or start_small_box == 1:  # 修改条件，考虑空标签页
                 if not (small_box_num == start_small_box and start_small_box == 1):  # 避免重复showPage
                     c.showPage()
                     c.setFillColor(cmyk_black)
 
-            # 🔧 使用修复后的数据处理器计算序列号范围（包含边界检查）
-            serial_range = regular_data_processor.generate_regular_small_box_serial_range(
-                base_number, small_box_num, boxes_per_small_box, total_boxes
-            )
-
-            # 🔧 计算当前小箱的实际张数（考虑最后一小箱的边界情况）
-            pieces_per_box = int(params["张/盒"])
-            # 计算当前小箱实际包含的盒数
-            start_box = (small_box_num - 1) * boxes_per_small_box + 1
-            end_box = min(start_box + boxes_per_small_box - 1, total_boxes)
-            actual_boxes_in_small_box = end_box - start_box + 1
-            actual_pieces_in_small_box = actual_boxes_in_small_box * pieces_per_box
-
-            # 计算小箱标Carton No - 格式：当前小箱/总小箱数
-            carton_no = regular_data_processor.calculate_carton_number_for_small_box(small_box_num, total_small_boxes)
+            # 序列号范围（含边界检查）、实际张数（最后一小箱按实际盒数）、Carton No（当前小箱/总小箱数）
+            serial_range = label['serial']
+            actual_pieces_in_small_box = label['quantity']
+            carton_no = label['carton_no']
             
             # 获取标签模版类型
             template_type = params.get("标签模版", "有纸卡备注")
@@ -472,7 +419,6 @@ class RegularTemplate(PDFBaseUtils):
         output_path: str,
         total_large_boxes: int,
         total_small_boxes: int,
-        remainder_info: Dict[str, Any],
         total_boxes: int,
         excel_file_path: str = None,
     ):
@@ -511,7 +457,7 @@ class RegularTemplate(PDFBaseUtils):
         small_boxes_per_large_box: int, total_large_boxes: int, total_boxes: int, serial_font_size: int = 10
     ):
         """创建单个大箱标PDF文件"""
-        c = canvas.Canvas(output_path, pagesize=self.page_size)
+        c = open_canvas(output_path, self.page_size, params.get("流式写入", False), params.get("压缩线程数"))
         width, height = self.page_size
 
         # 设置PDF/X兼容模式和CMYK颜色
@@ -528,7 +474,7 @@ class RegularTemplate(PDFBaseUtils):
         if start_large_box == 1:
             # 获取中文名称参数
             # 清理中文名称（可能包含Excel换行符\n和Windows非法字符）
-            chinese_name = _clean_for_filename(params.get("中文名称", ""))
+            chinese_name = clean_for_filename(params.get("中文名称", ""))
             # 获取标签模版类型
             template_type = params.get("标签模版", "有纸卡备注")
             
@@ -541,29 +487,21 @@ class RegularTemplate(PDFBaseUtils):
             c.showPage()
             c.setFillColor(cmyk_black)
 
+        # 序列号范围、实际张数和Carton No从任务的标签计划中按行读取
+        large_box_plan = build_label_plan('regular_box', data, params).level('大箱标')
+
         # 生成指定范围的大箱标
-        for large_box_num in range(start_large_box, end_large_box + 1):
+        for large_box_num, label in zip(range(start_large_box, end_large_box + 1),
+                                        large_box_plan.iter_rows(start_large_box - 1, end_large_box)):
             if large_box_num > start_large_box or start_large_box == 1:  # 修改条件，考虑空标签页
                 if not (large_box_num == start_large_box and start_large_box == 1):  # 避免重复showPage
                     c.showPage()
                     c.setFillColor(cmyk_black)
 
-            # 🔧 使用修复后的数据处理器计算序列号范围（包含边界检查）
-            serial_range = regular_data_processor.generate_regular_large_box_serial_range(
-                base_number, large_box_num, small_boxes_per_large_box, boxes_per_small_box, total_boxes
-            )
-
-            # 🔧 计算当前大箱的实际张数（考虑最后一大箱的边界情况）
-            pieces_per_box = int(params["张/盒"])
-            # 计算当前大箱实际包含的盒数
-            boxes_per_large_box = boxes_per_small_box * small_boxes_per_large_box
-            start_box = (large_box_num - 1) * boxes_per_large_box + 1
-            end_box = min(start_box + boxes_per_large_box - 1, total_boxes)
-            actual_boxes_in_large_box = end_box - start_box + 1
-            actual_pieces_in_large_box = actual_boxes_in_large_box * pieces_per_box
-
-            # 计算大箱标Carton No - 格式：当前大箱/总大箱数  
-            carton_no = regular_data_processor.calculate_carton_range_for_large_box(large_box_num, total_large_boxes)
+            # 序列号范围（含边界检查）、实际张数（最后一大箱按实际盒数）、Carton No（当前大箱/总大箱数）
+            serial_range = label['serial']
+            actual_pieces_in_large_box = label['quantity']
+            carton_no = label['carton_no']
             
             # 获取标签模版类型
             template_type = params.get("标签模版", "有纸卡备注")
@@ -616,7 +554,7 @@ class RegularTemplate(PDFBaseUtils):
         total_large_boxes: int, total_boxes: int, serial_font_size: int = 10
     ):
         """创建单个二级箱标PDF文件"""
-        c = canvas.Canvas(output_path, pagesize=self.page_size)
+        c = open_canvas(output_path, self.page_size, params.get("流式写入", False), params.get("压缩线程数"))
         width, height = self.page_size
 
         # 设置PDF/X兼容模式和CMYK颜色
@@ -633,7 +571,7 @@ class RegularTemplate(PDFBaseUtils):
         if start_large_box == 1:
             # 获取中文名称参数
             # 清理中文名称（可能包含Excel换行符\n和Windows非法字符）
-            chinese_name = _clean_for_filename(params.get("中文名称", ""))
+            chinese_name = clean_for_filename(params.get("中文名称", ""))
             # 获取标签模版类型
             template_type = params.get("标签模版", "有纸卡备注")
             
@@ -646,29 +584,21 @@ class RegularTemplate(PDFBaseUtils):
             c.showPage()
             c.setFillColor(cmyk_black)
 
+        # 序列号范围、实际张数和Carton No从任务的标签计划中按行读取
+        carton_plan = build_label_plan('regular_box', data, params).level('箱标')
+
         # 生成指定范围的箱标
-        for large_box_num in range(start_large_box, end_large_box + 1):
+        for large_box_num, label in zip(range(start_large_box, end_large_box + 1),
+                                        carton_plan.iter_rows(start_large_box - 1, end_large_box)):
             if large_box_num > start_large_box or start_large_box == 1:  # 修改条件，考虑空标签页
                 if not (large_box_num == start_large_box and start_large_box == 1):  # 避免重复showPage
                     c.showPage()
                     c.setFillColor(cmyk_black)
 
-            # 🔧 使用修复后的数据处理器计算序列号范围（包含边界检查）
-            # 二级模式：复用大箱标逻辑，但设置 small_boxes_per_large_box = 1
-            serial_range = regular_data_processor.generate_regular_large_box_serial_range(
-                base_number, large_box_num, 1, boxes_per_large_box, total_boxes
-            )
-
-            # 🔧 计算当前箱的实际张数（考虑最后一箱的边界情况）
-            pieces_per_box = int(params["张/盒"])
-            # 计算当前箱实际包含的盒数
-            start_box = (large_box_num - 1) * boxes_per_large_box + 1
-            end_box = min(start_box + boxes_per_large_box - 1, total_boxes)
-            actual_boxes_in_large_box = end_box - start_box + 1
-            actual_pieces_in_large_box = actual_boxes_in_large_box * pieces_per_box
-
-            # 计算箱标Carton No - 格式：当前箱/总箱数  
-            carton_no = regular_data_processor.calculate_carton_range_for_large_box(large_box_num, total_large_boxes)
+            # 二级模式：序列号范围（含边界检查）、实际张数、Carton No（当前箱/总箱数）
+            serial_range = label['serial']
+            actual_pieces_in_large_box = label['quantity']
+            carton_no = label['carton_no']
             
             # 获取标签模版类型
             template_type = params.get("标签模版", "有纸卡备注")
@@ -0,0 +1,151 @@
+"""
+序列号反向查询
+
+仓库扫描盒标序列号（如 DSK01234-05）后，不重新生成任务即可查到它所在的盒、套、
+小箱、大箱以及各级标签PDF中的页码；也可以反过来列出某个箱内的全部盒标序列号。
+位置用数据处理器的闭式逆运算计算（常规模板指定逐箱容量时用标签计划的前缀和索引），
+标签文本从任务的标签计划中读取。
+"""
+
+import math
+from typing import Any, Dict, List
+
+from src.data.job_records import CAPACITY_FIELDS
+from src.pdf.label_plan import build_label_plan, first_label_page
+from src.pdf.regular_box.data_processor import regular_data_processor
+from src.pdf.split_box.data_processor import split_box_data_processor
+
+
+def _packing(template: str, data: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """任务的装箱参数（与模板中的取值方式一致）"""
+    total_boxes = math.ceil(int(float(data['总张数'])) / int(params['张/盒']))
+    has_small_box = bool(params.get('是否有小箱', True))
+    return {
+        'base_number': data.get('开始号') or None,
+        'total_boxes': total_boxes,
+        'boxes_per_set': int(params.get('盒/套', params.get('boxes_per_set', 1))) if template == 'split_box' else 1,
+        'boxes_per_small_box': int(params['盒/小箱']),
+        'small_boxes_per_large_box': int(params.get('小箱/大箱', 1)) if has_small_box else 1,
+        'has_small_box': has_small_box,
+    }
+
+
+def _has_capacities(params: Dict[str, Any]) -> bool:
+    """是否指定了逐箱容量"""
+    return any(params.get(field) for field in CAPACITY_FIELDS)
+
+
+def _carton_label(plan, level: str, number: int) -> Dict[str, Any]:
+    """箱标的编号、页码（第一页为空箱标签）和标签上的内容"""
+    if number > len(plan.level(level)):
+        # 按当前装箱参数计算的箱数不足以装下该盒，没有对应的标签
+        return {'number': number, 'page': None, 'serial_range': None, 'quantity': None, 'carton_no': None}
+    label = plan.level(level).row(number - 1)
+    return {
+        'number': number,
+        'page': number + first_label_page(level) - 1,
+        'serial_range': label['serial'],
+        'quantity': label['quantity'],
+        'carton_no': label['carton_no'],
+    }
+
+
+def locate_serial(template: str, data: Dict[str, Any], params: Dict[str, Any], serial: str) -> Dict[str, Any]:
+    """
+    查询盒标序列号所在的盒、套、小箱、大箱和页码
+
+    Args:
+        template: 'regular_box' 或 'split_box'
+        data: 六字段标准数据
+        params: 包装参数
+        serial: 盒标序列号
+
+    Returns:
+        {'serial', 'box', 'set'/'box_in_set'（分盒模板）,
+         'labels': {级别名称: {'number', 'page', ...}}}，级别名称与generated_files的键一致，
+        页码从1开始；未生成盒标时没有'盒标'
+
+    Raises:
+        ValueError: 序列号不属于本任务
+    """
+    packing = _packing(template, data, params)
+    if template == 'split_box':
+        position = split_box_data_processor.locate_serial(
+            serial, packing['base_number'], packing['boxes_per_set'], packing['boxes_per_small_box'],
+            packing['small_boxes_per_large_box'], packing['total_boxes'], packing['has_small_box']
+        )
+    else:
+        position = regular_data_processor.locate_serial(
+            serial, packing['base_number'], packing['boxes_per_small_box'],
+            packing['small_boxes_per_large_box'], packing['total_boxes'], packing['has_small_box']
+        )
+
+    plan = build_label_plan(template, data, params)
+    if template == 'regular_box' and _has_capacities(params):
+        # 逐箱容量：在装箱索引中二分查找
+        if packing['has_small_box']:
+            position['small_box'] = plan.carton_for_box('小箱标', position['box'])
+            position['large_box'] = plan.carton_for_box('大箱标', position['box'])
+        else:
+            position['large_box'] = plan.carton_for_box('箱标', position['box'])
+    labels = {}
+    if params.get('是否有盒标', False):
+        labels['盒标'] = {'number': position['box'], 'page': position['box'] + first_label_page('盒标', params) - 1}
+    if packing['has_small_box']:
+        labels['小箱标'] = _carton_label(plan, '小箱标', position['small_box'])
+        labels['大箱标'] = _carton_label(plan, '大箱标', position['large_box'])
+    else:
+        labels['箱标'] = _carton_label(plan, '箱标', position['large_box'])
+
+    result = {'serial': serial, 'box': position['box']}
+    if template == 'split_box':
+        result['set'] = position['set']
+        result['box_in_set'] = position['box_in_set']
+    result['labels'] = labels
+    return result
+
+
+def carton_contents(template: str, data: Dict[str, Any], params: Dict[str, Any],
+                    level: str, number: int) -> Dict[str, Any]:
+    """
+    范围查询：某个小箱/大箱/箱内的全部盒标序列号
+
+    Args:
+        template: 'regular_box' 或 'split_box'
+        data: 六字段标准数据
+        params: 包装参数
+        level: '小箱标'、'大箱标' 或 '箱标'（无小箱模式）
+        number: 箱号（从1开始）
+
+    Returns:
+        {'level', 'number', 'page', 'serial_range', 'quantity', 'carton_no',
+         'boxes': [起始盒号, 结束盒号], 'serials': 盒标序列号列表}
+
+    Raises:
+        ValueError: 级别或箱号不属于本任务
+    """
+    plan = build_label_plan(template, data, params)
+    if level == '盒标' or level not in plan.levels:
+        raise ValueError(f"本任务没有'{level}'，可查询: {', '.join(name for name in plan.levels if name != '盒标')}")
+    if not 1 <= number <= len(plan.level(level)):
+        raise ValueError(f"{level}编号应为1-{len(plan.level(level))}，当前值：{number}")
+
+    packing = _packing(template, data, params)
+    boxes_per_carton = packing['boxes_per_small_box']
+    if level == '大箱标':
+        boxes_per_carton *= packing['small_boxes_per_large_box']
+    if template == 'regular_box' and _has_capacities(params):
+        start_box, end_box = plan.box_range(level, number)
+    elif template == 'split_box':
+        start_box, end_box = split_box_data_processor.box_range_for_carton(
+            number, packing['boxes_per_set'], boxes_per_carton, packing['total_boxes']
+        )
+    else:
+        start_box, end_box = regular_data_processor.box_range_for_carton(number, boxes_per_carton, packing['total_boxes'])
+
+    serials: List[str] = [row['serial'] for row in plan.level('盒标').iter_rows(start_box - 1, end_box)]
+    result = _carton_label(plan, level, number)
+    result['level'] = level
+    result['boxes'] = [start_box, end_box]
+    result['serials'] = serials
+    return result
@@ -0,0 +1,140 @@
+"""
+盒标分片并行渲染
+
+一个任务的盒标是一个文件，页数可达数十万。这里把盒号范围切成连续的分片交给进程池：
+主进程先写入文件头、空白首页并预编译版式，为全部页面预留连续的对象编号；
+每个工作进程用快速引擎的分片写入器把自己那段页面（内容流 + 页面对象）写到临时文件；
+主进程按页序把分片原样拼接到输出文件，最后写入字体（每种字体/子集只嵌入一次）和交叉引用表。
+
+分片按主进程的字体快照编码文本。序列号中出现快照以外的字符（需要新的TrueType子集编码
+或Type1替代字体）时分片失败，整个文件改为单进程渲染，输出不变。
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.pdf.fast_label_writer import FastLabelWriter, PageShardWriter, box_label_page, write_box_label_file
+from src.pdf.label_layout import blank_page_layout
+from src.pdf.label_plan import build_label_plan
+from src.utils.font_manager import font_manager
+
+
+# 每个分片至少的页数（页数太少时进程启动和拼接的开销大于收益）
+MIN_SHARD_PAGES = 2000
+
+# 每个工作进程分到的分片数：多于1个时，主进程拼接前面的分片与后面分片的渲染重叠
+SHARDS_PER_WORKER = 2
+
+
+def _shard_ranges(start: int, stop: int, workers: int) -> List[Tuple[int, int]]:
+    """把行范围 [start, stop) 切成连续的分片"""
+    total = stop - start
+    if workers <= 1:
+        return [(start, stop)]
+    count = max(1, min(workers * SHARDS_PER_WORKER, total // MIN_SHARD_PAGES))
+    bounds = [start + total * i // count for i in range(count + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _render_shard(task: Dict[str, Any]) -> List[int]:
+    """
+    工作进程：渲染一段连续的盒标页面到分片文件
+
+    Returns:
+        分片内各对象的相对偏移量
+    """
+    font_manager.register_chinese_font()
+    layout, serial_text = box_label_page(task["style"], task["page_size"], task["top_text"], task["top_text_y"],
+                                         task["serial_number_y"], task["ticket_count"])
+    box_plan = build_label_plan(task["template"], task["data"], task["params"]).level('盒标')
+
+    writer = PageShardWriter(task["shard_path"], task["page_size"], task["first_obj"], task["fonts"])
+    try:
+        for label in box_plan.iter_rows(task["start"], task["stop"]):
+            writer.add_page(layout, {"serial": serial_text(label['serial'])})
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.finish()
+
+
+def _write_sharded(output_path: str, page_size: Tuple[float, float], style: str, top_text: str,
+                   template: str, data: Dict[str, Any], params: Dict[str, Any], shards: List[Tuple[int, int]],
+                   top_text_y: float, serial_number_y: float, ticket_count, chinese_name: str,
+                   title: str, subject: str, workers: int) -> int:
+    width, height = page_size
+    layout, _ = box_label_page(style, page_size, top_text, top_text_y, serial_number_y, ticket_count)
+    shard_dir = tempfile.mkdtemp(prefix=".shards-", dir=os.path.dirname(os.path.abspath(output_path)))
+    # 页面在各工作进程中压缩，主进程只写空白首页，不需要压缩线程
+    with FastLabelWriter(output_path, page_size, title=title, subject=subject, compress_workers=0) as writer:
+        if chinese_name:
+            writer.add_page(blank_page_layout(style, width, height, chinese_name))
+        writer.prepare(layout)
+        total_pages = shards[-1][1] - shards[0][0]
+        first_obj = writer.reserve_objects(2 * total_pages)
+        fonts = writer.font_snapshot()
+
+        tasks = []
+        for index, (start, stop) in enumerate(shards):
+            tasks.append({
+                "template": template, "data": data, "params": params, "page_size": page_size, "style": style,
+                "top_text": top_text, "top_text_y": top_text_y, "serial_number_y": serial_number_y,
+                "ticket_count": ticket_count, "start": start, "stop": stop, "fonts": fonts,
+                "first_obj": first_obj + 2 * (start - shards[0][0]),
+                "shard_path": os.path.join(shard_dir, f"{index:05d}.part"),
+            })
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_render_shard, task) for task in tasks]
+                # 按页序拼接：等待第i个分片时，后面的分片仍在其他进程中渲染
+                for task, future in zip(tasks, futures):
+                    writer.append_shard(task["shard_path"], task["first_obj"], future.result())
+                    os.remove(task["shard_path"])
+        finally:
+            for task in tasks:
+                if os.path.exists(task["shard_path"]):
+                    os.remove(task["shard_path"])
+            os.rmdir(shard_dir)
+        return writer.page_count
+
+
+def write_box_labels(output_path: str, page_size: Tuple[float, float], style: str, top_text: str,
+                     template: str, data: Dict[str, Any], params: Dict[str, Any], start_box: int, end_box: int,
+                     top_text_y: float, serial_number_y: float, ticket_count=None, chinese_name: str = "",
+                     title: str = "", subject: str = "", workers: Optional[int] = None) -> int:
+    """
+    用快速引擎生成盒标文件，页数足够多且 workers > 1 时按盒号分片并行渲染
+
+    Args:
+        output_path: 输出PDF路径
+        page_size: 页面尺寸
+        style: "外观一" 或 "外观二"
+        top_text: 标题（外观二为Game title）
+        template: 'regular_box' 或 'split_box'（序列号从该模板的标签计划读取）
+        data, params: 任务数据和参数（单进程渲染时按params["压缩线程数"]在后台压缩页面）
+        start_box, end_box: 盒号范围（从1开始，含两端）
+        top_text_y, serial_number_y: 外观一标题和序列号的基线位置
+        ticket_count: 外观二的Ticket count
+        chinese_name: 中文名称，非空时第一页为空白首页
+        title, subject: 文档信息
+        workers: 渲染进程数，None或1为单进程
+
+    Returns:
+        写入的页数
+    """
+    shards = _shard_ranges(start_box - 1, end_box, workers or 1)
+    if len(shards) > 1:
+        try:
+            return _write_sharded(output_path, page_size, style, top_text, template, data, params, shards,
+                                  top_text_y, serial_number_y, ticket_count, chinese_name, title, subject, workers)
+        except Exception as e:
+            print(f"⚠️ 盒标分片渲染失败，改为单进程渲染: {e}")
+
+    box_plan = build_label_plan(template, data, params).level('盒标')
+    serial_numbers = (label['serial'] for label in box_plan.iter_rows(start_box - 1, end_box))
+    return write_box_label_file(output_path, page_size, style, top_text, serial_numbers, top_text_y,
+                                serial_number_y, ticket_count=ticket_count, chinese_name=chinese_name,
+                                title=title, subject=subject, compress_workers=params.get("压缩线程数"))
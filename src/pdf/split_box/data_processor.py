@@ -4,12 +4,13 @@
 """
 
 import pandas as pd
-import re
 import math
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 # 导入现有的通用Excel工具，确保功能一致性
 from src.utils.excel_data_extractor import ExcelDataExtractor
+from src.data.extraction_cache import extraction_cache
+from src.utils.serial_formatter import get_serial_scheme, serial_formatter
 
 
 class SplitBoxDataProcessor:
@@ -24,7 +25,8 @@ class SplitBoxDataProcessor:
         提取分盒盒标所需的数据 - 使用统一的公共数据提取方法
         """
         # 使用统一的公共数据提取方法
-        extractor = ExcelDataExtractor(excel_file_path)
+        extractor = ExcelDataExtractor(excel_file_path, reader_mode='bounded', cache=extraction_cache,
+                                       scan_all_sheets=True)
         return extractor.extract_common_data()
     
     def extract_small_box_label_data(self, excel_file_path: str) -> Dict[str, Any]:
@@ -32,7 +34,8 @@ class SplitBoxDataProcessor:
         提取分盒小箱标所需的数据 - 使用统一的公共数据提取方法
         """
         # 使用统一的公共数据提取方法
-        extractor = ExcelDataExtractor(excel_file_path)
+        extractor = ExcelDataExtractor(excel_file_path, reader_mode='bounded', cache=extraction_cache,
+                                       scan_all_sheets=True)
         return extractor.extract_common_data()
     
     def extract_large_box_label_data(self, excel_file_path: str) -> Dict[str, Any]:
@@ -40,37 +43,16 @@ class SplitBoxDataProcessor:
         提取分盒大箱标所需的数据 - 使用统一的公共数据提取方法
         """
         # 使用统一的公共数据提取方法
-        extractor = ExcelDataExtractor(excel_file_path)
+        extractor = ExcelDataExtractor(excel_file_path, reader_mode='bounded', cache=extraction_cache,
+                                       scan_all_sheets=True)
         return extractor.extract_common_data()
     
     def parse_serial_number_format(self, serial_number: str) -> Dict[str, Any]:
         """
         解析序列号格式 - 保持原始数字格式
-        对应原来代码中的正则表达式解析逻辑，增强以保持原始位数
-        """
-        # 分盒模板使用简单的数字提取逻辑（与原代码一致）
-        match = re.search(r'(\d+)', serial_number)
-        if match:
-            # 获取第一个数字（主号）的起始位置
-            digit_start = match.start()
-            # 截取主号前面的所有字符作为前缀
-            prefix_part = serial_number[:digit_start]
-            original_number_str = match.group(1)  # 原始数字字符串
-            base_main_num = int(original_number_str)  # 主号数值
-            
-            return {
-                'prefix': prefix_part,
-                'main_number': base_main_num,
-                'original_digits': len(original_number_str),  # 🔑 新增：原始位数
-                'digit_start': digit_start
-            }
-        else:
-            return {
-                'prefix': 'DSK',
-                'main_number': 1001,
-                'original_digits': 5,  # 默认5位
-                'digit_start': 0
-            }
+        第一个数字序列为主号，之前的全部字符为前缀（与通用序列号格式化工具一致）
+        """
+        return serial_formatter.parse_serial_number_format(serial_number)
     
     def format_serial_number(self, prefix: str, number: int, original_digits: int) -> str:
         """
@@ -117,7 +99,7 @@ class SplitBoxDataProcessor:
         """
         # 计算副号进位阈值
         group_size = boxes_per_small_box * small_boxes_per_large_box
-        serial_info = self.parse_serial_number_format(base_number)
+        scheme = get_serial_scheme(base_number, 'split')
         
         # 分盒模板序列号生成逻辑（与原代码完全一致）
         box_index = box_num - 1  # 转换为0-based索引
@@ -126,8 +108,8 @@ class SplitBoxDataProcessor:
         main_increments = box_index // group_size  # 主号增加的次数
         suffix_in_group = (box_index % group_size) + 1  # 当前组内的副号（1-based）
         
-        current_main = serial_info['main_number'] + main_increments
-        current_number = f"{self.format_serial_number(serial_info['prefix'], current_main, serial_info['original_digits'])}-{suffix_in_group:02d}"
+        current_main = scheme.number(main_increments)
+        current_number = scheme.format_sub(main_increments, suffix_in_group)
         
         print(f"📝 分盒盒标 #{box_num}: 主号{current_main}, 副号{suffix_in_group}, 分组大小{group_size}({boxes_per_small_box}×{small_boxes_per_large_box}) → {current_number}")
         return current_number
@@ -159,14 +141,8 @@ class SplitBoxDataProcessor:
         # 3. 计算套内盒号（从1开始）
         box_in_set = (box_index % boxes_per_set) + 1
         
-        # 解析基准序列号
-        serial_info = self.parse_serial_number_format(base_number)
-        
-        # 计算当前套的主号：基准主号 + (套号-1)
-        current_main = serial_info['main_number'] + (set_num - 1)
-        
-        # 生成Serial号：父级编号为套，子级编号为盒
-        result = f"{self.format_serial_number(serial_info['prefix'], current_main, serial_info['original_digits'])}-{box_in_set:02d}"
+        # 当前套的主号：基准主号 + (套号-1)；生成Serial号：父级编号为套，子级编号为盒
+        result = get_serial_scheme(base_number, 'split').format_sub(set_num - 1, box_in_set)
         
         print(f"📝 [新盒标Serial] 盒#{box_num} → 套{set_num}盒{box_in_set} → {result} (父级编号=套{set_num}, 子级编号=盒{box_in_set})")
         return result
@@ -180,7 +156,7 @@ class SplitBoxDataProcessor:
         """
         # 计算副号进位阈值
         group_size = boxes_per_small_box * small_boxes_per_large_box
-        serial_info = self.parse_serial_number_format(base_number)
+        scheme = get_serial_scheme(base_number, 'split')
         
         # 计算当前小箱包含的盒子范围
         start_box = (small_box_num - 1) * boxes_per_small_box + 1
@@ -194,15 +170,13 @@ class SplitBoxDataProcessor:
         first_box_index = start_box - 1
         first_main_increments = first_box_index // group_size
         first_suffix = (first_box_index % group_size) + 1
-        first_main = serial_info['main_number'] + first_main_increments
-        first_serial = f"{self.format_serial_number(serial_info['prefix'], first_main, serial_info['original_digits'])}-{first_suffix:02d}"
+        first_serial = scheme.format_sub(first_main_increments, first_suffix)
         
         # 计算范围内最后一个盒子的序列号  
         last_box_index = end_box - 1
         last_main_increments = last_box_index // group_size
         last_suffix = (last_box_index % group_size) + 1
-        last_main = serial_info['main_number'] + last_main_increments
-        last_serial = f"{self.format_serial_number(serial_info['prefix'], last_main, serial_info['original_digits'])}-{last_suffix:02d}"
+        last_serial = scheme.format_sub(last_main_increments, last_suffix)
         
         # 始终显示为范围格式，即使首尾序列号相同
         serial_range = f"{first_serial}-{last_serial}"
@@ -220,7 +194,7 @@ class SplitBoxDataProcessor:
         """
         # 计算副号进位阈值
         group_size = boxes_per_small_box * small_boxes_per_large_box
-        serial_info = self.parse_serial_number_format(base_number)
+        scheme = get_serial_scheme(base_number, 'split')
         
         # 计算当前大箱包含的小箱范围
         start_small_box = (large_box_num - 1) * small_boxes_per_large_box + 1
@@ -238,15 +212,13 @@ class SplitBoxDataProcessor:
         first_box_index = start_box - 1
         first_main_increments = first_box_index // group_size
         first_suffix = (first_box_index % group_size) + 1
-        first_main = serial_info['main_number'] + first_main_increments
-        first_serial = f"{self.format_serial_number(serial_info['prefix'], first_main, serial_info['original_digits'])}-{first_suffix:02d}"
+        first_serial = scheme.format_sub(first_main_increments, first_suffix)
         
         # 计算范围内最后一个盒子的序列号
         last_box_index = end_box - 1
         last_main_increments = last_box_index // group_size
         last_suffix = (last_box_index % group_size) + 1
-        last_main = serial_info['main_number'] + last_main_increments
-        last_serial = f"{self.format_serial_number(serial_info['prefix'], last_main, serial_info['original_digits'])}-{last_suffix:02d}"
+        last_serial = scheme.format_sub(last_main_increments, last_suffix)
         
         # 始终显示为范围格式，即使首尾序列号相同
         serial_range = f"{first_serial}-{last_serial}"
@@ -363,14 +335,8 @@ class SplitBoxDataProcessor:
         set_num = math.ceil(box_num / boxes_per_set)
         box_in_set = ((box_num - 1) % boxes_per_set) + 1
         
-        # 解析基准序列号
-        serial_info = self.parse_serial_number_format(base_number)
-        
-        # 计算当前套的主号：基准主号 + (套号-1)
-        current_main = serial_info['main_number'] + (set_num - 1)
-        
-        # 生成Serial号
-        result = f"{self.format_serial_number(serial_info['prefix'], current_main, serial_info['original_digits'])}-{box_in_set:02d}"
+        # 当前套的主号：基准主号 + (套号-1)
+        result = get_serial_scheme(base_number, 'split').format_sub(set_num - 1, box_in_set)
         
         print(f"📝 [套盒Serial] 盒#{box_num} → 套{set_num}盒{box_in_set} → {result}")
         return result
@@ -443,11 +409,9 @@ class SplitBoxDataProcessor:
             print(f"    套内盒子范围: {start_box_in_set}-{end_box_in_set}")
             
             # 生成套内Serial范围
-            serial_info = self.parse_serial_number_format(base_number)
-            set_main_number = serial_info['main_number'] + (set_num - 1)
-            
-            start_serial = f"{self.format_serial_number(serial_info['prefix'], set_main_number, serial_info['original_digits'])}-{start_box_in_set:02d}"
-            end_serial = f"{self.format_serial_number(serial_info['prefix'], set_main_number, serial_info['original_digits'])}-{end_box_in_set:02d}"
+            scheme = get_serial_scheme(base_number, 'split')
+            start_serial = scheme.format_sub(set_num - 1, start_box_in_set)
+            end_serial = scheme.format_sub(set_num - 1, end_box_in_set)
         
         # 生成范围格式 - 始终显示为范围形式
         result = f"{start_serial}-{end_serial}"
@@ -539,11 +503,9 @@ class SplitBoxDataProcessor:
             print(f"    套内盒子范围: {start_box_in_set}-{end_box_in_set}")
             
             # 生成套内Serial范围
-            serial_info = self.parse_serial_number_format(base_number)
-            set_main_number = serial_info['main_number'] + (set_num - 1)
-            
-            start_serial = f"{self.format_serial_number(serial_info['prefix'], set_main_number, serial_info['original_digits'])}-{start_box_in_set:02d}"
-            end_serial = f"{self.format_serial_number(serial_info['prefix'], set_main_number, serial_info['original_digits'])}-{end_box_in_set:02d}"
+            scheme = get_serial_scheme(base_number, 'split')
+            start_serial = scheme.format_sub(set_num - 1, start_box_in_set)
+            end_serial = scheme.format_sub(set_num - 1, end_box_in_set)
         
         # 生成范围格式 - 始终显示为范围形式
         result = f"{start_serial}-{end_serial}"
@@ -722,5 +684,81 @@ class SplitBoxDataProcessor:
             return actual_quantity
 
 
+    # ========== 反向查询：序列号 → 盒、套、小箱、大箱 ==========
+
+    def carton_for_box(self, box_num: int, boxes_per_set: int, boxes_per_carton: int) -> int:
+        """
+        计算盒所在的箱号（小箱或大箱），与序列号范围的分配规则一致
+
+        一套分多箱（箱容量 < 盒/套）时按套内盒号分箱，否则按全局盒号均匀分箱
+        """
+        if boxes_per_set > 1 and boxes_per_carton < boxes_per_set:
+            cartons_per_set = math.ceil(boxes_per_set / boxes_per_carton)
+            set_index, box_index_in_set = divmod(box_num - 1, boxes_per_set)
+            return set_index * cartons_per_set + box_index_in_set // boxes_per_carton + 1
+        return (box_num - 1) // boxes_per_carton + 1
+
+    def box_range_for_carton(self, carton_num: int, boxes_per_set: int, boxes_per_carton: int,
+                             total_boxes: int) -> Tuple[int, int]:
+        """
+        计算箱内的盒号范围（carton_for_box的逆运算）
+
+        Returns:
+            (起始盒号, 结束盒号)，1-based含首尾；箱内没有盒时结束盒号 = 起始盒号 - 1
+        """
+        if boxes_per_set > 1 and boxes_per_carton < boxes_per_set:
+            cartons_per_set = math.ceil(boxes_per_set / boxes_per_carton)
+            set_index, carton_index_in_set = divmod(carton_num - 1, cartons_per_set)
+            set_offset = set_index * boxes_per_set
+            start_box = set_offset + carton_index_in_set * boxes_per_carton + 1
+            end_box = set_offset + min((carton_index_in_set + 1) * boxes_per_carton, boxes_per_set)
+        else:
+            start_box = (carton_num - 1) * boxes_per_carton + 1
+            end_box = carton_num * boxes_per_carton
+        return start_box, max(min(end_box, total_boxes), start_box - 1)
+
+    def locate_serial(self, serial: str, base_number: str, boxes_per_set: int, boxes_per_small_box: int,
+                      small_boxes_per_large_box: int, total_boxes: int, has_small_box: bool = True) -> Dict[str, Any]:
+        """
+        反向查询盒标序列号所在的盒、套、小箱和大箱（generate_box_serial_with_set_logic的逆运算）
+
+        参数:
+            serial: 盒标序列号（如 DSK01234-05）
+            base_number: 开始号
+            boxes_per_set: 盒/套数量
+            boxes_per_small_box: 盒/小箱数量（无小箱时为盒/箱）
+            small_boxes_per_large_box: 小箱/大箱数量
+            total_boxes: 总盒数
+            has_small_box: 是否有小箱
+
+        返回:
+            {'box': 盒号, 'set': 套号, 'box_in_set': 套内盒号,
+             'small_box': 小箱号（无小箱时为None）, 'large_box': 大箱号（无小箱时为箱号）}
+
+        Raises:
+            ValueError: 序列号不属于本任务
+        """
+        main_offset, box_in_set = get_serial_scheme(base_number, 'split').offset_of(serial)
+        if box_in_set is None or not 1 <= box_in_set <= boxes_per_set:
+            raise ValueError(f"序列号'{serial}'的副号应为01-{boxes_per_set:02d}")
+        box_num = main_offset * boxes_per_set + box_in_set
+        if box_num > total_boxes:
+            raise ValueError(f"序列号'{serial}'超出本任务的{total_boxes}盒")
+
+        if has_small_box:
+            small_box_num = self.carton_for_box(box_num, boxes_per_set, boxes_per_small_box)
+            boxes_per_large_box = boxes_per_small_box * small_boxes_per_large_box
+        else:
+            small_box_num = None
+            boxes_per_large_box = boxes_per_small_box
+        return {
+            'box': box_num,
+            'set': main_offset + 1,
+            'box_in_set': box_in_set,
+            'small_box': small_box_num,
+            'large_box': self.carton_for_box(box_num, boxes_per_set, boxes_per_large_box),
+        }
+
+
 # 创建全局实例供split_box模板使用
 split_box_data_processor = SplitBoxDataProcessor()
\ No newline at end of file
@@ -2,56 +2,22 @@
 Split Box Template - Multi-level PDF generation with special serial number logic
 """
 import math
-import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
-from reportlab.pdfgen import canvas
 from reportlab.lib.colors import CMYKColor
 # 导入基础工具类
 from src.utils.pdf_base import PDFBaseUtils
+from src.utils.filename_utils import clean_for_filename
 
-# 导入分盒模板专属数据处理器和渲染器
-from src.pdf.split_box.data_processor import split_box_data_processor
+# 导入分盒模板专属渲染器和标签计划
 from src.pdf.split_box.renderer import split_box_renderer
-from src.utils.carton_summary_generator import generate_carton_summary_for_template
-
-
-def _clean_for_filename(text: str) -> str:
-    r"""
-    清理文本使其适合作为Windows/macOS文件名
-
-    处理问题：
-    1. 换行符 (\n, \r) - Excel单元格中的换行会导致Windows文件名错误
-    2. Windows非法字符 (< > : " / \ | ? *)
-    3. 控制字符（ASCII 0-31）
-
-    Args:
-        text: 原始文本
-
-    Returns:
-        清理后的安全文本
-    """
-    if not text:
-        return ""
-
-    # 转为字符串并清理
-    text = str(text)
-
-    # 1. 替换换行符为空格（Excel单元格中的换行）
-    text = text.replace('\n', ' ').replace('\r', ' ')
-
-    # 2. 移除Windows非法字符: < > : " / \ | ? * 和控制字符（ASCII 0-31）
-    text = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', text)
-
-    # 3. 移除前后空格和点号（Windows不允许文件名以这些结尾）
-    text = text.strip('. ')
-
-    # 4. 压缩多余的空格和下划线
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'_+', '_', text)
-
-    return text
+from src.pdf.label_plan import build_label_plan
+from src.pdf.fast_label_writer import RENDER_ENGINE_FAST, fast_engine_supported
+from src.pdf.sharded_box_labels import write_box_labels
+from src.pdf.streaming_canvas import open_canvas
+from src.pdf.plan_validation import validate_label_plan
+from src.pdf.label_levels import render_carton_summary, render_level, run_label_levels
 
 
 class SplitBoxTemplate(PDFBaseUtils):
@@ -78,6 +44,9 @@ class SplitBoxTemplate(PDFBaseUtils):
         if "盒/套" not in params:
             print("⚠️ 警告：缺少'盒/套'参数，使用默认值1")
             params["盒/套"] = 1
+        # 先构建并校验标签计划：参数不支持时报错；序列号范围/数量对不上时给出警告，严格校验时报错
+        validate_label_plan(build_label_plan('split_box', data, params), params.get("严格校验", False))
+
         # 检查是否有小箱
         has_small_box = params.get("是否有小箱", True)
         
@@ -132,9 +101,9 @@ class SplitBoxTemplate(PDFBaseUtils):
             print(f"    总大箱数: {total_large_boxes} = ceil({total_sets} ÷ {sets_per_large_box}) (多套分一个大箱)")
 
         # 创建输出目录 - 新格式：编号+英文名+中文名+标签
-        clean_customer_code = _clean_for_filename(data['客户名称编码'])  # 编号
-        clean_label_name = _clean_for_filename(data['标签名称'])  # 英文名
-        clean_chinese_name = _clean_for_filename(params.get("中文名称", ""))  # 中文名
+        clean_customer_code = clean_for_filename(data['客户名称编码'])  # 编号
+        clean_label_name = clean_for_filename(data['标签名称'])  # 英文名
+        clean_chinese_name = clean_for_filename(params.get("中文名称", ""))  # 中文名
         folder_name = f"{clean_customer_code}+{clean_label_name}+{clean_chinese_name}+标签"
         full_output_dir = Path(output_dir) / folder_name
         full_output_dir.mkdir(parents=True, exist_ok=True)
@@ -147,7 +116,7 @@ class SplitBoxTemplate(PDFBaseUtils):
         customer_code = clean_customer_code  # 使用已清理的客户编码
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        generated_files = {}
+        levels = []
 
         # 检查是否需要生成盒标
         has_box_label = params.get("是否有盒标", False)
@@ -159,8 +128,10 @@ class SplitBoxTemplate(PDFBaseUtils):
             box_label_filename = f"{customer_code}_{chinese_name}_{english_name}_分盒盒标_{timestamp}.pdf"
             box_label_path = full_output_dir / box_label_filename
 
-            self._create_split_box_label(data, params, str(box_label_path), selected_appearance, excel_file_path)
-            generated_files["盒标"] = str(box_label_path)
+            levels.append(("盒标", render_level, (
+                self._create_split_box_label, str(box_label_path),
+                data, params, str(box_label_path), selected_appearance, excel_file_path
+            ), {}))
         else:
             print("⏭️ 用户选择无盒标，跳过盒标生成")
 
@@ -169,39 +140,33 @@ class SplitBoxTemplate(PDFBaseUtils):
         small_box_filename = f"{customer_code}_{chinese_name}_{english_name}_分盒小箱标_{timestamp}.pdf"
         small_box_path = full_output_dir / small_box_filename
         remainder_info = {"total_boxes": total_boxes}
-        self._create_split_box_small_box_label(
+        levels.append(("小箱标", render_level, (
+            self._create_split_box_small_box_label, str(small_box_path),
             data, params, str(small_box_path), total_small_boxes, remainder_info, excel_file_path
-        )
-        generated_files["小箱标"] = str(small_box_path)
+        ), {}))
 
         # 生成大箱标
         # 文件名格式：客户编号_中文名称_英文名称_分盒大箱标_日期时间戳
         large_box_filename = f"{customer_code}_{chinese_name}_{english_name}_分盒大箱标_{timestamp}.pdf"
         large_box_path = full_output_dir / large_box_filename
-        self._create_split_box_large_box_label(
+        levels.append(("大箱标", render_level, (
+            self._create_split_box_large_box_label, str(large_box_path),
             data, params, str(large_box_path), total_large_boxes, excel_file_path, large_boxes_per_set_ratio
-        )
-        generated_files["大箱标"] = str(large_box_path)
-
-        # 生成外箱汇总表
-        try:
-            # 计算每箱盒数（有小箱的情况：盒/小箱 × 小箱/大箱）
-            boxes_per_large_box = boxes_per_small_box * small_boxes_per_large_box
-
-            summary_file_path = generate_carton_summary_for_template(
-                output_dir=str(full_output_dir),
-                data=data,
-                params=params,
-                total_large_boxes=total_large_boxes,
-                boxes_per_large_box=boxes_per_large_box
-            )
-            generated_files["外箱汇总表"] = summary_file_path
-            print(f"✅ 外箱汇总表已生成: {summary_file_path}")
-        except Exception as e:
-            print(f"⚠️ 外箱汇总表生成失败: {e}")
-            # 汇总表生成失败不影响主流程
-
-        return generated_files
+        ), {}))
+
+        # 生成外箱汇总表（失败不影响主流程）
+        # 计算每箱盒数（有小箱的情况：盒/小箱 × 小箱/大箱）
+        boxes_per_large_box = boxes_per_small_box * small_boxes_per_large_box
+        levels.append(("外箱汇总表", render_carton_summary, (), dict(
+            output_dir=str(full_output_dir),
+            data=data,
+            params=params,
+            total_large_boxes=total_large_boxes,
+            boxes_per_large_box=boxes_per_large_box
+        )))
+
+        # 各级标签互相独立，按级别进程数并行生成
+        return run_label_levels(levels, params.get("级别进程数"))
     
     def _create_two_level_pdfs(self, data: Dict[str, Any], params: Dict[str, Any], output_dir: str, excel_file_path: str = None) -> Dict[str, str]:
         """
@@ -256,9 +221,9 @@ class SplitBoxTemplate(PDFBaseUtils):
             print(f"    总大箱数: {total_large_boxes} = ceil({total_sets} ÷ {sets_per_large_box}) (多套分一个大箱)")
 
         # 创建输出目录 - 新格式：编号+英文名+中文名+标签
-        clean_customer_code = _clean_for_filename(data['客户名称编码'])  # 编号
-        clean_label_name = _clean_for_filename(data['标签名称'])  # 英文名
-        clean_chinese_name = _clean_for_filename(params.get("中文名称", ""))  # 中文名
+        clean_customer_code = clean_for_filename(data['客户名称编码'])  # 编号
+        clean_label_name = clean_for_filename(data['标签名称'])  # 英文名
+        clean_chinese_name = clean_for_filename(params.get("中文名称", ""))  # 中文名
         folder_name = f"{clean_customer_code}+{clean_label_name}+{clean_chinese_name}+标签"
         full_output_dir = Path(output_dir) / folder_name
         full_output_dir.mkdir(parents=True, exist_ok=True)
@@ -271,7 +236,7 @@ class SplitBoxTemplate(PDFBaseUtils):
         customer_code = clean_customer_code  # 使用已清理的客户编码
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        generated_files = {}
+        levels = []
 
         # 检查是否需要生成盒标
         has_box_label = params.get("是否有盒标", False)
@@ -283,8 +248,10 @@ class SplitBoxTemplate(PDFBaseUtils):
             box_label_filename = f"{customer_code}_{chinese_name}_{english_name}_分盒盒标_{timestamp}.pdf"
             box_label_path = full_output_dir / box_label_filename
 
-            self._create_split_box_label(data, params, str(box_label_path), selected_appearance, excel_file_path)
-            generated_files["盒标"] = str(box_label_path)
+            levels.append(("盒标", render_level, (
+                self._create_split_box_label, str(box_label_path),
+                data, params, str(box_label_path), selected_appearance, excel_file_path
+            ), {}))
         else:
             print("⏭️ 用户选择无盒标，跳过盒标生成")
 
@@ -293,28 +260,24 @@ class SplitBoxTemplate(PDFBaseUtils):
         large_box_filename = f"{customer_code}_{chinese_name}_{english_name}_分盒箱标_{timestamp}.pdf"
         large_box_path = full_output_dir / large_box_filename
         
-        self._create_two_level_large_box_label(
-            data, params, str(large_box_path), total_large_boxes, total_boxes, boxes_per_large_box, excel_file_path, large_boxes_per_set_ratio
-        )
-        generated_files["箱标"] = str(large_box_path)
-
-        # 生成外箱汇总表
-        try:
-            # 无小箱的情况，每箱盒数就是 boxes_per_large_box
-            summary_file_path = generate_carton_summary_for_template(
-                output_dir=str(full_output_dir),
-                data=data,
-                params=params,
-                total_large_boxes=total_large_boxes,
-                boxes_per_large_box=boxes_per_large_box
-            )
-            generated_files["外箱汇总表"] = summary_file_path
-            print(f"✅ 外箱汇总表已生成: {summary_file_path}")
-        except Exception as e:
-            print(f"⚠️ 外箱汇总表生成失败: {e}")
-            # 汇总表生成失败不影响主流程
-
-        return generated_files
+        levels.append(("箱标", render_level, (
+            self._create_two_level_large_box_label, str(large_box_path),
+            data, params, str(large_box_path), total_large_boxes, total_boxes, boxes_per_large_box, excel_file_path,
+            large_boxes_per_set_ratio
+        ), {}))
+
+        # 生成外箱汇总表（失败不影响主流程）
+        # 无小箱的情况，每箱盒数就是 boxes_per_large_box
+        levels.append(("外箱汇总表", render_carton_summary, (), dict(
+            output_dir=str(full_output_dir),
+            data=data,
+            params=params,
+            total_large_boxes=total_large_boxes,
+            boxes_per_large_box=boxes_per_large_box
+        )))
+
+        # 各级标签互相独立，按级别进程数并行生成
+        return run_label_levels(levels, params.get("级别进程数"))
 
     def _create_split_box_label(self, data: Dict[str, Any], params: Dict[str, Any], output_path: str, style: str, excel_file_path: str = None):
         """创建split box template box labels - 特殊序列号逻辑"""
@@ -343,19 +306,8 @@ class SplitBoxTemplate(PDFBaseUtils):
     def _create_single_split_box_label_file(self, data: Dict[str, Any], params: Dict[str, Any], output_path: str, 
                                            style: str, start_box: int, end_box: int, top_text: str, base_number: str, boxes_per_set: int, boxes_per_small_box: int, small_boxes_per_large_box: int):
         """创建单个分盒模板盒标PDF文件"""
-        c = canvas.Canvas(output_path, pagesize=self.page_size)
         width, height = self.page_size
 
-        # 设置PDF/X兼容模式和CMYK颜色
-        c.setPageCompression(1)
-        c.setTitle(f"分盒盒标-{style}-{start_box}到{end_box}")
-        c.setSubject("Fenhe Box Label")
-        c.setCreator("Data-to-PDF Print")
-
-        # 使用CMYK黑色
-        cmyk_black = CMYKColor(0, 0, 0, 1)
-        c.setFillColor(cmyk_black)
-        
         # 真正的三等分留白布局：每个留白区域高度相等
         blank_height = height / 5  # 每个留白区域高度：10mm
         
@@ -365,10 +317,38 @@ class SplitBoxTemplate(PDFBaseUtils):
 
         # 获取中文名称用于空白首页
         # 清理中文名称（可能包含Excel换行符\n和Windows非法字符）
-        chinese_name = _clean_for_filename(params.get("中文名称", ""))
+        chinese_name = clean_for_filename(params.get("中文名称", ""))
         
+        # 序列号从任务的标签计划中按行读取（父级编号为套，子级编号为盒）
+        box_plan = build_label_plan('split_box', data, params).level('盒标')
+
+        render_workers = int(params.get("渲染进程数") or 1)
+        if (params.get("渲染引擎") == RENDER_ENGINE_FAST or render_workers > 1) and fast_engine_supported():
+            # 快速引擎：版式预编译为内容流模板，每页只替换序列号，输出与画布路径相同；
+            # 渲染进程数大于1时按盒号分片并行渲染，再按页序拼接为一个文件
+            has_blank_page = style in ["外观一", "外观二"] and bool(chinese_name)
+            if has_blank_page:
+                print(f"📝 生成分盒盒标空白首页({style}): {chinese_name}")
+            write_box_labels(output_path, self.page_size, style, top_text, 'split_box', data, params, start_box, end_box,
+                             top_text_y, serial_number_y, ticket_count=int(params["张/盒"]),
+                             chinese_name=chinese_name if has_blank_page else "",
+                             title=f"分盒盒标-{style}-{start_box}到{end_box}", subject="Fenhe Box Label", workers=render_workers)
+            return
+
+        c = open_canvas(output_path, self.page_size, params.get("流式写入", False), params.get("压缩线程数"))
+
+        # 设置PDF/X兼容模式和CMYK颜色
+        c.setPageCompression(1)
+        c.setTitle(f"分盒盒标-{style}-{start_box}到{end_box}")
+        c.setSubject("Fenhe Box Label")
+        c.setCreator("Data-to-PDF Print")
+
+        # 使用CMYK黑色
+        cmyk_black = CMYKColor(0, 0, 0, 1)
+        c.setFillColor(cmyk_black)
+
         # 生成指定范围的盒标
-        for box_num in range(start_box, end_box + 1):
+        for box_num, label in zip(range(start_box, end_box + 1), box_plan.iter_rows(start_box - 1, end_box)):
             # 🔥 新增：在第一个标签时添加空白首页（外观1和外观2都支持）
             if box_num == start_box and style in ["外观一", "外观二"] and chinese_name:
                 print(f"📝 生成分盒盒标空白首页({style}): {chinese_name}")
@@ -385,10 +365,7 @@ class SplitBoxTemplate(PDFBaseUtils):
                 c.showPage()
                 c.setFillColor(cmyk_black)
 
-            # 使用新的盒标Serial计算方法：父级编号为套，子级编号为盒
-            current_number = split_box_data_processor.generate_box_serial_with_set_logic(
-                base_number, box_num, boxes_per_set
-            )
+            current_number = label['serial']
 
             # 根据选择的外观渲染
             if style == "外观一":
@@ -446,7 +423,7 @@ class SplitBoxTemplate(PDFBaseUtils):
                                                  remark_text: str, pieces_per_box: int, boxes_per_set: int, boxes_per_small_box: int, 
                                                  total_small_boxes: int, small_boxes_per_large_box: int, total_boxes: int, serial_font_size: int = 10):
         """创建单个分盒小箱标PDF文件"""
-        c = canvas.Canvas(output_path, pagesize=self.page_size)
+        c = open_canvas(output_path, self.page_size, params.get("流式写入", False), params.get("压缩线程数"))
         width, height = self.page_size
 
         # 设置PDF/X兼容模式和CMYK颜色
@@ -463,7 +440,7 @@ class SplitBoxTemplate(PDFBaseUtils):
         if start_small_box == 1:
             # 获取中文名称参数
             # 清理中文名称（可能包含Excel换行符\n和Windows非法字符）
-            chinese_name = _clean_for_filename(params.get("中文名称", ""))
+            chinese_name = clean_for_filename(params.get("中文名称", ""))
             # 获取标签模版类型
             template_type = params.get("标签模版", "有纸卡备注")
             
@@ -476,34 +453,21 @@ class SplitBoxTemplate(PDFBaseUtils):
             c.showPage()
             c.setFillColor(cmyk_black)
 
+        # 序列号范围、实际张数和Carton No从任务的标签计划中按行读取
+        small_box_plan = build_label_plan('split_box', data, params).level('小箱标')
+
         # 生成指定范围的分盒小箱标
-        for small_box_num in range(start_small_box, end_small_box + 1):
+        for small_box_num, label in zip(range(start_small_box, end_small_box + 1),
+                                        small_box_plan.iter_rows(start_small_box - 1, end_small_box)):
             if small_box_num > start_small_box or start_small_box == 1:  # 修改条件，考虑空标签页
                 if not (small_box_num == start_small_box and start_small_box == 1):  # 避免重复showPage
                     c.showPage()
                     c.setFillColor(cmyk_black)
 
-            # 🔧 根据模式选择Serial生成逻辑
-            if boxes_per_set > 1:  # 分/套盒模式
-                serial_range = split_box_data_processor.generate_set_based_small_box_serial_range(
-                    small_box_num, base_number, boxes_per_set, boxes_per_small_box, total_boxes
-                )
-            else:  # 传统分盒模式
-                serial_range = split_box_data_processor.generate_split_small_box_serial_range(
-                    base_number, small_box_num, boxes_per_small_box, small_boxes_per_large_box, total_boxes
-                )
-
-            # 🔧 使用新的quantity计算方法
-            actual_pieces_in_small_box = split_box_data_processor.calculate_actual_quantity_for_small_box(
-                small_box_num, pieces_per_box, boxes_per_small_box, total_boxes
-            )
-
-            # 计算分盒小箱标的Carton No - 基于最新逻辑整理
-            print(f"\n📦 准备计算小箱标 #{small_box_num} 的Carton No")
-            carton_no = split_box_data_processor.calculate_carton_number_for_small_box(
-                small_box_num, boxes_per_set, boxes_per_small_box
-            )
-            print(f"📦 小箱标 #{small_box_num} Carton No计算完成: {carton_no}\n")
+            # 序列号范围（分/套盒或传统分盒规则）、实际张数、Carton No
+            serial_range = label['serial']
+            actual_pieces_in_small_box = label['quantity']
+            carton_no = label['carton_no']
 
             # 获取标签模版类型 - 参照常规模版的实现方式
             template_type = params.get("标签模版", "有纸卡备注")
@@ -571,7 +535,7 @@ class SplitBoxTemplate(PDFBaseUtils):
         if large_boxes_per_set_ratio is None:
             boxes_per_large_box = boxes_per_small_box * small_boxes_per_large_box
             large_boxes_per_set_ratio = boxes_per_set / boxes_per_large_box
-        c = canvas.Canvas(output_path, pagesize=self.page_size)
+        c = open_canvas(output_path, self.page_size, params.get("流式写入", False), params.get("压缩线程数"))
         width, height = self.page_size
 
         # 设置PDF/X兼容模式和CMYK颜色
@@ -588,7 +552,7 @@ class SplitBoxTemplate(PDFBaseUtils):
         if start_large_box == 1:
             # 获取中文名称参数
             # 清理中文名称（可能包含Excel换行符\n和Windows非法字符）
-            chinese_name = _clean_for_filename(params.get("中文名称", ""))
+            chinese_name = clean_for_filename(params.get("中文名称", ""))
             # 获取标签模版类型
             template_type = params.get("标签模版", "有纸卡备注")
             
@@ -601,40 +565,21 @@ class SplitBoxTemplate(PDFBaseUtils):
             c.showPage()
             c.setFillColor(cmyk_black)
 
+        # 序列号范围、实际张数和Carton No从任务的标签计划中按行读取
+        large_box_plan = build_label_plan('split_box', data, params).level('大箱标')
+
         # 生成指定范围的大箱标
-        for large_box_num in range(start_large_box, end_large_box + 1):
+        for large_box_num, label in zip(range(start_large_box, end_large_box + 1),
+                                        large_box_plan.iter_rows(start_large_box - 1, end_large_box)):
             if large_box_num > start_large_box or start_large_box == 1:  # 修改条件，考虑空标签页
                 if not (large_box_num == start_large_box and start_large_box == 1):  # 避免重复showPage
                     c.showPage()
                     c.setFillColor(cmyk_black)
 
-            # 计算当前大箱的序列号范围，使用正确的副号进位阈值
-            # 从data_processor中获取序列号范围，但需要计算总盒数边界
-            total_pieces = int(float(data["总张数"]))
-            total_boxes = math.ceil(total_pieces / pieces_per_box)
-            
-            # 🔧 根据模式选择Serial生成逻辑
-            if boxes_per_set > 1:  # 分/套盒模式
-                serial_range = split_box_data_processor.generate_set_based_large_box_serial_range(
-                    large_box_num, base_number, boxes_per_set, boxes_per_small_box, small_boxes_per_large_box, total_boxes
-                )
-            else:  # 传统分盒模式
-                serial_range = split_box_data_processor.generate_split_large_box_serial_range(
-                    base_number, large_box_num, small_boxes_per_large_box, boxes_per_small_box, total_boxes
-                )
-            
-            # 计算大箱标的Carton No - 基于最新逻辑整理  
-            boxes_per_large_box = boxes_per_small_box * small_boxes_per_large_box
-            print(f"\n📦 准备计算大箱标 #{large_box_num} 的Carton No")
-            carton_no = split_box_data_processor.calculate_carton_range_for_large_box(
-                large_box_num, large_boxes_per_set_ratio, total_sets
-            )
-            print(f"📦 大箱标 #{large_box_num} Carton No计算完成: {carton_no}\n")
-            
-            # 🔧 使用新的quantity计算方法
-            actual_quantity_for_large_box = split_box_data_processor.calculate_actual_quantity_for_large_box(
-                large_box_num, pieces_per_box, boxes_per_small_box, small_boxes_per_large_box, total_boxes, boxes_per_set
-            )
+            # 序列号范围（按总盒数边界和副号进位阈值）、Carton No、实际张数
+            serial_range = label['serial']
+            carton_no = label['carton_no']
+            actual_quantity_for_large_box = label['quantity']
             
             # 获取标签模版类型 - 参照常规模版的实现方式
             template_type = params.get("标签模版", "有纸卡备注")
@@ -682,7 +627,7 @@ class SplitBoxTemplate(PDFBaseUtils):
                                                  remark_text: str, pieces_per_box: int, boxes_per_large_box: int, 
                                                  total_large_boxes: int, total_boxes: int, serial_font_size: int = 10, large_boxes_per_set_ratio: float = None):
         """创建单个分盒箱标PDF文件（无小箱模式）"""
-        c = canvas.Canvas(output_path, pagesize=self.page_size)
+        c = open_canvas(output_path, self.page_size, params.get("流式写入", False), params.get("压缩线程数"))
         width, height = self.page_size
 
         # 设置PDF/X兼容模式和CMYK颜色
@@ -699,7 +644,7 @@ class SplitBoxTemplate(PDFBaseUtils):
         if start_large_box == 1:
             # 获取中文名称参数
             # 清理中文名称（可能包含Excel换行符\n和Windows非法字符）
-            chinese_name = _clean_for_filename(params.get("中文名称", ""))
+            chinese_name = clean_for_filename(params.get("中文名称", ""))
             # 获取标签模版类型
             template_type = params.get("标签模版", "有纸卡备注")
             
@@ -712,45 +657,21 @@ class SplitBoxTemplate(PDFBaseUtils):
             c.showPage()
             c.setFillColor(cmyk_black)
 
+        # 序列号范围、实际张数和Carton No从任务的标签计划中按行读取
+        carton_plan = build_label_plan('split_box', data, params).level('箱标')
+
         # 生成指定范围的箱标
-        for large_box_num in range(start_large_box, end_large_box + 1):
+        for large_box_num, label in zip(range(start_large_box, end_large_box + 1),
+                                        carton_plan.iter_rows(start_large_box - 1, end_large_box)):
             if large_box_num > start_large_box or start_large_box == 1:  # 修改条件，考虑空标签页
                 if not (large_box_num == start_large_box and start_large_box == 1):  # 避免重复showPage
                     c.showPage()
                     c.setFillColor(cmyk_black)
 
-            # 计算无小箱模式箱标的Carton No - 使用新的逻辑
-            boxes_per_set = int(params.get("盒/套", params.get("boxes_per_set", 1)))
-            
-            # 🔧 根据模式选择Serial生成逻辑（无小箱模式）
-            if boxes_per_set > 1:  # 分/套盒模式
-                serial_range = split_box_data_processor.generate_set_based_large_box_serial_range(
-                    large_box_num, base_number, boxes_per_set, boxes_per_large_box, 1, total_boxes
-                )
-            else:  # 传统分盒模式
-                # 无小箱模式：复用大箱标逻辑，但设置 small_boxes_per_large_box = 1，进位阈值 = boxes_per_large_box
-                serial_range = split_box_data_processor.generate_split_large_box_serial_range(
-                    base_number, large_box_num, 1, boxes_per_large_box, total_boxes
-                )
-            total_pieces = int(float(data["总张数"]))
-            total_sets = math.ceil(math.ceil(total_pieces / pieces_per_box) / boxes_per_set)
-            
-            # 计算large_boxes_per_set_ratio（如果没有传入）
-            if large_boxes_per_set_ratio is None:
-                large_boxes_per_set_ratio = boxes_per_set / boxes_per_large_box
-            
-            print(f"\n📦 准备计算无小箱模式箱标 #{large_box_num} 的Carton No")
-            carton_no = split_box_data_processor.calculate_carton_range_for_large_box(
-                large_box_num, large_boxes_per_set_ratio, total_sets
-            )
-            print(f"📦 无小箱模式箱标 #{large_box_num} Carton No计算完成: {carton_no}\n")
-            
-            # 🔧 使用新的quantity计算方法（二级模式：盒直接装到大箱）
-            total_boxes = math.ceil(total_pieces / pieces_per_box)
-            boxes_per_set = int(params.get("盒/套", params.get("boxes_per_set", 1)))
-            actual_quantity_for_large_box = split_box_data_processor.calculate_actual_quantity_for_large_box(
-                large_box_num, pieces_per_box, boxes_per_large_box, 1, total_boxes, boxes_per_set
-            )
+            # 无小箱模式：序列号范围、Carton No、实际张数（盒直接装到箱）
+            serial_range = label['serial']
+            carton_no = label['carton_no']
+            actual_quantity_for_large_box = label['quantity']
             
             # 获取标签模版类型 - 参照常规模版的实现方式
             template_type = params.get("标签模版", "有纸卡备注")
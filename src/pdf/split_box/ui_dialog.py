@@ -6,6 +6,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from src.pdf.cost_estimator import LONG_JOB_SECONDS, estimate_job_cost, format_cost_estimate, load_cost_profile
+
 
 class SplitBoxUIDialog:
     """分盒模板UI对话框处理类"""
@@ -18,6 +20,8 @@ class SplitBoxUIDialog:
             main_app: 主GUI应用程序实例
         """
         self.main_app = main_app
+        # 估算监听：[(变量, trace id)]，对话框销毁时移除
+        self._cost_traces = []
     
     def show_parameters_dialog(self):
         """显示分/套盒模板参数设置对话框"""
@@ -305,6 +309,24 @@ class SplitBoxUIDialog:
             row=2, column=1, sticky=tk.W, pady=12
         )
 
+        # 右侧：预计生成（页数、文件大小、耗时），参数变化时更新
+        estimate_frame = ttk.LabelFrame(right_column, text="预计生成", padding="12")
+        estimate_frame.pack(fill=tk.X, pady=(10, 0))
+        self.cost_label = ttk.Label(estimate_frame, font=("Arial", 10), justify=tk.LEFT)
+        self.cost_label.pack(anchor=tk.W)
+        self.cost_profile = load_cost_profile()
+        self._watch_cost_params((
+            self.main_app.pieces_per_box_var,
+            self.main_app.boxes_per_set_var,
+            self.main_app.boxes_per_small_box_var,
+            self.main_app.small_boxes_per_large_box_var,
+            self.main_app.has_small_box_var,
+            self.main_app.has_box_label_var,
+            self.main_app.appearance_var,
+        ))
+        self.cost_label.bind("<Destroy>", self._remove_cost_traces)
+        self.update_cost_estimate()
+
         # 按钮框架 - 居中布局
         button_frame = ttk.Frame(center_container)
         button_frame.pack(pady=(15, 0))
@@ -444,8 +466,65 @@ class SplitBoxUIDialog:
             "选择外观": self.main_app.appearance_var.get(),
         }
 
+        # 预计耗时较长时再次确认，避免误启动长时间任务
+        estimate = estimate_job_cost("split_box", self.main_app.current_data, self.main_app.packaging_params,
+                                     self.cost_profile)
+        if estimate["seconds"] > LONG_JOB_SECONDS and not messagebox.askyesno(
+            "预计耗时较长", format_cost_estimate(estimate) + "\n\n确认生成？", parent=dialog
+        ):
+            return
+
         dialog.destroy()
         self.main_app.generate_multi_level_pdfs()
+
+    def _estimate_params(self):
+        """读取估算所需的包装参数，参数不完整或无效时返回None"""
+        has_small_box = self.main_app.has_small_box_var.get() == "有小箱"
+        try:
+            params = {
+                "张/盒": int(self.main_app.pieces_per_box_var.get().strip()),
+                "盒/套": int(self.main_app.boxes_per_set_var.get().strip()),
+                "盒/小箱": int(self.main_app.boxes_per_small_box_var.get().strip()),
+                "小箱/大箱": int(self.main_app.small_boxes_per_large_box_var.get().strip()) if has_small_box else 1,
+            }
+        except ValueError:
+            return None
+        if any(value <= 0 for value in params.values()):
+            return None
+        params.update({
+            "是否有小箱": has_small_box,
+            "是否有盒标": self.main_app.has_box_label_var.get() == "有盒标",
+            "选择外观": self.main_app.appearance_var.get(),
+            "中文名称": self.main_app.chinese_name_var.get().strip(),
+        })
+        return params
+
+    def _watch_cost_params(self, variables):
+        """监听参数变量，输入变化时刷新估算（先移除上次打开对话框时的监听）"""
+        self._remove_cost_traces()
+        self._cost_traces = [(var, var.trace_add("write", self.update_cost_estimate)) for var in variables]
+
+    def _remove_cost_traces(self, event=None):
+        """移除参数变量上的估算监听（变量属于主程序，对话框关闭后仍然存在）"""
+        for var, trace_id in self._cost_traces:
+            try:
+                var.trace_remove("write", trace_id)
+            except tk.TclError:
+                pass
+        self._cost_traces = []
+
+    def update_cost_estimate(self, *args):
+        """按当前参数更新预计页数、文件大小和耗时"""
+        params = self._estimate_params()
+        if params is None:
+            self.cost_label.config(text="请输入完整的包装参数")
+            return
+        try:
+            estimate = estimate_job_cost("split_box", self.main_app.current_data, params, self.cost_profile)
+        except (KeyError, ValueError, TypeError):
+            self.cost_label.config(text="无法估算（总张数无效）")
+            return
+        self.cost_label.config(text=format_cost_estimate(estimate))
     
     def on_small_box_choice_changed(self):
         """处理小箱选择变化"""
@@ -0,0 +1,188 @@
+"""
+流式画布
+
+reportlab的Canvas在save()之前把每一页的内容流都保存在内存中，几十万页的文件会占用数GB内存。
+StreamingCanvas保留Canvas的全部绘制接口，但在showPage时把本页的内容流和页面对象立即写入文件，
+内存中只保留每个对象的偏移量（见 FastLabelWriter）；表单对象（箱标表格的静态部分）在endForm时写入，
+字体、页面树和交叉引用表在save时写入。内存占用与页数无关。
+
+支持模板用到的全部功能：文字、线条、矩形、CMYK颜色、表单（beginForm/doForm）、
+Type1标准字体和TrueType子集字体。图片、注释/链接、透明度、渐变、专色、裁切标记等
+需要额外资源的功能不支持，使用时抛出ValueError。
+"""
+
+import weakref
+from typing import Dict, Optional, Tuple
+
+from reportlab.lib.rl_accel import fp_str
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfdoc import xObjectName
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from src.pdf.fast_label_writer import FastLabelWriter, _font_supported
+
+
+class _CanvasFileWriter(FastLabelWriter):
+    """流式画布的文件写入器：字体映射和TrueType子集状态使用画布文档中的记录"""
+
+    # 对象4为表单字典（所有页面共用，save时写入）
+    _XOBJECTS_OBJ = 4
+    _FIRST_OBJ = 5
+    _RESOURCES = (f"<< /Font {FastLabelWriter._FONTS_OBJ} 0 R /ProcSet [ /PDF /Text ] "
+                  f"/XObject {_XOBJECTS_OBJ} 0 R >>")
+
+    def __init__(self, output_path: str, page_size: Tuple[float, float], doc,
+                 compress_workers: Optional[int] = None):
+        super().__init__(output_path, page_size, compress_workers=compress_workers)
+        # canvas.setFont和文本对象通过 doc.getInternalFontName / font.splitString(text, doc) 分配字体名称
+        self.fontMapping = doc.fontMapping
+        self.delayedFonts = doc.delayedFonts
+        self._type1_fonts = []
+        self._font_doc = doc
+        self._checked_fonts = 0
+        self.forms: Dict[str, int] = {}  # 表单内部名称 -> 对象编号
+
+    def check_fonts(self):
+        """检查新用到的字体能否直接写出（嵌入的Type1字体等需要画布保存时生成的额外对象）"""
+        names = list(self.fontMapping)
+        for font_name in names[self._checked_fonts:]:
+            if not _font_supported(pdfmetrics.getFont(font_name)):
+                raise ValueError(f"流式写入不支持字体 {font_name}，请使用普通画布")
+        self._checked_fonts = len(names)
+
+    def write_form(self, internal_name: str, form) -> int:
+        """写入表单对象（与reportlab PDFFormXObject的输出相同），返回对象编号"""
+        # 先写入尚在压缩的页面，使文件中的对象顺序与不使用压缩线程时相同（表单只在首次使用时写入一次）
+        self._flush_pages()
+        number = self.forms[internal_name] = self._new_obj()
+        self._write_stream(number, form.stream, (
+            f" /BBox [ {fp_str(*form.BBoxList())} ] /FormType 1 /Matrix [ 1 0 0 1 0 0 ] "
+            f"/Resources {self._RESOURCES_OBJ} 0 R /Subtype /Form /Type /XObject"), compress=bool(form.compression))
+        return number
+
+    def _write_fonts(self) -> Dict[str, int]:
+        self.check_fonts()
+        self._type1_fonts = [font for font in map(pdfmetrics.getFont, self.fontMapping)
+                             if not isinstance(font, TTFont)]
+        return super()._write_fonts()
+
+    def close(self):
+        if not self._closed:
+            try:
+                self._flush_pages()
+                self._write_object(self._XOBJECTS_OBJ, "<< " + " ".join(
+                    f"/{name} {number} 0 R" for name, number in self.forms.items()) + " >>")
+            except BaseException:
+                self.abort()
+                raise
+        super().close()
+
+
+class StreamingCanvas(canvas.Canvas):
+    """
+    每页完成后立即写入文件的画布，用法与canvas.Canvas相同
+
+    出错时（画布未save就被释放）自动删除未写完的文件，与画布路径出错时不生成文件一致。
+    setPageCompression(1)时页面内容流由压缩线程压缩（compress_workers，见 FastLabelWriter），
+    与后面页面的绘制同时进行。
+    """
+
+    def __init__(self, filename: str, pagesize: Tuple[float, float], compress_workers: Optional[int] = None,
+                 **kwargs):
+        super().__init__(filename, pagesize=pagesize, **kwargs)
+        self._writer = _CanvasFileWriter(filename, pagesize, self._doc, compress_workers)
+        self._used_forms = set()
+        self._discard = weakref.finalize(self, self._writer.abort)
+
+    def _check_unsupported(self, what: str, page: bool = True):
+        """需要额外资源（注释、透明度、渐变、专色等）或页面属性的功能无法流式写入"""
+        unsupported = [
+            ("注释/链接", self._annotationrefs),
+            ("透明度等图形状态", self._extgstate.getState()),
+            ("渐变", self._shadingUsed),
+            ("专色", self._colorsUsed),
+        ]
+        if page:
+            unsupported += [
+                ("裁切标记", self._cropMarks),
+                ("页面旋转", self._pageRotation),
+                ("页面切换效果", self._pageTransition or self._pageDuration is not None),
+                ("页面框", any(getattr(self, f"_{box}Box", None) for box in ("crop", "art", "bleed", "trim"))),
+            ]
+        for name, used in unsupported:
+            if used:
+                raise ValueError(f"流式写入不支持{name}（{what}），请使用普通画布")
+
+    def endForm(self, **extra_attributes):
+        name = self._formData[0]
+        self._check_unsupported(f"表单 {name}", page=False)
+        super().endForm(**extra_attributes)
+        # 表单同时登记在画布文档中（doc.hasForm等照常可用），内容立即写入文件
+        internal_name = xObjectName(name)
+        self._writer.write_form(internal_name, self._doc.idToObject[internal_name])
+
+    def drawImage(self, *args, **kwargs):
+        raise ValueError("流式写入不支持图片，请使用普通画布")
+
+    drawInlineImage = drawImage
+
+    def showPage(self):
+        """写出当前页并开始新的一页"""
+        self._check_unsupported(f"第{self._pageNumber}页")
+        self._writer.check_fonts()
+        self._used_forms.update(xObjectName(name) for name in self._formsinuse)
+
+        code = self._code
+        code.append(' ')
+        stream = self._psCommandsBeforePage + [self._preamble] + code + self._psCommandsAfterPage
+        self._writer.add_content_page(("\n".join(stream) + "\n").encode("utf-8"), self._pagesize,
+                                      compress=bool(self._pageCompression))
+
+        if self._onPage:
+            self._onPage(self._pageNumber)
+        self._startPage()
+
+    def save(self):
+        """写出最后一页（如有）、字体、页面树和交叉引用表"""
+        if len(self._code):
+            self.showPage()
+        missing = self._used_forms.difference(self._writer.forms)
+        if missing:
+            self._writer.abort()
+            raise ValueError(f"表单未定义: {', '.join(sorted(missing))}")
+        info = self._doc.info
+        self._writer.info = {"Title": info.title, "Author": info.author, "Subject": info.subject,
+                             "Creator": info.creator, "Keywords": info.keywords}
+        self._writer.close()
+        self._discard.detach()
+
+    def abort(self):
+        """出错时关闭并删除未写完的文件"""
+        self._writer.abort()
+        self._discard.detach()
+
+    @property
+    def page_count(self) -> int:
+        """已写入的页数"""
+        return self._writer.page_count
+
+
+def open_canvas(output_path: str, page_size: Tuple[float, float], streaming: bool = False,
+                compress_workers: Optional[int] = None) -> canvas.Canvas:
+    """
+    创建模板使用的画布
+
+    Args:
+        output_path: 输出PDF路径
+        page_size: 页面尺寸
+        streaming: True时使用流式画布（params["流式写入"]），页面完成后立即写入文件
+        compress_workers: 流式画布的页面压缩线程数（params["压缩线程数"]）；
+            普通画布在save时统一压缩，不使用压缩线程
+
+    Returns:
+        canvas.Canvas 或 StreamingCanvas
+    """
+    if streaming:
+        return StreamingCanvas(output_path, pagesize=page_size, compress_workers=compress_workers)
+    return canvas.Canvas(output_path, pagesize=page_size)
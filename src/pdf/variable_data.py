@@ -0,0 +1,173 @@
+"""
+可变数据标签 - 每行数据一张标签
+适用于序列号不连续、由客户直接提供每箱序列号清单的订单。
+数据行以生成器方式逐行读取、逐页渲染并写入流式画布，复用常规/分盒模板的绘制函数；
+无论多少行都只生成一个PDF文件，内存占用与行数无关。
+"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from reportlab.lib.colors import CMYKColor
+
+from src.utils.pdf_base import PDFBaseUtils
+from src.pdf.streaming_canvas import open_canvas
+from src.pdf.regular_box.renderer import regular_renderer
+from src.pdf.split_box.renderer import split_box_renderer
+from src.data.bounded_reader import is_empty_cell
+
+
+# 支持的标签级别
+LABEL_LEVELS = ("盒标", "小箱标", "大箱标")
+
+
+def _cell(record: Dict[str, Any], defaults: Dict[str, Any], field: str) -> Any:
+    """读取行内字段，行内为空时使用任务级默认值"""
+    value = record.get(field)
+    if is_empty_cell(value) or str(value).strip() == "":
+        return defaults.get(field)
+    return value
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return "" if value is None else str(value).strip()
+
+
+class VariableDataTemplate(PDFBaseUtils):
+    """可变数据标签模板：逐行渲染，每行一页"""
+
+    def __init__(self):
+        """初始化可变数据模板"""
+        super().__init__()
+
+    def create_labels(self, rows: Iterable[Tuple[str, Dict[str, Any]]], output_path: str, level: str,
+                      template: str = "regular_box", defaults: Optional[Dict[str, Any]] = None,
+                      compress_workers: Optional[int] = None) -> str:
+        """
+        逐行生成可变数据标签
+
+        Args:
+            rows: (来源描述, {列名: 值}) 迭代器，如job_records.iter_workbook_records
+            output_path: 输出PDF路径（全部标签写入这一个文件）
+            level: 标签级别（盒标/小箱标/大箱标）
+            template: 'regular_box' 或 'split_box'，决定使用哪个模板的绘制函数
+            defaults: 行内缺省时使用的任务级字段（标签名称、客户名称编码、张/盒、
+                      选择外观、标签模版、序列号字体大小、中文名称）
+            compress_workers: 页面压缩线程数，0为在渲染线程中压缩，None为默认值
+
+        Columns:
+            盒标: 序列号，可选 标签名称、张/盒（外观二）
+            小箱标/大箱标: 序列号（或 开始序列号+结束序列号）、数量、箱号，可选 标签名称、客户名称编码
+
+        Returns:
+            生成的PDF文件路径
+
+        Raises:
+            ValueError: 某行数据有误（不保留未写完的文件）
+        """
+        if level not in LABEL_LEVELS:
+            raise ValueError(f"未知的标签级别: {level}")
+        defaults = dict(defaults or {})
+
+        c = self._new_canvas(output_path, level, template, defaults, compress_workers)
+        total_labels = 0
+        try:
+            for source, record in rows:
+                if total_labels > 0:
+                    c.showPage()
+                    c.setFillColor(CMYKColor(0, 0, 0, 1))
+                try:
+                    self._render_row(c, level, template, record, defaults)
+                except ValueError as e:
+                    raise ValueError(f"{source}: {e}")
+                total_labels += 1
+            if total_labels == 0:
+                raise ValueError("没有数据行")
+        except BaseException:
+            c.abort()
+            raise
+
+        c.save()
+        print(f"✅ 可变数据{level}生成完成: {total_labels}张标签: {output_path}")
+        return output_path
+
+    def _new_canvas(self, path: str, level: str, template: str, defaults: Dict[str, Any],
+                    compress_workers: Optional[int]):
+        """创建流式画布；按现有模板的习惯先输出空箱标签/空白首页"""
+        renderer = split_box_renderer if template == "split_box" else regular_renderer
+        c = open_canvas(path, self.page_size, streaming=True, compress_workers=compress_workers)
+        width, height = self.page_size
+        c.setPageCompression(1)
+        c.setTitle(f"{level}-可变数据")
+        c.setCreator("Data-to-PDF Print")
+        cmyk_black = CMYKColor(0, 0, 0, 1)
+        c.setFillColor(cmyk_black)
+
+        chinese_name = _text(defaults.get("中文名称"))
+        if chinese_name:
+            if level == "盒标":
+                if _text(defaults.get("选择外观")) == "外观二":
+                    renderer.render_blank_first_page_appearance_two(c, width, height, chinese_name)
+                else:
+                    renderer.render_blank_first_page(c, width, height, chinese_name)
+            else:
+                remark_text = _text(defaults.get("客户名称编码"))
+                if _text(defaults.get("标签模版")) == "无纸卡备注":
+                    renderer.render_empty_box_label_no_paper_card(c, width, height, chinese_name, remark_text)
+                else:
+                    renderer.render_empty_box_label(c, width, height, chinese_name, remark_text)
+            c.showPage()
+            c.setFillColor(cmyk_black)
+        return c
+
+    def _render_row(self, c, level: str, template: str, record: Dict[str, Any], defaults: Dict[str, Any]):
+        """用现有模板的绘制函数渲染一行"""
+        width, height = self.page_size
+        renderer = split_box_renderer if template == "split_box" else regular_renderer
+        theme_text = _text(_cell(record, defaults, "标签名称")) or "Unknown Title"
+
+        serial = _text(_cell(record, defaults, "序列号"))
+        if not serial:
+            start_serial = _text(_cell(record, defaults, "开始序列号"))
+            end_serial = _text(_cell(record, defaults, "结束序列号"))
+            if start_serial and end_serial:
+                serial = f"{start_serial}-{end_serial}"
+        if not serial:
+            raise ValueError("缺少序列号")
+
+        if level == "盒标":
+            # 与模板盒标相同的五等分布局
+            blank_height = height / 5
+            top_text_y = height - 1.5 * blank_height
+            serial_number_y = height - 3.5 * blank_height
+            if _text(defaults.get("选择外观")) == "外观二":
+                pieces_per_box = int(float(_cell(record, defaults, "张/盒") or 0))
+                renderer.render_appearance_two(c, width, self.page_size, theme_text, pieces_per_box,
+                                               serial, top_text_y, serial_number_y)
+            else:
+                renderer.render_appearance_one(c, width, theme_text, serial, top_text_y, serial_number_y)
+            return
+
+        quantity = _cell(record, defaults, "数量")
+        carton_no = _text(_cell(record, defaults, "箱号"))
+        if quantity is None or not carton_no:
+            raise ValueError("小箱标/大箱标需要'数量'和'箱号'")
+        quantity = int(float(quantity))
+        remark_text = _text(_cell(record, defaults, "客户名称编码")) or "Unknown Client"
+        template_type = _text(defaults.get("标签模版")) or "有纸卡备注"
+        serial_font_size = int(defaults.get("序列号字体大小") or 10)
+
+        if template == "split_box":
+            if level == "小箱标":
+                draw = (split_box_renderer.draw_split_box_small_box_table if template_type == "有纸卡备注"
+                        else split_box_renderer.draw_split_box_small_box_table_no_paper_card)
+            else:
+                draw = (split_box_renderer.draw_split_box_large_box_table if template_type == "有纸卡备注"
+                        else split_box_renderer.draw_split_box_large_box_table_no_paper_card)
+            draw(c, width, height, theme_text, quantity, serial, carton_no, remark_text,
+                 serial_font_size=serial_font_size)
+        else:
+            draw = regular_renderer.draw_small_box_table if level == "小箱标" else regular_renderer.draw_large_box_table
+            draw(c, width, height, theme_text, quantity, serial, carton_no, remark_text,
+                 template_type, serial_font_size)
@@ -1,44 +1,14 @@
 """
 外箱装箱信息汇总表生成器
 在标签生成完成后，自动生成外箱汇总Excel表格
+逐箱指定容量（小箱容量/大箱容量）时，每种每箱盒数一行
 """
 
 import pandas as pd
 from pathlib import Path
-import re
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 
-
-def _clean_for_filename(text: str) -> str:
-    """
-    清理文本使其适合作为Windows/macOS文件名
-
-    Args:
-        text: 原始文本
-
-    Returns:
-        清理后的安全文本
-    """
-    if not text:
-        return ""
-
-    # 转为字符串并清理
-    text = str(text)
-
-    # 1. 替换换行符为空格
-    text = text.replace('\n', ' ').replace('\r', ' ')
-
-    # 2. 移除Windows非法字符: < > : " / \ | ? * 和控制字符
-    text = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', text)
-
-    # 3. 移除前后空格和点号
-    text = text.strip('. ')
-
-    # 4. 压缩多余的空格和下划线
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'_+', '_', text)
-
-    return text
+from src.utils.filename_utils import clean_for_filename
 
 
 class CartonSummaryGenerator:
@@ -56,7 +26,8 @@ class CartonSummaryGenerator:
         english_name: str,
         pieces_per_box: int,
         total_large_boxes: int,
-        boxes_per_large_box: int
+        boxes_per_large_box: int,
+        carton_groups: Optional[List[Tuple[int, int]]] = None
     ) -> str:
         """
         生成外箱装箱信息汇总表
@@ -69,14 +40,18 @@ class CartonSummaryGenerator:
             pieces_per_box: 每盒数量（张/盒）
             total_large_boxes: 总箱数（总外箱数）
             boxes_per_large_box: 每箱盒数（每个大箱包含的盒数）
+            carton_groups: [(每箱盒数, 箱数)]，逐箱容量时每组一行；None时只有一行（总箱数 × 每箱盒数）
 
         Returns:
             生成的Excel文件路径
         """
+        if carton_groups is None:
+            carton_groups = [(boxes_per_large_box, total_large_boxes)]
+
         # 清理名称用于显示和文件名
-        clean_chinese = _clean_for_filename(chinese_name) if chinese_name else ""
-        clean_english = _clean_for_filename(english_name) if english_name else ""
-        clean_code = _clean_for_filename(product_code) if product_code else ""
+        clean_chinese = clean_for_filename(chinese_name) if chinese_name else ""
+        clean_english = clean_for_filename(english_name) if english_name else ""
+        clean_code = clean_for_filename(product_code) if product_code else ""
 
         # 组合显示名称：中文名 + 空格 + 英文名
         display_name = f"{clean_chinese} {clean_english}".strip()
@@ -85,10 +60,10 @@ class CartonSummaryGenerator:
 
         # 创建数据字典
         summary_data = {
-            "名称": [display_name],
-            "每盒数量": [pieces_per_box],
-            "总箱数": [total_large_boxes],
-            "每箱盒数": [boxes_per_large_box]
+            "名称": [display_name] * len(carton_groups),
+            "每盒数量": [pieces_per_box] * len(carton_groups),
+            "总箱数": [count for _, count in carton_groups],
+            "每箱盒数": [boxes for boxes, _ in carton_groups]
         }
 
         # 创建DataFrame
@@ -125,12 +100,29 @@ class CartonSummaryGenerator:
 carton_summary_generator = CartonSummaryGenerator()
 
 
+def group_cartons(boxes_per_carton: Sequence[int]) -> List[Tuple[int, int]]:
+    """
+    按每箱盒数分组（按首次出现的顺序）
+
+    Args:
+        boxes_per_carton: 每个外箱的实际盒数
+
+    Returns:
+        [(每箱盒数, 箱数)]
+    """
+    groups: Dict[int, int] = {}
+    for boxes in boxes_per_carton:
+        groups[int(boxes)] = groups.get(int(boxes), 0) + 1
+    return list(groups.items())
+
+
 def generate_carton_summary_for_template(
     output_dir: str,
     data: Dict[str, Any],
     params: Dict[str, Any],
     total_large_boxes: int,
-    boxes_per_large_box: int
+    boxes_per_large_box: int,
+    boxes_per_carton: Optional[Sequence[int]] = None
 ) -> str:
     """
     为模板生成外箱汇总表的便捷函数
@@ -141,6 +133,7 @@ def generate_carton_summary_for_template(
         params: 参数字典（包含中文名称、张/盒等）
         total_large_boxes: 总箱数（总外箱数）
         boxes_per_large_box: 每箱盒数
+        boxes_per_carton: 每个外箱的实际盒数（来自标签计划，逐箱容量时使用），None时按统一的每箱盒数
 
     Returns:
         生成的Excel文件路径
@@ -159,5 +152,6 @@ def generate_carton_summary_for_template(
         english_name=english_name,
         pieces_per_box=pieces_per_box,
         total_large_boxes=total_large_boxes,
-        boxes_per_large_box=boxes_per_large_box
+        boxes_per_large_box=boxes_per_large_box,
+        carton_groups=group_cartons(boxes_per_carton) if boxes_per_carton is not None else None
     )
@@ -3,42 +3,179 @@
 根据关键字动态查找并提取数据
 """
 
-import pandas as pd
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 from typing import Dict, List, Tuple, Any, Optional
 
+from src.data.bounded_reader import BoundedRegionReader, is_empty_cell
+from src.data.keyword_matcher import KeywordMatcher, keyword_alternatives, load_keyword_aliases
+from src.data.reader_backends import get_backend, rows_to_grid
+
+
+# 字段别名（内置keyword_aliases.json + 用户配置），如 开始号 → 起始号、Start No
+KEYWORD_ALIASES = load_keyword_aliases()
+
+# 公共数据的关键字配置 - 包含匹配关键字及其别名
+COMMON_KEYWORD_CONFIG = {
+    '标签名称': {
+        'keyword': '标签名称',
+        'keywords': KEYWORD_ALIASES.get('标签名称', []),
+        'direction': 'right'
+    },
+    '开始号': {
+        'keyword': '开始号',
+        'keywords': KEYWORD_ALIASES.get('开始号', []),
+        'direction': 'down'
+    },
+    '客户名称编码': {
+        'keyword': '客户名称编码',
+        'keywords': KEYWORD_ALIASES.get('客户名称编码', []),
+        'direction': 'down'
+    },
+    '张/盒': {
+        'keyword': '张/盒',
+        'keywords': KEYWORD_ALIASES.get('张/盒', []),
+        'direction': 'down'
+    },
+    '主题': {
+        'keyword': '主题',
+        'keywords': KEYWORD_ALIASES.get('主题', []),
+        'direction': 'down'
+    }
+}
+
+# 总张数关键字（数据固定在关键字下方）
+TOTAL_COUNT_KEYWORD = '总张数'
+TOTAL_COUNT_CONFIG = {
+    '总张数': {
+        'keyword': TOTAL_COUNT_KEYWORD,
+        'keywords': KEYWORD_ALIASES.get('总张数', []),
+        'direction': 'down'
+    }
+}
+
+# 所有字段关键字及别名编译成一个匹配器，每个单元格文本只遍历一次
+COMMON_KEYWORD_MATCHER = KeywordMatcher(
+    keyword
+    for config in list(COMMON_KEYWORD_CONFIG.values()) + list(TOTAL_COUNT_CONFIG.values())
+    for keyword in keyword_alternatives(config)
+)
+
+# 公共数据字段（输出顺序）
+COMMON_FIELDS = ['客户名称编码', '标签名称', '开始号', '总张数', '张/盒', '主题']
+
+# 多工作表并行扫描的最大线程数
+MAX_SHEET_SCAN_WORKERS = 4
+
+
+def _iter_until_stopped(rows, stop_event: threading.Event):
+    """逐行转发，stop_event置位后立即停止读取并关闭底层读取器"""
+    try:
+        for row in rows:
+            if stop_event.is_set():
+                return
+            yield row
+    finally:
+        if hasattr(rows, 'close'):
+            rows.close()
+
+
+def _merge_sheet_results(results: Dict[int, Optional[Dict[str, Any]]], sheet_count: int) -> Tuple[Dict[str, Any], Dict[str, Optional[int]], bool]:
+    """
+    按工作表顺序合并各工作表的提取结果，每个字段取第一个有值的工作表
+    
+    Args:
+        results: {工作表索引: 提取结果}，只包含已完成扫描的工作表
+        sheet_count: 工作表总数
+        
+    Returns:
+        (合并数据, {字段: 来源工作表索引}, 是否所有字段都已确定)
+        字段确定的条件：它之前的工作表都已扫描完成，且找到了值或所有工作表都已扫描
+    """
+    merged = {}
+    sources = {}
+    complete = True
+    for field in COMMON_FIELDS:
+        merged[field] = None
+        sources[field] = None
+        for sheet_index in range(sheet_count):
+            if sheet_index not in results:
+                complete = False
+                break
+            value = (results[sheet_index] or {}).get(field)
+            if value is not None:
+                merged[field] = value
+                sources[field] = sheet_index
+                break
+    return merged, sources, complete
+
+
 class ExcelDataExtractor:
     """
     Excel数据提取器
     通过关键字查找对应的数据位置
     """
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, reader_mode: str = 'full', cache=None, backend: Optional[str] = None,
+                 sheet_index: int = 0, scan_all_sheets: bool = False,
+                 stop_event: Optional[threading.Event] = None):
         """
         初始化提取器
         
         Args:
             file_path: Excel文件路径
+            reader_mode: 读取模式
+                'full' - 读取整个工作表
+                'bounded' - 逐行读取，公共数据关键字全部定位后停止
+            cache: 可选的提取结果缓存（ExtractionCache），提供时延迟到缓存未命中才解析Excel
+            backend: 指定读取后端名称（见reader_backends），None表示按格式自动选择
+            sheet_index: 读取的工作表索引
+            scan_all_sheets: 提取公共数据时并行扫描所有工作表，每个字段取第一个有值的工作表
+            stop_event: 置位后停止读取（多工作表扫描时用于提前结束其余工作表）
         """
         self.file_path = file_path
-        self.df = None
+        self.reader_mode = reader_mode
+        self.cache = cache
+        self.backend_name = backend
+        self.sheet_index = sheet_index
+        self.scan_all_sheets = scan_all_sheets
+        self.stop_event = stop_event
+        # 多工作表扫描时每个字段的来源工作表名称：{字段: 工作表名称}
+        self.field_sources: Dict[str, Optional[str]] = {}
+        # 单元格值网格（numpy object数组，空单元格为None/NaN）
+        self._values: Optional[np.ndarray] = None
         self.keyword_positions = {}
-        self._load_excel()
+        # 单元格文本索引：{单元格文本: [(行, 列), ...]}，加载时一次性构建
+        self._text_index: Dict[str, List[Tuple[int, int]]] = {}
+        if cache is None and not scan_all_sheets:
+            self._load_excel()
+    
+    def _ensure_loaded(self):
+        """确保Excel已加载（使用缓存时延迟加载）"""
+        if self._values is None:
+            self._load_excel()
     
     def _load_excel(self):
         """加载Excel文件"""
         try:
-            # 首先尝试读取第一个工作表（默认）
-            self.df = pd.read_excel(self.file_path, header=None, sheet_name=0, engine='openpyxl')
-            print(f"✅ Excel文件已加载: {self.df.shape[0]}行 x {self.df.shape[1]}列 (工作表: 0)")
+            backend = get_backend(self.file_path, self.backend_name,
+                                  streaming=self.reader_mode == 'bounded')
+            rows = backend.iter_rows(self.file_path, self.sheet_index)
+            if self.stop_event is not None:
+                rows = _iter_until_stopped(rows, self.stop_event)
+            if self.reader_mode == 'bounded':
+                self._load_bounded(backend, rows)
+            else:
+                self._load_full(backend, rows)
             
             # 显示前几行内容用于调试
             print("📋 Excel前5行内容预览:")
-            for i in range(min(5, self.df.shape[0])):
+            for i in range(min(5, self._values.shape[0])):
                 row_content = []
-                for j in range(min(5, self.df.shape[1])):
-                    cell_value = self.df.iloc[i, j]
-                    if pd.notna(cell_value):
+                for j in range(min(5, self._values.shape[1])):
+                    cell_value = self._values[i, j]
+                    if not is_empty_cell(cell_value):
                         cell_str = str(cell_value).strip()
                         row_content.append(f"[{j}]='{cell_str}'")
                     else:
@@ -47,6 +184,77 @@ class ExcelDataExtractor:
                 
         except Exception as e:
             raise Exception(f"无法加载Excel文件: {e}")
+        
+        self._build_text_index()
+    
+    def _load_full(self, backend, rows):
+        """读取工作表的全部内容"""
+        self._values = rows_to_grid(rows)
+        print(f"✅ Excel文件已加载: {self._values.shape[0]}行 x {self._values.shape[1]}列 "
+              f"(工作表: {self.sheet_index}, 读取后端: {backend.name})")
+    
+    def _load_bounded(self, backend, rows):
+        """只读取表头区域，公共数据关键字及其数据单元格读到后停止"""
+        reader = BoundedRegionReader(COMMON_KEYWORD_CONFIG, TOTAL_COUNT_CONFIG, matcher=COMMON_KEYWORD_MATCHER)
+        self._values = rows_to_grid(reader.read(rows))
+        print(f"✅ Excel文件已加载(有界读取): {self._values.shape[0]}行 x {self._values.shape[1]}列 "
+              f"(工作表: {self.sheet_index}, 读取后端: {backend.name})")
+    
+    def _build_text_index(self):
+        """
+        一次性构建单元格文本索引
+        
+        对单元格值网格做一次向量化遍历：非空掩码、坐标和文本转换都在numpy中完成，
+        之后所有关键字查找都只是字典命中，不再逐个单元格调用iloc。
+        所有字段关键字及别名用预编译的多模式匹配器一次解析，每种文本只遍历一次。
+        """
+        self._text_index = {}
+        self.keyword_positions = {}
+        
+        values = self._values
+        not_empty = (values != None) & (values == values)  # noqa: E711  排除None和NaN
+        rows, cols = np.nonzero(not_empty)  # 行优先顺序，与逐行扫描一致
+        if len(rows) == 0:
+            return
+        
+        texts = np.char.strip(values[rows, cols].astype(str))
+        for text, row_idx, col_idx in zip(texts.tolist(), rows.tolist(), cols.tolist()):
+            self._text_index.setdefault(text, []).append((row_idx, col_idx))
+        
+        # 预先解析所有已知关键字及别名（包含匹配），避免后续再扫描
+        positions = {keyword: [] for keyword in COMMON_KEYWORD_MATCHER.patterns}
+        for text, cells in self._text_index.items():
+            for keyword in COMMON_KEYWORD_MATCHER.find(text):
+                positions[keyword].extend(cells)
+        for keyword, cells in positions.items():
+            cells.sort()
+            self.keyword_positions[keyword] = cells
+        
+        print(f"✅ 单元格索引已构建: {len(rows)}个非空单元格, {len(self._text_index)}种文本")
+    
+    def _resolve_keyword(self, keyword: str) -> List[Tuple[int, int]]:
+        """
+        获取包含关键字的所有单元格坐标（行优先顺序，不区分大小写），结果按关键字缓存
+        
+        Args:
+            keyword: 要查找的关键字
+            
+        Returns:
+            (行, 列) 坐标列表
+        """
+        cached = self.keyword_positions.get(keyword)
+        if cached is not None:
+            return cached
+        
+        folded = keyword.casefold()
+        matches = []
+        for text, cells in self._text_index.items():
+            if folded in text.casefold():
+                matches.extend(cells)
+        matches.sort()
+        
+        self.keyword_positions[keyword] = matches
+        return matches
     
     def find_keyword(self, keyword: str) -> List[Dict[str, Any]]:
         """
@@ -58,55 +266,30 @@ class ExcelDataExtractor:
         Returns:
             包含位置信息的字典列表
         """
-        if self.df is None:
-            return []
+        self._ensure_loaded()
         
         positions = []
         print(f"🔍 搜索关键字: '{keyword}'")
         
-        # 记录所有包含关键字的单元格，用于调试
-        potential_matches = []
-        
-        for row_idx in range(self.df.shape[0]):
-            for col_idx in range(self.df.shape[1]):
-                cell_value = self.df.iloc[row_idx, col_idx]
-                
-                if pd.notna(cell_value):
-                    cell_str = str(cell_value).strip()
-                    
-                    # 检查是否包含关键字（用于调试）
-                    if keyword in cell_str:
-                        potential_matches.append(f"({row_idx+1},{col_idx+1})='{cell_str}'")
-                        
-                        # 精确匹配或包含匹配的逻辑
-                        match_found = False
-                        
-                        # 优先精确匹配
-                        if cell_str == keyword:
-                            match_found = True
-                            print(f"   ✅ 精确匹配在({row_idx+1},{col_idx+1}): '{cell_str}'")
-                        # 其次包含匹配
-                        elif keyword in cell_str:
-                            match_found = True
-                            print(f"   ✅ 包含匹配在({row_idx+1},{col_idx+1}): '{cell_str}'")
-                        
-                        if match_found:
-                            col_letter = self._col_index_to_letter(col_idx)
-                            positions.append({
-                                'row': row_idx,
-                                'col': col_idx,
-                                'excel_ref': f"{col_letter}{row_idx + 1}",
-                                'value': cell_str,
-                                'keyword': keyword
-                            })
+        for row_idx, col_idx in self._resolve_keyword(keyword):
+            cell_str = str(self._values[row_idx, col_idx]).strip()
+            col_letter = self._col_index_to_letter(col_idx)
+            positions.append({
+                'row': row_idx,
+                'col': col_idx,
+                'excel_ref': f"{col_letter}{row_idx + 1}",
+                'value': cell_str,
+                'keyword': keyword
+            })
         
         # 调试输出
-        if potential_matches:
-            print(f"   📍 发现 {len(potential_matches)} 个包含关键字的单元格:")
-            for match in potential_matches[:5]:  # 只显示前5个
-                print(f"      {match}")
-            if len(potential_matches) > 5:
-                print(f"      ... 还有 {len(potential_matches) - 5} 个")
+        if positions:
+            print(f"   📍 发现 {len(positions)} 个包含关键字的单元格:")
+            for pos in positions[:5]:  # 只显示前5个
+                match_type = "精确匹配" if pos['value'] == keyword else "包含匹配"
+                print(f"      ✅ {match_type}在({pos['row']+1},{pos['col']+1}): '{pos['value']}'")
+            if len(positions) > 5:
+                print(f"      ... 还有 {len(positions) - 5} 个")
         else:
             print(f"   ❌ 未找到包含关键字 '{keyword}' 的单元格")
         
@@ -142,8 +325,7 @@ class ExcelDataExtractor:
         Returns:
             附近单元格的值
         """
-        if self.df is None:
-            return None
+        self._ensure_loaded()
         
         direction_map = {
             'right': (0, 1),
@@ -163,9 +345,9 @@ class ExcelDataExtractor:
         new_row, new_col = row + dr, col + dc
         
         # 检查边界
-        if (0 <= new_row < self.df.shape[0] and 0 <= new_col < self.df.shape[1]):
-            value = self.df.iloc[new_row, new_col]
-            return value if pd.notna(value) else None
+        if (0 <= new_row < self._values.shape[0] and 0 <= new_col < self._values.shape[1]):
+            value = self._values[new_row, new_col]
+            return None if is_empty_cell(value) else value
         
         return None
     
@@ -178,7 +360,7 @@ class ExcelDataExtractor:
             格式: {
                 'field_name': {
                     'keyword': '关键字',  # 单个关键字（向后兼容）
-                    'keywords': ['关键字1', '关键字2'],  # 多个可能的关键字
+                    'keywords': ['关键字1', '关键字2'],  # 多个可能的关键字（别名），取最先出现的
                     'direction': 'right',  # 数据相对于关键字的位置
                     'offset': (0, 1)  # 可选，额外偏移
                 }
@@ -187,20 +369,19 @@ class ExcelDataExtractor:
         Returns:
             提取的数据字典
         """
+        self._ensure_loaded()
         extracted_data = {}
         
         for field_name, config in keyword_config.items():
-            keyword = config['keyword']
+            keywords = keyword_alternatives(config)
             direction = config.get('direction', 'right')
             offset = config.get('offset', (0, 0))
             
-            # 查找关键字
-            positions = self.find_keyword(keyword)
+            # 查找关键字：所有候选关键字中第一个出现的位置
+            match = self._first_keyword_match(keywords)
             
-            if positions:
-                # 使用第一个匹配的位置
-                pos = positions[0]
-                row, col = pos['row'], pos['col']
+            if match:
+                row, col, keyword = match
                 
                 # 应用方向偏移
                 if direction == 'right':
@@ -220,9 +401,9 @@ class ExcelDataExtractor:
                 target_col += offset[1]
                 
                 # 获取目标位置的值
-                if (0 <= target_row < self.df.shape[0] and 0 <= target_col < self.df.shape[1]):
-                    value = self.df.iloc[target_row, target_col]
-                    extracted_data[field_name] = value if pd.notna(value) else None
+                if (0 <= target_row < self._values.shape[0] and 0 <= target_col < self._values.shape[1]):
+                    value = self._values[target_row, target_col]
+                    extracted_data[field_name] = None if is_empty_cell(value) else value
                     
                     col_letter = self._col_index_to_letter(target_col)
                     print(f"✅ {field_name}: 匹配关键字 '{keyword}', 从 {col_letter}{target_row + 1} 提取 = {value}")
@@ -230,11 +411,54 @@ class ExcelDataExtractor:
                     print(f"❌ {field_name}: 目标位置超出范围")
                     extracted_data[field_name] = None
             else:
-                print(f"❌ {field_name}: 未找到关键字 '{keyword}'")
+                print(f"❌ {field_name}: 未找到关键字 {' / '.join(repr(k) for k in keywords)}")
                 extracted_data[field_name] = None
         
         return extracted_data
     
+    def _first_keyword_match(self, keywords: List[str]) -> Optional[Tuple[int, int, str]]:
+        """
+        在候选关键字中查找行优先第一个出现的位置
+        
+        Args:
+            keywords: 候选关键字列表（字段关键字及其别名）
+            
+        Returns:
+            (行, 列, 命中的关键字)，都未找到时返回None
+        """
+        best = None
+        for keyword in keywords:
+            cells = self._resolve_keyword(keyword)
+            if cells and (best is None or cells[0] < best[:2]):
+                best = (cells[0][0], cells[0][1], keyword)
+        return best
+    
+    def _extract_total_count(self) -> Optional[int]:
+        """
+        通过关键字索引提取总张数，只从关键字下方单元格取值
+        
+        Returns:
+            提取的总张数，未找到时返回None让用户输入
+        """
+        try:
+            self._ensure_loaded()
+            # 合并总张数关键字及别名的所有匹配位置（行优先）
+            keywords = keyword_alternatives(TOTAL_COUNT_CONFIG['总张数'])
+            cells = sorted({cell for keyword in keywords for cell in self._resolve_keyword(keyword)})
+            for row_idx, col_idx in cells:
+                print(f"✅ 找到总张数关键字: 位置({row_idx+1},{col_idx+1}) = '{self._values[row_idx, col_idx]}'")
+                total_value = self.get_nearby_value(row_idx, col_idx, 'down')
+                if total_value is not None:
+                    print(f"✅ 从下方提取总张数: {total_value}")
+                    return int(float(total_value))
+            
+            print("❌ 未找到总张数关键字，需要用户手动输入")
+            return None
+        
+        except Exception as e:
+            print(f"❌ 提取总张数失败: {e}")
+            return None
+    
     def extract_common_data(self) -> Dict[str, Any]:
         """
         提取所有模板都需要的公共数据：客户编码、标签名称、开始号、总张数、张/盒
@@ -244,54 +468,129 @@ class ExcelDataExtractor:
         """
         print("🔍 提取公共数据字段...")
         
-        # 定义公共数据的关键字配置 - 精确匹配指定关键字
-        keyword_config = {
-            '标签名称': {
-                'keyword': '标签名称',
-                'direction': 'right'
-            },
-            '开始号': {
-                'keyword': '开始号', 
-                'direction': 'down'
-            },
-            '客户名称编码': {
-                'keyword': '客户名称编码',
-                'direction': 'down'
-            },
-            '张/盒': {
-                'keyword': '张/盒',
-                'direction': 'down'
-            },
-            '主题': {
-                'keyword': '主题',
-                'direction': 'down'
-            }
-        }
+        # 缓存命中时直接返回，完全跳过Excel解析
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.file_path, {
+                'keyword_config': COMMON_KEYWORD_CONFIG,
+                'total_count_keyword': TOTAL_COUNT_CONFIG,
+                'reader_mode': self.reader_mode,
+                'backend': self.backend_name,
+                'sheet_index': self.sheet_index,
+                'scan_all_sheets': self.scan_all_sheets
+            })
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.field_sources = dict(cached['sources'])
+                extracted_data = dict(cached['data'])
+                print(f"⚡ 命中提取缓存，跳过Excel解析:")
+                for key, value in extracted_data.items():
+                    print(f"   {key}: {value}")
+                return extracted_data
+        
+        if self.scan_all_sheets:
+            extracted_data = self._extract_common_data_all_sheets()
+        else:
+            extracted_data = self._extract_sheet_common_data()
+        
+        if cache_key is not None:
+            self.cache.put(cache_key, {'data': extracted_data, 'sources': self.field_sources})
+        
+        print(f"✅ 公共数据提取完成:")
+        for key, value in extracted_data.items():
+            source = self.field_sources.get(key)
+            print(f"   {key}: {value}" + (f" (工作表: {source})" if source else ""))
+        
+        return extracted_data
+    
+    def _extract_sheet_common_data(self) -> Dict[str, Any]:
+        """
+        从当前工作表提取公共数据
         
+        Returns:
+            公共数据字典，无效或空的字段为None
+        """
         # 使用关键字提取数据
-        extracted_data = self.extract_data_by_keywords(keyword_config)
+        extracted_data = self.extract_data_by_keywords(COMMON_KEYWORD_CONFIG)
         
         # 提取总张数（使用专门的逻辑）
-        from src.utils.text_processor import text_processor
-        total_count = text_processor.extract_total_count_by_keyword(self.df)
+        total_count = self._extract_total_count()
         extracted_data['总张数'] = total_count if total_count and total_count > 0 else None
         
         # 清理提取的数据：只保留真正有效的数据，无效或空的设为None
         cleaned_data = {}
-        for field in ['客户名称编码', '标签名称', '开始号', '总张数', '张/盒', '主题']:
+        for field in COMMON_FIELDS:
             value = extracted_data.get(field)
             if value is not None and str(value).strip() != '' and str(value) != '0':
                 cleaned_data[field] = value
             else:
                 cleaned_data[field] = None
         
-        extracted_data = cleaned_data
+        return cleaned_data
+    
+    def _extract_common_data_all_sheets(self) -> Dict[str, Any]:
+        """
+        并行扫描所有工作表提取公共数据
         
-        print(f"✅ 公共数据提取完成:")
-        for key, value in extracted_data.items():
-            print(f"   {key}: {value}")
+        每个工作表在线程池中独立读取（有界读取模式下只读表头区域），
+        按工作表顺序合并：每个字段取第一个有值的工作表。一旦所有字段都已确定，
+        立即通知其余工作表停止读取并取消尚未开始的扫描。
         
-        return extracted_data
+        Returns:
+            公共数据字典，来源工作表记录在self.field_sources
+        """
+        backend = get_backend(self.file_path, self.backend_name, streaming=self.reader_mode == 'bounded')
+        sheet_names = backend.sheet_names(self.file_path)
+        max_workers = max(1, min(len(sheet_names), MAX_SHEET_SCAN_WORKERS))
+        print(f"🔍 并行扫描{len(sheet_names)}个工作表 (线程数: {max_workers})")
+        
+        stop_event = threading.Event()
+        results: Dict[int, Optional[Dict[str, Any]]] = {}
+        merged, sources = {field: None for field in COMMON_FIELDS}, {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(self._scan_sheet, backend.name, sheet_index, stop_event): sheet_index
+                for sheet_index in range(len(sheet_names))
+            }
+            for future in as_completed(futures):
+                sheet_index = futures[future]
+                try:
+                    results[sheet_index] = future.result()
+                except Exception as e:
+                    print(f"⚠️ 工作表 '{sheet_names[sheet_index]}' 扫描失败: {e}")
+                    results[sheet_index] = None
+                
+                merged, sources, complete = _merge_sheet_results(results, len(sheet_names))
+                if complete:
+                    skipped = len(sheet_names) - len(results)
+                    if skipped:
+                        print(f"⚡ 所有字段已确定，跳过剩余{skipped}个工作表")
+                    stop_event.set()
+                    for pending in futures:
+                        pending.cancel()
+                    break
+        
+        self.field_sources = {
+            field: (sheet_names[index] if index is not None else None)
+            for field, index in sources.items()
+        }
+        return merged
+    
+    def _scan_sheet(self, backend_name: str, sheet_index: int, stop_event: threading.Event) -> Optional[Dict[str, Any]]:
+        """
+        扫描单个工作表（在线程池中执行）
+        
+        Returns:
+            该工作表的公共数据，被提前停止时返回None
+        """
+        if stop_event.is_set():
+            return None
+        sheet = ExcelDataExtractor(self.file_path, reader_mode=self.reader_mode, backend=backend_name,
+                                   sheet_index=sheet_index, stop_event=stop_event)
+        if stop_event.is_set():
+            return None  # 读取被中断，数据不完整
+        return sheet._extract_sheet_common_data()
     
     def get_unified_standard_data(self, user_supplemented_data=None):
         """
@@ -0,0 +1,43 @@
+"""
+文件名工具
+模板、外箱汇总表和标签清单共用的文件名清理规则（清单中的目标文件名依赖它们完全一致）
+"""
+
+import re
+
+
+def clean_for_filename(text: str) -> str:
+    r"""
+    清理文本使其适合作为Windows/macOS文件名
+
+    处理问题：
+    1. 换行符 (\n, \r) - Excel单元格中的换行会导致Windows文件名错误
+    2. Windows非法字符 (< > : " / \ | ? *)
+    3. 控制字符（ASCII 0-31）
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        清理后的安全文本
+    """
+    if not text:
+        return ""
+
+    # 转为字符串并清理
+    text = str(text)
+
+    # 1. 替换换行符为空格（Excel单元格中的换行）
+    text = text.replace('\n', ' ').replace('\r', ' ')
+
+    # 2. 移除Windows非法字符: < > : " / \ | ? * 和控制字符（ASCII 0-31）
+    text = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', text)
+
+    # 3. 移除前后空格和点号（Windows不允许文件名以这些结尾）
+    text = text.strip('. ')
+
+    # 4. 压缩多余的空格和下划线
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'_+', '_', text)
+
+    return text
@@ -4,7 +4,150 @@
 """
 
 import re
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# 常规模板：字母前缀 + 可选连字符 + 数字（如 DSK00001、CAR-01001）
+_REGULAR_PATTERN = re.compile(r'([A-Z]+)(-?)(\d+)')
+# 分盒模板：第一个数字序列之前的全部字符为前缀（如 JAW-0001、14KH0149）
+_SPLIT_PATTERN = re.compile(r'(\d+)')
+
+# 无法解析时的默认格式：(前缀, 起始号, 位数)
+_DEFAULT_FORMATS = {
+    'regular': ('DSK', 1, 5),
+    'split': ('DSK', 1001, 5),
+}
+
+
+class SerialScheme:
+    """
+    编译后的序列号格式：每个任务解析一次，之后每个标签只需一次整数格式化
+
+    序列号 = 前缀 + 补零到原始位数的主号，主号 = 起始号 + 偏移；
+    分盒模板的盒标在主号后追加两位副号（如 DSK01001-03）
+    """
+
+    def __init__(self, prefix: str, start_number: int, digits: int):
+        """
+        初始化序列号格式
+
+        Args:
+            prefix: 前缀（包含连字符等分隔符）
+            start_number: 起始主号
+            digits: 主号位数（不足补零）
+        """
+        self.prefix = prefix
+        self.start_number = start_number
+        self.digits = digits
+        # 预编译格式化函数，前缀中的花括号需要转义
+        escaped = prefix.replace('{', '{{').replace('}', '}}')
+        self._format_main = (escaped + '{:0%dd}' % digits).format
+        self._format_with_sub = (escaped + '{:0%dd}-{:02d}' % digits).format
+        # 反向解析：前缀 + 主号 + 可选副号
+        self._pattern = re.compile(re.escape(prefix) + r'(\d+)(?:-(\d+))?')
+
+    @classmethod
+    def parse(cls, serial_number: Optional[str], style: str = 'split') -> 'SerialScheme':
+        """
+        解析开始号
+
+        Args:
+            serial_number: 开始号（如 DSK01001、JAW-0001）
+            style: 'regular' - 常规模板规则（字母前缀 + 可选连字符 + 数字）
+                   'split' - 分盒模板规则（第一个数字序列之前的全部字符为前缀）
+
+        Returns:
+            序列号格式，无法解析时使用该规则的默认格式
+        """
+        if style not in _DEFAULT_FORMATS:
+            raise ValueError(f"未知的序列号规则: {style}")
+        if serial_number:
+            if style == 'regular':
+                match = _REGULAR_PATTERN.search(serial_number)
+                if match:
+                    number_text = match.group(3)
+                    return cls(match.group(1) + match.group(2), int(number_text), len(number_text))
+            else:
+                match = _SPLIT_PATTERN.search(serial_number)
+                if match:
+                    number_text = match.group(1)
+                    return cls(serial_number[:match.start()], int(number_text), len(number_text))
+        return cls(*_DEFAULT_FORMATS[style])
+
+    def number(self, offset: int) -> int:
+        """第offset个序列号的主号（offset从0开始）"""
+        return self.start_number + offset
+
+    def format(self, offset: int) -> str:
+        """
+        格式化第offset个序列号（offset从0开始，0为开始号本身）
+
+        示例:
+            SerialScheme('DSK', 1001, 5).format(2) -> 'DSK01003'
+        """
+        return self._format_main(self.start_number + offset)
+
+    def format_sub(self, offset: int, sub_number: int) -> str:
+        """
+        格式化带副号的序列号（分盒模板盒标）
+
+        示例:
+            SerialScheme('DSK', 1001, 5).format_sub(1, 3) -> 'DSK01002-03'
+        """
+        return self._format_with_sub(self.start_number + offset, sub_number)
+
+    def format_range(self, first_offset: int, last_offset: int) -> List[str]:
+        """批量格式化 [first_offset, last_offset] 内的全部序列号"""
+        fmt = self._format_main
+        return [fmt(number) for number in range(self.start_number + first_offset,
+                                                self.start_number + last_offset + 1)]
+
+    def range_text(self, first_offset: int, last_offset: int) -> str:
+        """标签上的序列号范围文本：首尾序列号用'-'连接（首尾相同也显示为范围）"""
+        return f"{self.format(first_offset)}-{self.format(last_offset)}"
+
+    def offset_of(self, serial: str) -> Tuple[int, Optional[int]]:
+        """
+        反向解析序列号（format/format_sub的逆运算）
+
+        示例:
+            SerialScheme('DSK', 1001, 5).offset_of('DSK01234-05') -> (233, 5)
+
+        Returns:
+            (主号偏移, 副号)，没有副号时副号为None
+
+        Raises:
+            ValueError: 序列号前缀不符或主号小于起始号
+        """
+        match = self._pattern.fullmatch(str(serial).strip())
+        if not match or int(match.group(1)) < self.start_number:
+            raise ValueError(f"序列号'{serial}'不属于开始号{self.format(0)}的编号规则")
+        sub_number = int(match.group(2)) if match.group(2) is not None else None
+        return int(match.group(1)) - self.start_number, sub_number
+
+    def to_dict(self) -> Dict[str, Any]:
+        """兼容旧接口的解析结果字典"""
+        return {
+            'prefix': self.prefix,
+            'main_number': self.start_number,
+            'original_digits': self.digits,
+        }
+
+
+@lru_cache(maxsize=256)
+def get_serial_scheme(serial_number: Optional[str], style: str = 'split') -> SerialScheme:
+    """
+    获取开始号对应的序列号格式（按开始号缓存，同一任务只解析一次）
+
+    Args:
+        serial_number: 开始号
+        style: 'regular' 或 'split'，见SerialScheme.parse
+
+    Returns:
+        序列号格式
+    """
+    return SerialScheme.parse(serial_number, style)
 
 
 class SerialNumberFormatter:
@@ -21,37 +164,10 @@ class SerialNumberFormatter:
         返回:
             包含前缀、数字值、原始位数等信息的字典
         """
-        if not serial_number:
-            return {
-                'prefix': 'DSK',
-                'main_number': 1001,
-                'original_digits': 5,
-                'digit_start': 0
-            }
-        
-        # 查找第一个数字序列
-        match = re.search(r'(\d+)', serial_number)
-        if match:
-            # 获取第一个数字（主号）的起始位置
-            digit_start = match.start()
-            # 截取主号前面的所有字符作为前缀
-            prefix_part = serial_number[:digit_start]
-            original_number_str = match.group(1)  # 原始数字字符串
-            base_main_num = int(original_number_str)  # 主号数值
-            
-            return {
-                'prefix': prefix_part,
-                'main_number': base_main_num,
-                'original_digits': len(original_number_str),  # 🔑 保持原始位数
-                'digit_start': digit_start
-            }
-        else:
-            return {
-                'prefix': 'DSK',
-                'main_number': 1001,
-                'original_digits': 5,  # 默认5位
-                'digit_start': 0
-            }
+        scheme = get_serial_scheme(serial_number, 'split')
+        # 前缀即主号之前的全部字符，主号起始位置等于前缀长度（无法解析时为0）
+        digit_start = len(scheme.prefix) if serial_number and _SPLIT_PATTERN.search(serial_number) else 0
+        return {**scheme.to_dict(), 'digit_start': digit_start}
     
     @staticmethod
     def format_serial_number(prefix: str, number: int, original_digits: int) -> str:
@@ -0,0 +1,195 @@
+"""
+文本测量缓存
+同一任务中标题、主题、中文名称等文本会在相同字体和字号下被反复测量和换行，
+这里统一缓存测量和换行结果（有界LRU），并记录命中/未命中次数。
+换行基于逐字符宽度表累加，耗时与文本长度成线性关系
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from reportlab.lib.rl_accel import unicode2T1
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+
+# 每类缓存的最大条目数
+DEFAULT_CACHE_SIZE = 4096
+
+
+class _GlyphAdvances(dict):
+    """
+    字体的逐字符宽度表（千分之一字号单位），按需从字体的宽度表读取
+
+    TrueType字体读取已注册TTF的charWidths表，Type1字体读取AFM宽度（含替代字体）。
+    宽度按与pdfmetrics.stringWidth相同的顺序累加、相同的方式换算为点，
+    因此按前缀累加得到的宽度与整行测量的结果逐位相同。
+    """
+
+    def __init__(self, font_name: str):
+        super().__init__()
+        font = pdfmetrics.getFont(font_name)
+        face = getattr(font, "face", None)
+        if face is not None and hasattr(face, "charWidths"):
+            char_widths, default_width = face.charWidths, face.defaultWidth
+            self._lookup = lambda char: char_widths.get(ord(char), default_width)
+            self.to_points = lambda units, size: 0.001 * size * units
+        else:
+            fonts = [font] + font.substitutionFonts
+            self._lookup = lambda char: sum(sum(map(f.widths.__getitem__, t)) for f, t in unicode2T1(char, fonts))
+            self.to_points = lambda units, size: units * 0.001 * size
+
+    def __missing__(self, char):
+        units = self[char] = self._lookup(char)
+        return units
+
+
+@lru_cache(maxsize=32)
+def _glyph_advances(font_name: str) -> _GlyphAdvances:
+    return _GlyphAdvances(font_name)
+
+
+def _wrap_words(text: str, max_width: float, font_name: str, font_size: float) -> Tuple[str, ...]:
+    """
+    按单词换行（文本已清理）
+
+    每个单词的宽度只在尝试放入当前行时累加一次（换到新行时再累加一次），
+    总耗时与文本长度成线性关系；换行结果与逐行整体测量相同。
+    """
+    advances = _glyph_advances(font_name)
+    to_points = advances.to_points
+    space = advances[" "]
+    lines = []
+    current_words = []
+    current_units = 0
+
+    for word in text.split():
+        units = current_units + space if current_words else current_units
+        for char in word:
+            units += advances[char]
+
+        if to_points(units, font_size) <= max_width:
+            current_words.append(word)
+            current_units = units
+        elif current_words:
+            lines.append(" ".join(current_words))
+            current_words = [word]
+            current_units = 0
+            for char in word:
+                current_units += advances[char]
+        else:
+            # 如果单个词太长，强制分行
+            lines.append(word)
+
+    if current_words:
+        lines.append(" ".join(current_words))
+    return tuple(lines) or ("",)
+
+
+def _wrap_chars(text: str, max_width: float, font_name: str, font_size: float) -> Tuple[str, ...]:
+    """按字符换行（适用于没有空格分隔的中文），每个字符的宽度只累加一次"""
+    advances = _glyph_advances(font_name)
+    to_points = advances.to_points
+    lines = []
+    line_start = 0
+    current_units = 0
+
+    for index, char in enumerate(text):
+        units = current_units + advances[char]
+        if to_points(units, font_size) <= max_width:
+            current_units = units
+        elif index > line_start:
+            lines.append(text[line_start:index])
+            line_start = index
+            current_units = 0 + advances[char]
+        else:
+            # 如果单个字符都超宽，强制添加
+            lines.append(char)
+            line_start = index + 1
+            current_units = 0
+
+    if line_start < len(text):
+        lines.append(text[line_start:])
+    return tuple(lines) or (text,)
+
+
+class TextMeasurer:
+    """文本测量缓存，所有渲染器共用"""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        """
+        初始化测量缓存
+
+        Args:
+            maxsize: 宽度缓存和换行缓存各自的最大条目数
+        """
+        self.maxsize = maxsize
+        self._string_width = lru_cache(maxsize=maxsize)(stringWidth)
+        self._wrap_words = lru_cache(maxsize=maxsize)(_wrap_words)
+        self._wrap_chars = lru_cache(maxsize=maxsize)(_wrap_chars)
+
+    def string_width(self, text: str, font_name: str, font_size: float) -> float:
+        """
+        文本宽度，按 (text, font, size) 缓存
+
+        Args:
+            text: 文本
+            font_name: 字体名称
+            font_size: 字体大小
+
+        Returns:
+            宽度（点）
+        """
+        return self._string_width(text, font_name, font_size)
+
+    def wrap_words(self, text: str, max_width: float, font_name: str, font_size: float) -> List[str]:
+        """
+        按单词换行，按 (text, font, size, max_width) 缓存
+
+        Returns:
+            文本行列表（新列表，调用方可以修改）
+        """
+        return list(self._wrap_words(text, max_width, font_name, font_size))
+
+    def wrap_chars(self, text: str, max_width: float, font_name: str, font_size: float) -> List[str]:
+        """
+        按字符换行，按 (text, font, size, max_width) 缓存
+
+        Returns:
+            文本行列表（新列表，调用方可以修改）
+        """
+        return list(self._wrap_chars(text, max_width, font_name, font_size))
+
+    def glyph_advances(self, font_name: str) -> _GlyphAdvances:
+        """
+        字体的逐字符宽度表（每页文本都不同、不适合按整串缓存时使用）
+
+        Returns:
+            {字符: 千分之一字号单位的宽度}，to_points(units, size) 换算为点，
+            按字符顺序累加后换算的结果与 string_width 逐位相同
+        """
+        return _glyph_advances(font_name)
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        各类缓存的命中情况
+
+        Returns:
+            {'width'/'wrap_words'/'wrap_chars': {'hits', 'misses', 'size'}}
+        """
+        stats = {}
+        for name, cached in (("width", self._string_width), ("wrap_words", self._wrap_words),
+                             ("wrap_chars", self._wrap_chars)):
+            info = cached.cache_info()
+            stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+        return stats
+
+    def clear(self):
+        """清空缓存和计数（字体重新注册后调用）"""
+        for cached in (self._string_width, self._wrap_words, self._wrap_chars):
+            cached.cache_clear()
+        _glyph_advances.cache_clear()
+
+
+# 全局文本测量实例
+text_measurer = TextMeasurer()
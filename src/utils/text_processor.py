@@ -6,6 +6,8 @@
 from typing import List, Optional
 from reportlab.pdfgen import canvas
 
+from src.utils.text_measurer import text_measurer
+
 
 class TextProcessor:
     """文本处理工具类，负责文本清理、换行和格式化"""
@@ -37,7 +39,7 @@ class TextProcessor:
         将文本包装以适应指定宽度
         
         Args:
-            canvas_obj: ReportLab Canvas对象
+            canvas_obj: ReportLab Canvas对象（宽度按字体度量计算，与canvas.stringWidth相同，可为None）
             text: 要包装的文本
             max_width: 最大宽度
             font_name: 字体名称
@@ -49,31 +51,9 @@ class TextProcessor:
         if not text:
             return [""]
         
-        # 先清理文本
+        # 先清理文本；测量和换行结果按 (文本, 字体, 字号, 宽度) 缓存
         text = self.clean_text_for_font(text)
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            text_width = canvas_obj.stringWidth(test_line, font_name, font_size)
-            
-            if text_width <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                    current_line = word
-                else:
-                    # 如果单个词太长，强制分行
-                    lines.append(word)
-                    current_line = ""
-        
-        if current_line:
-            lines.append(current_line)
-        
-        return lines if lines else [""]
+        return text_measurer.wrap_words(text, max_width, font_name, font_size)
     
     def has_chinese(self, text: str) -> bool:
         """
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+批量任务快速测试
+验证任务行规范化、工作簿流式读取和批量生成（相同任务不会互相覆盖）
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from openpyxl import Workbook
+
+from src.data.job_records import iter_workbook_jobs, normalize_job_record
+from src.pdf.batch_generator import job_dir_name, run_batch
+
+
+HEADER = ["客户名称编码", "标签名称", "开始号", "总张数", "张/盒", "主题", "盒/小箱", "小箱/大箱", "模板", "盒/套", "是否有盒标"]
+
+
+def _write_batch_workbook(path):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(HEADER)
+    ws.append(["C001", "ALPHA", "DSK01001", 3000, 100, "阿尔法", 5, 2, "常规", None, "有盒标"])
+    ws.append([None] * len(HEADER))
+    ws.append(["C002", "BETA", "JAW-0001", 2400, 120, "贝塔", 2, 2, "分/套盒", 4, "否"])
+    ws.append(["C003", "GAMMA", "X0001", None, 100, "伽马", 5, 2, "常规", None, None])
+    wb.save(path)
+
+
+def test_normalize_job_record_defaults():
+    """缺省参数使用对话框默认值，中文名称默认取主题"""
+    job = normalize_job_record({
+        "客户名称编码": "C001", "标签名称": "ALPHA", "开始号": 1001.0, "总张数": "3000",
+        "张/盒": 100, "主题": "阿尔法", "盒/小箱": 5, "是否有小箱": "无小箱",
+    })
+
+    assert job["template"] == "regular_box"
+    assert job["data"] == {"客户名称编码": "C001", "标签名称": "ALPHA", "开始号": "1001",
+                           "总张数": 3000, "张/盒": 100, "主题": "阿尔法"}
+    assert job["params"]["中文名称"] == "阿尔法"
+    assert job["params"]["是否有小箱"] is False
+    assert job["params"]["选择外观"] == "外观一"
+    assert "盒/套" not in job["params"]
+
+
+def test_normalize_job_record_errors():
+    """缺少字段或参数不合法时抛出ValueError"""
+    record = {"客户名称编码": "C001", "标签名称": "ALPHA", "开始号": "DSK01001", "总张数": 3000,
+              "张/盒": 100, "主题": "阿尔法", "盒/小箱": 5}
+    with pytest.raises(ValueError, match="缺少字段: 盒/小箱"):
+        normalize_job_record({**record, "盒/小箱": None})
+    with pytest.raises(ValueError, match="正整数"):
+        normalize_job_record({**record, "总张数": -5})
+    with pytest.raises(ValueError, match="未知的模板类型"):
+        normalize_job_record({**record, "模板": "嵌套"})
+
+
+def test_iter_workbook_jobs_streams_rows(tmp_path):
+    """逐行惰性读取，跳过空行，不合法的行带错误信息而不中断"""
+    path = tmp_path / "batch.xlsx"
+    _write_batch_workbook(path)
+
+    jobs = iter_workbook_jobs(str(path))
+    first = next(jobs)
+    assert first["source"] == "batch.xlsx 第2行"
+    assert first["params"]["是否有盒标"] is True
+
+    rest = list(jobs)
+    assert [job["source"] for job in rest] == ["batch.xlsx 第4行", "batch.xlsx 第5行"]
+    assert rest[0]["template"] == "split_box" and rest[0]["params"]["盒/套"] == 4
+    assert "总张数" in rest[1]["error"]
+
+
+def test_run_batch_generates_each_job(tmp_path):
+    """批量生成：每个合法任务生成一套标签，失败任务单独汇报"""
+    path = tmp_path / "batch.xlsx"
+    _write_batch_workbook(path)
+    output_dir = tmp_path / "out"
+
+    summary = run_batch(iter_workbook_jobs(str(path)), str(output_dir), max_workers=2, use_processes=False)
+
+    assert summary["succeeded"] == 2
+    assert summary["failed"] == 1
+    first_files = summary["results"][0]["files"]
+    assert set(first_files) == {"盒标", "小箱标", "大箱标", "外箱汇总表"}
+    assert all(os.path.exists(p) for p in first_files.values())
+    assert os.path.relpath(first_files["盒标"], output_dir).startswith("batch.xlsx 第2行" + os.sep)
+
+
+def test_identical_jobs_do_not_overwrite(tmp_path):
+    """客户、标签和中文名称相同的任务同时生成时各自写入子目录，不会互相覆盖"""
+    path = tmp_path / "batch.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(HEADER)
+    for _ in range(3):
+        ws.append(["C001", "ALPHA", "DSK01001", 300, 100, "阿尔法", 2, 2, "常规", None, "有盒标"])
+    wb.save(path)
+    output_dir = tmp_path / "out"
+
+    summary = run_batch(iter_workbook_jobs(str(path)), str(output_dir), max_workers=3, use_processes=False)
+
+    assert summary["succeeded"] == 3
+    paths = [p for result in summary["results"] for p in result["files"].values()]
+    assert len(set(paths)) == len(paths) == 12
+    assert all(os.path.exists(p) for p in paths)
+    assert sorted(os.listdir(output_dir)) == ["batch.xlsx 第2行", "batch.xlsx 第3行", "batch.xlsx 第4行"]
+
+    used = set()
+    assert [job_dir_name(source, i, used) for i, source in enumerate(["a.csv 第2行", "a.csv 第2行", "", ""], 1)] == \
+        ["a.csv 第2行", "a.csv 第2行_2", "任务3", "任务4"]
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_normalize_job_record_defaults()
+    test_normalize_job_record_errors()
+    for test in (test_iter_workbook_jobs_streams_rows, test_run_batch_generates_each_job,
+                 test_identical_jobs_do_not_overwrite):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ 批量任务快速测试通过")
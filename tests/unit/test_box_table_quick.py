@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+箱标表格快速测试
+验证表格静态部分（框线、标题、主题、备注）每个文件只写入一次，每页只写入可变文本
+"""
+
+import sys
+import os
+import io
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+
+from src.pdf.box_table import draw_box_table
+from src.pdf.regular_box.renderer import regular_renderer
+from src.pdf.split_box.renderer import split_box_renderer
+from src.utils.font_manager import font_manager
+
+
+# 直接调用渲染器时需要先注册字体（模板在PDFBase中注册）
+font_manager.register_chinese_font()
+
+PAGE_SIZE = (90 * mm, 50 * mm)
+
+
+def _render(pages, draw):
+    """逐页绘制表格，返回未压缩的PDF字节"""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=PAGE_SIZE, pageCompression=0)
+    for page in range(1, pages + 1):
+        draw(c, page)
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def test_static_part_written_once():
+    """多页箱标只包含一份表格框线和标题，每页引用同一个表单"""
+    pdf = _render(30, lambda c, page: regular_renderer.draw_small_box_table(
+        c, *PAGE_SIZE, "ALPHA", 40, f"DSK{page:05d}-DSK{page + 3:05d}", f"{page}/30", "C001"))
+    assert pdf.count(b"/Subtype /Form") == 1
+    for caption in (b"(Item:)", b"(Theme:)", b"(Quantity:)", b"(Carton No:)", b"(Remark:)", b"(Paper Cards)",
+                    b"(ALPHA)", b"(C001)"):
+        assert pdf.count(caption) == 1, caption
+    # 可变文本每页各一次
+    assert pdf.count(b"(40PCS)") == 30
+    assert b"(DSK00007-DSK00010)" in pdf and b"(30/30)" in pdf
+
+
+def test_form_follows_layout_and_theme():
+    """模版类型、主题或备注不同时使用不同的表单"""
+    def draw(c, page):
+        template_type = "有纸卡备注" if page % 2 else "无纸卡备注"
+        regular_renderer.draw_large_box_table(c, *PAGE_SIZE, "ALPHA", 80, "S", "1/1", "C001", template_type)
+        draw_box_table(c, *PAGE_SIZE, "BETA" if page > 2 else "ALPHA", 80, "S", "1/1", "C001")
+
+    pdf = _render(4, draw)
+    # 有纸卡ALPHA、无纸卡ALPHA、有纸卡BETA
+    assert pdf.count(b"/Subtype /Form") == 3
+    assert pdf.count(b"(Theme:)") == 2
+
+
+def test_split_box_tables_use_forms():
+    """分盒模板的四种表格同样只在页面中写入可变文本"""
+    def draw(c, page):
+        split_box_renderer.draw_split_box_small_box_table(c, *PAGE_SIZE, "ALPHA", 20, "A-B", f"{page}/5", "C001")
+        split_box_renderer.draw_split_box_small_box_table_no_paper_card(c, *PAGE_SIZE, "ALPHA", 20, "A-B", "1/5", "C001")
+        split_box_renderer.draw_split_box_large_box_table(c, *PAGE_SIZE, "ALPHA", 20, "A-B", "1/5", "C001")
+        split_box_renderer.draw_split_box_large_box_table_no_paper_card(c, *PAGE_SIZE, "ALPHA", 20, "A-B", "1/5", "C001")
+
+    pdf = _render(5, draw)
+    # 小箱标和大箱标版式相同，共用表单
+    assert pdf.count(b"/Subtype /Form") == 2
+    assert pdf.count(b"(Remark:)") == 2 and pdf.count(b"(20PCS)") == 20
+
+
+if __name__ == "__main__":
+    test_static_part_written_once()
+    test_form_follows_layout_and_theme()
+    test_split_box_tables_use_forms()
+    print("✅ 箱标表格快速测试通过")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+逐箱容量快速测试
+验证容量列表的前缀和索引、常规模板的混合装箱计划、反向查询和外箱汇总表
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.job_records import normalize_job_record
+from src.pdf.label_plan import CartonIndex, build_label_plan
+from src.pdf.regular_box.template import RegularTemplate
+from src.pdf.serial_lookup import carton_contents, locate_serial
+
+
+def test_carton_index_cycles_pattern():
+    """容量列表循环使用，最后一箱装余数；盒→箱二分查找与逐个展开一致"""
+    index = CartonIndex.build([10, 10, 8], 61)
+    assert index.capacities.tolist() == [10, 10, 8, 10, 10, 8, 5]
+    assert index.unit_range(3) == (21, 28)
+    expanded = np.repeat(np.arange(1, len(index) + 1), index.capacities)
+    assert index.carton_of(np.arange(1, 62)).tolist() == expanded.tolist()
+    assert index.carton_of(28) == 3 and index.carton_of(29) == 4
+    with pytest.raises(ValueError):
+        CartonIndex.build([5, 0], 10)
+
+
+def test_regular_plan_with_mixed_capacities():
+    """每个托盘一个短箱：数量、序列号范围和Carton No按实际容量计算"""
+    data = {"开始号": "DSK00001", "总张数": 610}
+    params = {"张/盒": 10, "盒/小箱": 10, "小箱/大箱": 3, "小箱容量": "10,10,8", "大箱容量": [3, 2]}
+    plan = build_label_plan("regular_box", data, params)
+    small = list(plan.level("小箱标").iter_rows())
+    assert [row["quantity"] for row in small] == [100, 100, 80, 100, 100, 80, 50]
+    assert small[2]["serial"] == "DSK00021-DSK00028" and small[2]["carton_no"] == "3/7"
+
+    large = list(plan.level("大箱标").iter_rows())
+    assert [row["serial"] for row in large] == ["DSK00001-DSK00028", "DSK00029-DSK00048",
+                                                "DSK00049-DSK00061"]
+    assert sum(row["quantity"] for row in large) == 610
+
+    result = locate_serial("regular_box", data, params, "DSK00048")
+    assert (result["labels"]["小箱标"]["number"], result["labels"]["大箱标"]["number"]) == (5, 2)
+    assert carton_contents("regular_box", data, params, "大箱标", 3)["boxes"] == [49, 61]
+
+    # 未指定容量时与均匀装箱完全一致
+    uniform = build_label_plan("regular_box", data, {"张/盒": 10, "盒/小箱": 10, "小箱/大箱": 3, "小箱容量": "10"})
+    assert uniform.level("大箱标").end_box.tolist() == [30, 60, 61]
+
+
+def test_capacities_from_job_records():
+    """任务文件可填写容量列；分盒模板按盒/套装箱，不接受逐箱容量"""
+    record = {"客户名称编码": "C01", "标签名称": "ALPHA", "开始号": "DSK00001", "总张数": 610, "张/盒": 10,
+              "主题": "A", "盒/小箱": 10, "小箱/大箱": 3, "小箱容量": "10，10，8"}
+    job = normalize_job_record(record)
+    assert job["params"]["小箱容量"] == (10, 10, 8) and "大箱容量" not in job["params"]
+
+    with pytest.raises(ValueError):
+        normalize_job_record({**record, "大箱容量": "3,x"})
+    split = normalize_job_record({**record, "模板": "分/套盒", "盒/套": 2})
+    with pytest.raises(ValueError):
+        build_label_plan("split_box", split["data"], split["params"])
+
+
+def test_carton_summary_groups_capacities(tmp_path):
+    """逐箱容量时外箱汇总表按每个大箱的实际盒数分组，不再输出统一的 盒/小箱 × 小箱/大箱"""
+    data = {"客户名称编码": "C01", "标签名称": "ALPHA", "开始号": "DSK00001", "总张数": 1220, "主题": "ALPHA"}
+    params = {"张/盒": 10, "盒/小箱": 10, "小箱/大箱": 3, "小箱容量": "10,10,8", "是否有盒标": False,
+              "选择外观": "外观一", "中文名称": ""}
+    result = RegularTemplate().create_multi_level_pdfs(data, params, str(tmp_path))
+    summary = pd.read_excel(result["外箱汇总表"])
+    assert list(zip(summary["每箱盒数"], summary["总箱数"])) == [(28, 4), (10, 1)]
+
+    uniform = RegularTemplate().create_multi_level_pdfs(data, {**params, "小箱容量": None}, str(tmp_path / "均匀"))
+    summary = pd.read_excel(uniform["外箱汇总表"])
+    assert list(zip(summary["每箱盒数"], summary["总箱数"])) == [(30, 5)]
+
+
+if __name__ == "__main__":
+    test_carton_index_cycles_pattern()
+    test_regular_plan_with_mixed_capacities()
+    test_capacities_from_job_records()
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_carton_summary_groups_capacities(Path(tmp))
+    print("✅ 逐箱容量快速测试通过")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+任务耗时估算快速测试
+验证闭式页数计算、按校准配置换算大小/耗时，以及参数对话框的估算显示
+"""
+
+import sys
+import os
+import itertools
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pdf.cost_estimator import (DEFAULT_COST_PROFILE, calibrate_cost_profile, count_labels, count_pages,
+                                    estimate_job_cost, load_cost_profile)
+from src.pdf.label_plan import build_label_plan
+from src.pdf.regular_box.ui_dialog import RegularUIDialog
+
+
+def test_closed_form_counts_match_plan():
+    """闭式计算的标签数量与标签计划一致（含分盒套数规则和逐箱容量）"""
+    data = {"开始号": "DSK01001"}
+    for boxes, bs, sl, bps, has_small_box in itertools.product((1, 29, 120), (1, 3, 7), (1, 4), (1, 3, 8), (True, False)):
+        data["总张数"] = boxes * 10 - 3
+        params = {"张/盒": 10, "盒/小箱": bs, "小箱/大箱": sl, "盒/套": bps, "是否有小箱": has_small_box}
+        for template in ("regular_box", "split_box"):
+            assert count_labels(template, data, params) == build_label_plan(template, data, params).counts()
+
+    params = {"张/盒": 10, "盒/小箱": 10, "小箱/大箱": 3, "小箱容量": "10,10,8", "大箱容量": [3, 2]}
+    data["总张数"] = 610
+    assert count_labels("regular_box", data, params) == build_label_plan("regular_box", data, params).counts()
+
+    # 页数：箱标有空箱标签页，盒标在填写中文名称时有空白首页
+    params = {"张/盒": 10, "盒/小箱": 4, "小箱/大箱": 3, "是否有盒标": True, "中文名称": "阿尔法"}
+    assert count_pages("regular_box", {"总张数": 437}, params) == {"盒标": 45, "小箱标": 12, "大箱标": 5}
+    assert "盒标" not in count_pages("regular_box", {"总张数": 437}, {**params, "是否有盒标": False})
+
+
+def test_estimate_uses_profile(tmp_path):
+    """大小和耗时按校准配置线性换算；配置缺失或版本不符时使用默认值"""
+    profile = {
+        "version": DEFAULT_COST_PROFILE["version"], "machine": "test", "calibrated_at": "2024-01-01T00:00:00",
+        "templates": {"split_box": {"seconds_per_page": 0.01, "seconds_per_job": 1.0, "levels": {
+            "盒标": {"bytes_per_page": 100, "bytes_per_file": 1000},
+            "小箱标": {"bytes_per_page": 200, "bytes_per_file": 1000},
+            "大箱标": {"bytes_per_page": 300, "bytes_per_file": 1000},
+        }}},
+    }
+    params = {"张/盒": 10, "盒/小箱": 2, "盒/套": 2, "是否有小箱": False}
+    estimate = estimate_job_cost("split_box", {"总张数": 20_000_000}, params, profile)
+    assert estimate["pages"] == {"箱标": 1_000_001}
+    assert estimate["bytes"]["箱标"] == 1000 + 300 * 1_000_001  # 箱标按大箱标的版式换算
+    assert abs(estimate["seconds"] - (1.0 + 0.01 * 1_000_001)) < 1e-6 and estimate["calibrated"]
+
+    assert load_cost_profile(str(tmp_path / "missing.json")) is DEFAULT_COST_PROFILE
+    (tmp_path / "old.json").write_text('{"version": 0}', encoding="utf-8")
+    assert load_cost_profile(str(tmp_path / "old.json")) is DEFAULT_COST_PROFILE
+
+    path = str(tmp_path / "cost_profile.json")
+    calibrated = calibrate_cost_profile(path, sizes=(8, 24))
+    assert load_cost_profile(path) == calibrated
+    assert calibrated["templates"]["regular_box"]["levels"]["小箱标"]["bytes_per_page"] > 0
+
+
+def test_dialog_estimate_text():
+    """参数对话框按输入实时显示估算，参数不完整时提示"""
+    var = lambda value: SimpleNamespace(get=lambda: value)
+    main_app = SimpleNamespace(
+        current_data={"总张数": 437}, pieces_per_box_var=var("10"), boxes_per_small_box_var=var("4"),
+        small_boxes_per_large_box_var=var("3"), has_small_box_var=var("有小箱"), has_box_label_var=var("无盒标"),
+        appearance_var=var("外观一"), chinese_name_var=var(""),
+    )
+    dialog = RegularUIDialog(main_app)
+    dialog.cost_profile = DEFAULT_COST_PROFILE
+    dialog.cost_label = SimpleNamespace(config=lambda text: setattr(dialog, "shown", text))
+
+    dialog.update_cost_estimate()
+    assert dialog.shown.splitlines()[0].startswith("小箱标: 12 页")
+    assert "合计: 17 页" in dialog.shown and "本机未校准" in dialog.shown
+
+    main_app.boxes_per_small_box_var = var("")
+    dialog.update_cost_estimate()
+    assert dialog.shown == "请输入完整的包装参数"
+
+
+def test_dialog_traces_removed_on_close():
+    """重复打开对话框不会累积参数变量上的估算监听，关闭后全部移除"""
+    import tkinter as tk
+    from src.pdf.split_box.ui_dialog import SplitBoxUIDialog
+    interp = tk.Tcl()
+    variables = [tk.StringVar(master=interp, value="4") for _ in range(3)]
+    for dialog in (RegularUIDialog(SimpleNamespace()), SplitBoxUIDialog(SimpleNamespace())):
+        dialog.update_cost_estimate = lambda *args: setattr(dialog, "updates", getattr(dialog, "updates", 0) + 1)
+        for _ in range(3):
+            dialog._watch_cost_params(variables)
+        assert [len(var.trace_info()) for var in variables] == [1, 1, 1]
+        variables[0].set("5")
+        assert dialog.updates == 1
+
+        dialog._remove_cost_traces()
+        assert [var.trace_info() for var in variables] == [[], [], []]
+        variables[0].set("6")
+        assert dialog.updates == 1
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_closed_form_counts_match_plan()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_estimate_uses_profile(Path(tmp))
+    test_dialog_estimate_text()
+    test_dialog_traces_removed_on_close()
+    print("✅ 任务耗时估算快速测试通过")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Excel数据提取快速测试
+验证关键字索引提取出的公共数据与表头内容一致
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook
+
+from src.utils.excel_data_extractor import ExcelDataExtractor
+
+
+def _write_order_sheet(path, line_items=200):
+    """生成一个带表头区域和大量明细行的订单表"""
+    wb = Workbook()
+    ws = wb.active
+    ws["B3"] = "主题"
+    ws["B4"] = "女士夜"
+    ws["B6"] = "客户名称编码"
+    ws["B7"] = "14KH0149"
+    ws["D6"] = "张/盒"
+    ws["D7"] = 730
+    ws["E6"] = "总张数"
+    ws["E7"] = 109500
+    ws["B10"] = "开始号"
+    ws["B11"] = "DSK01001"
+    ws["G11"] = "标签名称"
+    ws["H11"] = "LADIES NIGHT IN"
+    for row in range(20, 20 + line_items):
+        ws.cell(row=row, column=1, value=f"明细{row}")
+        ws.cell(row=row, column=2, value=row * 3)
+    wb.save(path)
+
+
+def test_extract_common_data(tmp_path):
+    """公共数据字段全部通过索引提取"""
+    path = tmp_path / "order.xlsx"
+    _write_order_sheet(path)
+
+    data = ExcelDataExtractor(str(path)).extract_common_data()
+
+    assert data["客户名称编码"] == "14KH0149"
+    assert data["标签名称"] == "LADIES NIGHT IN"
+    assert data["开始号"] == "DSK01001"
+    assert data["总张数"] == 109500
+    assert int(data["张/盒"]) == 730
+    assert data["主题"] == "女士夜"
+
+
+def test_find_keyword_row_major_order(tmp_path):
+    """包含匹配按行优先顺序返回，精确匹配与包含匹配都能命中"""
+    path = tmp_path / "order.xlsx"
+    _write_order_sheet(path, line_items=5)
+
+    extractor = ExcelDataExtractor(str(path))
+    positions = extractor.find_keyword("明细")
+
+    assert [p["excel_ref"] for p in positions] == ["A20", "A21", "A22", "A23", "A24"]
+    assert extractor.find_keyword("不存在的关键字") == []
+
+
+def test_missing_fields_are_none(tmp_path):
+    """缺失的字段返回None，交由用户补充"""
+    path = tmp_path / "empty.xlsx"
+    wb = Workbook()
+    wb.active["A1"] = "标签名称"
+    wb.save(path)
+
+    data = ExcelDataExtractor(str(path)).extract_common_data()
+
+    assert data["标签名称"] is None
+    assert data["总张数"] is None
+    assert data["开始号"] is None
+
+
+def test_bounded_reader_matches_full(tmp_path):
+    """有界读取与完整读取结果一致，且在明细行之前停止"""
+    path = tmp_path / "order.xlsx"
+    _write_order_sheet(path, line_items=2000)
+
+    full = ExcelDataExtractor(str(path))
+    bounded = ExcelDataExtractor(str(path), reader_mode='bounded')
+
+    full_data = full.extract_common_data()
+    bounded_data = bounded.extract_common_data()
+    assert bounded_data["张/盒"] == 730
+    assert {k: str(v) for k, v in bounded_data.items()} == \
+        {k: str(int(v)) if isinstance(v, float) else str(v) for k, v in full_data.items()}
+    assert bounded._values.shape[0] == 11  # 标签名称/开始号所在行读完即停止
+
+
+def test_bounded_reader_skips_empty_total_count(tmp_path):
+    """总张数第一个匹配下方为空时继续读取，直到找到有值的匹配"""
+    path = tmp_path / "order.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws["A1"] = "总张数"
+    ws["C5"] = "总张数"
+    ws["C6"] = 3000
+    for row in range(10, 100):
+        ws.cell(row=row, column=1, value=row)
+    wb.save(path)
+
+    extractor = ExcelDataExtractor(str(path), reader_mode='bounded')
+
+    assert extractor.extract_common_data()["总张数"] == 3000
+
+
+def test_scan_all_sheets_reports_sources(tmp_path):
+    """表头在第二个工作表时也能提取，并记录每个字段的来源工作表；靠前的工作表优先"""
+    path = tmp_path / "order.xlsx"
+    wb = Workbook()
+    cover = wb.active
+    cover.title = "封面"
+    cover["A1"] = "主题"
+    cover["A2"] = "封面主题"
+    header = wb.create_sheet("订单")
+    header["B3"] = "主题"
+    header["B4"] = "女士夜"
+    header["B6"] = "总张数"
+    header["B7"] = 3000
+    header["C6"] = "开始号"
+    header["C7"] = "DSK01001"
+    wb.save(path)
+
+    assert ExcelDataExtractor(str(path)).extract_common_data()["总张数"] is None
+
+    extractor = ExcelDataExtractor(str(path), reader_mode='bounded', scan_all_sheets=True)
+    data = extractor.extract_common_data()
+
+    assert data["总张数"] == 3000
+    assert data["开始号"] == "DSK01001"
+    assert data["主题"] == "封面主题"
+    assert extractor.field_sources["总张数"] == "订单"
+    assert extractor.field_sources["主题"] == "封面"
+    assert extractor.field_sources["标签名称"] is None
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_extract_common_data(Path(tmp))
+        test_find_keyword_row_major_order(Path(tmp))
+        test_missing_fields_are_none(Path(tmp))
+        test_bounded_reader_matches_full(Path(tmp))
+        test_bounded_reader_skips_empty_total_count(Path(tmp))
+        test_scan_all_sheets_reports_sources(Path(tmp))
+    print("✅ Excel数据提取快速测试通过")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+提取缓存快速测试
+验证内容哈希键、内存/磁盘两级命中和磁盘大小淘汰
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook
+
+from src.data.extraction_cache import ExtractionCache
+from src.utils.excel_data_extractor import ExcelDataExtractor
+
+
+def _write_sheet(path, total=109500):
+    wb = Workbook()
+    ws = wb.active
+    ws["A1"] = "标签名称"
+    ws["B1"] = "LADIES NIGHT IN"
+    ws["A3"] = "总张数"
+    ws["A4"] = total
+    wb.save(path)
+
+
+def test_cache_hits_skip_excel_parsing(tmp_path):
+    """第二次提取命中内存缓存，新进程（新缓存实例）命中磁盘缓存"""
+    path = tmp_path / "order.xlsx"
+    _write_sheet(path)
+    cache_dir = str(tmp_path / "cache")
+
+    cache = ExtractionCache(cache_dir=cache_dir)
+    first = ExcelDataExtractor(str(path), reader_mode='bounded', cache=cache).extract_common_data()
+
+    extractor = ExcelDataExtractor(str(path), reader_mode='bounded', cache=cache)
+    assert extractor.extract_common_data() == first
+    assert extractor._values is None  # 未解析Excel
+    assert cache.stats == {'memory_hits': 1, 'disk_hits': 0, 'misses': 1}
+
+    fresh_cache = ExtractionCache(cache_dir=cache_dir)
+    assert ExcelDataExtractor(str(path), cache=fresh_cache, reader_mode='bounded').extract_common_data() == first
+    assert fresh_cache.stats['disk_hits'] == 1
+
+
+def test_cache_key_follows_file_content(tmp_path):
+    """文件内容变化后缓存键随之变化"""
+    path = tmp_path / "order.xlsx"
+    cache = ExtractionCache(cache_dir=None)
+
+    _write_sheet(path, total=1000)
+    assert ExcelDataExtractor(str(path), cache=cache).extract_common_data()["总张数"] == 1000
+
+    _write_sheet(path, total=2000)
+    os.utime(path, ns=(0, 1))  # 保证修改时间变化
+    assert ExcelDataExtractor(str(path), cache=cache).extract_common_data()["总张数"] == 2000
+
+
+def test_disk_tier_size_eviction(tmp_path):
+    """磁盘层超过大小上限时淘汰最旧的条目，内存层按LRU淘汰"""
+    cache_dir = tmp_path / "cache"
+    cache = ExtractionCache(cache_dir=str(cache_dir), max_memory_entries=2, max_disk_bytes=300)
+
+    for i in range(10):
+        cache.put(f"key{i}", {"标签名称": "X" * 50, "序号": i})
+
+    remaining = sorted(os.listdir(cache_dir))
+    assert sum(os.path.getsize(cache_dir / name) for name in remaining) <= 300
+    assert "key9.json" in remaining
+    assert "key0.json" not in remaining
+    assert list(cache._memory) == ["key8", "key9"]
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_cache_hits_skip_excel_parsing, test_cache_key_follows_file_content,
+                 test_disk_tier_size_eviction):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ 提取缓存快速测试通过")
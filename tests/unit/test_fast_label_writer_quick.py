@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+盒标快速引擎快速测试
+验证快速引擎每页的内容流与画布路径逐字节相同，TrueType子集只嵌入一次，交叉引用表正确
+"""
+
+import sys
+import os
+import io
+import re
+import zlib
+import base64
+import tempfile
+import contextlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import reportlab
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from src.data.job_records import normalize_job_record
+from src.pdf.fast_label_writer import fast_engine_supported, write_box_label_file
+from src.pdf.label_layout import blank_page_layout, box_label_layout
+from src.pdf.regular_box.template import RegularTemplate
+from src.pdf.split_box.template import SplitBoxTemplate
+from src.utils.font_manager import font_manager
+
+
+# 直接调用快速引擎时需要先注册字体（模板在PDFBase中注册）
+font_manager.register_chinese_font()
+
+PAGE_SIZE = (90 * mm, 50 * mm)
+VERA_DIR = os.path.join(os.path.dirname(reportlab.__file__), "fonts")
+
+
+def _page_streams(path):
+    """按页面树顺序返回每页解压后的内容流"""
+    raw = open(path, "rb").read()
+    objects = {int(m.group(1)): m.group(2) for m in re.finditer(rb"(\d+) 0 obj\r?\n(.*?)endobj", raw, re.S)}
+    pages = next(body for body in objects.values() if b"/Type /Pages" in body)
+    streams = []
+    for kid in re.findall(rb"(\d+) 0 R", re.search(rb"/Kids \[(.*?)\]", pages, re.S).group(1)):
+        body = objects[int(re.search(rb"/Contents (\d+) 0 R", objects[int(kid)]).group(1))]
+        data = re.search(rb"stream\r?\n(.*?)endstream", body, re.S).group(1)
+        if b"ASCII85Decode" in body:
+            data = base64.a85decode(data.strip()[:-2])
+        streams.append(zlib.decompressobj().decompress(data))
+    return streams
+
+
+def _box_labels(template, output_path, engine, style, chinese_name="测试名称"):
+    data = {"客户名称编码": "C01", "标签名称": "ALPHA BETA GAMMA DELTA (EPSILON) ZETA", "开始号": "DSK01001",
+            "总张数": 300}
+    params = {"张/盒": 10, "盒/小箱": 2, "小箱/大箱": 2, "盒/套": 2, "选择外观": style,
+              "中文名称": chinese_name, "是否有盒标": True, "渲染引擎": engine}
+    with contextlib.redirect_stdout(io.StringIO()):
+        if isinstance(template, RegularTemplate):
+            template._create_box_label(data, params, output_path, style)
+        else:
+            template._create_split_box_label(data, params, output_path, style)
+    return open(output_path, "rb").read()
+
+
+def test_content_streams_match_canvas():
+    """两种外观、两个模板（含空白首页）每页的内容流与画布路径逐字节相同"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        for template in (RegularTemplate(), SplitBoxTemplate()):
+            for style in ("外观一", "外观二"):
+                canvas_path = os.path.join(output_dir, "canvas.pdf")
+                fast_path = os.path.join(output_dir, "fast.pdf")
+                assert b"ReportLab" in _box_labels(template, canvas_path, "canvas", style)
+                assert b"ReportLab" not in _box_labels(template, fast_path, "fast", style)
+                canvas_pages = _page_streams(canvas_path)
+                assert len(canvas_pages) == 31
+                assert _page_streams(fast_path) == canvas_pages
+
+
+def test_truetype_subsets_and_xref():
+    """TrueType字体：子集字体对象只写一次，内容流与画布路径相同，交叉引用偏移量指向各对象"""
+    for name, file_name in (("VeraFastTest", "Vera.ttf"), ("VeraFastTest-Bold", "VeraBd.ttf")):
+        pdfmetrics.registerFont(TTFont(name, os.path.join(VERA_DIR, file_name)))
+    saved = (font_manager.chinese_font_name, font_manager.bold_font_name, font_manager.bold_font_registered)
+    font_manager.chinese_font_name, font_manager.bold_font_name = "VeraFastTest", "VeraFastTest-Bold"
+    font_manager.bold_font_registered = True
+    box_label_layout.cache_clear()
+    blank_page_layout.cache_clear()
+    try:
+        assert fast_engine_supported()
+        with tempfile.TemporaryDirectory() as output_dir:
+            canvas_path = os.path.join(output_dir, "canvas.pdf")
+            fast_path = os.path.join(output_dir, "fast.pdf")
+            _box_labels(RegularTemplate(), canvas_path, "canvas", "外观二", "Ωmega ÀÉ")
+            _box_labels(RegularTemplate(), fast_path, "fast", "外观二", "Ωmega ÀÉ")
+            assert _page_streams(fast_path) == _page_streams(canvas_path)
+
+            pages = write_box_label_file(fast_path, PAGE_SIZE, "外观一", "ALPHA", (f"DSK{i:05d}" for i in range(50)),
+                                         30, 10, chinese_name="NAME")
+            raw = open(fast_path, "rb").read()
+    finally:
+        font_manager.chinese_font_name, font_manager.bold_font_name, font_manager.bold_font_registered = saved
+        box_label_layout.cache_clear()
+        blank_page_layout.cache_clear()
+
+    assert pages == 51
+    assert raw.count(b"/FontFile2") == 1 and raw.count(b"/Subtype /TrueType") == 1
+    assert b"/Count 51" in raw
+    xref = raw[int(raw[raw.rindex(b"startxref") + 9:].split()[0]):]
+    offsets = [int(line[:10]) for line in xref.split(b"\n")[3:] if line.endswith(b" n ")]
+    for number, offset in enumerate(offsets, 1):
+        assert raw[offset:].startswith(f"{number} 0 obj".encode())
+
+
+def test_engine_option_and_fallback():
+    """默认使用画布路径；字体不支持时快速引擎回退到画布；任务记录的渲染引擎列可选"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        path = os.path.join(output_dir, "box.pdf")
+        assert b"ReportLab" in _box_labels(RegularTemplate(), path, None, "外观一")
+
+        saved = font_manager.bold_font_name, font_manager.bold_font_registered
+        font_manager.bold_font_name, font_manager.bold_font_registered = "NoSuchFont", True
+        try:
+            assert not fast_engine_supported()
+        finally:
+            font_manager.bold_font_name, font_manager.bold_font_registered = saved
+
+    record = {"客户名称编码": "C01", "标签名称": "ALPHA", "开始号": "DSK01001", "总张数": 100, "张/盒": 10,
+              "主题": "ALPHA", "盒/小箱": 2}
+    assert "渲染引擎" not in normalize_job_record(record)["params"]
+    assert normalize_job_record(dict(record, 渲染引擎="快速"))["params"]["渲染引擎"] == "fast"
+    try:
+        normalize_job_record(dict(record, 渲染引擎="gpu"))
+        assert False, "未知的渲染引擎应报错"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_content_streams_match_canvas()
+    test_truetype_subsets_and_xref()
+    test_engine_option_and_fallback()
+    print("✅ 盒标快速引擎快速测试通过")
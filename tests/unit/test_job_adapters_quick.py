@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+任务输入适配器快速测试
+验证CSV/JSON/NDJSON任务与工作簿任务得到相同的规范化结果
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.job_adapters import iter_file_jobs
+
+
+RECORD = {"客户名称编码": "C001", "标签名称": "ALPHA", "开始号": "DSK01001", "总张数": 3000,
+          "张/盒": 100, "主题": "阿尔法", "盒/小箱": 5, "模板": "常规"}
+
+EXPECTED_DATA = {"客户名称编码": "C001", "标签名称": "ALPHA", "开始号": "DSK01001",
+                 "总张数": 3000, "张/盒": 100, "主题": "阿尔法"}
+
+
+def test_csv_jobs(tmp_path):
+    """CSV任务：开始号的前导零保留，数字列转换为整数"""
+    path = tmp_path / "jobs.csv"
+    path.write_text("客户名称编码,标签名称,开始号,总张数,张/盒,主题,盒/小箱\n"
+                    "C001,ALPHA,DSK01001,3000,100,阿尔法,5\n"
+                    "C002,BETA,00001,2000,100,贝塔,4\n", encoding="utf-8")
+
+    jobs = list(iter_file_jobs(str(path)))
+
+    assert jobs[0]["data"] == EXPECTED_DATA
+    assert jobs[1]["data"]["开始号"] == "00001"
+    assert jobs[1]["source"] == "jobs.csv 第3行"
+
+
+def test_json_jobs_flat_and_nested(tmp_path):
+    """JSON任务：扁平记录与 data/params 嵌套记录等价"""
+    nested = {"data": {k: RECORD[k] for k in EXPECTED_DATA}, "params": {"盒/小箱": 5}, "模板": "常规"}
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps({"jobs": [RECORD, nested]}, ensure_ascii=False), encoding="utf-8")
+
+    first, second = iter_file_jobs(str(path))
+
+    assert first["data"] == second["data"] == EXPECTED_DATA
+    assert first["params"] == second["params"]
+    assert second["source"] == "jobs.json 第2个任务"
+
+
+def test_ndjson_jobs_stream_lazily(tmp_path):
+    """NDJSON逐行读取：空行跳过，格式错误的行带错误信息而不中断"""
+    path = tmp_path / "jobs.ndjson"
+    lines = [json.dumps(RECORD, ensure_ascii=False), "", "{broken", json.dumps({**RECORD, "模板": "分/套盒", "盒/套": 5},
+                                                                            ensure_ascii=False)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    jobs = iter_file_jobs(str(path))
+    assert next(jobs)["data"] == EXPECTED_DATA
+
+    rest = list(jobs)
+    assert rest[0]["source"] == "jobs.ndjson 第3行" and "error" in rest[0]
+    assert rest[1]["template"] == "split_box" and rest[1]["params"]["盒/套"] == 5
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_csv_jobs, test_json_jobs_flat_and_nested, test_ndjson_jobs_stream_lazily):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ 任务输入适配器快速测试通过")
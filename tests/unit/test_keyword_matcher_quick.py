@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+多模式关键字匹配快速测试
+验证Aho-Corasick匹配结果与逐个包含匹配一致，以及别名提取
+"""
+
+import sys
+import os
+import json
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook
+
+from src.data.keyword_matcher import KeywordMatcher, keyword_alternatives, load_keyword_aliases
+from src.utils.excel_data_extractor import ExcelDataExtractor
+
+
+def test_matcher_matches_naive_contains():
+    """匹配结果与逐个关键字做不区分大小写的包含匹配一致（含重叠关键字）"""
+    patterns = ["he", "she", "his", "hers", "开始号", "始号", "Start No", "号"]
+    matcher = KeywordMatcher(patterns)
+    rng = random.Random(7)
+    alphabet = "hersiSTARTno 开始号起"
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        expected = [p for p in patterns if p.casefold() in text.casefold()]
+        assert matcher.find(text) == expected, text
+
+
+def test_keyword_alternatives_and_alias_file(tmp_path):
+    """'keyword'与'keywords'合并去重；别名从配置文件加载"""
+    assert keyword_alternatives({"keyword": "开始号", "keywords": ["开始号", "起始号"]}) == ["开始号", "起始号"]
+    assert keyword_alternatives({"keywords": ["Start No"]}) == ["Start No"]
+
+    path = tmp_path / "aliases.json"
+    path.write_text(json.dumps({"开始号": ["开始号", "首号"]}, ensure_ascii=False), encoding="utf-8")
+    assert load_keyword_aliases(str(path)) == {"开始号": ["开始号", "首号"]}
+    assert "起始号" in load_keyword_aliases()["开始号"]
+
+
+def test_extract_with_aliases(tmp_path):
+    """使用别名的表头在全表和有界读取模式下提取结果一致"""
+    wb = Workbook()
+    ws = wb.active
+    ws["A1"] = "Theme"
+    ws["B1"] = "主题"
+    ws["B2"] = "女士夜"
+    ws["C1"] = "CUSTOMER CODE"
+    ws["C2"] = "14KH0149"
+    ws["D1"] = "张/盒"
+    ws["D2"] = 730
+    ws["E1"] = "Total Qty"
+    ws["F1"] = "总张数"
+    ws["F2"] = 109500
+    ws["A4"] = "起始号"
+    ws["A5"] = "DSK01001"
+    ws["C5"] = "Label Name:"
+    ws["D5"] = "LADIES NIGHT IN"
+    path = tmp_path / "aliases.xlsx"
+    wb.save(path)
+
+    full = ExcelDataExtractor(str(path)).extract_common_data()
+    bounded = ExcelDataExtractor(str(path), reader_mode="bounded").extract_common_data()
+
+    assert full == bounded
+    assert full["开始号"] == "DSK01001"
+    assert full["客户名称编码"] == "14KH0149"
+    assert full["标签名称"] == "LADIES NIGHT IN"
+    # Total Qty下方为空，取下一个下方有值的总张数
+    assert full["总张数"] == 109500
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_matcher_matches_naive_contains()
+    for test in (test_keyword_alternatives_and_alias_file, test_extract_with_aliases):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ 多模式关键字匹配快速测试通过")
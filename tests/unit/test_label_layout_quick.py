@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+标签版式快速测试
+验证坐标和换行后的静态文本每个文件只计算一次，每页只按字段绘制可变文本
+"""
+
+import sys
+import os
+import io
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+
+from src.pdf.label_layout import box_label_layout, box_table_layout
+from src.pdf.regular_box.renderer import regular_renderer
+from src.pdf.split_box.renderer import split_box_renderer
+from src.utils.font_manager import font_manager
+from src.utils.text_processor import text_processor
+
+
+# 直接调用渲染器时需要先注册字体（模板在PDFBase中注册）
+font_manager.register_chinese_font()
+
+WIDTH, HEIGHT = 90 * mm, 50 * mm
+LONG_TITLE = "ALPHA BETA GAMMA DELTA EPSILON ZETA ETA THETA"
+
+
+def _render(pages, draw):
+    c = canvas.Canvas(io.BytesIO(), pagesize=(WIDTH, HEIGHT))
+    for page in range(1, pages + 1):
+        draw(c, page)
+        c.showPage()
+    c.save()
+
+
+def test_box_label_layout():
+    """外观一长标题换行为18号多行，外观二Game title首行带前缀，序列号位置固定"""
+    one = box_label_layout("外观一", WIDTH, None, LONG_TITLE, 30.0, 10.0)
+    sizes = {slot.font_size for slot, _ in one.static_text}
+    assert len(one.static_text) > 1 and sizes == {18}
+    assert " ".join(text for _, text in one.static_text) == LONG_TITLE
+    assert one.fields["serial"].y == 10.0 and one.fields["serial"].font_size == 22
+
+    two = box_label_layout("外观二", WIDTH, HEIGHT, LONG_TITLE, 30.0, 10.0, 250)
+    assert two.static_text[0][1].startswith("Game title: ALPHA")
+    assert two.static_text[-1][1] == "Ticket count: 250"
+    assert two.fields["serial"].y == 6 * mm and not two.fields["serial"].centred
+
+
+def test_table_layout_rows():
+    """有纸卡备注5行、无纸卡备注4行，Quantity行双倍高度"""
+    paper = box_table_layout(WIDTH, HEIGHT, "ALPHA", "C001")
+    plain = box_table_layout(WIDTH, HEIGHT, "ALPHA", "C001", paper_card=False, serial_font_size=12)
+    assert len(paper.lines) == 4 + 2 and len(plain.lines) == 3 + 2
+    assert [text for _, text in paper.static_text][:3] == ["Item:", "Paper Cards", "Theme:"]
+    assert "Theme:" not in [text for _, text in plain.static_text]
+    assert plain.fields["serial_range"].font_size == 12
+    # 数量在分隔线上方，序列号范围在下方
+    split_y = paper.lines[-1][1]
+    assert paper.fields["quantity"].y > split_y > paper.fields["serial_range"].y
+    assert paper.form_name != plain.form_name
+
+
+def test_static_text_wrapped_once_per_file():
+    """多页标签只换行一次标题和主题，每页复用缓存的版式"""
+    calls = []
+    original = text_processor.wrap_text_to_fit
+
+    def counting_wrap(*args, **kwargs):
+        calls.append(args[1])
+        return original(*args, **kwargs)
+
+    box_label_layout.cache_clear()
+    box_table_layout.cache_clear()
+    text_processor.wrap_text_to_fit = counting_wrap
+    try:
+        _render(40, lambda c, page: regular_renderer.render_appearance_one(
+            c, WIDTH, LONG_TITLE, f"DSK{page:05d}", 30.0, 10.0))
+        _render(40, lambda c, page: split_box_renderer.draw_split_box_large_box_table(
+            c, WIDTH, HEIGHT, LONG_TITLE, 20, f"A{page}-B{page}", f"{page}/40", "C001"))
+    finally:
+        text_processor.wrap_text_to_fit = original
+    assert calls == [LONG_TITLE, LONG_TITLE]
+    assert box_label_layout.cache_info().hits == 39 and box_table_layout.cache_info().misses == 1
+
+
+if __name__ == "__main__":
+    test_box_label_layout()
+    test_table_layout_rows()
+    test_static_text_wrapped_once_per_file()
+    print("✅ 标签版式快速测试通过")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+任务内标签级别并行生成快速测试
+验证并行生成的文件与逐级生成相同，结果字典的形状和顺序不变
+"""
+
+import sys
+import os
+import io
+import time
+import contextlib
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.job_records import normalize_job_record
+from src.pdf.label_levels import run_label_levels
+from src.pdf.regular_box.template import RegularTemplate
+from src.pdf.split_box.template import SplitBoxTemplate
+from tests.unit.test_fast_label_writer_quick import _page_streams
+
+
+DATA = {"客户名称编码": "C01", "标签名称": "ALPHA BETA", "开始号": "DSK01001", "总张数": 300}
+
+
+def _generate(template, params, output_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return template.create_multi_level_pdfs(DATA, params, output_dir)
+
+
+def _slow_level(path, delay):
+    time.sleep(delay)
+    return path
+
+
+def _failed_level():
+    return None
+
+
+def _broken_level():
+    raise ValueError("级别生成失败")
+
+
+def test_parallel_levels_match_sequential():
+    """两个模板、有无小箱：并行生成的各级文件与逐级生成逐页相同，结果字典键顺序相同"""
+    cases = (
+        (RegularTemplate(), {"是否有小箱": True}),
+        (RegularTemplate(), {"是否有小箱": False}),
+        (SplitBoxTemplate(), {"是否有小箱": True, "盒/套": 2}),
+        (SplitBoxTemplate(), {"是否有小箱": False, "盒/套": 2}),
+    )
+    for template, extra in cases:
+        params = dict({"张/盒": 10, "盒/小箱": 2, "小箱/大箱": 2, "选择外观": "外观一", "中文名称": "名称",
+                       "是否有盒标": True, "序列号字体大小": 10}, **extra)
+        with tempfile.TemporaryDirectory() as sequential_dir, tempfile.TemporaryDirectory() as parallel_dir:
+            sequential = _generate(template, dict(params, 级别进程数=1), sequential_dir)
+            parallel = _generate(template, dict(params, 级别进程数=4), parallel_dir)
+            assert list(parallel) == list(sequential)
+            assert list(sequential)[0] == "盒标" and list(sequential)[-1] == "外箱汇总表"
+            for name, path in sequential.items():
+                assert os.path.exists(parallel[name])
+                assert os.path.relpath(parallel[name], parallel_dir).split(os.sep)[0] == \
+                    os.path.relpath(path, sequential_dir).split(os.sep)[0]
+                if path.endswith(".pdf"):
+                    assert _page_streams(parallel[name]) == _page_streams(path)
+
+
+def test_result_order_and_failures():
+    """结果按级别顺序排列（与完成顺序无关）；返回None的级别不出现在结果中；级别异常向上抛出"""
+    levels = [
+        ("盒标", _slow_level, ("box.pdf", 0.3), {}),
+        ("小箱标", _slow_level, ("small.pdf", 0), {}),
+        ("外箱汇总表", _failed_level, (), {}),
+    ]
+    for workers in (1, 3):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_label_levels(levels, workers)
+        assert list(result.items()) == [("盒标", "box.pdf"), ("小箱标", "small.pdf")]
+
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_label_levels(levels + [("大箱标", _broken_level, (), {})], workers)
+            assert False, "级别异常应向上抛出"
+        except ValueError:
+            pass
+
+
+def test_level_worker_option():
+    """级别进程数列可选且必须为正整数"""
+    record = {"客户名称编码": "C01", "标签名称": "ALPHA", "开始号": "DSK01001", "总张数": 100, "张/盒": 10,
+              "主题": "ALPHA", "盒/小箱": 2}
+    assert "级别进程数" not in normalize_job_record(record)["params"]
+    assert normalize_job_record(dict(record, 级别进程数=3))["params"]["级别进程数"] == 3
+    try:
+        normalize_job_record(dict(record, 级别进程数="-1"))
+        assert False, "级别进程数必须为正整数"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_parallel_levels_match_sequential()
+    test_result_order_and_failures()
+    test_level_worker_option()
+    print("✅ 任务内标签级别并行生成快速测试通过")
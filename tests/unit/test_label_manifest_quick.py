@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+标签清单快速测试
+验证仅计划模式：不渲染PDF，逐行导出标签清单（级别、序列号、数量、Carton No、目标文件、页码）
+"""
+
+import sys
+import os
+import csv
+import json
+import itertools
+import types
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from click.testing import CliRunner
+
+from src.cli import cli
+from src.pdf.generator import PDFGenerator
+from src.pdf.label_manifest import iter_manifest, iter_manifest_lines
+
+
+DATA = {"客户名称编码": "C01", "标签名称": "ALPHA", "开始号": "DSK01001", "总张数": 437}
+PARAMS = {"张/盒": 10, "盒/小箱": 4, "小箱/大箱": 3, "选择外观": "外观一", "中文名称": "阿尔法", "是否有盒标": True}
+
+
+def test_manifest_rows_and_pages():
+    """每张标签一行，页码计入盒标空白首页和箱标空箱标签页"""
+    rows = list(PDFGenerator().iter_label_manifest("regular_box", DATA, PARAMS, timestamp="20240101_120000"))
+    levels = [level for level, _ in itertools.groupby(row["level"] for row in rows)]
+    assert levels == ["盒标", "小箱标", "大箱标"]
+    assert len(rows) == 44 + 11 + 4
+
+    box = rows[0]
+    assert (box["serial"], box["page"], box["quantity"], box["carton_no"]) == ("DSK01001", 2, None, None)
+    assert box["file"] == "C01+ALPHA+阿尔法+标签/C01_阿尔法_ALPHA_盒标_外观一_20240101_120000.pdf"
+
+    large = [row for row in rows if row["level"] == "大箱标"]
+    assert large[-1] == {"level": "大箱标", "index": 4, "serial": "DSK01037-DSK01044", "quantity": 80,
+                         "carton_no": "4/4", "file": "C01+ALPHA+阿尔法+标签/C01_阿尔法_ALPHA_大箱标_20240101_120000.pdf",
+                         "page": 5}
+
+    split = list(iter_manifest("split_box", DATA, {"张/盒": 10, "盒/小箱": 2, "盒/套": 2, "是否有小箱": False}))
+    assert [row["level"] for row in split] == ["箱标"] * 22  # 未生成盒标
+    assert split[0]["serial"] == "DSK01001-01-DSK01001-02" and split[0]["file"].endswith("_分盒箱标_*.pdf")
+
+
+def test_manifest_lines_are_streamed():
+    """CSV/NDJSON逐行生成，百万盒任务取前几行不需要展开整个清单"""
+    big = {**DATA, "总张数": 20_000_000}
+    lines = iter_manifest_lines(iter_manifest("regular_box", big, PARAMS), "csv")
+    assert isinstance(lines, types.GeneratorType)
+    head = list(itertools.islice(lines, 3))
+    assert head[0] == "level,index,serial,quantity,carton_no,file,page\n"
+    assert head[2].startswith("盒标,2,DSK01002,,,")
+
+    ndjson = iter_manifest_lines(iter_manifest("regular_box", DATA, {**PARAMS, "是否有盒标": False}), "ndjson")
+    first = json.loads(next(ndjson))
+    assert (first["level"], first["serial"], first["quantity"], first["page"]) == ("小箱标", "DSK01001-DSK01004", 40, 2)
+
+
+def test_cli_manifest(tmp_path):
+    """命令行导出任务文件中全部任务的清单，每行带任务来源"""
+    path = tmp_path / "jobs.ndjson"
+    jobs = [{**DATA, "张/盒": 10, "主题": "A", "盒/小箱": 4, "小箱/大箱": 3},
+            {**DATA, "张/盒": 10, "主题": "B", "盒/小箱": 2, "模板": "分/套盒", "盒/套": 2, "是否有小箱": False}]
+    path.write_text("\n".join(json.dumps(job, ensure_ascii=False) for job in jobs), encoding="utf-8")
+
+    output = tmp_path / "manifest.csv"
+    result = CliRunner().invoke(cli, ["manifest", str(path), "-o", str(output)])
+    assert result.exit_code == 0, result.output
+    with open(output, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 11 + 4 + 22
+    assert rows[0]["source"] == "jobs.ndjson 第1行" and rows[-1]["source"] == "jobs.ndjson 第2行"
+    # 目标文件包含批量模式中每个任务的子目录
+    assert rows[0]["file"].startswith("jobs.ndjson 第1行/C01+ALPHA+")
+    assert rows[-1]["serial"] == "DSK01022-01-DSK01022-02" and rows[-1]["page"] == "23"
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_manifest_rows_and_pages()
+    test_manifest_lines_are_streamed()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_cli_manifest(Path(tmp))
+    print("✅ 标签清单快速测试通过")
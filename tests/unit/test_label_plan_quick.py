@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+标签计划快速测试
+验证LabelPlan逐行结果与常规/分盒数据处理器一致
+"""
+
+import sys
+import os
+import math
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pdf.label_plan import build_label_plan
+from src.pdf.regular_box.data_processor import regular_data_processor
+from src.pdf.split_box.data_processor import split_box_data_processor
+
+
+def _rows(plan, level):
+    return [(row['serial'], row['quantity'], row['carton_no']) for row in plan.level(level).iter_rows()]
+
+
+def test_regular_plan_matches_processor():
+    """常规模板：最后一箱按实际盒数计算张数，Carton No为 当前/总数"""
+    data = {'开始号': 'DSK01001', '总张数': 437}
+    plan = build_label_plan('regular_box', data, {'张/盒': 10, '盒/小箱': 4, '小箱/大箱': 3})
+    assert plan.counts() == {'盒标': 44, '小箱标': 11, '大箱标': 4}
+    assert plan.level('盒标').row(43)['serial'] == regular_data_processor.generate_regular_box_serial_number('DSK01001', 44)
+
+    small = _rows(plan, '小箱标')
+    for n, (serial, quantity, carton_no) in enumerate(small, 1):
+        assert serial == regular_data_processor.generate_regular_small_box_serial_range('DSK01001', n, 4, 44)
+        assert carton_no == f"{n}/11"
+    assert small[-1] == ('DSK01041-DSK01044', 40, '11/11')
+    assert _rows(plan, '大箱标')[-1] == ('DSK01037-DSK01044', 80, '4/4')
+
+    two_level = build_label_plan('regular_box', data, {'张/盒': 10, '盒/小箱': 5, '是否有小箱': False})
+    assert list(two_level.levels) == ['盒标', '箱标']
+    assert _rows(two_level, '箱标')[-1] == ('DSK01041-DSK01044', 40, '9/9')
+
+
+def test_split_plan_matches_processor():
+    """分盒模板：套盒序列号、套内数量和Carton No与逐个计算的结果一致"""
+    processor = split_box_data_processor
+    data = {'开始号': 'JAW-0001', '总张数': 170}
+    for bps, bs, sl in ((6, 2, 2), (3, 3, 2), (2, 4, 2), (6, 6, 1)):
+        params = {'张/盒': 10, '盒/小箱': bs, '小箱/大箱': sl, '盒/套': bps}
+        plan = build_label_plan('split_box', data, params)
+        total_boxes, total_sets = 17, math.ceil(17 / bps)
+        large_ratio = math.ceil(bps / bs) / sl
+        for n, (serial, _, _) in enumerate(_rows(plan, '盒标'), 1):
+            assert serial == processor.generate_box_serial_with_set_logic('JAW-0001', n, bps)
+        for n, (serial, quantity, carton_no) in enumerate(_rows(plan, '小箱标'), 1):
+            assert serial == processor.generate_set_based_small_box_serial_range(n, 'JAW-0001', bps, bs, total_boxes)
+            assert quantity == processor.calculate_actual_quantity_for_small_box(n, 10, bs, total_boxes)
+            assert carton_no == processor.calculate_carton_number_for_small_box(n, bps, bs)
+        for n, (serial, quantity, carton_no) in enumerate(_rows(plan, '大箱标'), 1):
+            assert serial == processor.generate_set_based_large_box_serial_range(n, 'JAW-0001', bps, bs, sl, total_boxes)
+            assert quantity == processor.calculate_actual_quantity_for_large_box(n, 10, bs, sl, total_boxes, bps)
+            assert carton_no == processor.calculate_carton_range_for_large_box(n, large_ratio, total_sets)
+
+
+def test_large_job_plans_quickly():
+    """两百万盒的任务只做数组运算，不逐个生成标签"""
+    start = time.perf_counter()
+    plan = build_label_plan('split_box', {'开始号': 'DSK01001', '总张数': 20_000_003},
+                            {'张/盒': 10, '盒/小箱': 6, '小箱/大箱': 4, '盒/套': 3})
+    assert time.perf_counter() - start < 2
+    assert len(plan.level('盒标')) == 2_000_001
+    assert plan.level('盒标').row(2_000_000)['serial'] == 'DSK667667-03'
+    assert plan.counts() == {'盒标': 2_000_001, '小箱标': 666_667, '大箱标': 166_667}
+
+
+if __name__ == "__main__":
+    test_regular_plan_matches_processor()
+    test_split_plan_matches_processor()
+    test_large_job_plans_quickly()
+    print("✅ 标签计划快速测试通过")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+页面后台压缩快速测试
+验证压缩线程写出的文件与在渲染线程中压缩逐字节相同（页序不变），排队的页面有上限，压缩线程数列可选
+"""
+
+import sys
+import os
+import re
+import tempfile
+from unittest import mock
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.colors import CMYKColor
+
+from src.data.job_records import normalize_job_record
+from src.pdf import fast_label_writer
+from src.pdf.box_table import draw_box_table
+from src.pdf.fast_label_writer import FastLabelWriter, default_compress_workers, write_box_label_file
+from src.pdf.label_layout import box_label_layout
+from src.pdf.streaming_canvas import StreamingCanvas
+from src.utils.font_manager import font_manager
+from tests.unit.test_fast_label_writer_quick import _page_streams
+
+
+# 直接调用写入器时需要先注册字体（模板在PDFBase中注册）
+font_manager.register_chinese_font()
+
+PAGE_SIZE = (255, 141)
+
+
+def _stable_bytes(path):
+    """去掉创建时间和文件ID（与写入时间有关）后的文件内容"""
+    raw = open(path, "rb").read()
+    raw = re.sub(rb"D:\d{14}\+00'00'", b"D:0", raw)
+    return re.sub(rb"/ID \[ <[0-9a-f]+> <[0-9a-f]+> \]", b"/ID", raw)
+
+
+def _write_canvas(path, pages, compress_workers):
+    c = StreamingCanvas(path, pagesize=PAGE_SIZE, compress_workers=compress_workers)
+    for i in range(pages):
+        # 中间一段页面不压缩，验证压缩与不压缩的页面混合时顺序不变
+        c.setPageCompression(0 if 100 <= i < 110 else 1)
+        c.setFillColor(CMYKColor(0, 0, 0, 1))
+        draw_box_table(c, *PAGE_SIZE, "THEME", 100, f"DSK{i:05d}-DSK{i + 9:05d}", f"{i + 1}/{pages}", "REM")
+        c.showPage()
+    c.save()
+
+
+def test_threaded_deflate_matches_inline():
+    """快速引擎和流式画布：使用压缩线程与在渲染线程中压缩的输出逐字节相同"""
+    serials = [f"DSK{i:05d}" for i in range(1, 301)]
+    with tempfile.TemporaryDirectory() as output_dir:
+        outputs = {}
+        for workers in (0, 1, 3):
+            path = os.path.join(output_dir, f"box_{workers}.pdf")
+            pages = write_box_label_file(path, PAGE_SIZE, "外观二", "GAME", serials, 0, 0, ticket_count=437,
+                                         chinese_name="名称", title="盒标", compress_workers=workers)
+            assert pages == len(serials) + 1
+            outputs[workers] = _stable_bytes(path)
+        assert outputs[1] == outputs[0] and outputs[3] == outputs[0]
+        streams = _page_streams(os.path.join(output_dir, "box_3.pdf"))
+        assert b"DSK00001" in streams[1] and b"DSK00300" in streams[-1]
+
+        for workers in (0, 2):
+            _write_canvas(os.path.join(output_dir, f"canvas_{workers}.pdf"), 203, workers)
+        assert _stable_bytes(os.path.join(output_dir, "canvas_2.pdf")) == \
+            _stable_bytes(os.path.join(output_dir, "canvas_0.pdf"))
+
+
+def test_pending_pages_bounded_and_abort():
+    """排队等待写入的批次不超过上限；出错时压缩线程关闭并删除未写完的文件"""
+    layout = box_label_layout("外观一", PAGE_SIZE[0], None, "TITLE", 100, 50)
+    with tempfile.TemporaryDirectory() as output_dir:
+        path = os.path.join(output_dir, "labels.pdf")
+        writer = FastLabelWriter(path, PAGE_SIZE, compress_workers=2)
+        for i in range(2000):
+            writer.add_page(layout, {"serial": f"DSK{i:05d}"})
+            assert len(writer._pending_batches) <= writer._deflate_max_pending
+        writer.abort()
+        assert writer._deflate_pool is None
+        assert not os.path.exists(path)
+
+        with FastLabelWriter(path, PAGE_SIZE, compress_workers=2) as writer:
+            for i in range(130):
+                writer.add_page(layout, {"serial": f"DSK{i:05d}"})
+        streams = _page_streams(path)
+        assert [b"DSK%05d" % i in stream for i, stream in enumerate(streams)] == [True] * 130
+
+
+def test_compress_worker_option():
+    """压缩线程数列可选（0为不使用）且不能为负数；默认值为CPU核数减一（最多4个）"""
+    record = {"客户名称编码": "C01", "标签名称": "ALPHA", "开始号": "DSK01001", "总张数": 100, "张/盒": 10,
+              "主题": "ALPHA", "盒/小箱": 2}
+    assert "压缩线程数" not in normalize_job_record(record)["params"]
+    assert normalize_job_record(dict(record, 压缩线程数="0"))["params"]["压缩线程数"] == 0
+    assert normalize_job_record(dict(record, 压缩线程数=2))["params"]["压缩线程数"] == 2
+    try:
+        normalize_job_record(dict(record, 压缩线程数="-1"))
+        assert False, "压缩线程数不能为负数"
+    except ValueError:
+        pass
+
+    for cpus, expected in ((None, 0), (1, 0), (4, 3), (16, 4)):
+        with mock.patch.object(fast_label_writer.os, "cpu_count", return_value=cpus):
+            assert default_compress_workers() == expected
+
+
+if __name__ == "__main__":
+    test_threaded_deflate_matches_inline()
+    test_pending_pages_bounded_and_abort()
+    test_compress_worker_option()
+    print("✅ 页面后台压缩快速测试通过")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+标签计划校验快速测试
+验证渲染前的向量化检查：序列号范围首尾相接、数量与范围一致、Carton No唯一，
+分盒模板补齐的最后一套不报错，默认只警告、严格校验时报错
+"""
+
+import sys
+import os
+import io
+import copy
+import time
+import contextlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from src.pdf.label_plan import LabelPlan, build_label_plan
+from src.pdf.plan_validation import check_label_plan, validate_label_plan
+from src.pdf.split_box.template import SplitBoxTemplate
+
+
+def test_consistent_plans_pass():
+    """常规模板（含逐箱容量）、整套装箱和最后一套补齐的分盒模板通过校验"""
+    data = {"开始号": "DSK00001", "总张数": 6103}
+    for params in ({"张/盒": 10, "盒/小箱": 7, "小箱/大箱": 3},
+                   {"张/盒": 10, "盒/小箱": 10, "小箱/大箱": 3, "小箱容量": "10,10,8", "大箱容量": [3, 2]},
+                   {"张/盒": 10, "盒/小箱": 5, "是否有小箱": False}):
+        assert check_label_plan(build_label_plan("regular_box", data, params)) == []
+
+    split = {"开始号": "DSK01001", "总张数": 1200}
+    assert check_label_plan(build_label_plan("split_box", split, {"张/盒": 10, "盒/小箱": 6, "小箱/大箱": 2, "盒/套": 6})) == []
+    assert check_label_plan(build_label_plan("split_box", split, {"张/盒": 10, "盒/小箱": 4, "盒/套": 2,
+                                                                  "是否有小箱": False})) == []
+
+    # 最后一套不满（61盒，4盒/套）：小箱标序列号写到补齐的第64盒；每套一盒时不检查记法，不打印Carton No的级别不报错
+    padded = {"开始号": "DSK01001", "总张数": 610}
+    for params in ({"张/盒": 10, "盒/小箱": 2, "小箱/大箱": 2, "盒/套": 4},
+                   {"张/盒": 10, "盒/小箱": 3, "盒/套": 1, "是否有小箱": False},
+                   {"张/盒": 10, "盒/小箱": 2, "小箱/大箱": 2, "盒/套": 1}):
+        assert check_label_plan(build_label_plan("split_box", padded, params)) == []
+    assert check_label_plan(build_label_plan("split_box", {"开始号": "DSK01001", "总张数": 1},
+                                             {"张/盒": 1000, "盒/小箱": 5, "盒/套": 10, "是否有小箱": False})) == []
+
+
+def test_drifted_plans_are_reported():
+    """小箱数量按全局盒号、序列号按套内盒号时报出第一张出错的标签"""
+    plan = build_label_plan("split_box", {"开始号": "DSK01001", "总张数": 1800},
+                            {"张/盒": 10, "盒/小箱": 4, "小箱/大箱": 3, "盒/套": 6})
+    errors = check_label_plan(plan)
+    assert any(error.startswith("小箱标第2张（DSK01001-05-DSK01001-06）数量为40") for error in errors)
+
+    # Carton No重复（在计划副本上修改，不影响缓存）
+    regular = build_label_plan("regular_box", {"开始号": "DSK00001", "总张数": 500}, {"张/盒": 10, "盒/小箱": 5, "是否有小箱": False})
+    level = copy.copy(regular.level("箱标"))
+    level.carton_a = level.carton_a.copy()
+    level.carton_a[5] = level.carton_a[3]
+    broken = LabelPlan("regular_box", 500, 10, 50, {**regular.levels, "箱标": level})
+    assert check_label_plan(broken) == ["箱标第4张（DSK00016-DSK00020）的Carton No 4/10重复"]
+
+    # 默认只警告并返回问题列表，严格校验时抛出异常
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert validate_label_plan(plan) == errors
+    assert "⚠️ 标签计划校验失败" in output.getvalue()
+    with pytest.raises(ValueError, match="小箱标第2张"):
+        validate_label_plan(plan, strict=True)
+
+
+def test_million_box_job_fails_fast(tmp_path):
+    """严格校验时百万盒的错误参数在一秒内报错，且不生成任何文件"""
+    data = {"开始号": "DSK00001", "总张数": 10_000_000, "客户名称编码": "C01", "主题": "阿尔法"}
+    params = {"张/盒": 10, "盒/小箱": 4, "小箱/大箱": 3, "盒/套": 6, "选择外观": "外观一", "严格校验": True}
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match="标签计划校验失败"):
+        SplitBoxTemplate().create_multi_level_pdfs(data, params, str(tmp_path))
+    assert time.perf_counter() - start < 1.0
+    assert list(tmp_path.iterdir()) == []
+
+    plan = build_label_plan("regular_box", data, {"张/盒": 10, "盒/小箱": 7, "小箱/大箱": 3})
+    start = time.perf_counter()
+    validate_label_plan(plan)
+    assert time.perf_counter() - start < 1.0
+    assert int(np.sum(plan.level("大箱标").quantity)) == 10_000_000
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_consistent_plans_pass()
+    test_drifted_plans_are_reported()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_million_box_job_fails_fast(Path(tmp))
+    print("✅ 标签计划校验快速测试通过")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+读取后端快速测试
+验证后端选择、CSV解析以及各后端输出的单元格网格一致
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from openpyxl import Workbook
+
+from src.data.reader_backends import available_backends, get_backend, rows_to_grid
+from src.utils.excel_data_extractor import ExcelDataExtractor
+
+
+def _header_rows():
+    return [
+        ["总张数", "开始号", "标签名称", "LADIES NIGHT IN"],
+        [109500, "DSK01001", None, None],
+    ]
+
+
+def test_csv_backend_extraction(tmp_path):
+    """CSV（GB18030编码）按单元格网格提取，数字转换不丢失前导0"""
+    path = tmp_path / "order.csv"
+    path.write_bytes("总张数,开始号,标签名称,LADIES NIGHT IN\n109500,01001,,\n".encode("gb18030"))
+
+    backend = get_backend(str(path))
+    assert backend.name == "csv"
+    assert list(backend.iter_rows(str(path))) == [
+        ["总张数", "开始号", "标签名称", "LADIES NIGHT IN"],
+        [109500, "01001", None, None],
+    ]
+
+    data = ExcelDataExtractor(str(path), reader_mode='bounded').extract_common_data()
+    assert data["总张数"] == 109500
+    assert data["开始号"] == "01001"
+    assert data["标签名称"] == "LADIES NIGHT IN"
+
+
+def test_unsupported_format_raises(tmp_path):
+    """不支持的格式和不可用的后端给出明确错误"""
+    with pytest.raises(ValueError, match="不支持的文件格式"):
+        get_backend(str(tmp_path / "order.txt"))
+    with pytest.raises(ValueError, match="不可用"):
+        get_backend(str(tmp_path / "order.csv"), name="openpyxl")
+
+
+def test_xlsx_backends_produce_same_grid(tmp_path):
+    """同一xlsx文件，所有可用后端输出相同的单元格网格"""
+    path = tmp_path / "order.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    for row in _header_rows():
+        ws.append(row)
+    ws["C5"] = 12.5
+    wb.save(path)
+
+    grids = [rows_to_grid(b.iter_rows(str(path))).tolist() for b in available_backends(".xlsx")]
+    assert all(grid == grids[0] for grid in grids)
+    assert grids[0][1][0] == 109500
+    assert grids[0][4][2] == 12.5
+
+
+def test_xls_backend(tmp_path):
+    """旧版.xls通过xlrd/calamine读取（需要安装可选依赖）"""
+    xlwt = pytest.importorskip("xlwt")
+    if not available_backends(".xls"):
+        pytest.skip("未安装.xls读取后端")
+
+    path = tmp_path / "order.xls"
+    book = xlwt.Workbook()
+    sheet = book.add_sheet("Sheet1")
+    for row_idx, row in enumerate(_header_rows()):
+        for col_idx, value in enumerate(row):
+            if value is not None:
+                sheet.write(row_idx, col_idx, value)
+    book.save(str(path))
+
+    data = ExcelDataExtractor(str(path)).extract_common_data()
+    assert data["总张数"] == 109500
+    assert data["开始号"] == "DSK01001"
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_csv_backend_extraction, test_unsupported_format_raises,
+                 test_xlsx_backends_produce_same_grid):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ 读取后端快速测试通过")
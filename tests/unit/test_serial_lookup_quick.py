@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+序列号反向查询快速测试
+验证序列号 → 盒/套/小箱/大箱/页码的逆运算与标签计划一致
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from click.testing import CliRunner
+
+from src.cli import cli
+from src.pdf.label_plan import build_label_plan
+from src.pdf.serial_lookup import carton_contents, locate_serial
+from src.pdf.split_box.data_processor import split_box_data_processor
+
+
+SPLIT_DATA = {"开始号": "DSK01001", "总张数": 1700}
+SPLIT_PARAMS = {"张/盒": 10, "盒/小箱": 4, "小箱/大箱": 3, "盒/套": 6, "是否有盒标": True, "中文名称": "阿尔法"}
+
+
+def test_split_locate_round_trip():
+    """每个盒标序列号都能查回自己的盒号，且落在所查小箱/大箱的盒号范围内"""
+    plan = build_label_plan("split_box", SPLIT_DATA, SPLIT_PARAMS)
+    for box_num, row in enumerate(plan.level("盒标").iter_rows(), 1):
+        result = locate_serial("split_box", SPLIT_DATA, SPLIT_PARAMS, row["serial"])
+        assert result["box"] == box_num
+        assert result["labels"]["盒标"]["page"] == box_num + 1  # 中文名称 → 空白首页
+        for level in ("小箱标", "大箱标"):
+            start_box, end_box = carton_contents("split_box", SPLIT_DATA, SPLIT_PARAMS, level,
+                                                 result["labels"][level]["number"])["boxes"]
+            assert start_box <= box_num <= end_box
+
+    result = locate_serial("split_box", SPLIT_DATA, SPLIT_PARAMS, "DSK01012-05")
+    assert (result["box"], result["set"], result["box_in_set"]) == (71, 12, 5)
+    assert result["labels"]["小箱标"] == {"number": 24, "page": 25, "serial_range": "DSK01012-05-DSK01012-06",
+                                        "quantity": 40, "carton_no": "12-2"}
+
+    with pytest.raises(ValueError):
+        locate_serial("split_box", SPLIT_DATA, SPLIT_PARAMS, "DSK01012-07")  # 副号超过盒/套
+    with pytest.raises(ValueError):
+        locate_serial("split_box", SPLIT_DATA, SPLIT_PARAMS, "DSK01030-01")  # 超过总盒数
+    assert split_box_data_processor.box_range_for_carton(3, 6, 4, 170) == (7, 10)
+
+
+def test_regular_carton_contents():
+    """常规模板：箱内序列号、页码和无小箱模式"""
+    data = {"开始号": "CAR-00001", "总张数": 437}
+    params = {"张/盒": 10, "盒/小箱": 4, "小箱/大箱": 3}
+    contents = carton_contents("regular_box", data, params, "大箱标", 4)
+    assert contents["boxes"] == [37, 44] and contents["page"] == 5
+    assert contents["serials"][0] == "CAR-00037" and contents["serials"][-1] == "CAR-00044"
+    assert contents["serial_range"] == "CAR-00037-CAR-00044" and contents["carton_no"] == "4/4"
+
+    result = locate_serial("regular_box", data, params, "CAR-00013")
+    assert "盒标" not in result["labels"]  # 未生成盒标
+    assert (result["labels"]["小箱标"]["number"], result["labels"]["大箱标"]["number"]) == (4, 2)
+
+    two_level = {"张/盒": 10, "盒/小箱": 5, "是否有小箱": False}
+    assert locate_serial("regular_box", data, two_level, "CAR-00013")["labels"]["箱标"]["number"] == 3
+    with pytest.raises(ValueError):
+        carton_contents("regular_box", data, two_level, "小箱标", 1)
+
+
+def test_cli_locate_and_carton(tmp_path):
+    """命令行在任务文件的全部任务中查找序列号"""
+    path = tmp_path / "jobs.ndjson"
+    jobs = [{"客户名称编码": "C01", "标签名称": "ALPHA", "开始号": "DSK01001", "总张数": 1700, "张/盒": 10,
+             "主题": "A", "盒/小箱": 4, "小箱/大箱": 3, "模板": "分/套盒", "盒/套": 6},
+            {"客户名称编码": "C02", "标签名称": "BETA", "开始号": "CAR-00001", "总张数": 500, "张/盒": 10,
+             "主题": "B", "盒/小箱": 5}]
+    path.write_text("\n".join(json.dumps(job, ensure_ascii=False) for job in jobs), encoding="utf-8")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["locate", str(path), "CAR-00012"])
+    assert result.exit_code == 0
+    matches = json.loads(result.output)
+    assert [match["source"] for match in matches] == ["jobs.ndjson 第2行"]
+    assert matches[0]["labels"]["小箱标"]["number"] == 3
+
+    result = runner.invoke(cli, ["carton", str(path), "--level", "大箱标", "--number", "2"])
+    assert result.exit_code == 0
+    assert json.loads(result.output)["serials"][:2] == ["DSK01003-01", "DSK01003-02"]
+
+    assert runner.invoke(cli, ["locate", str(path), "XYZ999"]).exit_code == 1
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_split_locate_round_trip()
+    test_regular_carton_contents()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_cli_locate_and_carton(Path(tmp))
+    print("✅ 序列号反向查询快速测试通过")
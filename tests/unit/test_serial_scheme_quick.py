@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+序列号格式快速测试
+验证SerialScheme的解析规则、格式化结果与处理器一致
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.utils.serial_formatter import SerialScheme, get_serial_scheme
+from src.pdf.regular_box.data_processor import regular_data_processor
+from src.pdf.split_box.data_processor import split_box_data_processor
+
+
+def test_parse_rules():
+    """常规规则只取字母前缀和连字符，分盒规则取第一个数字之前的全部字符"""
+    regular = SerialScheme.parse("CAR-01001", "regular")
+    assert (regular.prefix, regular.start_number, regular.digits) == ("CAR-", 1001, 5)
+    assert SerialScheme.parse("14KH0149", "regular").prefix == "KH"
+    assert SerialScheme.parse("14KH0149", "split").prefix == ""
+
+    # 无法解析时使用各自的默认格式
+    assert SerialScheme.parse(None, "regular").format(0) == "DSK00001"
+    assert SerialScheme.parse("无编号", "split").format(0) == "DSK01001"
+    with pytest.raises(ValueError):
+        SerialScheme.parse("DSK01001", "nested")
+
+
+def test_format_methods():
+    """保持原始位数，超出位数时自然增长"""
+    scheme = SerialScheme.parse("MCH0102", "split")
+    assert scheme.format(0) == "MCH0102"
+    assert scheme.format_sub(3, 7) == "MCH0105-07"
+    assert scheme.format_range(0, 2) == ["MCH0102", "MCH0103", "MCH0104"]
+    assert scheme.range_text(0, 0) == "MCH0102-MCH0102"
+    assert SerialScheme.parse("A9", "split").format(1) == "A10"
+    assert get_serial_scheme("DSK01001", "regular") is get_serial_scheme("DSK01001", "regular")
+
+
+def test_processors_use_scheme():
+    """处理器生成的序列号与SerialScheme一致"""
+    assert regular_data_processor.generate_regular_box_serial_number("DSK01001", 3) == "DSK01003"
+    assert regular_data_processor.generate_regular_small_box_serial_range("DSK01001", 2, 5, 7) == "DSK01006-DSK01007"
+    assert regular_data_processor.parse_serial_number_format("CAR-01001") == {
+        "prefix": "CAR", "start_number": 1001, "digits": 5, "separator": "-"}
+
+    assert split_box_data_processor.generate_box_serial_with_set_logic("JAW-0001", 5, 4) == "JAW-0002-01"
+    assert split_box_data_processor.generate_split_small_box_serial_range("JAW-0001", 2, 2, 2, 10) == "JAW-0001-03-JAW-0001-04"
+
+
+if __name__ == "__main__":
+    test_parse_rules()
+    test_format_methods()
+    test_processors_use_scheme()
+    print("✅ 序列号格式快速测试通过")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+盒标分片并行渲染快速测试
+验证分片渲染的输出与单进程逐页相同、字体只嵌入一次，快照以外的字符回退到单进程
+"""
+
+import sys
+import os
+import io
+import contextlib
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.units import mm
+
+import src.pdf.sharded_box_labels as sharded_box_labels
+from src.data.job_records import normalize_job_record
+from src.pdf.fast_label_writer import FastLabelWriter, PageShardWriter, box_label_page
+from src.pdf.sharded_box_labels import _render_shard, _shard_ranges, write_box_labels
+from src.utils.font_manager import font_manager
+from tests.unit.test_fast_label_writer_quick import _page_streams
+
+
+# 直接调用快速引擎时需要先注册字体（模板在PDFBase中注册）
+font_manager.register_chinese_font()
+
+PAGE_SIZE = (90 * mm, 50 * mm)
+DATA = {"客户名称编码": "C01", "标签名称": "ALPHA BETA", "开始号": "DSK01001", "总张数": 600}
+PARAMS = {"张/盒": 10, "盒/小箱": 2, "小箱/大箱": 2, "盒/套": 2, "选择外观": "外观二", "中文名称": "名称"}
+
+
+def _write(path, style, workers, data=DATA, template="regular_box"):
+    saved = sharded_box_labels.MIN_SHARD_PAGES
+    sharded_box_labels.MIN_SHARD_PAGES = 5
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            pages = write_box_labels(path, PAGE_SIZE, style, "ALPHA BETA", template, data, PARAMS, 1, 60, 30, 10,
+                                     ticket_count=10, chinese_name="名称", title="盒标", subject="Box Label",
+                                     workers=workers)
+    finally:
+        sharded_box_labels.MIN_SHARD_PAGES = saved
+    return pages, open(path, "rb").read(), output.getvalue()
+
+
+def test_sharded_output_matches_single_process():
+    """两种外观、两个模板：分片渲染每页内容流与单进程相同，字体对象只写一次，临时分片已清理"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        for template in ("regular_box", "split_box"):
+            for style in ("外观一", "外观二"):
+                single_path = os.path.join(output_dir, "single.pdf")
+                sharded_path = os.path.join(output_dir, "sharded.pdf")
+                assert _write(single_path, style, 1, template=template)[0] == 61
+                pages, raw, log = _write(sharded_path, style, 3, template=template)
+                assert pages == 61 and "失败" not in log
+                assert _page_streams(sharded_path) == _page_streams(single_path)
+                assert raw.count(b"/Type /Font") == open(single_path, "rb").read().count(b"/Type /Font")
+                assert b"/Count 61" in raw
+                xref = raw[int(raw[raw.rindex(b"startxref") + 9:].split()[0]):]
+                offsets = [int(line[:10]) for line in xref.split(b"\n")[3:] if line.endswith(b" n ")]
+                for number, offset in enumerate(offsets, 1):
+                    assert raw[offset:].startswith(f"{number} 0 obj".encode())
+        assert sorted(os.listdir(output_dir)) == ["sharded.pdf", "single.pdf"]
+
+
+def _failing_shard(task):
+    raise ValueError("字体 Symbol 不在主进程的字体快照中")
+
+
+def test_unknown_characters_fall_back_to_single_process():
+    """分片写入器拒绝快照以外的字符；任一分片失败时回退为单进程渲染，输出不变且不留临时文件"""
+    layout, serial_text = box_label_page("外观一", PAGE_SIZE, "ALPHA BETA", 30, 10, None)
+    with tempfile.TemporaryDirectory() as output_dir:
+        with FastLabelWriter(os.path.join(output_dir, "parent.pdf"), PAGE_SIZE) as parent:
+            parent.prepare(layout)
+            fonts = parent.font_snapshot()
+            first_obj = parent.reserve_objects(4)
+            shard = PageShardWriter(os.path.join(output_dir, "0.part"), PAGE_SIZE, first_obj, fonts)
+            shard.add_page(layout, {"serial": serial_text("DSK00001")})
+            try:
+                shard.add_page(layout, {"serial": serial_text("DSKΩ0002")})
+                assert False, "快照以外的字符应报错"
+            except ValueError:
+                shard.abort()
+            parent.abort()
+        assert os.listdir(output_dir) == []
+
+        single_path = os.path.join(output_dir, "single.pdf")
+        sharded_path = os.path.join(output_dir, "sharded.pdf")
+        _write(single_path, "外观一", 1)
+        sharded_box_labels._render_shard = _failing_shard
+        try:
+            pages, _, log = _write(sharded_path, "外观一", 2)
+        finally:
+            sharded_box_labels._render_shard = _render_shard
+        assert pages == 61
+        assert "改为单进程渲染" in log
+        assert _page_streams(sharded_path) == _page_streams(single_path)
+        assert sorted(os.listdir(output_dir)) == ["sharded.pdf", "single.pdf"]
+
+
+def test_shard_ranges_and_worker_option():
+    """分片连续覆盖整个范围；渲染进程数列可选且必须为正整数"""
+    assert _shard_ranges(0, 100000, 1) == [(0, 100000)]
+    for start, stop, workers in ((0, 100000, 4), (7, 9000, 3), (0, 2500, 8), (5, 10, 4)):
+        shards = _shard_ranges(start, stop, workers)
+        assert shards[0][0] == start and shards[-1][1] == stop
+        assert all(a[1] == b[0] for a, b in zip(shards, shards[1:]))
+        assert len(shards) <= workers * sharded_box_labels.SHARDS_PER_WORKER
+    assert len(_shard_ranges(0, 100000, 4)) == 8
+
+    record = {"客户名称编码": "C01", "标签名称": "ALPHA", "开始号": "DSK01001", "总张数": 100, "张/盒": 10,
+              "主题": "ALPHA", "盒/小箱": 2}
+    assert "渲染进程数" not in normalize_job_record(record)["params"]
+    assert normalize_job_record(dict(record, 渲染进程数="4"))["params"]["渲染进程数"] == 4
+    try:
+        normalize_job_record(dict(record, 渲染进程数=0))
+        assert False, "渲染进程数必须为正整数"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_sharded_output_matches_single_process()
+    test_unknown_characters_fall_back_to_single_process()
+    test_shard_ranges_and_worker_option()
+    print("✅ 盒标分片并行渲染快速测试通过")
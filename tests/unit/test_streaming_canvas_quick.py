@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+流式画布快速测试
+验证流式写入的各级标签与普通画布逐页相同，峰值内存不随页数增长，不支持的功能报错且不留下半个文件
+"""
+
+import sys
+import os
+import io
+import gc
+import contextlib
+import tempfile
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.colors import CMYKColor
+from reportlab.pdfgen import canvas
+
+from src.data.job_records import normalize_job_record
+from src.pdf.box_table import draw_box_table
+from src.pdf.regular_box.template import RegularTemplate
+from src.pdf.split_box.template import SplitBoxTemplate
+from src.pdf.streaming_canvas import StreamingCanvas
+from src.utils.font_manager import font_manager
+from tests.unit.test_fast_label_writer_quick import _page_streams
+
+
+# 直接调用box_table时需要先注册字体（模板在PDFBase中注册）
+font_manager.register_chinese_font()
+
+DATA = {"客户名称编码": "C01", "标签名称": "ALPHA BETA GAMMA DELTA", "开始号": "DSK01001", "总张数": 437}
+PAGE_SIZE = (255, 141)
+
+
+def _generate(template, params, output_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return template.create_multi_level_pdfs(DATA, params, output_dir)
+
+
+def _peak_memory(canvas_class, pages, path):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        c = canvas_class(path, pagesize=PAGE_SIZE)
+        c.setPageCompression(1)
+        for i in range(pages):
+            c.setFillColor(CMYKColor(0, 0, 0, 1))
+            draw_box_table(c, *PAGE_SIZE, "THEME", 100, f"DSK{i:05d}-DSK{i + 9:05d}", f"{i + 1}/{pages}", "REM")
+            c.showPage()
+        c.save()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_streaming_matches_canvas():
+    """两个模板、有无小箱：流式写入的各级标签与普通画布逐页相同，交叉引用偏移量指向各对象"""
+    cases = (
+        (RegularTemplate(), {"是否有小箱": True}),
+        (RegularTemplate(), {"是否有小箱": False, "标签模版": "无纸卡备注"}),
+        (SplitBoxTemplate(), {"是否有小箱": True, "盒/套": 2}),
+        (SplitBoxTemplate(), {"是否有小箱": False, "盒/套": 2}),
+    )
+    for template, extra in cases:
+        params = dict({"张/盒": 10, "盒/小箱": 2, "小箱/大箱": 2, "选择外观": "外观二", "中文名称": "名称",
+                       "是否有盒标": True, "序列号字体大小": 10, "级别进程数": 1}, **extra)
+        with tempfile.TemporaryDirectory() as canvas_dir, tempfile.TemporaryDirectory() as streaming_dir:
+            expected = _generate(template, params, canvas_dir)
+            streamed = _generate(template, dict(params, 流式写入=True), streaming_dir)
+            assert list(streamed) == list(expected)
+            for name, path in expected.items():
+                if not path.endswith(".pdf"):
+                    continue
+                assert _page_streams(streamed[name]) == _page_streams(path)
+                raw = open(streamed[name], "rb").read()
+                assert b"ReportLab" not in raw
+                xref = raw[int(raw[raw.rindex(b"startxref") + 9:].split()[0]):]
+                offsets = [int(line[:10]) for line in xref.split(b"\n")[3:] if line.endswith(b" n ")]
+                for number, offset in enumerate(offsets, 1):
+                    assert raw[offset:].startswith(f"{number} 0 obj".encode())
+
+
+def test_peak_memory_flat():
+    """页数增加4倍时流式画布的峰值内存基本不变，普通画布随页数线性增长"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        path = os.path.join(output_dir, "labels.pdf")
+        streaming_growth = _peak_memory(StreamingCanvas, 2000, path) - _peak_memory(StreamingCanvas, 500, path)
+        canvas_growth = _peak_memory(canvas.Canvas, 2000, path) - _peak_memory(canvas.Canvas, 500, path)
+    assert streaming_growth < 512 * 1024
+    assert canvas_growth > 10 * streaming_growth
+
+
+def test_unsupported_features_and_option():
+    """不支持的功能报错，未保存的流式画布释放后删除未写完的文件；流式写入列可选"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        path = os.path.join(output_dir, "labels.pdf")
+        c = StreamingCanvas(path, pagesize=PAGE_SIZE)
+        c.drawString(10, 10, "PAGE 1")
+        c.showPage()
+        c.linkURL("https://example.com", (0, 0, 10, 10))
+        try:
+            c.showPage()
+            assert False, "流式画布不支持链接"
+        except ValueError:
+            pass
+        assert os.path.exists(path)
+        del c
+        gc.collect()
+        assert not os.path.exists(path)
+
+    record = {"客户名称编码": "C01", "标签名称": "ALPHA", "开始号": "DSK01001", "总张数": 100, "张/盒": 10,
+              "主题": "ALPHA", "盒/小箱": 2}
+    assert "流式写入" not in normalize_job_record(record)["params"]
+    assert normalize_job_record(dict(record, 流式写入="是"))["params"]["流式写入"] is True
+
+
+if __name__ == "__main__":
+    test_streaming_matches_canvas()
+    test_peak_memory_flat()
+    test_unsupported_features_and_option()
+    print("✅ 流式画布快速测试通过")
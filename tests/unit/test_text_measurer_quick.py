@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+文本测量缓存快速测试
+验证宽度和换行结果与直接测量一致，缓存有界，重复文本只测量一次
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from src.pdf.label_layout import blank_page_layout, box_label_layout, box_table_layout
+from src.pdf.regular_box.template import RegularTemplate
+from src.utils.text_measurer import TextMeasurer, text_measurer
+from src.utils.text_processor import text_processor
+
+
+def test_results_match_direct_measurement():
+    """缓存的宽度和换行与逐次测量的结果相同，返回的列表互不影响"""
+    measurer = TextMeasurer()
+    assert measurer.string_width("ALPHA 01", "Helvetica", 12) == stringWidth("ALPHA 01", "Helvetica", 12)
+
+    lines = measurer.wrap_words("ALPHA BETA GAMMA DELTA", 60, "Helvetica", 10)
+    assert lines == ["ALPHA", "BETA", "GAMMA", "DELTA"]
+    lines.append("changed")
+    assert "changed" not in measurer.wrap_words("ALPHA BETA GAMMA DELTA", 60, "Helvetica", 10)
+
+    assert measurer.wrap_chars("ABCDEFGH", 20, "Helvetica", 10) == ["AB", "CD", "EF", "GH"]
+    assert measurer.wrap_chars("WIDE", 1, "Helvetica", 10) == ["W", "I", "D", "E"]  # 单个字符超宽时强制分行
+    assert text_processor.wrap_text_to_fit(None, "", 60, "Helvetica", 10) == [""]
+
+
+def test_bounded_lru_counts_hits():
+    """按 (文本, 字体, 字号[, 宽度]) 缓存，超出容量时淘汰最久未用的条目"""
+    measurer = TextMeasurer(maxsize=2)
+    for text in ("A", "B", "A", "C", "B"):
+        measurer.string_width(text, "Helvetica", 10)
+    measurer.string_width("A", "Helvetica", 12)  # 字号不同，单独缓存
+    stats = measurer.cache_stats()["width"]
+    assert stats == {"hits": 1, "misses": 5, "size": 2}
+
+    measurer.wrap_words("ALPHA BETA", 100, "Helvetica", 10)
+    measurer.wrap_words("ALPHA BETA", 100, "Helvetica", 10)
+    measurer.wrap_words("ALPHA BETA", 50, "Helvetica", 10)
+    assert measurer.cache_stats()["wrap_words"]["hits"] == 1
+    measurer.clear()
+    assert measurer.cache_stats()["wrap_words"] == {"hits": 0, "misses": 0, "size": 0}
+
+
+def test_job_measures_repeated_text_once():
+    """一个任务内标题、主题和中文名称的测量次数与页数无关"""
+    params = {"张/盒": 10, "盒/小箱": 2, "小箱/大箱": 2, "是否有盒标": True, "选择外观": "外观一",
+              "中文名称": "阿尔法贝塔伽马德尔塔艾普西隆泽塔伊塔西塔约塔卡帕", "标签模版": "有纸卡备注"}
+    stats = []
+    for sheets in (80, 8000):
+        data = {"客户名称编码": "C01", "标签名称": "ALPHA BETA GAMMA DELTA EPSILON ZETA", "开始号": "DSK01001",
+                "总张数": sheets}
+        box_label_layout.cache_clear()
+        box_table_layout.cache_clear()
+        blank_page_layout.cache_clear()
+        text_measurer.clear()
+        with tempfile.TemporaryDirectory() as output_dir:
+            RegularTemplate().create_multi_level_pdfs(data, params, output_dir)
+        stats.append(text_measurer.cache_stats())
+    assert stats[0] == stats[1]
+    assert stats[1]["wrap_words"]["misses"] <= 3
+
+
+if __name__ == "__main__":
+    test_results_match_direct_measurement()
+    test_bounded_lru_counts_hits()
+    test_job_measures_repeated_text_once()
+    print("✅ 文本测量缓存快速测试通过")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+线性换行快速测试
+验证基于逐字符宽度表的换行与逐行整体测量的结果完全一致，且每个字符只测量常数次
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from src.utils import text_measurer as measurer_module
+
+
+# reportlab自带的TrueType字体，代替未安装的微软雅黑
+TTF_NAME = "VeraWrapTest"
+pdfmetrics.registerFont(TTFont(TTF_NAME, os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")))
+
+
+def _reference_wrap(text, max_width, font_name, font_size, by_chars=False):
+    """原有实现：每加入一个单词/字符就重新测量整行"""
+    lines, current = [], ""
+    for token in (text if by_chars else text.split()):
+        test_line = current + token if by_chars else current + (" " if current else "") + token
+        if pdfmetrics.stringWidth(test_line, font_name, font_size) <= max_width:
+            current = test_line
+        elif current:
+            lines.append(current)
+            current = token
+        else:
+            lines.append(token)
+            current = ""
+    if current:
+        lines.append(current)
+    return tuple(lines) or ((text,) if by_chars else ("",))
+
+
+def test_identical_line_breaks():
+    """随机文本（含中文、重音字符）在Type1和TrueType字体下换行结果一致，包括恰好等宽的边界"""
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefg0123456789-.,阿尔法贝塔伽马é     "
+    rng = random.Random(7)
+    for font_name in ("Helvetica", "Helvetica-Bold", TTF_NAME):
+        for _ in range(500):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 80))).strip() or "A"
+            font_size = rng.choice([8, 10, 12, 22])
+            # 一半用某个前缀的精确宽度作为最大宽度，检查边界比较
+            prefix = text[:rng.randint(1, len(text))]
+            max_width = rng.choice([pdfmetrics.stringWidth(prefix, font_name, font_size), rng.uniform(5, 250)])
+            assert measurer_module._wrap_words(text, max_width, font_name, font_size) == \
+                _reference_wrap(text, max_width, font_name, font_size)
+            assert measurer_module._wrap_chars(text, max_width, font_name, font_size) == \
+                _reference_wrap(text, max_width, font_name, font_size, by_chars=True)
+
+
+def test_glyph_table_matches_font_widths():
+    """逐字符宽度取自字体宽度表，累加后与stringWidth逐位相同"""
+    for font_name in ("Helvetica-Bold", TTF_NAME):
+        advances = measurer_module._glyph_advances(font_name)
+        for text in ("Paper Cards", "阿尔法 ALPHA-01", "é"):
+            units = 0
+            for char in text:
+                units += advances[char]
+            assert advances.to_points(units, 22) == pdfmetrics.stringWidth(text, font_name, 22)
+
+    face = pdfmetrics.getFont(TTF_NAME).face
+    assert measurer_module._glyph_advances(TTF_NAME)["A"] == face.charWidths[ord("A")]
+
+
+def test_wrapping_is_linear():
+    """超长中文名称按字符换行：每个字符只查表常数次，不再逐行重新测量"""
+    lookups = []
+
+    class CountingAdvances(measurer_module._GlyphAdvances):
+        def __getitem__(self, char):
+            lookups.append(char)
+            return super().__getitem__(char)
+
+    long_name = "阿尔法贝塔伽马德尔塔" * 500
+    advances = CountingAdvances(TTF_NAME)
+    original = measurer_module._glyph_advances
+    measurer_module._glyph_advances = lambda font_name: advances
+    try:
+        lines = measurer_module._wrap_chars(long_name, 200, TTF_NAME, 22)
+        words = measurer_module._wrap_words(" ".join(["ALPHA"] * 2000), 300, TTF_NAME, 10)
+    finally:
+        measurer_module._glyph_advances = original
+    assert "".join(lines) == long_name and len(lines) > 100
+    assert len(words) > 50
+    # 字符换行每字符最多查表2次，单词换行每字符（含空格）最多2次
+    assert len(lookups) <= 2 * len(long_name) + 2 * (2000 * 6 + 1)
+
+
+if __name__ == "__main__":
+    test_identical_line_breaks()
+    test_glyph_table_matches_font_widths()
+    test_wrapping_is_linear()
+    print("✅ 线性换行快速测试通过")
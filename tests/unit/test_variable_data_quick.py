@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+可变数据标签快速测试
+验证每行一页、大量行只生成一个文件、错误行定位且不保留未写完的文件
+"""
+
+import sys
+import os
+import re
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.pdf.variable_data import VariableDataTemplate
+
+
+def _page_count(path):
+    with open(path, "rb") as f:
+        return len(re.findall(rb"/Type /Page\b", f.read()))
+
+
+def _rows(count):
+    for i in range(1, count + 1):
+        yield f"清单.xlsx 第{i + 1}行", {"序列号": f"SN{i:05d}-SN{i + 9:05d}", "数量": 10.0, "箱号": f"{i}/{count}"}
+
+
+def test_one_page_per_row(tmp_path):
+    """每行数据一页，中文名称非空时第一页为空箱标签"""
+    output = str(tmp_path / "小箱标.pdf")
+    path = VariableDataTemplate().create_labels(
+        _rows(7), output, "小箱标", defaults={"中文名称": "测试", "客户名称编码": "C001"}
+    )
+
+    assert path == output
+    assert _page_count(output) == 8
+
+
+def test_many_rows_single_file(tmp_path):
+    """行数很多时仍只生成一个文件（流式写入，不再按 _001、_002 分文件）"""
+    output = str(tmp_path / "大箱标.pdf")
+    path = VariableDataTemplate().create_labels(_rows(6000), output, "大箱标", template="split_box")
+
+    assert path == output
+    assert os.listdir(tmp_path) == ["大箱标.pdf"]
+    assert _page_count(output) == 6000
+
+
+def test_missing_serial_reports_row(tmp_path):
+    """缺少序列号的行报错并带上来源行号，已写入的页面连同文件一起删除"""
+    rows = [("清单.xlsx 第2行", {"序列号": "SN00001"}), ("清单.xlsx 第3行", {"序列号": None})]
+    with pytest.raises(ValueError, match="清单.xlsx 第3行: 缺少序列号"):
+        VariableDataTemplate().create_labels(iter(rows), str(tmp_path / "盒标.pdf"), "盒标")
+    assert os.listdir(tmp_path) == []
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_one_page_per_row, test_many_rows_single_file, test_missing_serial_reports_row):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ 可变数据标签快速测试通过")